@@ -10,6 +10,7 @@
 set -ex
 
 cp client/resources/sigv4_auth.py client/src/pcluster_client
+cp client/resources/fast_client.py client/src/pcluster_client
 patch -u -N client/src/pcluster_client/api_client.py < client/resources/api_client.py.patch
 patch -u -N client/src/requirements.txt < client/resources/client-requirements.txt.patch
 patch -u -N client/src/setup.py < client/resources/setup.py.patch
@@ -0,0 +1,210 @@
+"""High throughput API client."""
+
+# Copyright 2024 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"). You
+# may not use this file except in compliance with the License. A copy
+# of the License is located at
+#
+# http://aws.amazon.com/apache2.0/
+#
+# or in the "LICENSE.txt" file accompanying this file. This file is
+# distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS
+# OF ANY KIND, express or implied. See the License for the specific
+# language governing permissions and limitations under the License.
+
+import asyncio
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+from pcluster_client import rest
+from pcluster_client.api_client import ApiClient
+from pcluster_client.model_utils import (
+    ModelNormal,
+    ModelSimple,
+    date,
+    datetime,
+    deserialize_primitive,
+    file_type,
+    validate_and_convert_types,
+)
+
+DEFAULT_POOL_THREADS = 16
+
+# Model class -> {json key: (python attribute name, accepted types)}
+_MODEL_PLANS = {}
+
+
+def _get_model_plan(model_class):
+    plan = _MODEL_PLANS.get(model_class)
+    if plan is None:
+        openapi_types = model_class.openapi_types
+        plan = {
+            json_key: (attribute, openapi_types[attribute]) for attribute, json_key in model_class.attribute_map.items()
+        }
+        _MODEL_PLANS[model_class] = plan
+    return plan
+
+
+def _new_model(model_class, data_store, configuration):
+    """Create a model instance holding the given values, without validating them."""
+    model = object.__new__(model_class)
+    model.__dict__.update(
+        _data_store=data_store,
+        _check_type=False,
+        _spec_property_naming=True,
+        _path_to_item=(),
+        _configuration=configuration,
+        _visited_composed_classes=(model_class,),
+    )
+    return model
+
+
+def _build_model(model_class, data, configuration):
+    plan = _get_model_plan(model_class)
+    discard_unknown_keys = configuration.discard_unknown_keys and model_class.additional_properties_type is None
+    data_store = {}
+    for json_key, value in data.items():
+        attribute, types = plan.get(json_key, (json_key, None))
+        if types is not None:
+            data_store[attribute] = _convert(value, types, configuration)
+        elif not discard_unknown_keys:
+            data_store[attribute] = value
+    return _new_model(model_class, data_store, configuration)
+
+
+def _parse_datetime(value, required_type):
+    # The API returns ISO 8601 timestamps in UTC, e.g. 2021-07-15T01:22:02.655Z
+    try:
+        parsed = datetime.fromisoformat(value[:-1] + "+00:00" if value.endswith("Z") else value)
+    except ValueError:
+        return deserialize_primitive(value, required_type, ["received_data"])
+    return parsed if required_type is datetime else parsed.date()
+
+
+# Returned by _convert_to_type when the value does not have the shape of the type
+_NO_MATCH = object()
+
+
+def _convert_to_type(value, required_type, configuration):
+    """Convert a trusted JSON value to the given type, return _NO_MATCH if the value does not have its shape."""
+    if isinstance(required_type, list):
+        if isinstance(value, list):
+            item_types = tuple(required_type)
+            return [_convert(item, item_types, configuration) for item in value]
+    elif isinstance(required_type, dict):
+        if isinstance(value, dict):
+            value_types = required_type[str]
+            return {key: _convert(item, value_types, configuration) for key, item in value.items()}
+    elif required_type in (datetime, date):
+        if isinstance(value, str):
+            return _parse_datetime(value, required_type)
+    elif isinstance(required_type, type) and issubclass(required_type, ModelSimple):
+        return _new_model(required_type, {"value": value}, configuration)
+    elif isinstance(required_type, type) and issubclass(required_type, ModelNormal):
+        if isinstance(value, dict) and required_type.discriminator is None:
+            return _build_model(required_type, value, configuration)
+    return _NO_MATCH
+
+
+def _convert(value, types, configuration):
+    """
+    Convert a trusted JSON value to the first of the given types it matches.
+
+    Values which do not match any type in the expected shape go through the
+    generated validation and conversion logic.
+    """
+    if value is None or type(value) in types:
+        return value
+    for required_type in types:
+        converted = _convert_to_type(value, required_type, configuration)
+        if converted is not _NO_MATCH:
+            return converted
+    return validate_and_convert_types(value, types, ["received_data"], True, True, configuration=configuration)
+
+
+class FastApiClient(ApiClient):
+    """
+    API client tuned for applications issuing many requests.
+
+    Compared to ApiClient:
+      * responses are trusted by default: models are built without checking
+        the type, the allowed values and the validations of every field, which
+        is the dominant cost when deserializing large responses.
+        Set trusted_responses=False to keep the full checks.
+      * the thread pool and the keep-alive connection pool are sized so that
+        concurrent requests reuse the same connections to the API endpoint.
+      * batch() runs many API calls concurrently from asyncio code.
+
+    :param pool_threads: The number of threads used to run concurrent requests.
+    :param pools_size: The number of connection pools, one per host.
+    :param maxsize: The number of connections kept alive per host.
+        Defaults to the largest of pool_threads and configuration.connection_pool_maxsize.
+    :param trusted_responses: Skip the checks when deserializing responses.
+    """
+
+    def __init__(
+        self,
+        configuration=None,
+        header_name=None,
+        header_value=None,
+        cookie=None,
+        pool_threads=DEFAULT_POOL_THREADS,
+        pools_size=4,
+        maxsize=None,
+        trusted_responses=True,
+    ):
+        super().__init__(configuration, header_name, header_value, cookie, pool_threads)
+        if maxsize is None:
+            maxsize = max(pool_threads, self.configuration.connection_pool_maxsize or 0)
+        self.rest_client = rest.RESTClientObject(self.configuration, pools_size=pools_size, maxsize=maxsize)
+        self.trusted_responses = trusted_responses
+        self._executor = None
+
+    def close(self):
+        """Shut down the executor of the batched calls, then the thread pool of the client."""
+        if self._executor:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        super().close()
+
+    @property
+    def executor(self):
+        """Create the executor running the batched calls on first use."""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.pool_threads, thread_name_prefix="pcluster-client")
+        return self._executor
+
+    def deserialize(self, response, response_type, _check_type):
+        """Deserialize the response, without checking the values when the responses are trusted."""
+        if not self.trusted_responses or response_type == (file_type,):
+            return super().deserialize(response, response_type, _check_type)
+        try:
+            received_data = json.loads(response.data)
+        except ValueError:
+            received_data = response.data
+        return _convert(received_data, response_type, self.configuration)
+
+    async def batch(self, calls, max_concurrency=None, return_exceptions=False):
+        """
+        Run the given API calls concurrently, sharing the connections to the API.
+
+        :param calls: iterable of callables without arguments, e.g.
+            functools.partial(api.describe_cluster, cluster_name)
+        :param max_concurrency: maximum number of calls in flight, pool_threads by default.
+        :param return_exceptions: return the exceptions raised by the calls
+            in place of their results instead of raising the first one.
+        :return: the results of the calls, in the same order.
+        """
+        loop = asyncio.get_running_loop()
+        semaphore = asyncio.Semaphore(min(max_concurrency or self.pool_threads, self.pool_threads))
+
+        async def _run(call):
+            async with semaphore:
+                return await loop.run_in_executor(self.executor, call)
+
+        return await asyncio.gather(*(_run(call) for call in calls), return_exceptions=return_exceptions)
+
+    def run_batch(self, calls, max_concurrency=None, return_exceptions=False):
+        """Blocking version of batch(), for callers not running an event loop."""
+        return asyncio.run(self.batch(calls, max_concurrency=max_concurrency, return_exceptions=return_exceptions))
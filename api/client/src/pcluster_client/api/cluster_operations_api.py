@@ -344,6 +344,7 @@ class ClusterOperationsApi(object):
                     'region',
                     'dryrun',
                     'force_update',
+                    'full_validation',
                 ],
                 'required': [
                     'cluster_name',
@@ -387,6 +388,8 @@ class ClusterOperationsApi(object):
                         (bool,),
                     'force_update':
                         (bool,),
+                    'full_validation':
+                        (bool,),
                 },
                 'attribute_map': {
                     'cluster_name': 'clusterName',
@@ -395,6 +398,7 @@ class ClusterOperationsApi(object):
                     'region': 'region',
                     'dryrun': 'dryrun',
                     'force_update': 'forceUpdate',
+                    'full_validation': 'fullValidation',
                 },
                 'location_map': {
                     'cluster_name': 'path',
@@ -404,6 +408,7 @@ class ClusterOperationsApi(object):
                     'region': 'query',
                     'dryrun': 'query',
                     'force_update': 'query',
+                    'full_validation': 'query',
                 },
                 'collection_format_map': {
                     'suppress_validators': 'multi',
@@ -782,6 +787,7 @@ class ClusterOperationsApi(object):
             region (str): AWS Region that the operation corresponds to.. [optional]
             dryrun (bool): Only perform request validation without creating any resource. May be used to validate the cluster configuration and update requirements. (Defaults to 'false'.). [optional]
             force_update (bool): Force update by ignoring the update validation errors. (Defaults to 'false'.). [optional]
+            full_validation (bool): Validate the whole cluster configuration instead of only the parts changed by the update. (Defaults to 'false'.). [optional]
             _return_http_data_only (bool): response data without head status
                 code and headers. Default is True.
             _preload_content (bool): if False, the urllib3.HTTPResponse object
@@ -279,6 +279,9 @@ class ImageOperationsApi(object):
                     'image_status',
                     'region',
                     'next_token',
+                    'os',
+                    'architecture',
+                    'version',
                 ],
                 'required': [
                     'image_status',
@@ -302,16 +305,28 @@ class ImageOperationsApi(object):
                         (str,),
                     'next_token':
                         (str,),
+                    'os':
+                        (str,),
+                    'architecture':
+                        (str,),
+                    'version':
+                        (str,),
                 },
                 'attribute_map': {
                     'image_status': 'imageStatus',
                     'region': 'region',
                     'next_token': 'nextToken',
+                    'os': 'os',
+                    'architecture': 'architecture',
+                    'version': 'version',
                 },
                 'location_map': {
                     'image_status': 'query',
                     'region': 'query',
                     'next_token': 'query',
+                    'os': 'query',
+                    'architecture': 'query',
+                    'version': 'query',
                 },
                 'collection_format_map': {
                 }
@@ -661,6 +676,9 @@ class ImageOperationsApi(object):
         Keyword Args:
             region (str): List images built in a given AWS Region.. [optional]
             next_token (str): Token to use for paginated requests.. [optional]
+            os (str): Filter AVAILABLE images by OS distribution (Default is to not filter.). [optional]
+            architecture (str): Filter AVAILABLE images by architecture (Default is to not filter.). [optional]
+            version (str): Filter images by ParallelCluster version (Default is to not filter.). [optional]
             _return_http_data_only (bool): response data without head status
                 code and headers. Default is True.
             _preload_content (bool): if False, the urllib3.HTTPResponse object
@@ -0,0 +1,113 @@
+"""Unit tests of the FastApiClient of the ParallelCluster API client."""
+
+import json
+import threading
+import unittest
+
+from pcluster_client.fast_client import FastApiClient
+from pcluster_client.model.describe_cluster_instances_response_content import DescribeClusterInstancesResponseContent
+from pcluster_client.model.describe_cluster_response_content import DescribeClusterResponseContent
+from pcluster_client.model.instance_state import InstanceState
+
+INSTANCE = {
+    "instanceId": "i-0123456789abcdef0",
+    "instanceType": "c5.xlarge",
+    "launchTime": "2021-07-15T01:22:02.655Z",
+    "privateIpAddress": "10.0.0.1",
+    "state": "running",
+    "nodeType": "HeadNode",
+}
+
+
+class FakeResponse(object):
+    """HTTP response returning the given data as JSON document."""
+
+    def __init__(self, data):
+        self.data = json.dumps(data)
+
+
+class TestFastApiClient(unittest.TestCase):
+    """FastApiClient unit tests."""
+
+    def setUp(self):
+        """Create a client trusting the responses and one checking them."""
+        self.trusted_client = FastApiClient()
+        self.checked_client = FastApiClient(trusted_responses=False)
+
+    def tearDown(self):
+        """Close the clients."""
+        self.trusted_client.close()
+        self.checked_client.close()
+
+    def assert_same_deserialization(self, data, response_type):
+        """Verify that the trusted deserialization returns the same model as the checked one."""
+        trusted = self.trusted_client.deserialize(FakeResponse(data), response_type, True)
+        checked = self.checked_client.deserialize(FakeResponse(data), response_type, True)
+        self.assertEqual(trusted, checked)
+        self.assertEqual(trusted.to_dict(), checked.to_dict())
+        return trusted
+
+    def test_trusted_deserialization(self):
+        """Test that trusted responses are deserialized to the same models as the checked ones."""
+        response = self.assert_same_deserialization(
+            {"instances": [INSTANCE] * 10, "nextToken": "token"},
+            (DescribeClusterInstancesResponseContent,),
+        )
+        self.assertIsInstance(response.instances[0].state, InstanceState)
+        self.assertEqual(response.instances[0].launch_time.microsecond, 655000)
+
+        self.assert_same_deserialization(
+            {
+                "clusterName": "mycluster",
+                "region": "us-east-1",
+                "version": "3.12.0",
+                "clusterStatus": "CREATE_COMPLETE",
+                "cloudformationStackStatus": "CREATE_COMPLETE",
+                "cloudFormationStackStatus": "CREATE_COMPLETE",
+                "cloudformationStackArn": "arn",
+                "creationTime": "2021-07-15T01:22:02.655Z",
+                "lastUpdatedTime": "2021-07-15T01:22:02Z",
+                "clusterConfiguration": {"url": "https://url"},
+                "computeFleetStatus": "RUNNING",
+                "tags": [{"key": "key", "value": "value"}],
+                "headNode": INSTANCE,
+                "unknownField": {"key": 1},
+            },
+            (DescribeClusterResponseContent,),
+        )
+
+    def test_connection_pool_size(self):
+        """Test that the connections kept alive match the number of threads, unless set explicitly."""
+        client = FastApiClient(pool_threads=64)
+        self.assertEqual(client.rest_client.pool_manager.connection_pool_kw["maxsize"], 64)
+        client = FastApiClient(pool_threads=2, maxsize=8)
+        self.assertEqual(client.rest_client.pool_manager.connection_pool_kw["maxsize"], 8)
+
+    def test_run_batch(self):
+        """Test that the batched calls run concurrently up to max_concurrency and keep their order."""
+        lock = threading.Lock()
+        in_flight = {"current": 0, "max": 0}
+        barrier = threading.Barrier(2)
+
+        def call(value):
+            with lock:
+                in_flight["current"] += 1
+                in_flight["max"] = max(in_flight["max"], in_flight["current"])
+            barrier.wait(timeout=5)
+            with lock:
+                in_flight["current"] -= 1
+            if value == 3:
+                raise ValueError(value)
+            return value
+
+        results = self.trusted_client.run_batch(
+            [lambda value=value: call(value) for value in range(6)], max_concurrency=2, return_exceptions=True
+        )
+        self.assertEqual(results[:3], [0, 1, 2])
+        self.assertIsInstance(results[3], ValueError)
+        self.assertEqual(results[4:], [4, 5])
+        self.assertEqual(in_flight["max"], 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
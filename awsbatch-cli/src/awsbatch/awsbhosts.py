@@ -307,9 +307,16 @@ def main():
         config = AWSBatchCliConfig(log, args.cluster)
         boto3_factory = Boto3ClientFactory(region=config.region, proxy=config.proxy)
 
-        AWSBhostsCommand(log, boto3_factory).run(
-            compute_environments=[config.compute_environment], instance_ids=args.instance_ids, show_details=args.details
-        )
+        try:
+            AWSBhostsCommand(log, boto3_factory).run(
+                compute_environments=[config.compute_environment],
+                instance_ids=args.instance_ids,
+                show_details=args.details,
+            )
+        except SystemExit:
+            # listing the hosts fails if the compute environment of a stale cached configuration is gone
+            config.invalidate_cache(log)
+            raise
 
     except KeyboardInterrupt:
         print("Exiting...")
@@ -145,7 +145,11 @@ def main():
         else:
             job_queues = [config.job_queue]
             show_details = args.details
-        AWSBqueuesCommand(log, boto3_factory).run(job_queues=job_queues, show_details=show_details)
+        command = AWSBqueuesCommand(log, boto3_factory)
+        command.run(job_queues=job_queues, show_details=show_details)
+        if not args.job_queues and not command.output.items:
+            # the job queue of a stale cached configuration is gone
+            config.invalidate_cache(log)
 
     except KeyboardInterrupt:
         print("Exiting...")
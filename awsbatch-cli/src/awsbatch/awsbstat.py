@@ -499,13 +499,18 @@ def main(argv=None):
             job_status_set = OrderedDict((status, "") for status in AWS_BATCH_JOB_STATUS)
         job_status = list(job_status_set)
 
-        AWSBstatCommand(log, boto3_factory).run(
-            job_status=job_status,
-            expand_children=args.expand_children,
-            job_ids=args.job_ids,
-            job_queue=config.job_queue,
-            show_details=args.details,
-        )
+        try:
+            AWSBstatCommand(log, boto3_factory).run(
+                job_status=job_status,
+                expand_children=args.expand_children,
+                job_ids=args.job_ids,
+                job_queue=config.job_queue,
+                show_details=args.details,
+            )
+        except SystemExit:
+            # listing the jobs fails if the job queue of a stale cached configuration is gone
+            config.invalidate_cache(log)
+            raise
 
     except KeyboardInterrupt:
         print("Exiting...")
@@ -10,18 +10,20 @@
 # This file is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, express or implied.
 # See the License for the specific language governing permissions and limitations under the License.
 
+import io
 import os
 import pipes
 import re
-import shutil
+import shlex
 import sys
-import tempfile
 import time
+from concurrent.futures import ThreadPoolExecutor
 
 import argparse
+from tabulate import tabulate
 
 from awsbatch.common import AWSBatchCliConfig, Boto3ClientFactory, config_logger
-from awsbatch.utils import S3Uploader, fail, shell_join
+from awsbatch.utils import RateLimiter, S3Uploader, fail, shell_join
 
 
 def _get_parser():
@@ -141,6 +143,28 @@ def _get_parser():
         "with a job ID for array jobs so that each index child of this job must wait for the corresponding index "
         "child of each dependency to complete before it can begin. Syntax: jobId=<string>,type=<string>;...",
     )
+    # bulk submission parameters
+    parser.add_argument(
+        "-mf",
+        "--manifest",
+        help="File listing the jobs to submit, one per line. Every line contains the awsbsub options and arguments "
+        "of a job, e.g. '-jn job1 -if input.txt my_command arg1'. Empty lines and lines starting with # are ignored. "
+        "Use - to read the manifest from stdin. All the jobs are submitted to the same cluster",
+    )
+    parser.add_argument(
+        "-mp",
+        "--max-parallel",
+        help="The maximum number of jobs of the manifest prepared and submitted in parallel. Default is 8",
+        type=int,
+        default=8,
+    )
+    parser.add_argument(
+        "-sr",
+        "--submission-rate",
+        help="The maximum number of jobs of the manifest submitted per second. Default is 10",
+        type=float,
+        default=10,
+    )
     parser.add_argument("-aws", "--awscli", help=argparse.SUPPRESS, action="store_true")
     parser.add_argument("-ll", "--log-level", help=argparse.SUPPRESS, default="ERROR")
     parser.add_argument(
@@ -165,7 +189,7 @@ def _validate_parameters(args):
             fail("The command parameter is required with --command-file option")
         elif not os.path.isfile(args.command):
             fail("The command parameter (%s) must be an existing file" % args.command)
-    elif not sys.stdin.isatty():
+    elif args.stdin:
         # stdin
         if args.arguments or isinstance(args.command, str):
             fail("Error: command and arguments cannot be specified when submitting by stdin.")
@@ -182,22 +206,41 @@ def _validate_parameters(args):
         fail("--parent-working-dir and --working-dir parameters cannot be used at the same time")
 
 
-def _generate_unique_job_key(job_name):
+def _validate_manifest_parameters(args):
+    """
+    Validate input parameters of a manifest submission.
+
+    :param args: args variable
+    """
+    if isinstance(args.command, str) or args.arguments:
+        fail("Error: command and arguments cannot be specified when submitting a manifest.")
+    if args.max_parallel < 1 or args.submission_rate <= 0:
+        fail("--max-parallel and --submission-rate parameters must be positive")
+
+
+def _generate_unique_job_key(job_name, suffix=None):
     """
     Generate an unique job key to use as identifier.
 
     :param job_name: job name
-    :return: "job-<job_name>-<timestamp>"
+    :param suffix: suffix distinguishing the jobs submitted at the same time (optional)
+    :return: "job-<job_name>-<timestamp>" or "job-<job_name>-<timestamp>-<suffix>"
     """
-    return "job-{0}-{1}".format(job_name, int(time.time() * 1000))
+    job_key = "job-{0}-{1}".format(job_name, int(time.time() * 1000))
+    return "{0}-{1}".format(job_key, suffix) if suffix is not None else job_key
+
 
+def _get_s3_dedup_folder(config):
+    """Return the S3 folder storing the deduplicated content of the job files."""
+    return "{prefix}/batch/inputs/".format(prefix=config.artifact_directory)
 
-def _upload_and_get_command(boto3_factory, args, job_s3_folder, job_name, config, log):
+
+def _upload_and_get_command(s3_uploader, args, job_s3_folder, job_name, config, log):
     """
     Get command by parsing args and config.
 
     The function will also perform an s3 upload, if needed.
-    :param boto3_factory: initialized Boto3ClientFactory object
+    :param s3_uploader: S3Uploader object
     :param args: input arguments
     :param job_s3_folder: S3 folder for the job files
     :param job_name: job name
@@ -206,15 +249,14 @@ def _upload_and_get_command(boto3_factory, args, job_s3_folder, job_name, config
     :return: command to submit
     """
     # create S3 folder for the job
-    s3_uploader = S3Uploader(boto3_factory, config.s3_bucket, job_s3_folder)
+    s3_uploader.create_folder(job_s3_folder)
 
-    # upload input files, if there
+    # upload input files, if there, in parallel
     if args.input_file:
-        for file in args.input_file:
-            s3_uploader.put_file(file, os.path.basename(file))
+        s3_uploader.put_files([(file, os.path.basename(file)) for file in args.input_file], job_s3_folder)
 
     # upload command, if needed
-    if args.command_file or not sys.stdin.isatty() or args.env:
+    if args.command_file or args.stdin or args.env:
         # define job script name
         job_script = job_name + ".sh"
         log.info("Using command-file option or stdin. Job script name: %s" % job_script)
@@ -224,18 +266,18 @@ def _upload_and_get_command(boto3_factory, args, job_s3_folder, job_name, config
             env_file = job_name + ".env.sh"
             # get environment variables and upload file used to extend the submission environment
             env_blacklist = args.env_blacklist if args.env_blacklist else config.env_blacklist
-            _get_env_and_upload(s3_uploader, args.env, env_blacklist, env_file, log)
+            _get_env_and_upload(s3_uploader, args.env, env_blacklist, env_file, job_s3_folder, log)
 
         # upload job script
         if args.command_file:
             # existing script file
             try:
-                s3_uploader.put_file(args.command, job_script)
+                s3_uploader.put_file(args.command, job_script, job_s3_folder)
             except Exception as e:
                 fail("Error creating job script. Failed with exception: %s" % e)
-        elif not sys.stdin.isatty():
+        elif args.stdin:
             # stdin
-            _get_stdin_and_upload(s3_uploader, job_script)
+            _get_stdin_and_upload(s3_uploader, job_script, job_s3_folder)
 
         # define command to execute
         bash_command = _compose_bash_command(args, config.s3_bucket, config.region, job_s3_folder, job_script, env_file)
@@ -249,25 +291,22 @@ def _upload_and_get_command(boto3_factory, args, job_s3_folder, job_name, config
     return command
 
 
-def _get_stdin_and_upload(s3_uploader, job_script):
+def _get_stdin_and_upload(s3_uploader, job_script, job_s3_folder):
     """
-    Create file from STDIN and upload to S3.
+    Stream STDIN to S3.
 
     :param s3_uploader: S3Uploader object
     :param job_script: job script name
+    :param job_s3_folder: S3 folder for the job files
     """
     try:
-        # copy stdin to temporary file and upload
         with os.fdopen(sys.stdin.fileno(), "rb") as src:
-            with tempfile.NamedTemporaryFile() as dst:
-                shutil.copyfileobj(src, dst)
-                dst.flush()
-                s3_uploader.put_file(dst.name, job_script)
+            s3_uploader.put_fileobj(src, job_script, job_s3_folder)
     except Exception as e:
         fail("Error creating job script. Failed with exception: %s" % e)
 
 
-def _get_env_and_upload(s3_uploader, env, env_blacklist, env_file, log):
+def _get_env_and_upload(s3_uploader, env, env_blacklist, env_file, job_s3_folder, log):
     """
     Get environment variables, create a file containing the list of the exported env variables and upload to S3.
 
@@ -275,15 +314,13 @@ def _get_env_and_upload(s3_uploader, env, env_blacklist, env_file, log):
     :param env: comma separated list of environment variables
     :param env_blacklist: comma separated list of blacklisted environment variables
     :param env_file: environment file name
+    :param job_s3_folder: S3 folder for the job files
     :param log: log
     """
     key_value_list = _get_env_key_value_list(env, log, env_blacklist)
     try:
-        # copy env to temporary file
-        with tempfile.NamedTemporaryFile(mode="w") as dst:
-            dst.write("\n".join(key_value_list) + "\n")
-            dst.flush()
-            s3_uploader.put_file(dst.name, env_file)
+        content = ("\n".join(key_value_list) + "\n").encode("utf-8")
+        s3_uploader.put_fileobj(io.BytesIO(content), env_file, job_s3_folder)
     except Exception as e:
         fail("Error creating environment file. Failed with exception: %s" % e)
 
@@ -430,7 +467,7 @@ class AWSBsubCommand:
         self.log = log
         self.batch_client = boto3_factory.get_client("batch")
 
-    def run(  # noqa: C901 FIXME
+    def submit(  # noqa: C901 FIXME
         self,
         job_definition,
         job_name,
@@ -445,120 +482,237 @@ class AWSBsubCommand:
         dependencies=None,
         env=None,
     ):  # pylint: disable=too-many-positional-arguments
-        """Submit the job."""
-        try:
-            # array properties
-            array_properties = {}
-            if array_size:
-                array_properties.update(size=array_size)
-
-            retry_strategy = {"attempts": retry_attempts}
-
-            depends_on = dependencies if dependencies else []
-
-            # populate container overrides
-            container_overrides = {"command": command}
-            if vcpus:
-                container_overrides.update(vcpus=vcpus)
-            if memory:
-                container_overrides.update(memory=memory)
-            # populate environment variables
-            environment = []
-            for env_var in env:
-                environment.append({"name": env_var[0], "value": env_var[1]})
-            container_overrides.update(environment=environment)
-
-            # common submission arguments
-            submission_args = {
-                "jobName": job_name,
-                "jobQueue": job_queue,
-                "dependsOn": depends_on,
-                "retryStrategy": retry_strategy,
+        """
+        Submit the job and return the AWS Batch response.
+
+        Unlike run, errors are raised to the caller, so that it can go on submitting other jobs.
+        """
+        # array properties
+        array_properties = {}
+        if array_size:
+            array_properties.update(size=array_size)
+
+        retry_strategy = {"attempts": retry_attempts}
+
+        depends_on = dependencies if dependencies else []
+
+        # populate container overrides
+        container_overrides = {"command": command}
+        if vcpus:
+            container_overrides.update(vcpus=vcpus)
+        if memory:
+            container_overrides.update(memory=memory)
+        # populate environment variables
+        environment = []
+        for env_var in env:
+            environment.append({"name": env_var[0], "value": env_var[1]})
+        container_overrides.update(environment=environment)
+
+        # common submission arguments
+        submission_args = {
+            "jobName": job_name,
+            "jobQueue": job_queue,
+            "dependsOn": depends_on,
+            "retryStrategy": retry_strategy,
+        }
+
+        if nodes:
+            submission_args.update({"jobDefinition": job_definition})
+
+            target_nodes = "0:"
+            # populate node overrides
+            node_overrides = {
+                "numNodes": nodes,
+                "nodePropertyOverrides": [{"targetNodes": target_nodes, "containerOverrides": container_overrides}],
             }
+            submission_args.update({"nodeOverrides": node_overrides})
+            if timeout:
+                submission_args.update({"timeout": {"attemptDurationSeconds": timeout}})
+        else:
+            # Standard submission
+            submission_args.update({"jobDefinition": job_definition})
+            submission_args.update({"containerOverrides": container_overrides})
+            submission_args.update({"arrayProperties": array_properties})
+            if timeout:
+                submission_args.update({"timeout": {"attemptDurationSeconds": timeout}})
+
+        self.log.debug("Job submission args: %s", submission_args)
+        return self.batch_client.submit_job(**submission_args)
 
-            if nodes:
-                submission_args.update({"jobDefinition": job_definition})
-
-                target_nodes = "0:"
-                # populate node overrides
-                node_overrides = {
-                    "numNodes": nodes,
-                    "nodePropertyOverrides": [{"targetNodes": target_nodes, "containerOverrides": container_overrides}],
-                }
-                submission_args.update({"nodeOverrides": node_overrides})
-                if timeout:
-                    submission_args.update({"timeout": {"attemptDurationSeconds": timeout}})
-            else:
-                # Standard submission
-                submission_args.update({"jobDefinition": job_definition})
-                submission_args.update({"containerOverrides": container_overrides})
-                submission_args.update({"arrayProperties": array_properties})
-                if timeout:
-                    submission_args.update({"timeout": {"attemptDurationSeconds": timeout}})
-
-            self.log.debug("Job submission args: %s", submission_args)
-            response = self.batch_client.submit_job(**submission_args)
+    def run(self, **kwargs):
+        """Submit the job."""
+        try:
+            response = self.submit(**kwargs)
             print("Job %s (%s) has been submitted." % (response["jobId"], response["jobName"]))
         except Exception as e:
             fail("Error submitting job to AWS Batch. Failed with exception: %s" % e)
 
 
-def main():
+def _get_job_submission_args(args, config, s3_uploader, log, job_key_suffix=None):
+    """
+    Upload the job files, if needed, and return the arguments to submit the job.
+
+    :param args: input arguments of the job
+    :param config: config object
+    :param s3_uploader: S3Uploader object
+    :param log: log
+    :param job_key_suffix: suffix distinguishing the jobs submitted at the same time (optional)
+    :return: the arguments of AWSBsubCommand.submit
+    """
+    # define job name
+    if args.job_name:
+        job_name = args.job_name
+    else:
+        # set a default job name if not specified
+        if args.stdin:
+            # stdin
+            job_name = "STDIN"
+        else:
+            # normalize name
+            job_name = re.sub(r"\W+", "_", os.path.basename(args.command))
+        log.info("Job name not specified, setting it to (%s)", job_name)
+
+    # generate an internal unique job-id
+    job_key = _generate_unique_job_key(job_name, job_key_suffix)
+    job_s3_folder = "{prefix}/batch/{job_key}/".format(prefix=config.artifact_directory, job_key=job_key)
+    # upload script, if needed, and get related command
+    command = _upload_and_get_command(s3_uploader, args, job_s3_folder, job_name, config, log)
+    # parse and validate depends_on parameter
+    depends_on = _get_depends_on(args)
+
+    # select submission (standard vs MNP)
+    if args.nodes and args.nodes > 1:
+        if not hasattr(config, "job_definition_mnp"):
+            fail("Current cluster does not support MNP jobs submission")
+        job_definition = config.job_definition_mnp
+        nodes = args.nodes
+    else:
+        job_definition = config.job_definition
+        nodes = None
+
+    return dict(
+        job_definition=job_definition,
+        job_name=job_name,
+        job_queue=config.job_queue,
+        command=command,
+        nodes=nodes,
+        vcpus=args.vcpus,
+        memory=args.memory,
+        array_size=args.array_size,
+        dependencies=depends_on,
+        retry_attempts=args.retry_attempts,
+        timeout=args.timeout,
+        env=[("PCLUSTER_JOB_S3_URL", f"s3://{config.s3_bucket}/{job_s3_folder}")],
+    )
+
+
+def _read_manifest(args):
+    """
+    Read and validate the jobs listed in the manifest.
+
+    :param args: input arguments
+    :return: list of (line number, job arguments) tuples
+    """
+    try:
+        if args.manifest == "-":
+            lines = sys.stdin.read().splitlines()
+        else:
+            with open(args.manifest, encoding="utf-8") as manifest:
+                lines = manifest.read().splitlines()
+    except Exception as e:
+        fail("Error reading manifest (%s). Failed with exception: %s" % (args.manifest, e))
+
+    entries = []
+    parser = _get_parser()
+    for line_number, line in enumerate(lines, start=1):
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        try:
+            job_args = parser.parse_args(shlex.split(line))
+        except (SystemExit, ValueError):
+            fail("Error parsing line %d of the manifest: %s" % (line_number, line))
+        if job_args.manifest or (job_args.cluster and job_args.cluster != args.cluster):
+            fail("Line %d of the manifest cannot specify the --manifest or --cluster parameters" % line_number)
+        # jobs of the manifest never read the command from stdin
+        job_args.stdin = False
+        _validate_parameters(job_args)
+        entries.append((line_number, job_args))
+    if not entries:
+        fail("The manifest (%s) does not contain any job" % args.manifest)
+    return entries
+
+
+def _submit_manifest(args, config, boto3_factory, log):
+    """
+    Submit in parallel all the jobs listed in the manifest and print a summary.
+
+    All the jobs share the same cluster config, AWS Batch client and S3 uploader. Submissions are rate limited.
+
+    :param args: input arguments
+    :param config: config object
+    :param boto3_factory: initialized Boto3ClientFactory object
+    :param log: log
+    """
+    entries = _read_manifest(args)
+    s3_uploader = S3Uploader(boto3_factory, config.s3_bucket, dedup_folder=_get_s3_dedup_folder(config))
+    bsub_command = AWSBsubCommand(log, boto3_factory)
+    rate_limiter = RateLimiter(args.submission_rate)
+
+    def _submit(line_number, job_args):
+        try:
+            submission_args = _get_job_submission_args(job_args, config, s3_uploader, log, line_number)
+            rate_limiter.acquire()
+            response = bsub_command.submit(**submission_args)
+            log.info("Job %s (%s) has been submitted", response["jobId"], response["jobName"])
+            return line_number, response["jobName"], response["jobId"], None
+        except (Exception, SystemExit) as e:
+            # validation helpers call fail() which raises SystemExit, it must not stop the other submissions
+            log.error("Error submitting job at line %d of the manifest: %s", line_number, e)
+            return line_number, job_args.job_name or "-", None, str(e) or "error"
+
+    with ThreadPoolExecutor(max_workers=args.max_parallel) as executor:
+        results = list(executor.map(lambda entry: _submit(*entry), entries))
+
+    rows = [
+        [line_number, job_name, job_id or "-", "SUBMITTED" if job_id else "FAILED: {0}".format(error)]
+        for line_number, job_name, job_id, error in results
+    ]
+    print(tabulate(rows, ["line", "jobName", "jobId", "result"]))
+    failures = sum(1 for result in results if result[2] is None)
+    print("%d of %d jobs have been submitted." % (len(results) - failures, len(results)))
+    if failures:
+        # the submissions fail if the job queue or the job definitions of a stale cached configuration are gone
+        config.invalidate_cache(log)
+        fail("%d jobs failed to be submitted." % failures)
+
+
+def main(argv=None):
     """Command entrypoint."""
     try:
         # parse input parameters and config file
-        args = _get_parser().parse_args()
-        _validate_parameters(args)
+        args = _get_parser().parse_args(argv)
+        args.stdin = not args.manifest and not sys.stdin.isatty()
+        if args.manifest:
+            _validate_manifest_parameters(args)
+        else:
+            _validate_parameters(args)
         log = config_logger(args.log_level)
         log.info("Input parameters: %s", args)
         config = AWSBatchCliConfig(log=log, cluster=args.cluster)
         boto3_factory = Boto3ClientFactory(region=config.region, proxy=config.proxy)
 
-        # define job name
-        if args.job_name:
-            job_name = args.job_name
+        if args.manifest:
+            _submit_manifest(args, config, boto3_factory, log)
         else:
-            # set a default job name if not specified
-            if not sys.stdin.isatty():
-                # stdin
-                job_name = "STDIN"
-            else:
-                # normalize name
-                job_name = re.sub(r"\W+", "_", os.path.basename(args.command))
-            log.info("Job name not specified, setting it to (%s)", job_name)
-
-        # generate an internal unique job-id
-        job_key = _generate_unique_job_key(job_name)
-        job_s3_folder = "{prefix}/batch/{job_key}/".format(prefix=config.artifact_directory, job_key=job_key)
-        # upload script, if needed, and get related command
-        command = _upload_and_get_command(boto3_factory, args, job_s3_folder, job_name, config, log)
-        # parse and validate depends_on parameter
-        depends_on = _get_depends_on(args)
-
-        # select submission (standard vs MNP)
-        if args.nodes and args.nodes > 1:
-            if not hasattr(config, "job_definition_mnp"):
-                fail("Current cluster does not support MNP jobs submission")
-            job_definition = config.job_definition_mnp
-            nodes = args.nodes
-        else:
-            job_definition = config.job_definition
-            nodes = None
-
-        AWSBsubCommand(log, boto3_factory).run(
-            job_definition=job_definition,
-            job_name=job_name,
-            job_queue=config.job_queue,
-            command=command,
-            nodes=nodes,
-            vcpus=args.vcpus,
-            memory=args.memory,
-            array_size=args.array_size,
-            dependencies=depends_on,
-            retry_attempts=args.retry_attempts,
-            timeout=args.timeout,
-            env=[("PCLUSTER_JOB_S3_URL", f"s3://{config.s3_bucket}/{job_s3_folder}")],
-        )
+            s3_uploader = S3Uploader(boto3_factory, config.s3_bucket, dedup_folder=_get_s3_dedup_folder(config))
+            submission_args = _get_job_submission_args(args, config, s3_uploader, log)
+            try:
+                AWSBsubCommand(log, boto3_factory).run(**submission_args)
+            except SystemExit:
+                # the submission fails if the job queue or the job definition of a stale cached configuration are gone
+                config.invalidate_cache(log)
+                raise
     except KeyboardInterrupt:
         print("Exiting...")
         sys.exit(0)
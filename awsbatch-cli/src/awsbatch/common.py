@@ -11,10 +11,13 @@
 # See the License for the specific language governing permissions and limitations under the License.
 
 import errno
+import json
 import logging
 import operator
 import os
 import re
+import tempfile
+import time
 from collections import namedtuple
 from logging.handlers import RotatingFileHandler
 
@@ -153,6 +156,99 @@ class CliRequirementsMatcher:
                 fail(f"The cluster requires {req.package}{req.operator}{req.version}")
 
 
+class AWSBatchCliConfigCache:
+    """
+    Local cache of the cluster configurations resolved from the CloudFormation stacks.
+
+    Entries are stored in one file per cluster and region under ~/.parallelcluster/awsbatch-cli-cache.
+    Files are replaced atomically, so that the cache can be safely shared by concurrent processes.
+    Entries are used for ttl seconds without describing the stack again. The commands invalidate the entry
+    of a cluster when they fail in a way showing that it is stale, e.g. when the job queue is not found.
+    """
+
+    # Attributes of the AWSBatchCliConfig object initialized from the stack
+    CACHED_ATTRIBUTES = [
+        "stack_name",
+        "region",
+        "proxy",
+        "s3_bucket",
+        "artifact_directory",
+        "batch_cli_requirements",
+        "compute_environment",
+        "job_queue",
+        "job_definition",
+        "job_definition_mnp",
+        "head_node_ip",
+    ]
+    TTL_ENV = "PCLUSTER_AWSBATCH_CLI_CACHE_TTL"
+    DEFAULT_TTL = 300
+
+    def __init__(self, log, ttl=None):
+        """
+        Initialize the object.
+
+        :param log: log
+        :param ttl: time to live of the entries in seconds, 0 disables the cache.
+        Defaults to the PCLUSTER_AWSBATCH_CLI_CACHE_TTL environment variable or DEFAULT_TTL
+        """
+        self.log = log
+        self.cache_dir = os.path.expanduser(os.path.join("~", ".parallelcluster", "awsbatch-cli-cache"))
+        if ttl is None:
+            try:
+                ttl = int(os.environ.get(self.TTL_ENV, self.DEFAULT_TTL))
+            except ValueError:
+                log.warning("Invalid value for %s, using default TTL", self.TTL_ENV)
+                ttl = self.DEFAULT_TTL
+        self.ttl = ttl
+
+    def is_enabled(self):
+        """Tell if the cache is enabled."""
+        return self.ttl > 0
+
+    def __get_entry_path(self, cluster, region):
+        return os.path.join(self.cache_dir, region or "default", "{0}.json".format(cluster))
+
+    def get(self, cluster, region):
+        """
+        Return the cache entry for the given cluster and region, None if not there.
+
+        :return: dict with "attributes" and "expired" keys
+        """
+        if not self.is_enabled():
+            return None
+        try:
+            with open(self.__get_entry_path(cluster, region), encoding="utf-8") as entry_file:
+                entry = json.load(entry_file)
+            entry["expired"] = time.time() - entry["fetched_at"] > self.ttl
+            return entry
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            self.log.debug("Cluster configuration cache miss for (%s, %s): %s", cluster, region, e)
+            return None
+
+    def put(self, cluster, region, attributes):
+        """Store the attributes of the cluster configuration in the cache."""
+        if not self.is_enabled():
+            return
+        entry_path = self.__get_entry_path(cluster, region)
+        try:
+            os.makedirs(os.path.dirname(entry_path), exist_ok=True)
+            # write to a temporary file in the same folder and rename it, so that readers never see partial files
+            with tempfile.NamedTemporaryFile(
+                "w", dir=os.path.dirname(entry_path), prefix=".{0}.".format(cluster), delete=False, encoding="utf-8"
+            ) as entry_file:
+                json.dump({"fetched_at": time.time(), "attributes": attributes}, entry_file)
+            os.replace(entry_file.name, entry_path)
+        except OSError as e:
+            self.log.warning("Unable to store cluster configuration in cache (%s): %s", entry_path, e)
+
+    def invalidate(self, cluster, region):
+        """Remove the cache entry for the given cluster and region."""
+        try:
+            os.remove(self.__get_entry_path(cluster, region))
+        except OSError:
+            pass
+
+
 class AWSBatchCliConfig:
     """AWS ParallelCluster AWS Batch CLI configuration object."""
 
@@ -168,6 +264,8 @@ class AWSBatchCliConfig:
         """
         self.region = None
         self.env_blacklist = None
+        # region of the cache entry of the configuration, only set when resolved from the stack
+        self.__cache_region = None
 
         # search for awsbatch-cli config
         cli_config_file = os.path.expanduser(os.path.join("~", ".parallelcluster", "awsbatch-cli.cfg"))
@@ -184,6 +282,17 @@ class AWSBatchCliConfig:
     def __str__(self):
         return "{0}({1})".format(self.__class__.__name__, self.__dict__)
 
+    def invalidate_cache(self, log):
+        """
+        Remove the cached configuration of the cluster.
+
+        To be called on errors showing that the cached configuration is stale,
+        e.g. when the job queue or the compute environment of the cluster are not found.
+        """
+        if self.__cache_region:
+            log.info("Removing cached configuration of cluster (%s)" % self.stack_name)
+            AWSBatchCliConfigCache(log).invalidate(self.stack_name, self.__cache_region)
+
     def __verify_initialization(self, log):
         config_to_cfn_map = [
             ("s3_bucket", "ResourcesS3Bucket", "parameter"),
@@ -277,11 +386,20 @@ class AWSBatchCliConfig:
         """
         try:
             self.stack_name = cluster
-            log.info("Describing stack (%s)" % self.stack_name)
-            # get required values from the output of the describe-stack command
             # don't use proxy because we are in the client and use default region
             boto3_factory = Boto3ClientFactory(region=self.region)
             cfn_client = boto3_factory.get_client("cloudformation")
+
+            cache = AWSBatchCliConfigCache(log)
+            self.__cache_region = self.region or cfn_client.meta.region_name
+            cache_entry = cache.get(cluster, self.__cache_region)
+            if cache_entry and not cache_entry["expired"]:
+                log.info("Using cached configuration of cluster (%s)" % self.stack_name)
+                self.__dict__.update(cache_entry["attributes"])
+                return
+
+            log.info("Describing stack (%s)" % self.stack_name)
+            # get required values from the output of the describe-stack command
             stack = cfn_client.describe_stacks(StackName=self.stack_name).get("Stacks")[0]
             log.debug(stack)
             if self.region is None:
@@ -328,6 +446,12 @@ class AWSBatchCliConfig:
             elif scheduler != "awsbatch":
                 fail(f"This command cannot be used with a {scheduler} cluster.")
 
+            cache.put(
+                cluster,
+                self.__cache_region,
+                {key: getattr(self, key) for key in AWSBatchCliConfigCache.CACHED_ATTRIBUTES if hasattr(self, key)},
+            )
+
         except (ClientError, ParamValidationError) as e:
             fail("Error getting cluster information from AWS CloudFormation. Failed with exception: %s" % e)
 
@@ -10,15 +10,30 @@
 # This file is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, express or implied.
 # See the License for the specific language governing permissions and limitations under the License.
 
+import hashlib
+import os
 import pipes
 import re
 import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from typing import NoReturn
 
 import pkg_resources
+from boto3.s3.transfer import TransferConfig
+from botocore.exceptions import ClientError
 from dateutil import tz
 
+# Files bigger than this are uploaded to S3 with multipart uploads
+MULTIPART_THRESHOLD = 8 * 1024 * 1024
+MULTIPART_CHUNKSIZE = 8 * 1024 * 1024
+# Maximum number of files (and of parts of a single file) uploaded in parallel
+MAX_UPLOAD_CONCURRENCY = 8
+# Files smaller than this are always uploaded, bigger ones are deduplicated by content
+DEDUP_MIN_SIZE = 1024 * 1024
+
 
 def fail(error_message) -> NoReturn:
     """
@@ -115,23 +130,78 @@ def get_installed_version(package_name="aws-parallelcluster-awsbatch-cli"):
     return pkg_resources.get_distribution(package_name).version
 
 
+def get_file_digest(file_path):
+    """
+    Compute the SHA-256 digest of the content of a file.
+
+    :param file_path: file to read
+    :return: the hex digest
+    """
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as file:
+        for chunk in iter(lambda: file.read(MULTIPART_CHUNKSIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class RateLimiter:
+    """Thread-safe limiter spacing the calls to acquire at a maximum rate."""
+
+    def __init__(self, rate):
+        """Initialize the object.
+
+        :param rate: maximum number of calls per second, no limit if not set
+        """
+        self.interval = 1.0 / rate if rate else 0
+        self._next_time = 0
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Wait until the next call is allowed."""
+        with self._lock:
+            now = time.monotonic()
+            wait_time = max(0, self._next_time - now)
+            self._next_time = max(now, self._next_time) + self.interval
+        if wait_time:
+            time.sleep(wait_time)
+
+
 class S3Uploader:
-    """S3 uploader."""
+    """
+    S3 uploader.
+
+    Big files are uploaded with multipart uploads. When a dedup folder is given, files bigger than DEDUP_MIN_SIZE
+    are stored once in the dedup folder, with their SHA-256 digest as key, and copied server-side
+    to their destination, so that the same content is transferred from the client only once.
+    """
 
-    def __init__(self, boto3_factory, s3_bucket, default_folder=""):
+    def __init__(self, boto3_factory, s3_bucket, default_folder="", dedup_folder=None):
         """Initialize the object.
 
         :param boto3_factory: initialized Boto3ClientFactory object
         :param s3_bucket: S3 bucket to use
         :param default_folder: S3 folder on which put the files (optional)
+        :param dedup_folder: S3 folder storing the content of the deduplicated files (optional)
         """
         self.s3_client = boto3_factory.get_client("s3")
         self.s3_bucket = s3_bucket
         self.default_folder = default_folder
+        self.dedup_folder = dedup_folder
+        self.transfer_config = TransferConfig(
+            multipart_threshold=MULTIPART_THRESHOLD,
+            multipart_chunksize=MULTIPART_CHUNKSIZE,
+            max_concurrency=MAX_UPLOAD_CONCURRENCY,
+        )
+        # digests of the files already read, by (path, size, modification time)
+        self._file_digests = {}
+        # digests of the contents already in the dedup folder and locks to stage them, by digest
+        self._staged_digests = set()
+        self._staging_locks = {}
+        self._lock = threading.Lock()
         if default_folder:
-            self.__create_folder(default_folder)
+            self.create_folder(default_folder)
 
-    def __create_folder(self, folder):
+    def create_folder(self, folder):
         """
         Create an empty pseudo-folder in the S3 bucket.
 
@@ -151,4 +221,73 @@ class S3Uploader:
         :param folder: S3 folder on which put the files (optional)
         """
         s3_folder = folder if folder else self.default_folder
-        self.s3_client.upload_file(file_path, self.s3_bucket, s3_folder + key_name)
+        if self.dedup_folder and os.path.getsize(file_path) >= DEDUP_MIN_SIZE:
+            source_key = self.__stage_content(file_path)
+            self.s3_client.copy(
+                {"Bucket": self.s3_bucket, "Key": source_key},
+                self.s3_bucket,
+                s3_folder + key_name,
+                Config=self.transfer_config,
+            )
+        else:
+            self.s3_client.upload_file(file_path, self.s3_bucket, s3_folder + key_name, Config=self.transfer_config)
+
+    def put_fileobj(self, fileobj, key_name, folder=None):
+        """
+        Upload the content of a file-like object, even not seekable, to an s3 bucket.
+
+        :param fileobj: binary file-like object to upload
+        :param key_name: S3 key to create
+        :param folder: S3 folder on which put the files (optional)
+        """
+        s3_folder = folder if folder else self.default_folder
+        self.s3_client.upload_fileobj(fileobj, self.s3_bucket, s3_folder + key_name, Config=self.transfer_config)
+
+    def put_files(self, files, folder=None):
+        """
+        Upload many files concurrently to an s3 bucket.
+
+        :param files: list of (file to upload, S3 key to create) tuples
+        :param folder: S3 folder on which put the files (optional)
+        """
+        if not files:
+            return
+        with ThreadPoolExecutor(max_workers=min(MAX_UPLOAD_CONCURRENCY, len(files))) as executor:
+            futures = [executor.submit(self.put_file, file_path, key_name, folder) for file_path, key_name in files]
+            for future in futures:
+                future.result()
+
+    def __get_digest(self, file_path):
+        stat = os.stat(file_path)
+        cache_key = (os.path.realpath(file_path), stat.st_size, stat.st_mtime_ns)
+        with self._lock:
+            digest = self._file_digests.get(cache_key)
+        if not digest:
+            digest = get_file_digest(file_path)
+            with self._lock:
+                self._file_digests[cache_key] = digest
+        return digest
+
+    def __stage_content(self, file_path):
+        """
+        Upload the content of the file to the dedup folder, if not already there.
+
+        :param file_path: file to upload
+        :return: the S3 key of the content in the dedup folder
+        """
+        digest = self.__get_digest(file_path)
+        content_key = self.dedup_folder + digest
+        with self._lock:
+            staging_lock = self._staging_locks.setdefault(digest, threading.Lock())
+        # the content is checked and uploaded by a single thread, other threads wait for it
+        with staging_lock:
+            if digest in self._staged_digests:
+                return content_key
+            try:
+                self.s3_client.head_object(Bucket=self.s3_bucket, Key=content_key)
+            except ClientError as e:
+                if e.response.get("Error", {}).get("Code") not in ("404", "NoSuchKey", "NotFound"):
+                    raise
+                self.s3_client.upload_file(file_path, self.s3_bucket, content_key, Config=self.transfer_config)
+            self._staged_digests.add(digest)
+        return content_key
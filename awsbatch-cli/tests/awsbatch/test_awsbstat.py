@@ -47,6 +47,25 @@ class TestOutput:
 
         assert capsys.readouterr().out == read_text(test_datadir / "expected_output.txt")
 
+    def test_missing_job_queue_invalidates_cache(self, boto3_stubber, awsbatchcliconfig_mock, failed_with_message):
+        boto3_stubber(
+            "batch",
+            MockedBoto3Request(
+                method="list_jobs",
+                response="jobQueue not found",
+                expected_params={
+                    "jobQueue": DEFAULT_AWSBATCHCLICONFIG_MOCK_CONFIG["job_queue"],
+                    "jobStatus": "SUBMITTED",
+                    "nextToken": "",
+                },
+                generate_error=True,
+                error_code="ClientException",
+            ),
+        )
+
+        failed_with_message(awsbstat.main, None, ["-c", "cluster"])
+        awsbatchcliconfig_mock.return_value.invalidate_cache.assert_called_once()
+
     def test_no_jobs_all_status(self, capsys, boto3_stubber, test_datadir):
         empty_response = {"jobSummaryList": []}
         mocked_requests = []
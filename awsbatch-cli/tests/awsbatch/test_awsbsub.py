@@ -0,0 +1,145 @@
+import os
+
+import pytest
+from assertpy import assert_that
+from botocore.exceptions import ClientError
+
+from awsbatch import awsbsub
+from awsbatch.utils import DEDUP_MIN_SIZE, S3Uploader
+
+DEDUP_FOLDER = "artifact_directory/batch/inputs/"
+
+
+@pytest.fixture()
+def s3_client(mocker):
+    return mocker.MagicMock()
+
+
+@pytest.fixture()
+def boto3_factory(mocker, s3_client):
+    factory = mocker.MagicMock()
+    factory.get_client.side_effect = lambda service: s3_client if service == "s3" else mocker.MagicMock()
+    return factory
+
+
+class TestS3Uploader:
+    def test_put_files_deduplicates_big_files(self, boto3_factory, s3_client, tmpdir):
+        small_file = tmpdir.join("small.txt")
+        small_file.write("small")
+        big_file = tmpdir.join("big.bin")
+        big_file.write_binary(b"0" * DEDUP_MIN_SIZE)
+        same_content_file = tmpdir.join("same.bin")
+        same_content_file.write_binary(b"0" * DEDUP_MIN_SIZE)
+        s3_client.head_object.side_effect = ClientError({"Error": {"Code": "404"}}, "HeadObject")
+
+        uploader = S3Uploader(boto3_factory, "bucket", dedup_folder=DEDUP_FOLDER)
+        uploader.put_files(
+            [(str(small_file), "small.txt"), (str(big_file), "big.bin"), (str(same_content_file), "same.bin")],
+            "job1/",
+        )
+        uploader.put_files([(str(big_file), "big.bin")], "job2/")
+
+        # small files are uploaded directly in the job folder
+        uploaded_keys = [call.args[2] for call in s3_client.upload_file.call_args_list]
+        assert_that(uploaded_keys).contains("job1/small.txt")
+        # the content of the big files is uploaded only once and copied to every job folder
+        dedup_keys = [key for key in uploaded_keys if key.startswith(DEDUP_FOLDER)]
+        assert_that(dedup_keys).is_length(1)
+        assert_that(s3_client.head_object.call_count).is_equal_to(1)
+        copied_keys = sorted(call.args[2] for call in s3_client.copy.call_args_list)
+        assert_that(copied_keys).is_equal_to(["job1/big.bin", "job1/same.bin", "job2/big.bin"])
+        for call in s3_client.copy.call_args_list:
+            assert_that(call.args[0]).is_equal_to({"Bucket": "bucket", "Key": dedup_keys[0]})
+
+    def test_put_file_skips_existing_content(self, boto3_factory, s3_client, tmpdir):
+        big_file = tmpdir.join("big.bin")
+        big_file.write_binary(b"1" * DEDUP_MIN_SIZE)
+
+        S3Uploader(boto3_factory, "bucket", dedup_folder=DEDUP_FOLDER).put_file(str(big_file), "big.bin", "job/")
+
+        s3_client.upload_file.assert_not_called()
+        assert_that(s3_client.copy.call_args.args[2]).is_equal_to("job/big.bin")
+
+
+@pytest.mark.usefixtures("awsbatchcliconfig_mock")
+class TestManifest:
+    @pytest.fixture(autouse=True)
+    def config(self, awsbatchcliconfig_mock):
+        config = awsbatchcliconfig_mock.return_value
+        config.s3_bucket = "bucket"
+        config.artifact_directory = "artifact_directory"
+        config.job_definition = "job_definition"
+        config.proxy = "NONE"
+        return config
+
+    @pytest.fixture()
+    def batch_client(self, mocker, boto3_factory):
+        batch_client = mocker.MagicMock()
+        batch_client.submit_job.side_effect = lambda **kwargs: {
+            "jobId": "id-" + kwargs["jobName"],
+            "jobName": kwargs["jobName"],
+        }
+        boto3_factory.get_client.side_effect = lambda service: (
+            batch_client if service == "batch" else mocker.MagicMock()
+        )
+        mocker.patch("awsbatch.awsbsub.Boto3ClientFactory", return_value=boto3_factory)
+        mocker.patch("awsbatch.awsbsub.config_logger")
+        return batch_client
+
+    def test_submit_manifest(self, batch_client, capsys, tmpdir):
+        input_file = tmpdir.join("input.txt")
+        input_file.write("input")
+        manifest = tmpdir.join("manifest.txt")
+        manifest.write(
+            "# jobs to submit\n"
+            f"-jn job1 -if {input_file} my_command arg1\n"
+            "\n"
+            "-jn job2 -p 2 other_command\n"
+            "my_command\n"
+        )
+
+        awsbsub.main(["-c", "cluster", "--manifest", str(manifest), "--submission-rate", "1000"])
+
+        submitted = {call.kwargs["jobName"]: call.kwargs for call in batch_client.submit_job.call_args_list}
+        assert_that(submitted).contains_only("job1", "job2", "my_command")
+        assert_that(submitted["job1"]["containerOverrides"]["command"]).is_equal_to(["my_command", "arg1"])
+        assert_that(submitted["job2"]["containerOverrides"]["vcpus"]).is_equal_to(2)
+        # jobs submitted at the same time get distinct S3 folders
+        job_folders = {submission["containerOverrides"]["environment"][0]["value"] for submission in submitted.values()}
+        assert_that(job_folders).is_length(3)
+        out = capsys.readouterr().out
+        assert_that(out).contains("id-job1", "id-job2", "id-my_command", "3 of 3 jobs have been submitted.")
+
+    def test_submit_manifest_with_failures(self, batch_client, capsys, tmpdir):
+        manifest = tmpdir.join("manifest.txt")
+        manifest.write("-jn job1 my_command\n-jn job2 -cf missing_file.sh\n")
+
+        with pytest.raises(SystemExit):
+            awsbsub.main(["-c", "cluster", "--manifest", str(manifest)])
+        assert_that(capsys.readouterr().err).contains(
+            "The command parameter (missing_file.sh) must be an existing file"
+        )
+
+        batch_client.submit_job.side_effect = [Exception("Throttled"), {"jobId": "id-job2", "jobName": "job2"}]
+        manifest.write("-jn job1 my_command\n-jn job2 my_command\n")
+        with pytest.raises(SystemExit):
+            awsbsub.main(["-c", "cluster", "--manifest", str(manifest), "--max-parallel", "1"])
+        out, err = capsys.readouterr()
+        assert_that(out).contains("FAILED: Throttled", "id-job2", "1 of 2 jobs have been submitted.")
+        assert_that(err).contains("1 jobs failed to be submitted.")
+
+    def test_manifest_with_command(self, failed_with_message, tmpdir):
+        manifest = tmpdir.join("manifest.txt")
+        manifest.write("my_command\n")
+        failed_with_message(
+            awsbsub.main,
+            "Error: command and arguments cannot be specified when submitting a manifest.\n",
+            argv=["-c", "cluster", "--manifest", str(manifest), "my_command"],
+        )
+
+
+def test_generate_unique_job_key(mocker):
+    mocker.patch("awsbatch.awsbsub.time.time", return_value=1.5)
+    assert_that(awsbsub._generate_unique_job_key("name")).is_equal_to("job-name-1500")
+    assert_that(awsbsub._generate_unique_job_key("name", 3)).is_equal_to("job-name-1500-3")
+    assert_that(os.path.basename(awsbsub._get_s3_dedup_folder(mocker.MagicMock(artifact_directory="dir")))).is_empty()
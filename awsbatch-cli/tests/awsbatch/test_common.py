@@ -0,0 +1,126 @@
+import os
+from datetime import datetime
+
+import pytest
+from assertpy import assert_that
+
+from awsbatch.common import AWSBatchCliConfig, AWSBatchCliConfigCache
+from tests.utils import MockedBoto3Request
+
+STACK_NAME = "cluster"
+
+
+@pytest.fixture()
+def boto3_stubber_path():
+    return "awsbatch.common.boto3"
+
+
+@pytest.fixture(autouse=True)
+def home_dir(tmpdir, mocker):
+    mocker.patch.dict(os.environ, {"HOME": str(tmpdir)})
+    return tmpdir
+
+
+def _describe_stacks_request(job_queue="job_queue"):
+    stack = {
+        "StackName": STACK_NAME,
+        "StackId": f"arn:aws:cloudformation:us-east-1:123456789012:stack/{STACK_NAME}/id",
+        "CreationTime": datetime(2024, 1, 1),
+        "LastUpdatedTime": datetime(2024, 1, 2),
+        "StackStatus": "UPDATE_COMPLETE",
+        "Outputs": [
+            {"OutputKey": "BatchComputeEnvironmentArn", "OutputValue": "compute_environment"},
+            {"OutputKey": "BatchJobQueueArn", "OutputValue": job_queue},
+            {"OutputKey": "BatchJobDefinitionArn", "OutputValue": "job_definition"},
+            {"OutputKey": "HeadNodePrivateIP", "OutputValue": "10.0.0.1"},
+            {"OutputKey": "BatchCliRequirements", "OutputValue": "aws-parallelcluster-awsbatch-cli>=1.0.0"},
+        ],
+        "Parameters": [
+            {"ParameterKey": "ProxyServer", "ParameterValue": "NONE"},
+            {"ParameterKey": "ResourcesS3Bucket", "ParameterValue": "bucket"},
+            {"ParameterKey": "ArtifactS3RootDirectory", "ParameterValue": "artifact_directory"},
+            {"ParameterKey": "Scheduler", "ParameterValue": "awsbatch"},
+        ],
+    }
+    return MockedBoto3Request(
+        method="describe_stacks", response={"Stacks": [stack]}, expected_params={"StackName": STACK_NAME}
+    )
+
+
+class TestAWSBatchCliConfigCache:
+    def test_config_from_stack_is_cached(self, boto3_stubber, mocker):
+        log = mocker.MagicMock()
+        # the stack is described only once
+        boto3_stubber("cloudformation", [_describe_stacks_request()])
+        put_mock = mocker.spy(AWSBatchCliConfigCache, "put")
+
+        first_config = AWSBatchCliConfig(log=log, cluster=STACK_NAME)
+        # the second initialization uses the cached configuration without describing the stack
+        second_config = AWSBatchCliConfig(log=log, cluster=STACK_NAME)
+
+        assert_that(put_mock.call_count).is_equal_to(1)
+        log.info.assert_any_call("Using cached configuration of cluster (%s)" % STACK_NAME)
+        for config in [first_config, second_config]:
+            assert_that(config.job_queue).is_equal_to("job_queue")
+            assert_that(config.region).is_equal_to("us-east-1")
+            assert_that(config.s3_bucket).is_equal_to("bucket")
+            assert_that(hasattr(config, "job_definition_mnp")).is_false()
+
+    def test_invalidate_cache(self, boto3_stubber, mocker):
+        log = mocker.MagicMock()
+        boto3_stubber(
+            "cloudformation", [_describe_stacks_request(), _describe_stacks_request(job_queue="new_job_queue")]
+        )
+        mocker.patch("awsbatch.common.time.time", return_value=1000)
+
+        config = AWSBatchCliConfig(log=log, cluster=STACK_NAME)
+        assert_that(AWSBatchCliConfigCache(log).get(STACK_NAME, "us-east-1")).is_not_none()
+        config.invalidate_cache(log)
+        assert_that(AWSBatchCliConfigCache(log).get(STACK_NAME, "us-east-1")).is_none()
+
+        # the stack updated before the entry expires is described again once the entry is invalidated
+        assert_that(AWSBatchCliConfig(log=log, cluster=STACK_NAME).job_queue).is_equal_to("new_job_queue")
+        entry = AWSBatchCliConfigCache(log).get(STACK_NAME, "us-east-1")
+        assert_that(entry["attributes"]["job_queue"]).is_equal_to("new_job_queue")
+
+    def test_expired_entry_is_refreshed(self, boto3_stubber, mocker):
+        log = mocker.MagicMock()
+        boto3_stubber(
+            "cloudformation",
+            [_describe_stacks_request(), _describe_stacks_request(job_queue="new_job_queue")],
+        )
+        time_mock = mocker.patch("awsbatch.common.time.time", return_value=1000)
+
+        AWSBatchCliConfig(log=log, cluster=STACK_NAME)
+        time_mock.return_value = 1000 + AWSBatchCliConfigCache.DEFAULT_TTL + 1
+        AWSBatchCliConfig(log=log, cluster=STACK_NAME)
+
+        entry = AWSBatchCliConfigCache(log).get(STACK_NAME, "us-east-1")
+        assert_that(entry["attributes"]["job_queue"]).is_equal_to("new_job_queue")
+        assert_that(entry["expired"]).is_false()
+
+    def test_cache_disabled(self, boto3_stubber, mocker):
+        mocker.patch.dict(os.environ, {"PCLUSTER_AWSBATCH_CLI_CACHE_TTL": "0"})
+        log = mocker.MagicMock()
+        boto3_stubber("cloudformation", [_describe_stacks_request(), _describe_stacks_request()])
+
+        AWSBatchCliConfig(log=log, cluster=STACK_NAME)
+        AWSBatchCliConfig(log=log, cluster=STACK_NAME)
+
+        assert_that(AWSBatchCliConfigCache(log, ttl=300).get(STACK_NAME, "us-east-1")).is_none()
+
+    def test_cache_entries_by_cluster_and_region(self, mocker, home_dir):
+        cache = AWSBatchCliConfigCache(mocker.MagicMock())
+        cache.put(STACK_NAME, "us-east-1", {"job_queue": "queue1"})
+        cache.put(STACK_NAME, "eu-west-1", {"job_queue": "queue2"})
+
+        assert_that(cache.get(STACK_NAME, "us-east-1")["attributes"]).is_equal_to({"job_queue": "queue1"})
+        assert_that(cache.get(STACK_NAME, "eu-west-1")["attributes"]).is_equal_to({"job_queue": "queue2"})
+        assert_that(cache.get("other", "us-east-1")).is_none()
+        # no temporary file is left behind
+        assert_that(os.listdir(str(home_dir.join(".parallelcluster", "awsbatch-cli-cache", "us-east-1")))).is_equal_to(
+            ["cluster.json"]
+        )
+
+        cache.invalidate(STACK_NAME, "us-east-1")
+        assert_that(cache.get(STACK_NAME, "us-east-1")).is_none()
@@ -13,13 +13,14 @@
 # The above copyright notice and this permission notice shall be included in all
 # copies or substantial portions of the Software.
 import base64
+import gzip
 import io
 import json
 import os
 import sys
 
 from werkzeug.datastructures import Headers, MultiDict, iter_multi_items
-from werkzeug.http import HTTP_STATUS_CODES
+from werkzeug.http import HTTP_STATUS_CODES, parse_accept_header
 from werkzeug.urls import url_encode, url_unquote, url_unquote_plus
 from werkzeug.wrappers import Response
 
@@ -33,6 +34,18 @@ TEXT_MIME_TYPES = [
     "image/svg+xml",
 ]
 
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Responses smaller than this number of bytes are never compressed.
+# The threshold can be overridden with the COMPRESSION_MIN_SIZE environment variable, a negative value
+# disables the compression.
+DEFAULT_COMPRESSION_MIN_SIZE = 1024
+GZIP_COMPRESS_LEVEL = 6
+BROTLI_QUALITY = 5
+
 
 def all_casings(input_string):
     """
@@ -135,9 +148,59 @@ def setup_environ_items(environ, headers):
     return environ
 
 
-def generate_response(response, event):
+def get_compression_min_size():
+    try:
+        return int(os.environ.get("COMPRESSION_MIN_SIZE", DEFAULT_COMPRESSION_MIN_SIZE))
+    except ValueError:
+        return DEFAULT_COMPRESSION_MIN_SIZE
+
+
+def is_text_mimetype(mimetype):
+    return mimetype.startswith("text/") or mimetype in TEXT_MIME_TYPES
+
+
+def select_content_encoding(accept_encoding):
+    """Return the best compression supported by both the client and the adapter, None if there is none."""
+    if not accept_encoding:
+        return None
+    supported_encodings = ["br", "gzip"] if brotli else ["gzip"]
+    return parse_accept_header(accept_encoding).best_match(supported_encodings)
+
+
+def compress_body(body, content_encoding):
+    if content_encoding == "br":
+        return brotli.compress(body, quality=BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=GZIP_COMPRESS_LEVEL)
+
+
+def maybe_compress_response(response, body, accept_encoding):
+    """
+    Compress the body of text responses larger than the configured threshold with the best encoding
+    accepted by the client. Return the compressed body, or None if the response must not be compressed.
+    """
+    min_size = get_compression_min_size()
+    if min_size < 0 or len(body) < min_size or "Content-Encoding" in response.headers:
+        return None
+    if not is_text_mimetype(response.mimetype or "text/plain"):
+        return None
+    content_encoding = select_content_encoding(accept_encoding)
+    if not content_encoding:
+        return None
+
+    compressed_body = compress_body(body, content_encoding)
+    response.headers["Content-Encoding"] = content_encoding
+    response.headers["Content-Length"] = str(len(compressed_body))
+    response.headers.add("Vary", "Accept-Encoding")
+    return compressed_body
+
+
+def generate_response(response, event, accept_encoding=None):
     returndict = {"statusCode": response.status_code}
 
+    # Read the buffered body only once, the content is then either decoded or encoded in base64
+    body = response.get_data()
+    compressed_body = maybe_compress_response(response, body, accept_encoding) if body else None
+
     if "multiValueHeaders" in event:
         returndict["multiValueHeaders"] = group_headers(response.headers)
     else:
@@ -150,15 +213,16 @@ def generate_response(response, event):
             HTTP_STATUS_CODES[response.status_code],
         )
 
-    if response.data:
+    if compressed_body is not None:
+        returndict["body"] = base64.b64encode(compressed_body).decode("ascii")
+        returndict["isBase64Encoded"] = True
+    elif body:
         mimetype = response.mimetype or "text/plain"
-        if (mimetype.startswith("text/") or mimetype in TEXT_MIME_TYPES) and not response.headers.get(
-            "Content-Encoding", ""
-        ):
-            returndict["body"] = response.get_data(as_text=True)
+        if is_text_mimetype(mimetype) and not response.headers.get("Content-Encoding", ""):
+            returndict["body"] = body.decode("utf-8")
             returndict["isBase64Encoded"] = False
         else:
-            returndict["body"] = base64.b64encode(response.data).decode("utf-8")
+            returndict["body"] = base64.b64encode(body).decode("ascii")
             returndict["isBase64Encoded"] = True
 
     return returndict
@@ -227,7 +291,7 @@ def handle_payload_v1(app, event, context):
     environ = setup_environ_items(environ, headers)
 
     response = Response.from_app(app, environ)
-    returndict = generate_response(response, event)
+    returndict = generate_response(response, event, headers.get("Accept-Encoding"))
 
     return returndict
 
@@ -272,7 +336,7 @@ def handle_payload_v2(app, event, context):
 
     response = Response.from_app(app, environ)
 
-    returndict = generate_response(response, event)
+    returndict = generate_response(response, event, headers.get("Accept-Encoding"))
 
     return returndict
 
@@ -332,6 +332,7 @@ def update_cluster(
     region=None,
     dryrun=None,
     force_update=None,
+    full_validation=None,
 ):
     """
     Update a cluster managed in a given region.
@@ -353,6 +354,9 @@ def update_cluster(
     :param force_update: Force update by ignoring the update validation errors.
     (Defaults to &#39;false&#39;.)
     :type force_update: bool
+    :param full_validation: Validate the whole cluster configuration instead of only the parts changed by the update.
+    (Defaults to &#39;false&#39;.)
+    :type full_validation: bool
 
     :rtype: UpdateClusterResponseContent
     """
@@ -362,6 +366,7 @@ def update_cluster(
     validation_failure_level = validation_failure_level or ValidationLevel.ERROR
     dryrun = dryrun is True
     force_update = force_update is True
+    full_validation = full_validation is True
     update_cluster_request_content = UpdateClusterRequestContent.from_dict(update_cluster_request_content)
     cluster_config = update_cluster_request_content.cluster_configuration
 
@@ -383,6 +388,7 @@ def update_cluster(
                 force=force_update,
                 validator_suppressors=get_validator_suppressors(suppress_validators),
                 validation_failure_level=FailureLevel[validation_failure_level],
+                full_validation=full_validation,
             )
             change_set, _ = _analyze_changes(changes)
             validation_messages = validation_results_to_config_validation_errors(ignored_validation_failures)
@@ -393,6 +399,7 @@ def update_cluster(
             validator_suppressors=get_validator_suppressors(suppress_validators),
             validation_failure_level=FailureLevel[validation_failure_level],
             force=force_update,
+            full_validation=full_validation,
         )
 
         change_set, _ = _analyze_changes(changes)
@@ -49,9 +49,10 @@ from pcluster.api.models.delete_image_response_content import DeleteImageRespons
 from pcluster.api.models.image_build_status import ImageBuildStatus
 from pcluster.api.util import assert_valid_node_js
 from pcluster.aws.aws_api import AWSApi
+from pcluster.aws.aws_resources import StackInfo
 from pcluster.aws.common import AWSClientError
 from pcluster.aws.ec2 import Ec2Client
-from pcluster.constants import SUPPORTED_ARCHITECTURES, SUPPORTED_OSES, Operation
+from pcluster.constants import PCLUSTER_VERSION_TAG, SUPPORTED_ARCHITECTURES, SUPPORTED_OSES, Operation
 from pcluster.models.imagebuilder import (
     BadRequestImageBuilderActionError,
     ConfigValidationError,
@@ -317,7 +318,7 @@ def _image_info_to_ami_info(image):
 
 @configure_aws_region()
 @convert_errors()
-def list_images(image_status, region=None, next_token=None):
+def list_images(image_status, region=None, next_token=None, os=None, architecture=None, version=None):
     """
     Retrieve the list of existing custom images.
 
@@ -327,15 +328,24 @@ def list_images(image_status, region=None, next_token=None):
     :type region: str
     :param next_token: Token to use for paginated requests.
     :type next_token: str
+    :param os: Filter AVAILABLE images by OS distribution (Default is to not filter.)
+    :type os: str
+    :param architecture: Filter AVAILABLE images by architecture (Default is to not filter.)
+    :type architecture: str
+    :param version: Filter images by ParallelCluster version (Default is to not filter.)
+    :type version: str
 
     :rtype: ListImagesResponseContent
     """
     assert_supported_operation(operation=Operation.LIST_IMAGES, region=region)
     if image_status == ImageStatusFilteringOption.AVAILABLE:
-        return ListImagesResponseContent(images=_get_available_images())
+        _validate_optional_filters(os, architecture)
+        images, next_token = _get_available_images(os, architecture, version, next_token)
     else:
-        images, next_token = _get_images_in_progress(image_status, next_token)
-        return ListImagesResponseContent(images=images, next_token=next_token)
+        if os is not None or architecture is not None:
+            raise BadRequestException("The os and architecture filters are supported only for AVAILABLE images.")
+        images, next_token = _get_images_in_progress(image_status, version, next_token)
+    return ListImagesResponseContent(images=images, next_token=next_token)
 
 
 def _handle_config_validation_error(e: ConfigValidationError) -> BuildImageBadRequestException:
@@ -347,19 +357,24 @@ def _handle_config_validation_error(e: ConfigValidationError) -> BuildImageBadRe
     )
 
 
-def _get_available_images():
-    return [_image_info_to_image_info_summary(image) for image in AWSApi.instance().ec2.get_images()]
+def _get_available_images(os, architecture, version, next_token):
+    images, next_token = AWSApi.instance().ec2.get_images_page(
+        os=os, architecture=architecture, version=version, next_token=next_token
+    )
+    return [_image_info_to_image_info_summary(image) for image in images], next_token
 
 
-def _get_images_in_progress(image_status, next_token):
+def _get_images_in_progress(image_status, version, next_token):
     stacks, next_token = AWSApi.instance().cfn.get_imagebuilder_stacks(next_token=next_token)
-    imagebuilder_stacks = [ImageBuilderStack(stack) for stack in stacks]
     cloudformation_states = _image_status_to_cloudformation_status(image_status)
-    summaries = [
-        _imagebuilder_stack_to_image_info_summary(stack)
-        for stack in imagebuilder_stacks
-        if stack.status in cloudformation_states
+    # Filter on the stack data first, to describe the image resource of the selected stacks only
+    imagebuilder_stacks = [
+        ImageBuilderStack(stack)
+        for stack in stacks
+        if stack.get("StackStatus") in cloudformation_states
+        and (version is None or StackInfo(stack).get_tag(PCLUSTER_VERSION_TAG) == version)
     ]
+    summaries = [_imagebuilder_stack_to_image_info_summary(stack) for stack in imagebuilder_stacks]
     return summaries, next_token
 
 
@@ -8,13 +8,11 @@
 
 # Generated by OpenAPI Generator (python-flask)
 
-import datetime
-
-import six
 from connexion.apps.flask_app import FlaskJSONEncoder
+from flask.json.provider import DefaultJSONProvider
 
+from pcluster.api import serializer
 from pcluster.api.models.base_model_ import Model
-from pcluster.utils import to_iso_timestr
 
 
 class JSONEncoder(FlaskJSONEncoder):
@@ -25,14 +23,21 @@ class JSONEncoder(FlaskJSONEncoder):
     def default(self, obj):  # pylint: disable=arguments-renamed
         """Override the base method to add support for model objects serialization."""
         if isinstance(obj, Model):
-            dikt = {}
-            for attr, _ in six.iteritems(obj.openapi_types):
-                value = getattr(obj, attr)
-                if value is None and not self.include_nulls:
-                    continue
-                attr = obj.attribute_map[attr]
-                dikt[attr] = value
-            return dikt
-        elif isinstance(obj, datetime.date):
-            return to_iso_timestr(obj)
+            return serializer.SerializationPlan.get(obj).serialize(obj, self.include_nulls)
+        serialized = serializer.to_serializable(obj, self.include_nulls)
+        if serialized is not obj:
+            return serialized
         return FlaskJSONEncoder.default(self, obj)
+
+
+class JSONProvider(DefaultJSONProvider):
+    """Serialize the responses of the Flask app through the model serialization plans."""
+
+    def dumps(self, obj, **kwargs):  # noqa: D102
+        return serializer.dumps(
+            obj,
+            indent=kwargs.get("indent"),
+            sort_keys=kwargs.get("sort_keys", self.sort_keys),
+            separators=kwargs.get("separators"),
+            default=kwargs.get("default", self.default),
+        )
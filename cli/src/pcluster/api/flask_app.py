@@ -76,7 +76,7 @@ class ParallelClusterFlaskApp:
 
         self.app = connexion.FlaskApp(__name__, specification_dir="openapi/", skip_error_handlers=True)
         self.flask_app = self.app.app
-        self.flask_app.json_encoder = encoder.JSONEncoder
+        self.flask_app.json = encoder.JSONProvider(self.flask_app)
         self.app.add_api(
             "openapi.yaml",
             arguments={"title": "ParallelCluster"},
@@ -0,0 +1,141 @@
+# Copyright 2024 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"). You may not use this file except in compliance
+# with the License. A copy of the License is located at http://aws.amazon.com/apache2.0/
+# or in the "LICENSE.txt" file accompanying this file. This file is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES
+# OR CONDITIONS OF ANY KIND, express or implied. See the License for the specific language governing permissions and
+# limitations under the License.
+
+#
+# Fast JSON serialization of the API models.
+#
+# The attributes to serialize and their JSON keys are resolved once per model class into a serialization plan,
+# instead of walking openapi_types and attribute_map for every object. Lists of models of the same class,
+# like the log events or the instances returned by the API, are serialized with a single plan lookup.
+# The JSON document is produced by orjson when installed, by the json module otherwise.
+#
+import dataclasses
+import datetime
+import json
+import threading
+import uuid
+from decimal import Decimal
+from typing import Callable, Dict, Tuple, Type
+
+from pcluster.api.models.base_model_ import Model
+from pcluster.utils import to_iso_timestr
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Types returned as they are by the serialization
+_SCALAR_TYPES = frozenset({str, int, float, bool, type(None)})
+
+
+class SerializationPlan:
+    """Flat list of the (instance attribute, JSON key) pairs to serialize for a model class."""
+
+    _plans: Dict[Type[Model], "SerializationPlan"] = {}
+    _lock = threading.Lock()
+
+    def __init__(self, fields: Tuple[Tuple[str, str], ...], direct_access: bool):
+        self.fields = fields
+        # Generated models store the value of each property in a "_<name>" instance attribute,
+        # reading it from the instance dictionary avoids the call to the property getter.
+        self.direct_access = direct_access
+
+    @classmethod
+    def get(cls, model: Model) -> "SerializationPlan":
+        """Return the plan of the class of the given model, building it from the model if needed."""
+        plan = cls._plans.get(type(model))
+        if plan is None:
+            direct_access = all(f"_{attr}" in model.__dict__ for attr in model.openapi_types)
+            fields = tuple(
+                (f"_{attr}" if direct_access else attr, model.attribute_map[attr]) for attr in model.openapi_types
+            )
+            plan = SerializationPlan(fields, direct_access)
+            with cls._lock:
+                cls._plans[type(model)] = plan
+        return plan
+
+    @classmethod
+    def clear_all(cls):
+        """Remove all the plans."""
+        with cls._lock:
+            cls._plans.clear()
+
+    def serialize(self, model: Model, include_nulls: bool = False):
+        """Convert the given model into a dictionary of JSON serializable values."""
+        values = model.__dict__ if self.direct_access else None
+        result = {}
+        for name, key in self.fields:
+            value = values[name] if values is not None else getattr(model, name)
+            if value is None:
+                if include_nulls:
+                    result[key] = None
+                continue
+            result[key] = value if type(value) in _SCALAR_TYPES else to_serializable(value, include_nulls)
+        return result
+
+
+def _serialize_list(items, include_nulls):
+    result = []
+    plan_class, plan = None, None
+    for item in items:
+        item_class = type(item)
+        if item_class in _SCALAR_TYPES:
+            result.append(item)
+        elif isinstance(item, Model):
+            # Lists are usually made of models of the same class, the plan is looked up only when the class changes
+            if item_class is not plan_class:
+                plan_class, plan = item_class, SerializationPlan.get(item)
+            result.append(plan.serialize(item, include_nulls))
+        else:
+            result.append(to_serializable(item, include_nulls))
+    return result
+
+
+def to_serializable(obj, include_nulls: bool = False):
+    """Convert models, lists, dictionaries and dates into plain JSON serializable python objects."""
+    if type(obj) in _SCALAR_TYPES:
+        return obj
+    if isinstance(obj, Model):
+        return SerializationPlan.get(obj).serialize(obj, include_nulls)
+    if isinstance(obj, (list, tuple)):
+        return _serialize_list(obj, include_nulls)
+    if isinstance(obj, dict):
+        return {key: to_serializable(value, include_nulls) for key, value in obj.items()}
+    if isinstance(obj, datetime.date):
+        return to_iso_timestr(obj)
+    if isinstance(obj, (Decimal, uuid.UUID)):
+        return str(obj)
+    if dataclasses.is_dataclass(obj) and not isinstance(obj, type):
+        return to_serializable(dataclasses.asdict(obj), include_nulls)
+    return obj
+
+
+def dumps(
+    obj,
+    indent: int = None,
+    sort_keys: bool = False,
+    separators: Tuple[str, str] = None,
+    default: Callable = None,
+) -> str:
+    """
+    Serialize the given object, possibly made of models, to a JSON document.
+
+    orjson is used when installed and the requested layout is supported by it,
+    that is either compact or indented by two spaces.
+    default is called for the objects that are not serializable otherwise, as in json.dumps.
+    """
+    data = to_serializable(obj)
+    if orjson and (indent == 2 or (indent is None and separators == (",", ":"))):
+        option = orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        return orjson.dumps(data, default=default, option=option).decode("utf-8")
+    return json.dumps(data, indent=indent, sort_keys=sort_keys, separators=separators, default=default)
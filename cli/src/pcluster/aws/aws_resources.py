@@ -8,6 +8,9 @@
 # or in the "LICENSE.txt" file accompanying this file. This file is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES
 # OR CONDITIONS OF ANY KIND, express or implied. See the License for the specific language governing permissions and
 # limitations under the License.
+from collections import defaultdict
+from typing import List
+
 from pcluster.constants import (
     LUSTRE,
     OPENZFS,
@@ -593,6 +596,10 @@ class CapacityReservationInfo:
         """Return the total instance count, if present, 0 otherwise."""
         return self.capacity_reservation_data.get("TotalInstanceCount", 0)
 
+    def available_instance_count(self):
+        """Return the number of instances that can still be launched in the Capacity Reservation, 0 if not present."""
+        return self.capacity_reservation_data.get("AvailableInstanceCount", 0)
+
     def get_tag(self, tag_key: str):
         """Get stack tag by tag key."""
         return next(
@@ -611,3 +618,27 @@ class CapacityReservationInfo:
 
     def __eq__(self, other):
         return self.__dict__ == other.__dict__
+
+
+class CapacityReservationsIndex:
+    """Index of a list of capacity reservations by instance type and availability zone."""
+
+    def __init__(self, capacity_reservations: List[CapacityReservationInfo]):
+        self.capacity_reservations = capacity_reservations
+        self._capacity_reservations_by_key = defaultdict(list)
+        for capacity_reservation in capacity_reservations:
+            self._capacity_reservations_by_key[
+                (capacity_reservation.instance_type(), capacity_reservation.availability_zone())
+            ].append(capacity_reservation)
+        self.availability_zones = {availability_zone for _, availability_zone in self._capacity_reservations_by_key}
+
+    def get(self, instance_type: str, availability_zone: str) -> List[CapacityReservationInfo]:
+        """Return the capacity reservations of the given instance type in the given availability zone."""
+        return self._capacity_reservations_by_key.get((instance_type, availability_zone), [])
+
+    def remaining_capacity(self, instance_type: str, availability_zone: str) -> int:
+        """Return the number of instances that can still be launched with the matching capacity reservations."""
+        return sum(
+            capacity_reservation.available_instance_count()
+            for capacity_reservation in self.get(instance_type, availability_zone)
+        )
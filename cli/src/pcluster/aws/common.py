@@ -21,6 +21,13 @@ import boto3
 from botocore.config import Config
 from botocore.exceptions import BotoCoreError, ClientError, ParamValidationError
 
+from pcluster.aws.rate_limiter import (
+    THROTTLING_ERROR_CODES,
+    compute_backoff_with_jitter,
+    is_throttling_error_code,
+    register_rate_limiter,
+)
+
 LOGGER = logging.getLogger(__name__)
 
 
@@ -38,7 +45,7 @@ class AWSClientError(Exception):
         @classmethod
         def throttling_error_codes(cls):
             """Return a set of error codes returned when service rate limits are exceeded."""
-            return {cls.REQUEST_LIMIT_EXCEEDED.value, cls.THROTTLING_EXCEPTION.value}
+            return {cls.REQUEST_LIMIT_EXCEEDED.value, cls.THROTTLING_EXCEPTION.value} | THROTTLING_ERROR_CODES
 
     def __init__(self, function_name: str, message: str, error_code: str = None):
         super().__init__(message)
@@ -109,20 +116,34 @@ class AWSExceptionHandler:
 
         return wrapper
 
+    THROTTLING_MAX_ATTEMPTS = 10
+
     @staticmethod
     def retry_on_boto3_throttling(func):
-        """Retry boto3 calls on throttling, can be used as a decorator."""
+        """
+        Retry boto3 calls on throttling, can be used as a decorator.
+
+        Retries are spaced with exponential backoff and full jitter, so that concurrent callers throttled
+        at the same time do not retry in lockstep. The error is raised after THROTTLING_MAX_ATTEMPTS attempts.
+        """
 
         @functools.wraps(func)
         def wrapper(*args, **kwargs):
+            attempt = 0
             while True:
                 try:
                     return func(*args, **kwargs)
                 except ClientError as e:
-                    if e.response["Error"]["Code"] != "Throttling":
+                    if not is_throttling_error_code(e.response["Error"]["Code"]):
+                        raise
+                    attempt += 1
+                    if attempt >= AWSExceptionHandler.THROTTLING_MAX_ATTEMPTS:
                         raise
-                    LOGGER.debug("Throttling when calling %s function. Will retry in %d seconds.", func.__name__, 5)
-                    time.sleep(5)
+                    backoff = compute_backoff_with_jitter(attempt - 1)
+                    LOGGER.debug(
+                        "Throttling when calling %s function. Will retry in %.2f seconds.", func.__name__, backoff
+                    )
+                    time.sleep(backoff)
 
         return wrapper
 
@@ -144,6 +165,7 @@ class Boto3Client:
             client_name, config=Config(**botocore_config_kwargs) if botocore_config_kwargs else None
         )
         self._client.meta.events.register("provide-client-params.*.*", _log_boto3_calls)
+        register_rate_limiter(self._client)
 
     def _paginate_results(self, method, **kwargs):
         """
@@ -165,6 +187,7 @@ class Boto3Resource:
     def __init__(self, resource_name: str):
         self._resource = boto3.resource(resource_name)
         self._resource.meta.client.meta.events.register("provide-client-params.*.*", _log_boto3_calls)
+        register_rate_limiter(self._resource.meta.client)
 
 
 class Cache:
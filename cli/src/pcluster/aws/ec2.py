@@ -9,14 +9,25 @@
 # OR CONDITIONS OF ANY KIND, express or implied. See the License for the specific language governing permissions and
 # limitations under the License.
 import itertools
+import json
+import logging
+import os
 import re
+import tempfile
+import threading
+import time
 from datetime import datetime
-from typing import Any, List, Tuple
+from typing import Any, Dict, List, Tuple
 
 from botocore.exceptions import ClientError
 
 from pcluster import utils
-from pcluster.aws.aws_resources import CapacityReservationInfo, ImageInfo, InstanceTypeInfo
+from pcluster.aws.aws_resources import (
+    CapacityReservationInfo,
+    CapacityReservationsIndex,
+    ImageInfo,
+    InstanceTypeInfo,
+)
 from pcluster.aws.common import AWSClientError, AWSExceptionHandler, Boto3Client, Cache, ImageNotFoundError, get_region
 from pcluster.constants import (
     IMAGE_NAME_PART_TO_OS_MAP,
@@ -25,9 +36,210 @@ from pcluster.constants import (
     OS_TO_IMAGE_NAME_PART_MAP,
     PCLUSTER_IMAGE_BUILD_STATUS_TAG,
     PCLUSTER_IMAGE_ID_TAG,
+    PCLUSTER_IMAGE_OS_TAG,
+    PCLUSTER_VERSION_TAG,
 )
 from pcluster.utils import get_partition
 
+LOGGER = logging.getLogger(__name__)
+
+# Maximum number of custom images returned by a single page of the list images operation
+LIST_IMAGES_PAGE_SIZE = 100
+
+
+class InstanceTypeOfferingMatrix:
+    """
+    Region-wide matrix of the instance types offered in every availability zone.
+
+    For every instance type the matrix stores a bitset over the availability zones of the region,
+    so that the zones offering a group of instance types are found with a bitwise AND.
+    Matrices are built lazily with a single paginated DescribeInstanceTypeOfferings call, shared by the whole
+    process and saved to disk to be reused by the following runs until they expire.
+    Matrices are kept per account and region, because the same availability zone name maps to different
+    physical zones in different accounts.
+    """
+
+    CACHE_DIR = os.path.expanduser(os.path.join("~", ".parallelcluster", "cache"))
+    # Lifetime in seconds of the matrices, 0 disables the persistence on disk.
+    TTL_ENV = "PCLUSTER_INSTANCE_TYPE_OFFERINGS_CACHE_TTL"
+    DEFAULT_TTL = 24 * 60 * 60
+
+    _matrices = {}
+    _lock = threading.Lock()
+
+    def __init__(
+        self,
+        account_id: str,
+        region: str,
+        availability_zones: List[str],
+        bitsets: Dict[str, int],
+        creation_time: float,
+    ):
+        self.account_id = account_id
+        self.region = region
+        self.availability_zones = availability_zones
+        self.creation_time = creation_time
+        self._bitsets = bitsets
+
+    @staticmethod
+    def from_offerings(account_id: str, region: str, offerings: List[dict]):
+        """Build the matrix from the offerings returned by DescribeInstanceTypeOfferings for availability zones."""
+        availability_zones = sorted({offering["Location"] for offering in offerings})
+        az_bits = {az: 1 << index for index, az in enumerate(availability_zones)}
+        bitsets = {}
+        for offering in offerings:
+            instance_type = offering["InstanceType"]
+            bitsets[instance_type] = bitsets.get(instance_type, 0) | az_bits[offering["Location"]]
+        return InstanceTypeOfferingMatrix(account_id, region, availability_zones, bitsets, time.time())
+
+    @classmethod
+    def _get_ttl(cls):
+        try:
+            return int(os.environ.get(cls.TTL_ENV, cls.DEFAULT_TTL))
+        except ValueError:
+            return cls.DEFAULT_TTL
+
+    def is_expired(self):
+        """Tell if the matrix is older than the configured lifetime."""
+        ttl = self._get_ttl()
+        return ttl > 0 and time.time() - self.creation_time > ttl
+
+    @classmethod
+    def get(cls, account_id: str, region: str, describe_offerings) -> "InstanceTypeOfferingMatrix":
+        """
+        Return the matrix of the given account and region, loading it from disk or building it if needed.
+
+        :param describe_offerings: function returning all the offerings of the region for availability zones
+        """
+        with cls._lock:
+            matrix = cls._matrices.get((account_id, region))
+            if not matrix or matrix.is_expired():
+                matrix = cls._load(account_id, region)
+                if not matrix:
+                    LOGGER.debug("Building instance type offering matrix for region %s", region)
+                    matrix = cls.from_offerings(account_id, region, describe_offerings())
+                    matrix._save()
+                cls._matrices[(account_id, region)] = matrix
+            return matrix
+
+    @classmethod
+    def clear_all(cls):
+        """Remove the matrices kept in memory."""
+        with cls._lock:
+            cls._matrices.clear()
+
+    @classmethod
+    def _get_cache_file(cls, account_id, region):
+        return os.path.join(cls.CACHE_DIR, f"instance-type-offerings-{account_id}-{region}.json")
+
+    @classmethod
+    def _load(cls, account_id, region):
+        if cls._get_ttl() <= 0:
+            return None
+        try:
+            with open(cls._get_cache_file(account_id, region), encoding="utf-8") as cache_file:
+                data = json.load(cache_file)
+            matrix = InstanceTypeOfferingMatrix(
+                account_id, region, data["availability_zones"], data["offerings"], data["creation_time"]
+            )
+            return None if matrix.is_expired() else matrix
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            LOGGER.debug("Ignoring unreadable instance type offering cache for region %s: %s", region, e)
+            return None
+
+    def _save(self):
+        if self._get_ttl() <= 0:
+            return
+        data = {
+            "availability_zones": self.availability_zones,
+            "offerings": self._bitsets,
+            "creation_time": self.creation_time,
+        }
+        try:
+            os.makedirs(self.CACHE_DIR, exist_ok=True)
+            # Write to a temporary file first, so that concurrent runs never read a partial file
+            with tempfile.NamedTemporaryFile("w", dir=self.CACHE_DIR, delete=False, encoding="utf-8") as cache_file:
+                json.dump(data, cache_file)
+            os.replace(cache_file.name, self._get_cache_file(self.account_id, self.region))
+        except OSError as e:
+            LOGGER.debug("Unable to save instance type offering cache for region %s: %s", self.region, e)
+
+    def _to_availability_zones(self, bitset: int):
+        return tuple(az for index, az in enumerate(self.availability_zones) if bitset >> index & 1)
+
+    def get_supported_azs(self, instance_type: str) -> Tuple[str, ...]:
+        """Return the availability zones offering the given instance type."""
+        return self._to_availability_zones(self._bitsets.get(instance_type, 0))
+
+    def get_common_supported_azs(self, instance_types: List[str]) -> Tuple[str, ...]:
+        """Return the availability zones offering all the given instance types."""
+        bitset = (1 << len(self.availability_zones)) - 1
+        for instance_type in instance_types:
+            bitset &= self._bitsets.get(instance_type, 0)
+        return self._to_availability_zones(bitset)
+
+
+class ImageListCache:
+    """
+    Short-lived per-region cache of the pages of custom images returned by DescribeImages.
+
+    Repeated list calls for the same page and filters issued within the lifetime of the cache are served from memory.
+    The pages of a region are dropped as soon as an image of that region is deleted by this process.
+    """
+
+    # Lifetime in seconds of the cached pages, 0 disables the cache.
+    TTL_ENV = "PCLUSTER_LIST_IMAGES_CACHE_TTL"
+    DEFAULT_TTL = 60
+
+    _pages: Dict[str, Dict[tuple, tuple]] = {}
+    _lock = threading.Lock()
+
+    @classmethod
+    def _get_ttl(cls):
+        try:
+            return int(os.environ.get(cls.TTL_ENV, cls.DEFAULT_TTL))
+        except ValueError:
+            return cls.DEFAULT_TTL
+
+    @classmethod
+    def get(cls, region: str, key: tuple, describe_page):
+        """
+        Return the cached page of the given region identified by key, describing it if missing or expired.
+
+        :param describe_page: function returning the page
+        """
+        ttl = cls._get_ttl()
+        if ttl <= 0:
+            return describe_page()
+
+        now = time.monotonic()
+        with cls._lock:
+            cached_page = cls._pages.get(region, {}).get(key)
+        if cached_page and now - cached_page[0] < ttl:
+            return cached_page[1]
+
+        page = describe_page()
+        with cls._lock:
+            region_pages = cls._pages.setdefault(region, {})
+            for expired_key in [key for key, (timestamp, _) in region_pages.items() if now - timestamp >= ttl]:
+                del region_pages[expired_key]
+            region_pages[key] = (now, page)
+        return page
+
+    @classmethod
+    def invalidate(cls, region: str):
+        """Remove the pages cached for the given region."""
+        with cls._lock:
+            cls._pages.pop(region, None)
+
+    @classmethod
+    def clear_all(cls):
+        """Remove all the cached pages."""
+        with cls._lock:
+            cls._pages.clear()
+
 
 class Ec2Client(Boto3Client):
     """Implement EC2 Boto3 client."""
@@ -110,6 +322,14 @@ class Ec2Client(Boto3Client):
                 result.append(CapacityReservationInfo(capacity_reservation))
         return result
 
+    def get_capacity_reservations_index(self, capacity_reservation_ids: List[str]) -> CapacityReservationsIndex:
+        """Return the capacity reservations with the given ids indexed by instance type and availability zone."""
+        return self._get_capacity_reservations_index(tuple(sorted(set(capacity_reservation_ids))))
+
+    @Cache.cached
+    def _get_capacity_reservations_index(self, capacity_reservation_ids: Tuple[str]) -> CapacityReservationsIndex:
+        return CapacityReservationsIndex(self.describe_capacity_reservations(list(capacity_reservation_ids)))
+
     @AWSExceptionHandler.handle_client_exception
     @Cache.cached
     def get_subnet_avail_zone(self, subnet_id):
@@ -121,6 +341,8 @@ class Ec2Client(Boto3Client):
 
     def get_subnets_az_mapping(self, subnet_ids):
         """Return a dictionary mapping the input subnet_ids to their respective availability zones."""
+        # Describe all the subnets with a single call, the following lookups are served by the subnets cache
+        self.describe_subnets(subnet_ids)
         return {subnet_id: self.get_subnet_avail_zone(subnet_id) for subnet_id in subnet_ids}
 
     @AWSExceptionHandler.handle_client_exception
@@ -227,6 +449,19 @@ class Ec2Client(Boto3Client):
             for instance in result.get("Instances")
         ]
 
+    @AWSExceptionHandler.handle_client_exception
+    def get_in_use_image_ids(self):
+        """Return the ids of the AMIs used by instances that are not terminated nor shutting-down."""
+        instance_state = ("pending", "running", "stopping", "stopped")
+        return {
+            instance.get("ImageId")
+            for result in self._paginate_results(
+                self._client.describe_instances,
+                Filters=[{"Name": "instance-state-name", "Values": list(instance_state)}],
+            )
+            for instance in result.get("Instances")
+        }
+
     @AWSExceptionHandler.handle_client_exception
     def get_image_shared_account_ids(self, image_id):
         """Get account ids that image is shared with."""
@@ -249,6 +484,40 @@ class Ec2Client(Boto3Client):
         except ImageNotFoundError:
             return []
 
+    def get_images_page(self, os=None, architecture=None, version=None, next_token=None):
+        """
+        Return a page of the existing pcluster images and the token of the next page.
+
+        The os, architecture and version filters are evaluated by EC2.
+        """
+        filters = [
+            {"Name": "tag-key", "Values": [PCLUSTER_IMAGE_ID_TAG]},
+            {"Name": f"tag:{PCLUSTER_IMAGE_BUILD_STATUS_TAG}", "Values": ["available"]},
+        ]
+        if os:
+            filters.append({"Name": f"tag:{PCLUSTER_IMAGE_OS_TAG}", "Values": [os]})
+        if architecture:
+            filters.append({"Name": "architecture", "Values": [architecture]})
+        if version:
+            filters.append({"Name": f"tag:{PCLUSTER_VERSION_TAG}", "Values": [version]})
+        return ImageListCache.get(
+            get_region(),
+            (os, architecture, version, next_token),
+            lambda: self._describe_images_page(filters, next_token),
+        )
+
+    @AWSExceptionHandler.handle_client_exception
+    def _describe_images_page(self, filters, next_token):
+        """Describe the self-owned images matching the filters, skipping the empty pages."""
+        kwargs = {"Owners": ["self"], "Filters": filters, "MaxResults": LIST_IMAGES_PAGE_SIZE}
+        while True:
+            if next_token:
+                kwargs["NextToken"] = next_token
+            response = self._client.describe_images(**kwargs)
+            next_token = response.get("NextToken")
+            if response.get("Images") or not next_token:
+                return [ImageInfo(image) for image in response.get("Images", [])], next_token
+
     @AWSExceptionHandler.handle_client_exception
     def describe_key_pair(self, key_name):
         """Return the given key, if exists."""
@@ -381,19 +650,25 @@ class Ec2Client(Boto3Client):
             instances.extend(reservation["Instances"])
         return instances, response.get("NextToken")
 
+    def get_instance_type_offering_matrix(self) -> InstanceTypeOfferingMatrix:
+        """Return the matrix of the instance types offered in every availability zone of the region."""
+        from pcluster.aws.aws_api import AWSApi  # pylint: disable=import-outside-toplevel
+
+        return InstanceTypeOfferingMatrix.get(
+            AWSApi.instance().sts.get_account_id(),
+            get_region(),
+            lambda: self.describe_instance_type_offerings(location_type="availability-zone"),
+        )
+
     @AWSExceptionHandler.handle_client_exception
-    @Cache.cached
     def get_supported_az_for_instance_type(self, instance_type: str):
         """
         Return a tuple of availability zones that have the instance_type.
 
-        This function builds on get_supported_az_for_instance_types,
-        but simplifies the input to 1 instance type and returns a tuple
-
         :param instance_type: the instance type for which the supporting AZs.
         :return: a tuple of the supporting AZs
         """
-        return self.get_supported_az_for_instance_types([instance_type])[instance_type]
+        return self.get_instance_type_offering_matrix().get_supported_azs(instance_type)
 
     @AWSExceptionHandler.handle_client_exception
     def get_supported_az_for_instance_types(self, instance_types: List[str]):
@@ -412,16 +687,13 @@ class Ec2Client(Boto3Client):
             "t3.large": (us-east-1a, us-east-1b)
         }
         """
-        # first looks for info in cache, then using only one API call for all infos that is not inside the cache
-        result = {}
-        offerings = self.describe_instance_type_offerings(
-            filters=[{"Name": "instance-type", "Values": instance_types}], location_type="availability-zone"
-        )
-        for instance_type in instance_types:
-            result[instance_type] = tuple(
-                offering["Location"] for offering in offerings if offering["InstanceType"] == instance_type
-            )
-        return result
+        matrix = self.get_instance_type_offering_matrix()
+        return {instance_type: matrix.get_supported_azs(instance_type) for instance_type in instance_types}
+
+    @AWSExceptionHandler.handle_client_exception
+    def get_common_supported_az_for_instance_types(self, instance_types: List[str]):
+        """Return a tuple of the availability zones that have all the given instance types."""
+        return self.get_instance_type_offering_matrix().get_common_supported_azs(instance_types)
 
     @AWSExceptionHandler.handle_client_exception
     def deregister_image(self, image_id):
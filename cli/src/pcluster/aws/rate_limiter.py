@@ -0,0 +1,208 @@
+# Copyright 2024 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"). You may not use this file except in compliance
+# with the License. A copy of the License is located at
+#
+# http://aws.amazon.com/apache2.0/
+#
+# or in the "LICENSE.txt" file accompanying this file. This file is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES
+# OR CONDITIONS OF ANY KIND, express or implied. See the License for the specific language governing permissions and
+# limitations under the License.
+
+#
+# Process-wide client-side rate limiting for the boto3 clients created by the CLI.
+#
+# Every (service, region) pair owns a token bucket shared by all the clients and threads of the process.
+# The refill rate of each bucket is adapted with an AIMD (additive increase, multiplicative decrease) policy:
+# every throttling response halves the rate while every successful response increases it by a small step,
+# up to the configured budget.
+#
+import logging
+import os
+import random
+import threading
+import time
+from typing import Dict, Tuple
+
+LOGGER = logging.getLogger(__name__)
+
+# Error codes returned by the AWS services when the caller exceeds the allowed request rate.
+THROTTLING_ERROR_CODES = {
+    "Throttling",
+    "ThrottlingException",
+    "ThrottledException",
+    "RequestLimitExceeded",
+    "RequestThrottled",
+    "RequestThrottledException",
+    "TooManyRequestsException",
+    "SlowDown",
+}
+
+# Default budget (requests per second) for each service, used when no override is configured.
+DEFAULT_RATE = 20.0
+DEFAULT_SERVICE_RATES = {
+    "cloudformation": 5.0,
+    "imagebuilder": 5.0,
+    "iam": 10.0,
+    "sts": 10.0,
+}
+# Minimum rate (requests per second) a bucket can be brought to by throttling responses.
+MIN_RATE = 0.5
+# Factor applied to the rate on every throttling response.
+DECREASE_FACTOR = 0.5
+# Fraction of the budget added back to the rate on every successful response.
+INCREASE_STEP_RATIO = 0.05
+
+# Environment variables used to configure the rate limiter.
+RATE_LIMITER_DISABLED_ENV = "PCLUSTER_RATE_LIMITER_DISABLED"
+# Comma separated list of <service>=<requests per second>, e.g. "ec2=30,cloudformation=4".
+# The special service name "default" sets the budget of the services not explicitly listed.
+RATE_LIMITS_ENV = "PCLUSTER_RATE_LIMITS"
+
+
+def is_rate_limiter_enabled():
+    """Tell if the client-side rate limiter is enabled."""
+    return not os.environ.get(RATE_LIMITER_DISABLED_ENV)
+
+
+def is_throttling_error_code(error_code: str):
+    """Tell if the given error code is returned by AWS services on throttling."""
+    return error_code in THROTTLING_ERROR_CODES
+
+
+def compute_backoff_with_jitter(attempt: int, base: float = 1.0, cap: float = 20.0):
+    """
+    Return the time to wait before retrying the given attempt, using exponential backoff with full jitter.
+
+    :param attempt: 0-based index of the failed attempt
+    :param base: base of the exponential backoff in seconds
+    :param cap: maximum backoff in seconds
+    """
+    return random.uniform(0, min(cap, base * 2**attempt))  # nosec B311
+
+
+def _parse_rate_limits(value: str) -> Dict[str, float]:
+    rates = {}
+    for entry in filter(None, (item.strip() for item in (value or "").split(","))):
+        service, _, rate = entry.partition("=")
+        try:
+            rates[service.strip().lower()] = float(rate)
+        except ValueError:
+            LOGGER.warning("Ignoring invalid rate limit entry '%s' in %s", entry, RATE_LIMITS_ENV)
+    return rates
+
+
+def get_configured_rate(service: str):
+    """Return the budget in requests per second configured for the given service."""
+    overrides = _parse_rate_limits(os.environ.get(RATE_LIMITS_ENV))
+    if service in overrides:
+        return overrides[service]
+    return overrides.get("default", DEFAULT_SERVICE_RATES.get(service, DEFAULT_RATE))
+
+
+class TokenBucketRateLimiter:
+    """
+    Thread-safe token bucket with AIMD adaptation of the refill rate.
+
+    Tokens are reserved in arrival order: a caller finding the bucket empty takes a token in advance
+    and sleeps until it would have been refilled, so concurrent callers are spaced out evenly.
+    """
+
+    def __init__(self, max_rate: float, burst: float = None, min_rate: float = MIN_RATE, clock=None, sleep=None):
+        self.max_rate = max_rate
+        self.min_rate = min(min_rate, max_rate)
+        self.rate = max_rate
+        self.burst = burst if burst is not None else max(1.0, max_rate)
+        self._tokens = self.burst
+        self._clock = clock or time.monotonic
+        self._sleep = sleep or time.sleep
+        self._last_refill = self._clock()
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        self._tokens = min(self.burst, self._tokens + (now - self._last_refill) * self.rate)
+        self._last_refill = now
+
+    def acquire(self):
+        """Take a token from the bucket, waiting until one is available. Return the time waited."""
+        with self._lock:
+            self._refill(self._clock())
+            self._tokens -= 1
+            wait_time = -self._tokens / self.rate if self._tokens < 0 else 0
+        if wait_time > 0:
+            self._sleep(wait_time)
+        return wait_time
+
+    def on_throttle(self):
+        """Multiplicatively decrease the rate after a throttling response."""
+        with self._lock:
+            self._refill(self._clock())
+            self.rate = max(self.min_rate, self.rate * DECREASE_FACTOR)
+            # Drop the burst credit so that the new rate is applied immediately.
+            self._tokens = min(self._tokens, 0)
+
+    def on_success(self):
+        """Additively increase the rate after a successful response."""
+        with self._lock:
+            if self.rate < self.max_rate:
+                self._refill(self._clock())
+                self.rate = min(self.max_rate, self.rate + self.max_rate * INCREASE_STEP_RATIO)
+
+
+class RateLimiterRegistry:
+    """Registry of the process-wide rate limiters, one per (service, region) pair."""
+
+    _limiters: Dict[Tuple[str, str], TokenBucketRateLimiter] = {}
+    _lock = threading.Lock()
+
+    @staticmethod
+    def get(service: str, region: str) -> TokenBucketRateLimiter:
+        """Return the rate limiter for the given service and region, creating it if needed."""
+        key = (service, region)
+        with RateLimiterRegistry._lock:
+            limiter = RateLimiterRegistry._limiters.get(key)
+            if not limiter:
+                limiter = TokenBucketRateLimiter(max_rate=get_configured_rate(service))
+                RateLimiterRegistry._limiters[key] = limiter
+            return limiter
+
+    @staticmethod
+    def reset():
+        """Remove all the rate limiters, so that they get recreated with the current configuration."""
+        with RateLimiterRegistry._lock:
+            RateLimiterRegistry._limiters.clear()
+
+
+def _get_error_code(response):
+    if not response:
+        return None
+    _, parsed = response
+    return (parsed or {}).get("Error", {}).get("Code")
+
+
+def register_rate_limiter(client):
+    """
+    Attach the shared rate limiter for the client's service and region to the given botocore client.
+
+    A token is taken before every HTTP attempt (including the retries performed by botocore)
+    and the outcome of every attempt is fed back to the limiter to adapt its rate.
+    """
+    if not is_rate_limiter_enabled():
+        return
+    limiter = RateLimiterRegistry.get(client.meta.service_model.service_name, client.meta.region_name)
+
+    def _acquire_token(**kwargs):
+        waited = limiter.acquire()
+        if waited:
+            LOGGER.debug("Client-side rate limiter delayed %s by %.2f seconds", kwargs.get("event_name"), waited)
+
+    def _record_outcome(response=None, **kwargs):
+        error_code = _get_error_code(response)
+        if is_throttling_error_code(error_code):
+            limiter.on_throttle()
+            LOGGER.debug("Throttling on %s, client-side rate reduced to %.2f/s", kwargs.get("event_name"), limiter.rate)
+        elif response is not None:
+            limiter.on_success()
+
+    client.meta.events.register("before-send.*.*", _acquire_token)
+    client.meta.events.register("needs-retry.*.*", _record_outcome)
@@ -22,9 +22,13 @@ class ResourceGroupsClient(Boto3Client):
     @AWSExceptionHandler.handle_client_exception
     @Cache.cached
     def get_capacity_reservation_ids_from_group_resources(self, group):
-        """Return a list of capacity reservation ids."""
+        """Return a list of capacity reservation ids, going through all the pages of the group resources."""
         capacity_reservation_ids = []
-        resources = self._client.list_group_resources(Group=group)["Resources"]
+        resources = [
+            resource
+            for page in self._client.get_paginator("list_group_resources").paginate(Group=group)
+            for resource in page["Resources"]
+        ]
         for resource in resources:
             if resource["Identifier"]["ResourceType"] == "AWS::EC2::CapacityReservation":
                 capacity_reservation_ids.append(
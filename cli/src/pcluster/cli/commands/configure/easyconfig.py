@@ -15,6 +15,7 @@ import re
 import stat
 import sys
 from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 
 import boto3
 import yaml
@@ -76,6 +77,8 @@ def _get_vpcs_and_subnets():
     """
     Return a dictionary containing a list of vpc in the given region and the associated VPCs.
 
+    All the subnets of the region are retrieved with a single paginated sweep and grouped by VPC.
+
     Example:
     {"vpc_list": list({"id":vpc-id, "name":name, "number_of_subnets": 6}) ,
     "vpc_to_subnet" :
@@ -83,41 +86,50 @@ def _get_vpcs_and_subnets():
                     "vpc-id2": list({"id":subnet-id, "name":name, "size":subnet-size, "availability_zone": subnet-az})}}
     """
     ec2_client = boto3.client("ec2")
-    vpcs = ec2_client.describe_vpcs()
-    vpc_options = []
-    vpc_subnets = {}
+    vpcs = [vpc for page in ec2_client.get_paginator("describe_vpcs").paginate() for vpc in page.get("Vpcs")]
+    vpc_subnets = {vpc.get("VpcId"): [] for vpc in vpcs}
+    for subnet in _get_subnets(ec2_client):
+        if subnet.get("VpcId") in vpc_subnets:
+            vpc_subnets[subnet.get("VpcId")].append(
+                OrderedDict(
+                    [
+                        ("id", subnet.get("SubnetId")),
+                        ("name", get_resource_tag(subnet, tag_name="Name")),
+                        ("size", _extract_subnet_size(subnet.get("CidrBlock"))),
+                        ("availability_zone", subnet.get("AvailabilityZone")),
+                    ]
+                )
+            )
 
-    for vpc in vpcs.get("Vpcs"):
+    vpc_options = []
+    for vpc in vpcs:
         vpc_id = vpc.get("VpcId")
-        subnets = _get_subnets(ec2_client, vpc_id)
         vpc_name = get_resource_tag(vpc, tag_name="Name")
-        vpc_subnets[vpc_id] = subnets
-        vpc_options.append(OrderedDict([("id", vpc_id), ("name", vpc_name), ("number_of_subnets", len(subnets))]))
+        vpc_options.append(
+            OrderedDict([("id", vpc_id), ("name", vpc_name), ("number_of_subnets", len(vpc_subnets[vpc_id]))])
+        )
 
     return {"vpc_list": vpc_options, "vpc_subnets": vpc_subnets}
 
 
-def _get_subnets(conn, vpc_id):
-    subnet_options = []
-    subnet_filters = [{"Name": "vpcId", "Values": [vpc_id]}]
+def _get_subnets(conn):
+    subnet_filters = []
     # US isolated regions do not support IPv6.
     # Subnets in these regions do not have the field "Ipv6Native", so
     # applying the filter ipv6-native=false would make the DescribeSubnets call to always return an empty set.
     if not conn.meta.region_name.startswith("us-iso"):
         subnet_filters.append({"Name": "ipv6-native", "Values": ["false"]})
-    subnet_list = conn.describe_subnets(Filters=subnet_filters).get("Subnets")
-    for subnet in subnet_list:
-        subnet_options.append(
-            OrderedDict(
-                [
-                    ("id", subnet.get("SubnetId")),
-                    ("name", get_resource_tag(subnet, tag_name="Name")),
-                    ("size", _extract_subnet_size(subnet.get("CidrBlock"))),
-                    ("availability_zone", subnet.get("AvailabilityZone")),
-                ]
-            )
-        )
-    return subnet_options
+    for page in conn.get_paginator("describe_subnets").paginate(Filters=subnet_filters):
+        yield from page.get("Subnets")
+
+
+def _prefetch_instance_type_offerings():
+    """Load the instance types offered in the availability zones of the region, used to filter the subnets."""
+    try:
+        AWSApi.instance().ec2.get_instance_type_offering_matrix()
+    except Exception as e:
+        # The offerings are retrieved again, and the error reported, when they are actually needed
+        LOGGER.debug("Unable to prefetch instance type offerings: %s", e)
 
 
 def configure(args):  # noqa: C901
@@ -335,7 +347,10 @@ def _write_configuration_file(config_file_path, content):
 def _create_vpc_parameters(scheduler, head_node_instance_type, compute_instance_types, cluster_size):
     vpc_parameters = {}
     min_subnet_size = int(cluster_size)
-    vpc_and_subnets = _get_vpcs_and_subnets()
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        # Retrieve the instance type offerings while discovering the subnets
+        executor.submit(_prefetch_instance_type_offerings)
+        vpc_and_subnets = _get_vpcs_and_subnets()
     vpc_list = vpc_and_subnets["vpc_list"]
     if not vpc_list:
         print("There are no VPC for the given region. Starting automatic creation of VPC and subnets...")
@@ -467,11 +482,4 @@ def _prompt_for_placement_group():
 
 # Availability zone utilities
 def _get_common_supported_az_for_multi_instance_types(instance_types):
-    supported_az = AWSApi.instance().ec2.get_supported_az_for_instance_types(instance_types)
-    common_az = None
-    for az_list in supported_az.values():
-        if common_az is None:
-            common_az = set(az_list)
-        else:
-            common_az = common_az & set(az_list)
-    return common_az
+    return set(AWSApi.instance().ec2.get_common_supported_az_for_instance_types(instance_types))
@@ -193,8 +193,10 @@ def _validate_cidr(cidr):
 @handle_client_exception
 def get_vpc_subnets(vpc_id):
     """Return a list of the subnets cidr contained in the vpc."""
-    subnets = boto3.client("ec2").describe_subnets(Filters=[{"Name": "vpcId", "Values": [vpc_id]}])["Subnets"]
-    return [subnet["CidrBlock"] for subnet in subnets]
+    pages = (
+        boto3.client("ec2").get_paginator("describe_subnets").paginate(Filters=[{"Name": "vpcId", "Values": [vpc_id]}])
+    )
+    return [subnet["CidrBlock"] for page in pages for subnet in page["Subnets"]]
 
 
 @handle_client_exception
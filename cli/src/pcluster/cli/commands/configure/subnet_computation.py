@@ -9,6 +9,7 @@
 # OR CONDITIONS OF ANY KIND, express or implied. See the License for the specific language governing permissions and
 # limitations under the License.
 
+from bisect import bisect_left
 from ipaddress import ip_address, ip_network, summarize_address_range
 
 
@@ -16,6 +17,87 @@ def unicode(ip_addr):
     return "{0}".format(ip_addr)
 
 
+DEFAULT_SUBNET_TARGET_SIZE = 4000
+
+
+class CidrAllocator:
+    """
+    Allocate non-overlapping subnet CIDRs in a VPC.
+
+    The occupied address space is kept as a sorted list of disjoint intervals of decimal addresses,
+    so that every allocation is a single scan of the free gaps, without converting addresses from and to strings.
+    """
+
+    def __init__(self, vpc_cidr, occupied_cidrs=None):
+        self._vpc_begin, self._vpc_end = _get_cidr_limits_as_decimal(vpc_cidr)
+        # Sorted list of disjoint [begin, end] intervals of occupied addresses
+        self._occupied = []
+        for cidr in occupied_cidrs or []:
+            self._occupy(*_get_cidr_limits_as_decimal(cidr))
+
+    def _occupy(self, begin, end):
+        """Add the given interval to the occupied ones, merging it with the intervals it overlaps or touches."""
+        index = bisect_left(self._occupied, [begin])
+        if index > 0 and self._occupied[index - 1][1] >= begin - 1:
+            index -= 1
+            begin = self._occupied[index][0]
+        last = index
+        while last < len(self._occupied) and self._occupied[last][0] <= end + 1:
+            end = max(end, self._occupied[last][1])
+            last += 1
+        self._occupied[index:last] = [[begin, end]]
+
+    def _find_free_blocks(self, block_size, count):
+        """Return the first addresses of the first count free blocks of the given size, aligned to their size."""
+        blocks = []
+        candidate = _align_up(self._vpc_begin, block_size)
+        index = max(0, bisect_left(self._occupied, [candidate]) - 1)
+        while len(blocks) < count and candidate + block_size - 1 <= self._vpc_end:
+            if index < len(self._occupied) and self._occupied[index][1] < candidate:
+                index += 1
+            elif index < len(self._occupied) and self._occupied[index][0] <= candidate + block_size - 1:
+                candidate = _align_up(self._occupied[index][1] + 1, block_size)
+                index += 1
+            else:
+                blocks.append(candidate)
+                candidate += block_size
+        return blocks
+
+    def plan(self, target_size, count=1):
+        """
+        Allocate count subnets with size >= target_size, e.g. one per Availability Zone.
+
+        The free space of the VPC is scanned only once for all the subnets.
+        :return: the list of the allocated CIDRs, or None if there is not enough space for all the subnets
+        """
+        subnet_size, _ = _evaluate_subnet_size(target_size)
+        blocks = self._find_free_blocks(subnet_size, count)
+        if len(blocks) < count:
+            return None
+        for begin in blocks:
+            self._occupy(begin, begin + subnet_size - 1)
+        return [_decimal_ip_limits_to_cidr(begin, begin + subnet_size - 1) for begin in blocks]
+
+    def allocate(self, target_size):
+        """Allocate the first smallest suitable subnet with size >= target_size. Return its CIDR or None."""
+        cidrs = self.plan(target_size)
+        return cidrs[0] if cidrs else None
+
+    def allocate_with_fallback(self, min_subnet_size):
+        """
+        Allocate the largest subnet up to the default target size, with size >= min_subnet_size.
+
+        :return: the CIDR of the allocated subnet or None
+        """
+        target_size = max(DEFAULT_SUBNET_TARGET_SIZE, 2 * min_subnet_size)
+        while target_size >= min_subnet_size:
+            cidr = self.allocate(target_size)
+            if cidr:
+                return cidr
+            target_size = target_size // 2
+        return None
+
+
 def get_subnet_cidr(vpc_cidr, occupied_cidr, min_subnet_size):
     """
     Decide the parallelcluster subnet size of the compute fleet.
@@ -25,81 +107,26 @@ def get_subnet_cidr(vpc_cidr, occupied_cidr, min_subnet_size):
     :param min_subnet_size: the minimum size of the subnet
     :return:
     """
-    default_target_size = 4000
-    target_size = max(default_target_size, 2 * min_subnet_size)
-    cidr = evaluate_cidr(vpc_cidr, occupied_cidr, target_size)
-    while cidr is None:
-        if target_size < min_subnet_size:
-            return None
-        target_size = target_size // 2
-        cidr = evaluate_cidr(vpc_cidr, occupied_cidr, target_size)
-    return cidr
+    return CidrAllocator(vpc_cidr, occupied_cidr).allocate_with_fallback(min_subnet_size)
 
 
 def evaluate_cidr(vpc_cidr, occupied_cidrs, target_size):
     """
     Decide the first smallest suitable CIDR for a subnet with size >= target_size.
 
-    In order to find a space in between all the subnets we have, we first start by making all the occupied subnets size
-    bigger or equal to the one we are targeting. In order to do that, if a subnet is smaller than target_size, we will
-    find the bigger one to which she is part of.
-
-    After that, we will sort the subnet by cidr and than look for space between the end of one subnet and the beginning
-    of the other, not forgetting to also look for space in the begin and end.
+    A CIDR block is aligned to its size, so we look for the first block of the target size, aligned to its size,
+    which does not intersect any of the occupied subnets.
     :param vpc_cidr: the vpc_cidr in which the suitable subnet should be
     :param occupied_cidrs: a list of cidr of the already occupied subnets in the vpc
     :param target_size: the minimum target size of the subnet
     :return: the suitable CIDR if found, else None
     """
-    subnet_size, subnet_bitmask = _evaluate_subnet_size(target_size)
-    vpc_begin_address_decimal, vpc_end_address_decimal = _get_cidr_limits_as_decimal(vpc_cidr)
+    return CidrAllocator(vpc_cidr, occupied_cidrs).allocate(target_size)
 
-    # if we do not have enough space
-    if vpc_end_address_decimal - vpc_begin_address_decimal + 1 < subnet_size:
-        return None
-
-    # if we have space and no occupied cidr
-    if not occupied_cidrs:
-        return _decimal_ip_limits_to_cidr(vpc_begin_address_decimal, vpc_begin_address_decimal + subnet_size)
-
-    lower_limit_index = 0
-    upper_limit_index = 1
-
-    # Get subnets limits
-    occupied_cidrs = _align_subnet_cidrs(occupied_cidrs, subnet_bitmask)
-    subnets_limits = [_get_cidr_limits_as_decimal(subnet) for subnet in occupied_cidrs]
-    subnets_limits.sort(key=lambda x: x[upper_limit_index])
-
-    #  Looking at space between occupied cidrs
-    resulting_cidr = None
-
-    subnets_limits.append((vpc_end_address_decimal, vpc_end_address_decimal))
-    for index, subnet_limit in enumerate(subnets_limits):
-        current_lower_limit = subnet_limit[lower_limit_index]
-        # In the first case, vpc_begin_address is free, whereas upper_limit_index is not
-        previous_upper_limit = (
-            subnets_limits[index - 1][upper_limit_index] if index > 0 else vpc_begin_address_decimal - 1
-        )
-        if current_lower_limit - previous_upper_limit > subnet_size:
-            resulting_cidr = _decimal_ip_limits_to_cidr(previous_upper_limit + 1, previous_upper_limit + subnet_size)
-            break
 
-    return resulting_cidr
-
-
-def _align_subnet_cidrs(occupied_cidr, target_bitmask):
-    """Transform the subnet cidr that are smaller than the minimum bitmask to bigger ones."""
-    correct_cidrs = set()
-    for subnet_cidr in occupied_cidr:
-        if _get_bitmask(subnet_cidr) > target_bitmask:
-            correct_cidrs.add(expand_cidr(subnet_cidr, target_bitmask))
-        else:
-            correct_cidrs.add(subnet_cidr)
-    return list(correct_cidrs)
-
-
-def _get_bitmask(cidr):
-    return int(cidr.split("/")[1])
+def _align_up(address, block_size):
+    """Return the first address >= the given one that is aligned to the block size."""
+    return -(-address // block_size) * block_size
 
 
 def _evaluate_subnet_size(target_size):
@@ -119,18 +146,13 @@ def _get_cidr_limits_as_decimal(cidr):
     """
     Given a cidr, return the begin ip and the end ip as decimal.
 
-    For example, given the cidr 10.0.0.0/24, it will return 167772160, which is 10.0.0.0 and 167772416,
-    which is 10.0.1.0
+    For example, given the cidr 10.0.0.0/24, it will return 167772160, which is 10.0.0.0 and 167772415,
+    which is 10.0.0.255
     :param: cidr the cidr to convert
     :return: a tuple (decimal begin address, decimal end address)
     """
-    address = ip_network(unicode(cidr))
-    return _ip_to_decimal(str(address[0])), _ip_to_decimal(str(address[-1]))
-
-
-def _ip_to_decimal(ip_addr):
-    """Transform an ip into its decimal representation."""
-    return int(ip_address(unicode(ip_addr)))
+    network = ip_network(unicode(cidr))
+    return int(network.network_address), int(network.broadcast_address)
 
 
 def expand_cidr(cidr, new_size):
@@ -0,0 +1,97 @@
+#  Copyright 2024 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License"). You may not use this file except in compliance
+#  with the License. A copy of the License is located at http://aws.amazon.com/apache2.0/
+#  or in the "LICENSE.txt" file accompanying this file. This file is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES
+#  OR CONDITIONS OF ANY KIND, express or implied. See the License for the specific language governing permissions and
+#  limitations under the License.
+
+import logging
+from functools import partial
+from typing import List
+
+from argparse import ArgumentParser, Namespace
+
+from pcluster import utils
+from pcluster.api.controllers.common import assert_supported_operation
+from pcluster.aws.common import get_region
+from pcluster.cli.commands.common import CliCommand, to_int
+from pcluster.constants import Operation
+from pcluster.models.imagebuilder import (
+    GC_MAX_WORKERS,
+    ImageGarbageCollector,
+    ImageGarbageStatus,
+    ImageRetentionPolicy,
+)
+
+LOGGER = logging.getLogger(__name__)
+
+
+class PruneImagesCommand(CliCommand):
+    """Implement pcluster prune-images command."""
+
+    # CLI
+    name = "prune-images"
+    help = "Delete in bulk the custom ParallelCluster images selected by a retention policy."
+    description = (
+        f"{help} Images used by instances are always kept, images shared with other accounts are kept "
+        "unless --force is specified."
+    )
+
+    def __init__(self, subparsers):
+        super().__init__(subparsers, name=self.name, help=self.help, description=self.description)
+
+    def register_command_args(self, parser: ArgumentParser) -> None:  # noqa: D102
+        parser.add_argument(
+            "--older-than-days",
+            type=partial(to_int, "older-than-days"),
+            help="Select the images created more than the given number of days ago.",
+        )
+        parser.add_argument(
+            "--image-version",
+            dest="versions",
+            action="append",
+            help="Select the images built with the given ParallelCluster version. Can be specified multiple times.",
+        )
+        parser.add_argument(
+            "--image-status",
+            dest="statuses",
+            action="append",
+            choices=[ImageGarbageStatus.AVAILABLE, ImageGarbageStatus.FAILED],
+            help="Select the images with the given status. Can be specified multiple times. "
+            "(Defaults to both AVAILABLE and FAILED.)",
+        )
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            default=False,
+            help="Delete also the selected images that are shared with other accounts.",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            default=False,
+            help="Only report the images that would be deleted.",
+        )
+        parser.add_argument(
+            "--max-parallelism",
+            type=partial(to_int, "max-parallelism"),
+            default=GC_MAX_WORKERS,
+            help=f"Maximum number of images deleted concurrently. (Defaults to {GC_MAX_WORKERS}.)",
+        )
+
+    def execute(self, args: Namespace, extra_args: List[str]) -> None:  # noqa: D102 #pylint: disable=unused-argument
+        assert_supported_operation(operation=Operation.DELETE_IMAGE, region=args.region or get_region())
+        if args.older_than_days is None and not args.versions:
+            utils.error("At least one of --older-than-days and --image-version must be specified.")
+        if args.max_parallelism < 1:
+            utils.error("--max-parallelism must be greater than 0.")
+
+        policy = ImageRetentionPolicy(
+            older_than_days=args.older_than_days,
+            versions=tuple(args.versions or ()),
+            statuses=tuple(args.statuses or (ImageGarbageStatus.AVAILABLE, ImageGarbageStatus.FAILED)),
+        )
+        LOGGER.debug("Pruning images with retention policy %s", policy)
+        collector = ImageGarbageCollector(policy, force=args.force, max_workers=args.max_parallelism)
+        return {"dryRun": args.dry_run, "images": collector.collect(dry_run=args.dry_run)}
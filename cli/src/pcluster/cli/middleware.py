@@ -28,9 +28,28 @@ from botocore.exceptions import WaiterError
 
 import pcluster.cli.model
 from pcluster.cli.exceptions import APIOperationException, ParameterException
+from pcluster.models.compute_fleet_status_manager import ComputeFleetStatus, wait_for_status_change
 
 LOGGER = logging.getLogger(__name__)
 
+# Statuses the compute fleet goes through after a status update request and final status it is expected to reach.
+# The AWS Batch compute environments go straight from the previous status to the requested one.
+COMPUTE_FLEET_TRANSITIONS = {
+    "START_REQUESTED": (
+        {ComputeFleetStatus.START_REQUESTED, ComputeFleetStatus.STARTING},
+        ComputeFleetStatus.RUNNING,
+    ),
+    "STOP_REQUESTED": (
+        {ComputeFleetStatus.STOP_REQUESTED, ComputeFleetStatus.STOPPING},
+        ComputeFleetStatus.STOPPED,
+    ),
+    "ENABLED": ({ComputeFleetStatus.DISABLED}, ComputeFleetStatus.ENABLED),
+    "DISABLED": ({ComputeFleetStatus.ENABLED}, ComputeFleetStatus.DISABLED),
+}
+COMPUTE_FLEET_WAIT_TIMEOUT = 900
+# Poll at least once per second, so that the command returns within a second of the transition.
+COMPUTE_FLEET_WAIT_MAX_POLL_INTERVAL = 1
+
 
 def _cluster_status(cluster_name):
     controller = "cluster_operations_controller"
@@ -39,6 +58,13 @@ def _cluster_status(cluster_name):
     return pcluster.cli.model.call(full_func_name, cluster_name=cluster_name)
 
 
+def _compute_fleet_status(cluster_name):
+    controller = "cluster_compute_fleet_controller"
+    func_name = "describe_compute_fleet"
+    full_func_name = f"pcluster.api.controllers.{controller}.{func_name}"
+    return pcluster.cli.model.call(full_func_name, cluster_name=cluster_name)
+
+
 def add_additional_args(parser_map):
     """Add any additional arguments to parsers for individual operations.
 
@@ -49,6 +75,7 @@ def add_additional_args(parser_map):
     parser_map["create-cluster"].add_argument("--wait", action="store_true", help=argparse.SUPPRESS)
     parser_map["delete-cluster"].add_argument("--wait", action="store_true", help=argparse.SUPPRESS)
     parser_map["update-cluster"].add_argument("--wait", action="store_true", help=argparse.SUPPRESS)
+    parser_map["update-compute-fleet"].add_argument("--wait", action="store_true", help=argparse.SUPPRESS)
 
 
 def middleware_hooks():
@@ -56,7 +83,12 @@ def middleware_hooks():
 
     The map has operation names as the keys and functions as values.
     """
-    return {"create-cluster": create_cluster, "delete-cluster": delete_cluster, "update-cluster": update_cluster}
+    return {
+        "create-cluster": create_cluster,
+        "delete-cluster": delete_cluster,
+        "update-cluster": update_cluster,
+        "update-compute-fleet": update_compute_fleet,
+    }
 
 
 def queryable(func):
@@ -118,3 +150,33 @@ def delete_cluster(func, _body, kwargs):
         return {"message": f"Successfully deleted cluster '{kwargs['cluster_name']}'."}
     else:
         return ret
+
+
+@queryable
+def update_compute_fleet(func, body, kwargs):
+    wait = kwargs.pop("wait", False)
+    ret = func(**kwargs)
+    transition = COMPUTE_FLEET_TRANSITIONS.get(body.get("status"))
+    if wait and transition:
+        transition_statuses, final_status = transition
+        cluster_name = kwargs["cluster_name"]
+        describe_result = {}
+
+        def _get_status():
+            describe_result.update(_compute_fleet_status(cluster_name))
+            return ComputeFleetStatus(describe_result["status"])
+
+        try:
+            status = wait_for_status_change(
+                _get_status,
+                transition_statuses,
+                COMPUTE_FLEET_WAIT_TIMEOUT,
+                max_interval=COMPUTE_FLEET_WAIT_MAX_POLL_INTERVAL,
+            )
+        except TimeoutError as e:
+            LOGGER.error("Failed when waiting for compute fleet status update with error: %s", e)
+            raise APIOperationException({"message": f"Timeout waiting for compute fleet update of '{cluster_name}'."})
+        if status != final_status:
+            raise APIOperationException(describe_result)
+        ret = describe_result
+    return ret
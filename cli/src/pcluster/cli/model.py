@@ -12,11 +12,10 @@
 # limitations under the License.
 import functools
 import importlib
-import json
 
 import jmespath
 
-from pcluster.api import encoder, openapi
+from pcluster.api import openapi, serializer
 from pcluster.cli.exceptions import APIOperationException
 from pcluster.utils import to_kebab_case, to_snake_case, yaml_load
 
@@ -212,7 +211,7 @@ def call(func_str, *args, **kwargs):
     if isinstance(ret, tuple):
         ret, status_code = ret
         if status_code >= 400:
-            data = json.loads(encoder.JSONEncoder().encode(ret))
+            data = serializer.to_serializable(ret)
             raise APIOperationException(data)
-    data = json.loads(encoder.JSONEncoder().encode(ret))
+    data = serializer.to_serializable(ret)
     return jmespath.search(query, data) if query else data
@@ -17,13 +17,16 @@ import itertools
 import json
 import logging
 from abc import ABC, abstractmethod
+from contextlib import contextmanager
 from enum import Enum
+from functools import partial
 from typing import List, Set
 
 from pcluster.validators.common import AsyncValidator, FailureLevel, ValidationResult, Validator, ValidatorContext
 from pcluster.validators.iam_validators import AdditionalIamPolicyValidator
 from pcluster.validators.networking_validators import LambdaFunctionsVpcConfigValidator
 from pcluster.validators.s3_validators import UrlValidator
+from pcluster.validators.utils import UrlProber
 
 LOGGER = logging.getLogger(__name__)
 
@@ -77,6 +80,35 @@ class TypeMatchValidatorsSuppressor(ValidatorSuppressor):
         return validator.type in self._validators_to_suppress
 
 
+class ValidatorInvocations:
+    """
+    Invocations of the validators executed in a validation run.
+
+    The invocations of a validator with the same invocation key are executed once
+    and their result is returned to every resource registering them.
+    """
+
+    def __init__(self):
+        self._results = {}
+        self.total = 0
+        self.executed = 0
+
+    def execute(self, validator_class, validator_args, execute):
+        """Return the result of the given invocation, calling execute only if not already executed in the run."""
+        self.total += 1
+        key = validator_class.invocation_key(**validator_args)
+        if key is None:
+            self.executed += 1
+            return execute()
+        key = (validator_class, key)
+        if key not in self._results:
+            self.executed += 1
+            self._results[key] = execute()
+        else:
+            LOGGER.debug("Reusing the result of validator %s", validator_class.__name__)
+        return self._results[key]
+
+
 class Resource:
     """Represent an abstract Resource entity."""
 
@@ -136,6 +168,9 @@ class Resource:
         self._validation_futures = []
         self._validation_failures: List[ValidationResult] = []
         self._validators: List = []
+        # Inputs of the registered validators, in the same order as _validators
+        self._validator_inputs: List = []
+        self._declared_validator_inputs = None
         self.implied = implied
 
     @property
@@ -223,51 +258,77 @@ class Resource:
         return nested_resources
 
     def validate(
-        self, suppressors: List[ValidatorSuppressor] = None, context: ValidatorContext = None, nested: bool = False
+        self,
+        suppressors: List[ValidatorSuppressor] = None,
+        context: ValidatorContext = None,
+        nested: bool = False,
+        invocations: ValidatorInvocations = None,
     ):
         """
         Execute registered validators.
 
         The "nested" parameter is used only for internal recursive calls to distinguish those from the top level
         one where the async validators results should be awaited for.
+        The "invocations" are shared by all the resources of the validation run, a new one is created by the top level
+        call when not given.
         """
         # this validation logic is a responsibility that could be completely separated from the resource tree
         # also until we need to support both sync and async validation this logic will be unnecessarily complex
         # embracing async validation completely is possible and will greatly simplify this
         self._validation_futures.clear()
         self._validation_failures.clear()
+        if not nested:
+            # The urls are probed once per validation run
+            UrlProber.reset()
+        if invocations is None:
+            invocations = ValidatorInvocations()
 
         try:
-            self._validate_nested_resources(context, suppressors)
-            self._validate_self(context, suppressors)
+            self._validate_nested_resources(context, suppressors, invocations)
+            self._validate_self(context, suppressors, invocations)
         finally:
             if nested:
                 result = self._validation_failures, self._validation_futures.copy()
             else:
                 self._validation_failures.extend(self._await_async_validators())
                 result = self._validation_failures
+                LOGGER.debug(
+                    "Executed %s unique validator invocations out of %s", invocations.executed, invocations.total
+                )
             self._validation_futures.clear()
 
         return result
 
-    def _validate_nested_resources(self, context, suppressors):
+    def _validate_nested_resources(self, context, suppressors, invocations):
         # Call validators for nested resources
         for nested_resource in self._nested_resources():
-            failures, futures = nested_resource.validate(suppressors, context, nested=True)
+            failures, futures = nested_resource.validate(suppressors, context, nested=True, invocations=invocations)
             self._validation_futures.extend(futures)
             self._validation_failures.extend(failures)
 
-    def _validate_self(self, context, suppressors):
+    def _validate_self(self, context, suppressors, invocations):
         self._validators.clear()
+        self._validator_inputs.clear()
         self._register_validators(context)
-        for validator in self._validators:
+        validation_scope = context.validation_scope if context else None
+        for validator, validator_inputs in zip(self._validators, self._validator_inputs):
+            if validation_scope and not validation_scope.includes(*validator_inputs):
+                LOGGER.debug("Skipping validator %s, its inputs are not changed", validator[0].__name__)
+                continue
             if issubclass(validator[0], AsyncValidator):
-                result = self._validator_execute(*validator, suppressors, self._validator_execute_async)
+                result = invocations.execute(
+                    *validator, partial(self._validator_execute, *validator, suppressors, self._validator_execute_async)
+                )
                 if result:
+                    # The coroutine of an invocation shared by several resources is awaited once by asyncio.gather
                     self._validation_futures.extend([result])
             else:
                 self._validation_failures.extend(
-                    self._validator_execute(*validator, suppressors, self._validator_execute_sync) or []
+                    invocations.execute(
+                        *validator,
+                        partial(self._validator_execute, *validator, suppressors, self._validator_execute_sync),
+                    )
+                    or []
                 )
 
     def _register_validators(self, context: ValidatorContext = None):
@@ -290,6 +351,23 @@ class Resource:
         :return:
         """
         self._validators.append((validator_class, validator_args))
+        self._validator_inputs.append(self._declared_validator_inputs or (self,))
+
+    @contextmanager
+    def _validator_inputs_from(self, *inputs):
+        """
+        Declare the parts of the configuration the validators registered in the block take their arguments from.
+
+        By default the inputs of a validator are the resource registering it and its nested resources.
+        When only a part of the configuration is validated, e.g. the one changed by a cluster update,
+        the validators are executed only if their inputs are part of it.
+        :param inputs: Resources or paths of configuration sections, e.g. "Scheduling.SlurmSettings"
+        """
+        self._declared_validator_inputs = inputs
+        try:
+            yield
+        finally:
+            self._declared_validator_inputs = None
 
     def __repr__(self):
         """Return a human readable representation of the Resource object."""
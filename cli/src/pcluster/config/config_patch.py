@@ -15,6 +15,7 @@ import sys
 from collections import namedtuple
 from typing import List
 
+from pcluster.config.common import Resource
 from pcluster.config.update_policy import UpdatePolicy
 from pcluster.schemas.cluster_schema import ClusterSchema
 from pcluster.schemas.common_schema import BaseSchema
@@ -30,6 +31,15 @@ if sys.version_info <= (3, 7):
 
 LOGGER = logging.getLogger(__name__)
 
+# Scheduling resources keep queues and settings without the scheduler prefix, see SchedulingSchema.make_resource
+SCHEDULING_ATTRIBUTES = {
+    "slurm": {"slurm_queues": "queues", "slurm_settings": "settings"},
+    "awsbatch": {"aws_batch_queues": "queues", "aws_batch_settings": "settings"},
+}
+
+# Path element of an item of a list of sections, e.g. SlurmQueues[queue1]
+LIST_ITEM_PATH_REGEX = re.compile(r"^(?P<data_key>[^\[]+)\[(?P<update_key_value>.*)\]$")
+
 
 class ConfigPatch:
     """
@@ -203,6 +213,10 @@ class ConfigPatch:
                         )
                     )
 
+    def validation_scope(self, target_config):
+        """Return the scope limiting the validation of the target configuration to the parts changed by the patch."""
+        return ValidationScope(target_config, self.changes, self.cluster_schema)
+
     @property
     def update_policy_level(self):
         """
@@ -294,3 +308,73 @@ class ConfigPatch:
             )
 
         return {"changeSet": changes_list}
+
+
+class ValidationScope:
+    """
+    Parts of a configuration changed by a patch.
+
+    Configuration paths are tuples of data keys, where the items of a list of sections are identified by the data key
+    of the list followed by the value of their update key, e.g. ("Scheduling", "SlurmQueues", "queue1", "Networking").
+    An input of a validator is in scope when it contains, or is contained in, a changed part of the configuration.
+    """
+
+    def __init__(self, config: Resource, changes: List[Change], schema: BaseSchema):
+        self._changed_paths = [self._change_path(change) for change in changes]
+        self._resource_paths = {}
+        self._map_resource_paths(config, schema, ())
+
+    @staticmethod
+    def _change_path(change: Change):
+        path = []
+        for path_element in change.path:
+            match = LIST_ITEM_PATH_REGEX.match(path_element)
+            path.extend(match.groups() if match else [path_element])
+        path.append(change.key)
+        return tuple(path)
+
+    def _map_resource_paths(self, resource: Resource, schema: BaseSchema, path: tuple):
+        """Map every resource of the configuration to its path, following the same fields compared by the patch."""
+        self._resource_paths[id(resource)] = path
+        for field_name, field_obj in schema.declared_fields.items():
+            if not hasattr(field_obj, "nested"):
+                continue
+            attribute = SCHEDULING_ATTRIBUTES.get(getattr(resource, "scheduler", None), {}).get(field_name, field_name)
+            value = getattr(resource, attribute, None)
+            if not value:
+                continue
+            if getattr(field_obj, "many", False):
+                update_key = field_obj.metadata.get("update_key")
+                update_key_attribute = next(
+                    (
+                        nested_field.attribute or nested_field_name
+                        for nested_field_name, nested_field in field_obj.schema.declared_fields.items()
+                        if nested_field.data_key == update_key
+                    ),
+                    None,
+                )
+                for item in value:
+                    if isinstance(item, Resource) and update_key_attribute:
+                        item_path = path + (field_obj.data_key, str(getattr(item, update_key_attribute, None)))
+                        self._map_resource_paths(item, field_obj.schema, item_path)
+            elif isinstance(value, Resource):
+                self._map_resource_paths(value, field_obj.schema, path + (field_obj.data_key,))
+
+    def _is_changed(self, path: tuple):
+        return any(path[: len(changed_path)] == changed_path[: len(path)] for changed_path in self._changed_paths)
+
+    def includes(self, *inputs):
+        """
+        Tell if any of the given validator inputs is changed.
+
+        :param inputs: Resources or paths of configuration sections, e.g. "Scheduling.SlurmSettings"
+        """
+        for validator_input in inputs:
+            if isinstance(validator_input, str):
+                path = tuple(validator_input.split("."))
+            else:
+                path = self._resource_paths.get(id(validator_input))
+            # Resources not mapped to the configuration, e.g. created by the validators, are always in scope
+            if path is None or self._is_changed(path):
+                return True
+        return False
@@ -120,6 +120,12 @@ MAX_NUMBER_OF_QUEUES = 50
 MAX_NUMBER_OF_COMPUTE_RESOURCES_PER_CLUSTER = MAX_COMPUTE_RESOURCES_PER_QUEUE = 50
 MIN_SLURM_NODE_PRIORITY = 1
 MAX_SLURM_NODE_PRIORITY = 2**32 - 1  # max value of uint32_t
+# Queues are distributed across nested stacks holding this number of queues on average
+QUEUES_STACK_DEFAULT_SHARD_SIZE = 10
+
+# CloudFormation quotas of a single stack
+CFN_MAX_RESOURCES_PER_STACK = 500
+CFN_MAX_TEMPLATE_SIZE = 1000000  # bytes, for templates uploaded to S3
 
 # Thresholds used to trigger a warning if Memory Based Scheduling and Flexible Instance Types are used together
 MIN_MEMORY_ABSOLUTE_DIFFERENCE = 4096
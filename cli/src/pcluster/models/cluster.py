@@ -16,11 +16,12 @@ import json
 import logging
 import os
 import tempfile
-import time
+from collections import Counter
 from copy import deepcopy
 from datetime import datetime
 from enum import Enum
-from typing import List, Optional, Set, Tuple
+from functools import partial
+from typing import Dict, List, Optional, Set, Tuple
 
 import pkg_resources
 from marshmallow import ValidationError
@@ -52,14 +53,21 @@ from pcluster.models.common import (
     LogStream,
     LogStreams,
     NotFound,
+    StackEventStore,
     create_logs_archive,
     export_stack_events,
     parse_config,
     upload_archive,
 )
-from pcluster.models.compute_fleet_status_manager import ComputeFleetStatus, ComputeFleetStatusManager
+from pcluster.models.compute_fleet_status_manager import (
+    ComputeFleetStatus,
+    ComputeFleetStatusManager,
+    wait_for_status_change,
+)
 from pcluster.models.login_nodes_status import LoginNodesStatus
+from pcluster.models.running_capacity_snapshot import RunningCapacitySnapshot
 from pcluster.models.s3_bucket import S3Bucket, S3BucketFactory, S3FileFormat, create_s3_presigned_url
+from pcluster.models.stage_graph import StageGraph
 from pcluster.schemas.cluster_schema import ClusterSchema
 from pcluster.templates.cdk_builder import CDKTemplateBuilder
 from pcluster.templates.import_cdk import start as start_cdk_import
@@ -76,6 +84,16 @@ from pcluster.validators.common import FailureLevel, ValidationResult, Validator
 
 LOGGER = logging.getLogger(__name__)
 
+# Statuses of a stack whose update, or the rollback of the update, is still running
+STACK_UPDATE_IN_PROGRESS_STATUSES = {
+    "UPDATE_IN_PROGRESS",
+    "UPDATE_COMPLETE_CLEANUP_IN_PROGRESS",
+    "UPDATE_ROLLBACK_IN_PROGRESS",
+    "UPDATE_ROLLBACK_COMPLETE_CLEANUP_IN_PROGRESS",
+}
+# Maximum time (in seconds) to wait for a stack update to terminate
+STACK_UPDATE_TIMEOUT = 3600
+
 # pylint: disable=C0302
 
 
@@ -170,9 +188,7 @@ class Cluster:
         self.__config = None
         self.__s3_artifact_dir = None
         self.__official_ami = None
-        self.__has_running_capacity = None
-        self.__running_capacity = None
-        self.__has_running_login_nodes = None
+        self.__running_capacity_snapshot = None
 
     @property
     def stack(self):
@@ -367,26 +383,13 @@ class Cluster:
                 validator_suppressors, validation_failure_level
             )
 
-            LOGGER.info("Generating artifact dir, uploading config and instance types data...")
+            LOGGER.info("Generating artifact dir, uploading cluster artifacts and generating template...")
             self._add_tags()
             self._generate_artifact_dir()
             artifact_dir_generated = True
-            self._upload_config()
-            self._upload_instance_types_data()
+            assets_metadata = self._upload_artifacts_and_build_template()
             LOGGER.info("Generation and upload completed successfully")
 
-            # Create template if not provided by the user
-            assets_metadata = None
-            if not (self.config.dev_settings and self.config.dev_settings.cluster_template):
-                self.template_body, assets_metadata = CDKTemplateBuilder().build_cluster_template(
-                    cluster_config=self.config, bucket=self.bucket, stack_name=self.stack_name
-                )
-
-            LOGGER.info("Uploading cluster artifacts...")
-            # upload cluster artifacts and generated template
-            self._upload_artifacts()
-            LOGGER.info("Upload of cluster artifacts completed successfully")
-
             LOGGER.info("Creating stack named: %s", self.stack_name)
             asset_parameters = self._generate_asset_parameters(assets_metadata)
             creation_result = AWSApi.instance().cfn.create_stack_from_url(
@@ -475,12 +478,18 @@ class Cluster:
             raise BadRequestClusterActionError(f"Cluster {self.name} already exists.")
 
     def _validate_and_parse_config(
-        self, validator_suppressors, validation_failure_level, config_text=None, context: ValidatorContext = None
+        self,
+        validator_suppressors,
+        validation_failure_level,
+        config_text=None,
+        context: ValidatorContext = None,
+        full_validation: bool = True,
     ):
         """
         Perform syntactic and semantic validation and return parsed config.
 
         :param config_text: config to parse, self.source_config_text will be used if not specified.
+        :param full_validation: during an update, validate the whole config instead of only the changed parts.
         """
         cluster_config_dict = parse_config(config_text or self.source_config_text)
 
@@ -492,6 +501,10 @@ class Cluster:
             if context.during_update:
                 config.managed_head_node_security_group = self.stack.get_resource_physical_id("HeadNodeSecurityGroup")
                 config.managed_compute_security_group = self.stack.get_resource_physical_id("ComputeSecurityGroup")
+                if not full_validation:
+                    context.validation_scope = ConfigPatch(
+                        cluster=self, base_config=self.config.source_config, target_config=config.source_config
+                    ).validation_scope(config)
 
             validation_failures = config.validate(validator_suppressors, context)
             if any(f.level.value >= FailureLevel(validation_failure_level).value for f in validation_failures):
@@ -574,16 +587,51 @@ class Cluster:
                 LOGGER.error(message)
                 raise _cluster_error_mapper(e, message)
 
-    def _upload_artifacts(self):
+    def _upload_artifacts_and_build_template(self, changes=None, log_group_name=None):
         """
-        Upload cluster specific resources and cluster template.
+        Upload the cluster artifacts and generate the cluster template, if not provided by the user.
+
+        The stages run concurrently as long as they do not depend on each other: the template embeds the versions
+        of the uploaded config and instance types data, so its generation waits for these uploads only,
+        while the resources and the change set are uploaded during the generation.
+        Return the metadata of the assets of the generated template.
+        """
+        # Initialize the bucket before sharing it among the stages
+        self._check_bucket_existence()
+        stage_graph = StageGraph("cluster-artifacts")
+        stage_graph.add_stage("upload_config", self._upload_config)
+        stage_graph.add_stage("upload_instance_types_data", self._upload_instance_types_data)
+        stage_graph.add_stage("upload_resources", self._upload_resources)
+        if changes:
+            stage_graph.add_stage("upload_change_set", partial(self._upload_change_set, changes))
+        template_dependencies = []
+        if not (self.config.dev_settings and self.config.dev_settings.cluster_template):
+            stage_graph.add_stage(
+                "build_template",
+                partial(self._build_template, log_group_name),
+                depends_on=["upload_config", "upload_instance_types_data"],
+            )
+            template_dependencies.append("build_template")
+        stage_graph.add_stage("upload_template", self._upload_template, depends_on=template_dependencies)
+        return stage_graph.run().get("build_template")
+
+    def _build_template(self, log_group_name=None):
+        """Generate the cluster template and return the metadata of its assets."""
+        self.template_body, assets_metadata = CDKTemplateBuilder().build_cluster_template(
+            cluster_config=self.config, bucket=self.bucket, stack_name=self.stack_name, log_group_name=log_group_name
+        )
+        return assets_metadata
+
+    def _upload_resources(self):
+        """
+        Upload cluster specific resources.
 
         All dirs contained in resource dir will be uploaded as zip files to
         {bucket_name}/parallelcluster/{version}/clusters/{cluster_name}/{resource_dir}/artifacts.zip.
         All files contained in root dir will be uploaded to
         {bucket_name}/parallelcluster/{version}/clusters/{cluster_name}/{resource_dir}/artifact.
         """
-        LOGGER.info("Uploading cluster artifacts to S3...")
+        LOGGER.info("Uploading cluster resources to S3...")
         self._check_bucket_existence()
         try:
             resources = pkg_resources.resource_filename(__name__, "../resources/custom_resources")
@@ -595,12 +643,7 @@ class Cluster:
                     resource_dir=self.config.scheduler_resources,
                     custom_artifacts_name=PCLUSTER_S3_ARTIFACTS_DICT.get("scheduler_resources_name"),
                 )
-
-            # Upload template
-            if self.template_body:
-                self.bucket.upload_cfn_template(self.template_body, PCLUSTER_S3_ARTIFACTS_DICT.get("template_name"))
-
-            LOGGER.info("Cluster artifacts uploaded correctly.")
+            LOGGER.info("Cluster resources uploaded correctly.")
         except BadRequestClusterActionError:
             raise
         except Exception as e:
@@ -608,6 +651,20 @@ class Cluster:
             LOGGER.error(message)
             raise _cluster_error_mapper(e, message)
 
+    def _upload_template(self):
+        """Upload the cluster template."""
+        if not self.template_body:
+            return
+        self._check_bucket_existence()
+        try:
+            self.bucket.upload_cfn_template(self.template_body, PCLUSTER_S3_ARTIFACTS_DICT.get("template_name"))
+        except BadRequestClusterActionError:
+            raise
+        except Exception as e:
+            message = f"Unable to upload cluster template to the S3 bucket {self.bucket.name} due to exception: {e}"
+            LOGGER.error(message)
+            raise _cluster_error_mapper(e, message)
+
     def delete(self, keep_logs: bool = True):
         """Delete cluster preserving log groups."""
         try:
@@ -624,21 +681,23 @@ class Cluster:
     def _persist_cloudwatch_log_groups(self):
         """Enable cluster's CloudWatch log groups to persist past cluster deletion."""
         LOGGER.info("Configuring %s's CloudWatch log groups to persist past cluster deletion.", self.stack.name)
-        log_group_keys = self._get_unretained_cw_log_group_resource_keys()
+        # The template is retrieved and parsed once, then patched in place
+        template = self._get_stack_template()
+        log_group_keys = self._get_unretained_cw_log_group_resource_keys(template)
         if log_group_keys:  # Only persist the CloudWatch group
-            self._persist_stack_resources(log_group_keys)
+            self._persist_stack_resources(log_group_keys, template)
 
-    def _get_unretained_cw_log_group_resource_keys(self):
+    @staticmethod
+    def _get_unretained_cw_log_group_resource_keys(template):
         """Return the keys to all CloudWatch log group resources in template if the resource is not to be retained."""
         unretained_cw_log_group_keys = []
-        for key, resource in self._get_stack_template().get("Resources", {}).items():
+        for key, resource in template.get("Resources", {}).items():
             if resource.get("Type") == "AWS::Logs::LogGroup" and resource.get("DeletionPolicy") != "Retain":
                 unretained_cw_log_group_keys.append(key)
         return unretained_cw_log_group_keys
 
-    def _persist_stack_resources(self, keys):
+    def _persist_stack_resources(self, keys, template):
         """Set the resources in template identified by keys to have a DeletionPolicy of 'Retain'."""
-        template = self._get_stack_template()
         for key in keys:
             template["Resources"][key]["DeletionPolicy"] = "Retain"
         try:
@@ -649,29 +708,43 @@ class Cluster:
         except AWSClientError as e:
             raise _cluster_error_mapper(e, f"Unable to persist logs on cluster deletion, failed with error: {e}.")
 
-    def _get_updated_stack_status(self):
-        """Return updated status of the stack."""
+    def _get_last_stack_event(self):
+        """Return the most recent event of the stack itself."""
         try:
-            return AWSApi.instance().cfn.describe_stack(self.stack_name).get("StackStatus")
+            return StackEventStore.get(self.stack_name).find_stack_event()
         except AWSClientError as e:
             raise _cluster_error_mapper(e, f"Unable to retrieve status of stack {self.stack_name}. {e}")
 
     def _update_stack_template(self, template_url):
         """Update template of the running stack according to updated template."""
         try:
+            previous_stack_event = self._get_last_stack_event()
             AWSApi.instance().cfn.update_stack_from_url(self.stack_name, template_url)
-            self._wait_for_stack_update()
+            self._wait_for_stack_update(previous_stack_event)
         except AWSClientError as e:
             if "no updates are to be performed" in str(e).lower():
                 return  # If updated_template was the same as the stack's current one, consider the update a success
             raise e
 
-    def _wait_for_stack_update(self):
-        """Wait for the given stack to be finished updating."""
-        while self._get_updated_stack_status() == "UPDATE_IN_PROGRESS":
-            time.sleep(5)
-        while self._get_updated_stack_status() == "UPDATE_COMPLETE_CLEANUP_IN_PROGRESS":
-            time.sleep(2)
+    def _wait_for_stack_update(self, previous_stack_event=None):
+        """
+        Wait for the given stack to be finished updating.
+
+        The status is taken from the new events of the stack, polled with an increasing interval, so that
+        quick updates are detected right away. The events preceding the update request are ignored.
+        """
+        previous_event_id = previous_stack_event.get("EventId") if previous_stack_event else None
+
+        def _get_update_status():
+            stack_event = self._get_last_stack_event()
+            if not stack_event or stack_event.get("EventId") == previous_event_id:
+                return "UPDATE_IN_PROGRESS"  # The update has not been recorded yet
+            return stack_event.get("ResourceStatus")
+
+        status = wait_for_status_change(
+            _get_update_status, STACK_UPDATE_IN_PROGRESS_STATUSES, timeout=STACK_UPDATE_TIMEOUT
+        )
+        LOGGER.info("Update of stack %s terminated with status %s", self.stack_name, status)
 
     def _get_stack_template(self):
         """Return the template body of the stack."""
@@ -703,6 +776,16 @@ class Cluster:
         instances, _ = self.describe_instances(node_type=NodeType.COMPUTE)
         return instances
 
+    def get_compute_instances_per_queue(self) -> Dict[str, int]:
+        """Return the number of compute instances of each queue, going through all the pages of instances."""
+        instances_per_queue = Counter()
+        next_token = None
+        while True:
+            instances, next_token = self.describe_instances(node_type=NodeType.COMPUTE, next_token=next_token)
+            instances_per_queue.update(instance.queue_name for instance in instances)
+            if not next_token:
+                return dict(instances_per_queue)
+
     @property
     def head_node_instance(self) -> ClusterInstance:
         """Get head node instance."""
@@ -743,42 +826,39 @@ class Cluster:
         except AWSClientError as e:
             raise _cluster_error_mapper(e, f"Failed to retrieve cluster instances. {e}")
 
+    @property
+    def running_capacity_snapshot(self) -> RunningCapacitySnapshot:
+        """Return the snapshot of the running capacity, taken on first access and kept until refreshed."""
+        if not self.__running_capacity_snapshot:
+            self.refresh_running_capacity_snapshot()
+        return self.__running_capacity_snapshot
+
+    def refresh_running_capacity_snapshot(self) -> RunningCapacitySnapshot:
+        """Take a new snapshot of the running capacity, retrieving again the values on first use."""
+        self.__running_capacity_snapshot = RunningCapacitySnapshot(self)
+        return self.__running_capacity_snapshot
+
     def has_running_capacity(self, updated_value: bool = False) -> bool:
-        """Return True if the cluster has running capacity. Note: the value will be cached."""
-        if self.__has_running_capacity is None or updated_value:
-            if self.stack.scheduler == "awsbatch":
-                self.__has_running_capacity = self.get_running_capacity() > 0
-            else:
-                self.__has_running_capacity = (
-                    self.compute_fleet_status_manager.get_status() != ComputeFleetStatus.STOPPED
-                )
-        return self.__has_running_capacity
+        """Return True if the cluster has running capacity. Note: the value is taken from the snapshot."""
+        if updated_value:
+            self.refresh_running_capacity_snapshot()
+        return self.running_capacity_snapshot.has_running_capacity
 
     def has_running_login_nodes(self, updated_value: bool = False, pool_name: str = None) -> bool:
         """
         Return True if the cluster has running login nodes, or a specific pool if a pool name is provided.
 
-        Note: the value will be cached.
+        Note: the value is taken from the snapshot.
         """
-        healthy_nodes = self.login_nodes_status.get_healthy_nodes(pool_name=pool_name)
-        unhealthy_nodes = self.login_nodes_status.get_unhealthy_nodes(pool_name=pool_name)
-
-        if self.__has_running_login_nodes is None or updated_value:
-            self.__has_running_login_nodes = (
-                healthy_nodes is not None and unhealthy_nodes is not None and healthy_nodes + unhealthy_nodes != 0
-            )
-        return self.__has_running_login_nodes
+        if updated_value:
+            self.refresh_running_capacity_snapshot()
+        return self.running_capacity_snapshot.has_running_login_nodes(pool_name=pool_name)
 
     def get_running_capacity(self, updated_value: bool = False):
-        """Return the number of instances or desired capacity. Note: the value will be cached."""
-        if self.__running_capacity is None or updated_value:
-            if self.stack.scheduler == "slurm":
-                self.__running_capacity = len(self.compute_instances)
-            elif self.stack.scheduler == "awsbatch":
-                self.__running_capacity = AWSApi.instance().batch.get_compute_environment_capacity(
-                    ce_name=self.stack.batch_compute_environment
-                )
-        return self.__running_capacity
+        """Return the number of instances or desired capacity. Note: the value is taken from the snapshot."""
+        if updated_value:
+            self.refresh_running_capacity_snapshot()
+        return self.running_capacity_snapshot.running_capacity
 
     def start(self):
         """Start the cluster."""
@@ -793,6 +873,8 @@ class Cluster:
                 self.enable_awsbatch_compute_environment()
             else:  # traditional scheduler
                 self.start_compute_fleet()
+            # The running capacity changes with the compute fleet
+            self.__running_capacity_snapshot = None
         except ComputeFleetStatusManager.ConditionalStatusUpdateFailed:
             raise BadRequestClusterActionError(
                 "Failed when starting compute fleet due to a concurrent update of the status. "
@@ -835,6 +917,8 @@ class Cluster:
                 self.disable_awsbatch_compute_environment()
             else:  # traditional scheduler
                 self.stop_compute_fleet()
+            # The running capacity changes with the compute fleet
+            self.__running_capacity_snapshot = None
         except ComputeFleetStatusManager.ConditionalStatusUpdateFailed:
             raise BadRequestClusterActionError(
                 "Failed when stopping compute fleet due to a concurrent update of the status. "
@@ -863,8 +947,14 @@ class Cluster:
         validator_suppressors: Set[ValidatorSuppressor] = None,
         validation_failure_level: FailureLevel = FailureLevel.ERROR,
         force: bool = False,
+        full_validation: bool = False,
     ):
-        """Validate a cluster update request."""
+        """
+        Validate a cluster update request.
+
+        Unless full_validation is set, only the validators taking their inputs from the changed parts of the config
+        are executed.
+        """
         self._validate_cluster_exists()
         self._validate_stack_status_not_in_progress()
         target_config, ignored_validation_failures = self._validate_and_parse_config(
@@ -872,12 +962,15 @@ class Cluster:
             validation_failure_level=validation_failure_level,
             config_text=target_source_config,
             context=ValidatorContext(head_node_instance_id=self.head_node_instance.id, during_update=True),
+            full_validation=full_validation,
         )
         changes = self._validate_patch(force, target_config)
 
         return target_config, changes, ignored_validation_failures
 
     def _validate_patch(self, force, target_config):
+        # The update policies of all the changes are checked against the same snapshot of the running capacity
+        self.refresh_running_capacity_snapshot()
         patch = ConfigPatch(
             cluster=self, base_config=self.config.source_config, target_config=target_config.source_config
         )
@@ -903,6 +996,7 @@ class Cluster:
         validator_suppressors: Set[ValidatorSuppressor] = None,
         validation_failure_level: FailureLevel = FailureLevel.ERROR,
         force: bool = False,
+        full_validation: bool = False,
     ):
         """
         Update cluster.
@@ -914,29 +1008,16 @@ class Cluster:
         start_cdk_import()
         try:
             target_config, changes, ignored_validation_failures = self.validate_update_request(
-                target_source_config, validator_suppressors, validation_failure_level, force
+                target_source_config, validator_suppressors, validation_failure_level, force, full_validation
             )
 
             self.config = target_config
             self.__source_config_text = target_source_config
 
             self._add_tags()
-            self._upload_config()
-            self._upload_instance_types_data()
-            self._upload_change_set(changes)
-
-            # Create template if not provided by the user
-            assets_metadata = None
-            if not (self.config.dev_settings and self.config.dev_settings.cluster_template):
-                self.template_body, assets_metadata = CDKTemplateBuilder().build_cluster_template(
-                    cluster_config=self.config,
-                    bucket=self.bucket,
-                    stack_name=self.stack_name,
-                    log_group_name=self.stack.log_group_name,
-                )
-
-            # upload cluster artifacts and generated template
-            self._upload_artifacts()
+            assets_metadata = self._upload_artifacts_and_build_template(
+                changes=changes, log_group_name=self.stack.log_group_name
+            )
 
             asset_parameters = self._generate_asset_parameters(assets_metadata)
 
@@ -9,7 +9,6 @@
 # OR CONDITIONS OF ANY KIND, express or implied. See the License for the specific language governing permissions and
 # limitations under the License.
 import datetime
-import itertools
 import re
 from dataclasses import dataclass
 from typing import List
@@ -17,7 +16,7 @@ from typing import List
 from pcluster.aws.aws_api import AWSApi
 from pcluster.aws.aws_resources import InstanceInfo, StackInfo
 from pcluster.constants import CW_LOGS_CFN_PARAM_NAME, OS_MAPPING, PCLUSTER_NODE_TYPE_TAG, PCLUSTER_VERSION_TAG
-from pcluster.models.common import FiltersParserError, LogGroupTimeFiltersParser, get_all_stack_events
+from pcluster.models.common import FiltersParserError, LogGroupTimeFiltersParser, StackEventStore
 
 
 class ClusterStack(StackInfo):
@@ -92,8 +91,7 @@ class ClusterStack(StackInfo):
                 return True
             return False
 
-        stack_events = list(itertools.chain.from_iterable(get_all_stack_events(self.name)))
-        failure_event = next(filter(_is_failed_wait, stack_events), None)
+        failure_event = StackEventStore.get(self.name).find(_is_failed_wait)
         return failure_event.get("ResourceStatusReason") if failure_event else None
 
     def get_cluster_creation_failure(self):
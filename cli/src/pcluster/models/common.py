@@ -15,7 +15,9 @@ import logging
 import os
 import os.path
 import tarfile
+import threading
 import time
+from collections import OrderedDict
 from typing import List
 
 import configparser
@@ -245,23 +247,147 @@ class CloudWatchLogsExporter:
             os.remove(compressed_path)
 
 
+class StackEventStore:
+    """
+    Process-wide, incremental store of the events of a CloudFormation stack.
+
+    Events are kept newest first, as returned by CloudFormation. Every scan fetches only the events newer than the
+    last seen one, then walks the known events and loads the older pages only when the scan goes past them,
+    so that looking for a recent event does not require to retrieve the whole stack history.
+    """
+
+    MAX_STORES = 32
+    _stores = OrderedDict()
+    _stores_lock = threading.Lock()
+
+    def __init__(self, stack_name: str):
+        self.stack_name = stack_name
+        self._events = []
+        self._older_events_token = None
+        self._initialized = False
+        # Number of events added on top of the store, used by the ongoing scans to keep their position.
+        self._newer_events_count = 0
+        self._lock = threading.RLock()
+
+    @classmethod
+    def get(cls, stack_name: str) -> "StackEventStore":
+        """Return the event store of the given stack in the current region, creating it if needed."""
+        key = (get_region(), stack_name)
+        with cls._stores_lock:
+            store = cls._stores.get(key)
+            if store:
+                cls._stores.move_to_end(key)
+            else:
+                store = cls._stores[key] = StackEventStore(stack_name)
+                while len(cls._stores) > cls.MAX_STORES:
+                    cls._stores.popitem(last=False)
+            return store
+
+    @classmethod
+    def clear_all(cls):
+        """Remove all the event stores."""
+        with cls._stores_lock:
+            cls._stores.clear()
+
+    @staticmethod
+    def _event_id(event):
+        return event.get("EventId")
+
+    def refresh(self):
+        """Fetch the events generated since the last seen event."""
+        with self._lock:
+            if not self._initialized:
+                self._load_page(AWSApi.instance().cfn.get_stack_events(self.stack_name))
+                self._initialized = True
+                return
+
+            last_seen_event_id = self._event_id(self._events[0]) if self._events else None
+            newer_events = []
+            next_token = None
+            while True:
+                chunk = AWSApi.instance().cfn.get_stack_events(self.stack_name, next_token=next_token)
+                for event in chunk["StackEvents"]:
+                    if last_seen_event_id and self._event_id(event) == last_seen_event_id:
+                        self._add_newer_events(newer_events)
+                        return
+                    newer_events.append(event)
+                next_token = chunk.get("nextToken")
+                if not next_token:
+                    break
+            # The last seen event is no longer part of the history, e.g. the stack has been recreated.
+            LOGGER.debug("Reloading all the events of stack %s", self.stack_name)
+            self._events = newer_events
+            self._older_events_token = None
+            self._newer_events_count += len(newer_events)
+
+    def _add_newer_events(self, newer_events):
+        if newer_events:
+            LOGGER.debug("Found %s new events for stack %s", len(newer_events), self.stack_name)
+            self._events = newer_events + self._events
+            self._newer_events_count += len(newer_events)
+
+    def _load_page(self, chunk):
+        self._events = self._events + chunk["StackEvents"]
+        self._older_events_token = chunk.get("nextToken")
+
+    def _load_older_events(self):
+        """Load the next page of older events. Return False if the whole history has been already loaded."""
+        if not self._older_events_token:
+            return False
+        self._load_page(AWSApi.instance().cfn.get_stack_events(self.stack_name, next_token=self._older_events_token))
+        return True
+
+    def iter_events(self):
+        """Iterate lazily over all the events of the stack, from the newest to the oldest one."""
+        self.refresh()
+        with self._lock:
+            newer_events_count = self._newer_events_count
+        index = 0
+        while True:
+            with self._lock:
+                # Skip the events added by concurrent refreshes after the beginning of the scan.
+                index += self._newer_events_count - newer_events_count
+                newer_events_count = self._newer_events_count
+                if index >= len(self._events) and not self._load_older_events():
+                    return
+                if index >= len(self._events):
+                    continue
+                event = self._events[index]
+            index += 1
+            yield event
+
+    def find(self, predicate):
+        """Return the most recent event matching the given predicate, without scanning the older events."""
+        return next(filter(predicate, self.iter_events()), None)
+
+    def find_stack_event(self):
+        """Return the most recent event of the stack itself, whose status is the status of the stack."""
+        return self.find(
+            lambda event: event.get("ResourceType") == "AWS::CloudFormation::Stack"
+            and event.get("LogicalResourceId") == self.stack_name
+        )
+
+    def write_json(self, output_file: str):
+        """Write all the events to the given file as a JSON list, one event at a time."""
+        with open(output_file, "w", encoding="utf-8") as events_file:
+            events_file.write("[")
+            empty = True
+            for event in self.iter_events():
+                events_file.write("\n  " if empty else ",\n  ")
+                # JSON strings cannot contain raw newlines, so the event can be safely indented line by line.
+                events_file.write(json.dumps(event, cls=JSONEncoder, indent=2).replace("\n", "\n  "))
+                empty = False
+            events_file.write("]" if empty else "\n]")
+
+
 def get_all_stack_events(stack_name: str):
-    """Retrieve all stack events."""
-    stack_events = []
-    chunk = AWSApi.instance().cfn.get_stack_events(stack_name)
-    stack_events.append(chunk["StackEvents"])
-    while chunk.get("nextToken"):
-        chunk = AWSApi.instance().cfn.get_stack_events(stack_name, next_token=chunk["nextToken"])
-        stack_events.append(chunk["StackEvents"])
-    return stack_events
+    """Retrieve all stack events, from the newest to the oldest one."""
+    return list(StackEventStore.get(stack_name).iter_events())
 
 
 def export_stack_events(stack_name: str, output_file: str):
     """Save CFN stack events into a file."""
-    stack_events = get_all_stack_events(stack_name)
-
-    with open(output_file, "w", encoding="utf-8") as cfn_events_file:
-        cfn_events_file.write(json.dumps(stack_events, cls=JSONEncoder, indent=2))
+    StackEventStore.get(stack_name).write_json(output_file)
 
 
 def create_logs_archive(directory: str, output_file: str = None):
@@ -13,6 +13,7 @@ import time
 from abc import ABCMeta, abstractmethod
 from datetime import datetime, timezone
 from enum import Enum
+from typing import Callable, Iterable
 
 from boto3.dynamodb.conditions import Attr
 from pkg_resources import packaging
@@ -23,6 +24,12 @@ from pcluster.constants import PCLUSTER_DYNAMODB_PREFIX
 
 LOGGER = logging.getLogger(__name__)
 
+# Polling intervals (in seconds) used when waiting for a compute fleet status transition.
+# Status is polled frequently right after the request, then less and less often.
+MIN_POLL_INTERVAL = 1
+MAX_POLL_INTERVAL = 15
+POLL_BACKOFF_FACTOR = 1.5
+
 
 class ComputeFleetStatus(Enum):
     """Represents the status of the cluster compute fleet."""
@@ -63,6 +70,34 @@ class ComputeFleetStatus(Enum):
         return status in {ComputeFleetStatus.START_REQUESTED, ComputeFleetStatus.STARTING, ComputeFleetStatus.RUNNING}
 
 
+def wait_for_status_change(
+    get_status: Callable,
+    wait_on_statuses: Iterable,
+    timeout: float,
+    min_interval: float = MIN_POLL_INTERVAL,
+    max_interval: float = MAX_POLL_INTERVAL,
+):
+    """
+    Poll get_status until it returns a status not in wait_on_statuses and return it.
+
+    The polling interval starts at min_interval and grows by POLL_BACKOFF_FACTOR up to max_interval,
+    so that quick transitions are noticed right away while long ones do not generate too many calls.
+    A TimeoutError is raised if the status does not change within timeout seconds.
+    """
+    wait_on_statuses = set(wait_on_statuses)
+    start_time = time.time()
+    interval = min(min_interval, max_interval)
+    while True:
+        current_status = get_status()
+        if current_status not in wait_on_statuses:
+            return current_status
+        remaining_time = timeout - (time.time() - start_time)
+        if remaining_time <= 0:
+            raise TimeoutError("Timeout expired while waiting for status transition.")
+        time.sleep(min(interval, remaining_time))
+        interval = min(interval * POLL_BACKOFF_FACTOR, max_interval)
+
+
 class ComputeFleetStatusManager(metaclass=ABCMeta):
     """Implement functionalities to retrieve and update the compute fleet status."""
 
@@ -79,24 +114,23 @@ class ComputeFleetStatusManager(metaclass=ABCMeta):
         status, _ = self.get_status_with_last_updated_time(status_fallback=fallback)
         return status
 
-    def _wait_for_status_transition(self, wait_on_status, timeout=300, retry_every_seconds=15):
-        current_status = self.get_status()
-        start_time = time.time()
-        while current_status == wait_on_status and not self._timeout_expired(start_time, timeout):
-            current_status = self.get_status()
-            time.sleep(retry_every_seconds)
+    def _wait_for_status_transition(self, wait_on_status, timeout=300, max_poll_interval=MAX_POLL_INTERVAL):
+        return wait_for_status_change(self.get_status, {wait_on_status}, timeout, max_interval=max_poll_interval)
 
-        if current_status == wait_on_status:
-            raise TimeoutError("Timeout expired while waiting for status transition.")
-
-        return current_status
-
-    def update_status(self, request_status, in_progress_status, final_status, wait_transition=False):
+    def update_status(
+        self,
+        request_status,
+        in_progress_status,
+        final_status,
+        wait_transition=False,
+        max_poll_interval=MAX_POLL_INTERVAL,
+    ):
         """
         Update the status of the compute fleet and wait for a status transition.
 
         It updates the status of the fleet to request_status and then waits for it to be updated to final_status,
-        by eventually transitioning through in_progress_status
+        by eventually transitioning through in_progress_status.
+        The status is polled with an increasing interval capped to max_poll_interval seconds.
         """
         compute_fleet_status = self.get_status()
         if compute_fleet_status == ComputeFleetStatus.UNKNOWN:
@@ -116,12 +150,16 @@ class ComputeFleetStatusManager(metaclass=ABCMeta):
             return
 
         LOGGER.info("Submitted compute fleet status transition request. Waiting for status update to start...")
-        compute_fleet_status = self._wait_for_status_transition(wait_on_status=request_status, timeout=180)
+        compute_fleet_status = self._wait_for_status_transition(
+            wait_on_status=request_status, timeout=180, max_poll_interval=max_poll_interval
+        )
         if compute_fleet_status == in_progress_status:
             LOGGER.info(
                 "Compute fleet status transition is in progress. This operation might take a while to complete..."
             )
-            compute_fleet_status = self._wait_for_status_transition(wait_on_status=in_progress_status, timeout=600)
+            compute_fleet_status = self._wait_for_status_transition(
+                wait_on_status=in_progress_status, timeout=600, max_poll_interval=max_poll_interval
+            )
 
         if compute_fleet_status != final_status:
             raise Exception(
@@ -151,10 +189,6 @@ class ComputeFleetStatusManager(metaclass=ABCMeta):
         else:
             return JsonComputeFleetStatusManager(cluster_name)
 
-    @staticmethod
-    def _timeout_expired(start_time, timeout):
-        return (time.time() - start_time) > timeout
-
 
 class JsonComputeFleetStatusManager(ComputeFleetStatusManager):
     """
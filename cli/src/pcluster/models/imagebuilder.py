@@ -18,14 +18,16 @@ import os
 import os.path
 import re
 import tempfile
-from datetime import datetime
-from typing import Set
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Set, Tuple
 
 import pkg_resources
 from marshmallow.exceptions import ValidationError
 
 from pcluster.aws.aws_api import AWSApi
-from pcluster.aws.aws_resources import ImageInfo
+from pcluster.aws.aws_resources import ImageInfo, StackInfo
 from pcluster.aws.common import (
     AWSClientError,
     BadRequestError,
@@ -34,6 +36,7 @@ from pcluster.aws.common import (
     StackNotFoundError,
     get_region,
 )
+from pcluster.aws.ec2 import ImageListCache
 from pcluster.config.common import BaseTag, ValidatorSuppressor
 from pcluster.constants import (
     IMAGEBUILDER_RESOURCE_NAME_PREFIX,
@@ -73,7 +76,13 @@ from pcluster.models.imagebuilder_resources import (
 from pcluster.models.s3_bucket import S3Bucket, S3BucketFactory, S3FileFormat, create_s3_presigned_url
 from pcluster.schemas.imagebuilder_schema import ImageBuilderSchema
 from pcluster.templates.cdk_builder import CDKTemplateBuilder
-from pcluster.utils import datetime_to_epoch, generate_random_name_with_prefix, get_installed_version, get_partition
+from pcluster.utils import (
+    datetime_to_epoch,
+    generate_random_name_with_prefix,
+    get_installed_version,
+    get_partition,
+    to_utc_datetime,
+)
 from pcluster.validators.common import FailureLevel, ValidationResult
 
 ImageBuilderStatusMapping = {
@@ -105,6 +114,28 @@ ImageBuilderStatusMapping = {
 
 LOGGER = logging.getLogger(__name__)
 
+# Maximum number of concurrent requests used to delete the resources of an image
+DELETE_MAX_WORKERS = 8
+# Maximum number of images deleted concurrently by the image garbage collector
+GC_MAX_WORKERS = 4
+
+
+class ImageGarbageStatus:
+    """Statuses of the images that can be garbage collected."""
+
+    AVAILABLE = "AVAILABLE"
+    FAILED = "FAILED"
+
+
+class ImageGarbageAction:
+    """Outcomes of the garbage collection of an image."""
+
+    DELETED = "DELETED"
+    WOULD_DELETE = "WOULD_DELETE"
+    SKIPPED_IN_USE = "SKIPPED_IN_USE"
+    SKIPPED_SHARED = "SKIPPED_SHARED"
+    FAILED = "FAILED"
+
 
 class ImageBuilderActionError(Exception):
     """Represent an error during the execution of an action on the imagebuilder."""
@@ -542,9 +573,9 @@ class ImageBuilder:
                 f"Unable to upload imagebuilder cfn template to the S3 bucket {self.bucket.name} due to exception: {e}",
             )
 
-    def delete(self, force=False):  # noqa: C901
+    def delete(self, force=False):
         """Delete CFN Stack and associate resources and deregister the image."""
-        if force or (not self._check_instance_using_image() and not self._check_image_is_shared()):
+        if force or not self._check_image_in_use_or_shared():
             try:
                 if AWSApi.instance().cfn.stack_exists(self.image_id):
                     if self.stack.imagebuilder_image_is_building:
@@ -554,39 +585,60 @@ class ImageBuilder:
                     # Delete stack
                     AWSApi.instance().cfn.delete_stack(self.image_id)
 
+                # Resolve the image before starting the concurrent deletions,
+                # S3 artifacts deletion relies on the image tags to find the bucket.
+                image = None
                 if AWSApi.instance().ec2.image_exists(image_id=self.image_id):
-                    # Deregister image
-                    AWSApi.instance().ec2.deregister_image(self.image.id)
-
-                    # Delete snapshot
-                    for snapshot_id in self.image.snapshot_ids:
-                        AWSApi.instance().ec2.delete_snapshot(snapshot_id)
+                    image = self.image
                 elif AWSApi.instance().ec2.failed_image_exists(image_id=self.image_id):
-                    # Deregister image
-                    AWSApi.instance().ec2.deregister_image(self.failed_image.id)
-
-                    # Delete snapshot
-                    for snapshot_id in self.failed_image.snapshot_ids:
-                        AWSApi.instance().ec2.delete_snapshot(snapshot_id)
-
-                # Delete s3 image directory
-                try:
-                    self.bucket.check_bucket_exists()
-                    self.bucket.delete_s3_artifacts()
-                except AWSClientError:
-                    logging.warning(
-                        "S3 bucket associated to the image does not exist, skip image s3 artifacts deletion."
-                    )
-
-                # Delete log group
-                try:
-                    AWSApi.instance().logs.delete_log_group(self._log_group_name)
-                except AWSClientError:
-                    logging.warning("Unable to delete log group %s.", self._log_group_name)
+                    image = self.failed_image
+
+                with ThreadPoolExecutor(max_workers=DELETE_MAX_WORKERS) as executor:
+                    deletions = [executor.submit(self._delete_s3_artifacts), executor.submit(self._delete_log_group)]
+                    if image:
+                        # Snapshots can be deleted only once the image has been deregistered
+                        AWSApi.instance().ec2.deregister_image(image.id)
+                        deletions.extend(
+                            executor.submit(AWSApi.instance().ec2.delete_snapshot, snapshot_id)
+                            for snapshot_id in image.snapshot_ids
+                        )
+                    for deletion in deletions:
+                        deletion.result()
+                # Stop serving the deleted image from the cached list of images
+                ImageListCache.invalidate(get_region())
 
             except (AWSClientError, ImageError) as e:
                 raise _imagebuilder_error_mapper(e, f"Unable to delete image and stack, due to {str(e)}")
 
+    def _delete_s3_artifacts(self):
+        """Delete s3 image directory."""
+        try:
+            self.bucket.check_bucket_exists()
+            self.bucket.delete_s3_artifacts()
+        except AWSClientError:
+            logging.warning("S3 bucket associated to the image does not exist, skip image s3 artifacts deletion.")
+
+    def _delete_log_group(self):
+        """Delete the image builder log group."""
+        try:
+            AWSApi.instance().logs.delete_log_group(self._log_group_name)
+        except AWSClientError:
+            logging.warning("Unable to delete log group %s.", self._log_group_name)
+
+    def _check_image_in_use_or_shared(self):
+        """Check concurrently if the image is used by instances or shared with other accounts."""
+        try:
+            # Describe the image once, before the concurrent checks read it
+            _ = self.image
+        except (AWSClientError, ImageError) as e:
+            if isinstance(e, NonExistingImageError):
+                return False
+            raise _imagebuilder_error_mapper(e, f"Unable to delete image and stack, due to {str(e)}")
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            checks = [executor.submit(self._check_instance_using_image), executor.submit(self._check_image_is_shared)]
+            return any(check.result() for check in checks)
+
     def _check_image_is_shared(self):
         """Check the image is shared with other account."""
         try:
@@ -836,3 +888,125 @@ class ImageBuilder:
     def _stack_events_stream_name(self):
         """Return the name of the stack events log stream."""
         return STACK_EVENTS_LOG_STREAM_NAME_FORMAT.format(self.image_id)
+
+
+@dataclass(frozen=True)
+class ImageRetentionPolicy:
+    """
+    Policy selecting the images to be garbage collected.
+
+    An image is selected when it matches all the given criteria.
+    """
+
+    older_than_days: int = None
+    versions: Tuple[str, ...] = ()
+    statuses: Tuple[str, ...] = (ImageGarbageStatus.AVAILABLE, ImageGarbageStatus.FAILED)
+
+    def matches(self, status: str, creation_time: datetime, version: str, now: datetime):
+        """Tell if an image with the given status, creation time and version must be garbage collected."""
+        if status not in self.statuses:
+            return False
+        if self.versions and version not in self.versions:
+            return False
+        return self.older_than_days is None or now - creation_time >= timedelta(days=self.older_than_days)
+
+
+class ImageGarbageCollector:
+    """
+    Delete in bulk the images selected by a retention policy.
+
+    Available images are listed with a single paginated DescribeImages sweep, failed images from the imagebuilder stacks
+    and the images used by instances with a single paginated DescribeInstances sweep.
+    Images are then deleted in parallel, the client-side rate limiter paces the requests sent to each service.
+    """
+
+    def __init__(self, policy: ImageRetentionPolicy, force: bool = False, max_workers: int = GC_MAX_WORKERS):
+        self.policy = policy
+        self.force = force
+        self.max_workers = max_workers
+
+    def collect(self, dry_run: bool = False):
+        """
+        Delete the images selected by the retention policy.
+
+        :param dry_run: only report the images that would be deleted
+        :return: the list of the selected images, with the outcome of the garbage collection for each of them
+        """
+        candidates = self._get_candidates()
+        in_use_image_ids = AWSApi.instance().ec2.get_in_use_image_ids() if candidates else set()
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            return list(
+                executor.map(lambda candidate: self._collect_image(candidate, in_use_image_ids, dry_run), candidates)
+            )
+
+    def _get_candidates(self):
+        """Return the images and the failed image builds selected by the retention policy."""
+        now = datetime.now(tz=timezone.utc)
+        candidates = {}
+        if ImageGarbageStatus.AVAILABLE in self.policy.statuses:
+            for image in AWSApi.instance().ec2.get_images():
+                creation_time = to_utc_datetime(image.creation_date)
+                if self.policy.matches(ImageGarbageStatus.AVAILABLE, creation_time, image.version, now):
+                    candidates[image.pcluster_image_id] = _ImageGarbage(
+                        image.pcluster_image_id, ImageGarbageStatus.AVAILABLE, creation_time, image.version, image=image
+                    )
+
+        if ImageGarbageStatus.FAILED in self.policy.statuses:
+            failed_states = ImageBuilderStatusMapping["BUILD_FAILED"] + ImageBuilderStatusMapping["DELETE_FAILED"]
+            next_token = None
+            while True:
+                stacks, next_token = AWSApi.instance().cfn.get_imagebuilder_stacks(next_token=next_token)
+                for stack_data in stacks:
+                    stack = StackInfo(stack_data)
+                    image_id = stack.get_tag(PCLUSTER_IMAGE_ID_TAG)
+                    creation_time = to_utc_datetime(stack.creation_time)
+                    version = stack.get_tag(PCLUSTER_VERSION_TAG)
+                    if (
+                        stack.status in failed_states
+                        and image_id not in candidates
+                        and self.policy.matches(ImageGarbageStatus.FAILED, creation_time, version, now)
+                    ):
+                        candidates[image_id] = _ImageGarbage(
+                            image_id, ImageGarbageStatus.FAILED, creation_time, version, stack_data=stack_data
+                        )
+                if not next_token:
+                    break
+
+        return sorted(candidates.values(), key=lambda candidate: candidate.creation_time)
+
+    def _collect_image(self, candidate, in_use_image_ids, dry_run):
+        """Delete a single image, unless it is used by instances or shared, and return its report."""
+        report = {
+            "imageId": candidate.image_id,
+            "imageBuildStatus": candidate.status,
+            "creationTime": candidate.creation_time.isoformat(),
+            "version": candidate.version,
+        }
+        try:
+            if candidate.image:
+                report["ec2AmiId"] = candidate.image.id
+                if candidate.image.id in in_use_image_ids:
+                    return {**report, "action": ImageGarbageAction.SKIPPED_IN_USE}
+                if not self.force and AWSApi.instance().ec2.get_image_shared_account_ids(candidate.image.id):
+                    return {**report, "action": ImageGarbageAction.SKIPPED_SHARED}
+            if dry_run:
+                return {**report, "action": ImageGarbageAction.WOULD_DELETE}
+
+            stack = ImageBuilderStack(candidate.stack_data) if candidate.stack_data else None
+            ImageBuilder(image=candidate.image, image_id=candidate.image_id, stack=stack).delete(force=True)
+            return {**report, "action": ImageGarbageAction.DELETED}
+        except Exception as e:
+            LOGGER.error("Unable to delete image %s: %s", candidate.image_id, e)
+            return {**report, "action": ImageGarbageAction.FAILED, "reason": str(e)}
+
+
+@dataclass
+class _ImageGarbage:
+    """Image selected by the retention policy."""
+
+    image_id: str
+    status: str
+    creation_time: datetime
+    version: str
+    image: ImageInfo = None
+    stack_data: dict = None
@@ -0,0 +1,88 @@
+# Copyright 2024 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"). You may not use this file except in compliance
+# with the License. A copy of the License is located at
+#
+# http://aws.amazon.com/apache2.0/
+#
+# or in the "LICENSE.txt" file accompanying this file. This file is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES
+# OR CONDITIONS OF ANY KIND, express or implied. See the License for the specific language governing permissions and
+# limitations under the License.
+from typing import Dict
+
+from pcluster.aws.aws_api import AWSApi
+from pcluster.models.compute_fleet_status_manager import ComputeFleetStatus
+from pcluster.models.login_nodes_status import LoginNodesStatus
+
+_NOT_RETRIEVED = object()
+
+
+class RunningCapacitySnapshot:
+    """
+    Snapshot of the running capacity of a cluster: compute fleet status, compute instances per queue and login nodes.
+
+    Each part of the snapshot is retrieved once, the first time it is needed, and then kept:
+    all the checks done on the same snapshot, e.g. by the update policies, see the same values
+    without repeating the calls. A new snapshot must be taken to see the changes of the cluster.
+    """
+
+    def __init__(self, cluster):
+        self._cluster = cluster
+        self._compute_fleet_status = _NOT_RETRIEVED
+        self._instances_per_queue = _NOT_RETRIEVED
+        self._batch_capacity = _NOT_RETRIEVED
+        self._login_nodes_status = _NOT_RETRIEVED
+
+    @property
+    def scheduler(self) -> str:
+        """Return the scheduler of the cluster."""
+        return self._cluster.stack.scheduler
+
+    @property
+    def compute_fleet_status(self) -> ComputeFleetStatus:
+        """Return the status of the compute fleet, None for clusters without a compute fleet status."""
+        if self._compute_fleet_status is _NOT_RETRIEVED:
+            self._compute_fleet_status = (
+                None if self.scheduler == "awsbatch" else self._cluster.compute_fleet_status_manager.get_status()
+            )
+        return self._compute_fleet_status
+
+    @property
+    def instances_per_queue(self) -> Dict[str, int]:
+        """Return the number of compute instances of each queue, retrieved with a single sweep of the instances."""
+        if self._instances_per_queue is _NOT_RETRIEVED:
+            self._instances_per_queue = self._cluster.get_compute_instances_per_queue()
+        return self._instances_per_queue
+
+    @property
+    def running_capacity(self) -> int:
+        """Return the number of compute instances, or the desired capacity of the compute environment for awsbatch."""
+        if self.scheduler == "awsbatch":
+            if self._batch_capacity is _NOT_RETRIEVED:
+                self._batch_capacity = AWSApi.instance().batch.get_compute_environment_capacity(
+                    ce_name=self._cluster.stack.batch_compute_environment
+                )
+            return self._batch_capacity
+        if self.scheduler == "slurm":
+            return sum(self.instances_per_queue.values())
+        return None
+
+    @property
+    def has_running_capacity(self) -> bool:
+        """Return True if the cluster has running capacity."""
+        if self.scheduler == "awsbatch":
+            return self.running_capacity > 0
+        return self.compute_fleet_status != ComputeFleetStatus.STOPPED
+
+    @property
+    def login_nodes_status(self) -> LoginNodesStatus:
+        """Return the status of the login node pools."""
+        if self._login_nodes_status is _NOT_RETRIEVED:
+            self._login_nodes_status = self._cluster.login_nodes_status
+        return self._login_nodes_status
+
+    def has_running_login_nodes(self, pool_name: str = None) -> bool:
+        """Return True if the cluster has running login nodes, or the given pool if a pool name is provided."""
+        healthy_nodes = self.login_nodes_status.get_healthy_nodes(pool_name=pool_name)
+        unhealthy_nodes = self.login_nodes_status.get_unhealthy_nodes(pool_name=pool_name)
+        return healthy_nodes is not None and unhealthy_nodes is not None and healthy_nodes + unhealthy_nodes != 0
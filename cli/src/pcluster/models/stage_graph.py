@@ -0,0 +1,127 @@
+# Copyright 2024 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"). You may not use this file except in compliance
+# with the License. A copy of the License is located at
+#
+# http://aws.amazon.com/apache2.0/
+#
+# or in the "LICENSE.txt" file accompanying this file. This file is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES
+# OR CONDITIONS OF ANY KIND, express or implied. See the License for the specific language governing permissions and
+# limitations under the License.
+import logging
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Callable, Dict, Iterable, List
+
+LOGGER = logging.getLogger(__name__)
+
+DEFAULT_MAX_WORKERS = 4
+
+
+class Stage:
+    """Step of an operation, run once all the stages it depends on are completed."""
+
+    def __init__(self, name: str, function: Callable, depends_on: Iterable[str]):
+        self.name = name
+        self.function = function
+        self.depends_on = tuple(depends_on)
+        self.start_time = None
+        self.end_time = None
+
+    @property
+    def duration(self):
+        """Return the time spent running the stage, in seconds."""
+        return self.end_time - self.start_time
+
+
+class StageGraph:
+    """
+    Run the stages of an operation concurrently, each one as soon as the stages it depends on are completed.
+
+    The dependencies of a stage must be added before the stage itself, so the graph cannot contain cycles.
+    After a failure no new stage is started: the stages already running are waited for and the first error is raised.
+    The duration of every stage and the critical path of the operation are logged at the end of the run.
+    """
+
+    def __init__(self, name: str, max_workers: int = DEFAULT_MAX_WORKERS):
+        self.name = name
+        self.max_workers = max_workers
+        self.results = {}
+        self._stages: Dict[str, Stage] = {}
+
+    def add_stage(self, name: str, function: Callable, depends_on: Iterable[str] = ()):
+        """Add a stage running the given function, without arguments, after the given stages."""
+        if name in self._stages:
+            raise ValueError(f"Stage {name} already added to {self.name}.")
+        depends_on = tuple(depends_on)
+        missing_stages = [stage for stage in depends_on if stage not in self._stages]
+        if missing_stages:
+            raise ValueError(f"Stage {name} depends on stages not added to {self.name}: {missing_stages}.")
+        self._stages[name] = Stage(name, function, depends_on)
+        return self
+
+    def run(self):
+        """Run all the stages and return their results by stage name."""
+        pending_stages = dict(self._stages)
+        completed_stages = set()
+        running_stages = {}
+        error = None
+        start_time = time.monotonic()
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix=self.name) as executor:
+            while True:
+                if error is None:
+                    ready_stages = [
+                        stage for stage in pending_stages.values() if completed_stages.issuperset(stage.depends_on)
+                    ]
+                    for stage in ready_stages:
+                        del pending_stages[stage.name]
+                        running_stages[executor.submit(self._run_stage, stage)] = stage
+                if not running_stages:
+                    break
+                done, _ = wait(running_stages, return_when=FIRST_COMPLETED)
+                for future in done:
+                    stage = running_stages.pop(future)
+                    try:
+                        self.results[stage.name] = future.result()
+                        completed_stages.add(stage.name)
+                    except Exception as e:
+                        error = error or e
+        LOGGER.info(
+            "%s completed in %.2f seconds, critical path: %s",
+            self.name,
+            time.monotonic() - start_time,
+            " -> ".join(f"{stage.name} ({stage.duration:.2f}s)" for stage in self.critical_path()),
+        )
+        if error:
+            raise error
+        return self.results
+
+    @staticmethod
+    def _run_stage(stage: Stage):
+        stage.start_time = time.monotonic()
+        try:
+            return stage.function()
+        finally:
+            stage.end_time = time.monotonic()
+            LOGGER.info("Stage %s completed in %.2f seconds", stage.name, stage.duration)
+
+    @property
+    def timings(self) -> Dict[str, float]:
+        """Return the duration in seconds of the stages which have been run."""
+        return {stage.name: stage.duration for stage in self._stages.values() if stage.end_time is not None}
+
+    def critical_path(self) -> List[Stage]:
+        """
+        Return the chain of stages which determined the duration of the run.
+
+        The path ends with the last stage to complete and goes back, at every step,
+        to the dependency which completed last, i.e. the one the stage was waiting for.
+        """
+        run_stages = [stage for stage in self._stages.values() if stage.end_time is not None]
+        path = []
+        stage = max(run_stages, key=lambda stage: stage.end_time, default=None)
+        while stage:
+            path.insert(0, stage)
+            dependencies = [self._stages[name] for name in stage.depends_on]
+            stage = max(dependencies, key=lambda stage: stage.end_time, default=None)
+        return path
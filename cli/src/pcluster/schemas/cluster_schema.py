@@ -111,6 +111,7 @@ from pcluster.constants import (
     IAM_POLICY_REGEX,
     IAM_ROLE_REGEX,
     LUSTRE,
+    MAX_NUMBER_OF_QUEUES,
     MAX_SLURM_NODE_PRIORITY,
     MIN_SLURM_NODE_PRIORITY,
     ONTAP,
@@ -1133,6 +1134,9 @@ class ClusterDevSettingsSchema(BaseDevSettingsSchema):
     instance_types_data = fields.Str(metadata={"update_policy": UpdatePolicy.SUPPORTED})
     timeouts = fields.Nested(TimeoutsSchema, metadata={"update_policy": UpdatePolicy.SUPPORTED})
     compute_startup_time_metric_enabled = fields.Bool(metadata={"update_policy": UpdatePolicy.SUPPORTED})
+    queues_stack_shard_size = fields.Int(
+        validate=validate.Range(min=1, max=MAX_NUMBER_OF_QUEUES), metadata={"update_policy": UpdatePolicy.UNSUPPORTED}
+    )
 
     @post_load
     def make_resource(self, data, **kwargs):
@@ -12,6 +12,7 @@
 # This module contains all the classes representing the Resources objects.
 # These objects are obtained from the configuration file through a conversion based on the Schema classes.
 #
+import json
 import os
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
@@ -19,10 +20,18 @@ from typing import List
 
 from aws_cdk.cx_api import CloudAssembly, CloudFormationStackArtifact
 
+from pcluster.constants import CFN_MAX_RESOURCES_PER_STACK, CFN_MAX_TEMPLATE_SIZE
+from pcluster.models.common import LimitExceeded
 from pcluster.models.s3_bucket import S3Bucket, S3FileFormat, S3FileType
 from pcluster.utils import LOGGER, load_json_dict
 
 
+class StackQuotaExceededError(LimitExceeded):
+    """Represent an error due to a generated template exceeding the CloudFormation quotas of a stack."""
+
+    pass
+
+
 @dataclass
 class ClusterAssetFile:
     """Class for asset files generated from a CDK Synthesis."""
@@ -110,6 +119,37 @@ class CDKArtifactsManager:
         """Return the template content."""
         return self.cluster_cdk_assembly.get_template_body()
 
+    def check_stack_quotas(self):
+        """
+        Check the number of resources and the size of the root template and of every nested stack template.
+
+        The templates are checked as uploaded to S3, i.e. minified, against the CloudFormation quotas of a stack.
+        """
+        templates = {"root": self.get_template_body()}
+        for cdk_asset in self.cluster_cdk_assembly.get_assets():
+            asset_file_path = os.path.join(self.cluster_cdk_assembly.get_cloud_assembly_directory(), cdk_asset.path)
+            templates[cdk_asset.id] = load_json_dict(asset_file_path)
+
+        errors = []
+        for template_id, template in templates.items():
+            resources_count = len(template.get("Resources", {}))
+            template_size = len(json.dumps(template, separators=(",", ":")))
+            LOGGER.info(f"Template {template_id}: {resources_count} resources, {template_size} bytes")
+            if resources_count > CFN_MAX_RESOURCES_PER_STACK:
+                errors.append(
+                    f"template {template_id} has {resources_count} resources, "
+                    f"more than the limit of {CFN_MAX_RESOURCES_PER_STACK}"
+                )
+            if template_size > CFN_MAX_TEMPLATE_SIZE:
+                errors.append(
+                    f"template {template_id} is {template_size} bytes, more than the limit of {CFN_MAX_TEMPLATE_SIZE}"
+                )
+        if errors:
+            raise StackQuotaExceededError(
+                f"The cluster template exceeds the CloudFormation quotas: {'; '.join(errors)}. "
+                "Reduce the number of queues and compute resources, or the QueuesStackShardSize in the DevSettings."
+            )
+
     def upload_assets(self, bucket: S3Bucket):
         """
         Upload the assets in the cloud assembly directory to the cluster artifacts S3 Bucket.
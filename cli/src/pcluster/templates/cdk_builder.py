@@ -49,6 +49,7 @@ class CDKTemplateBuilder:
             LOGGER.info("CDK template generation completed successfully")
 
             cdk_artifacts_manager = CDKArtifactsManager(cloud_assembly)
+            cdk_artifacts_manager.check_stack_quotas()
             assets_metadata = cdk_artifacts_manager.upload_assets(bucket=bucket)
             generated_template = cdk_artifacts_manager.get_template_body()
 
@@ -23,9 +23,10 @@ from aws_cdk import aws_logs as logs
 from aws_cdk.core import CfnCustomResource, CfnResource, Construct, Stack
 
 from pcluster.config.cluster_config import SlurmClusterConfig
-from pcluster.constants import PCLUSTER_CLUSTER_NAME_TAG
-from pcluster.templates.queues_stack import QueuesStack
+from pcluster.constants import PCLUSTER_CLUSTER_NAME_TAG, QUEUES_STACK_DEFAULT_SHARD_SIZE
+from pcluster.templates.queues_stack import QueuesStack, get_queues_stack_shards
 from pcluster.templates.slurm_builder import SlurmConstruct
+from pcluster.utils import get_attr
 
 
 class ComputeFleetConstruct(Construct):
@@ -83,26 +84,31 @@ class ComputeFleetConstruct(Construct):
         return self.managed_compute_fleet_instance_roles
 
     def _add_resources(self):
-        queues_stack = QueuesStack(
-            scope=self,
-            id="Queues",
-            queues=self._config.scheduling.queues,
-            cluster_config=self._config,
-            log_group=self._log_group,
-            shared_storage_infos=self._shared_storage_infos,
-            shared_storage_mount_dirs=self._shared_storage_mount_dirs,
-            shared_storage_attributes=self._shared_storage_attributes,
-            cluster_hosted_zone=self._cluster_hosted_zone,
-            dynamodb_table=self._dynamodb_table,
-            head_eni=self._head_eni,
-            slurm_construct=self._slurm_construct,
-            compute_security_group=self._compute_security_group,
-            cluster_bucket=self._cluster_bucket,
+        shards = get_queues_stack_shards(
+            self._config.scheduling.queues,
+            get_attr(self._config, "dev_settings.queues_stack_shard_size", default=QUEUES_STACK_DEFAULT_SHARD_SIZE),
         )
-
-        self.managed_compute_fleet_instance_roles.update(queues_stack.managed_compute_instance_roles)
-        self.launch_templates.update(queues_stack.compute_launch_templates)
-        self.managed_compute_fleet_placement_groups.update(queues_stack.managed_placement_groups)
+        for shard, queues in shards.items():
+            queues_stack = QueuesStack(
+                scope=self,
+                id=f"Queues{shard}",
+                queues=queues,
+                cluster_config=self._config,
+                log_group=self._log_group,
+                shared_storage_infos=self._shared_storage_infos,
+                shared_storage_mount_dirs=self._shared_storage_mount_dirs,
+                shared_storage_attributes=self._shared_storage_attributes,
+                cluster_hosted_zone=self._cluster_hosted_zone,
+                dynamodb_table=self._dynamodb_table,
+                head_eni=self._head_eni,
+                slurm_construct=self._slurm_construct,
+                compute_security_group=self._compute_security_group,
+                cluster_bucket=self._cluster_bucket,
+            )
+
+            self.managed_compute_fleet_instance_roles.update(queues_stack.managed_compute_instance_roles)
+            self.launch_templates.update(queues_stack.compute_launch_templates)
+            self.managed_compute_fleet_placement_groups.update(queues_stack.managed_placement_groups)
 
         custom_resource_deps = list(self.managed_compute_fleet_placement_groups.values())
         if self._compute_security_group:
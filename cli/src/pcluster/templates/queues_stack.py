@@ -1,4 +1,6 @@
 import json
+import math
+from hashlib import sha1
 from typing import Dict, List
 
 from aws_cdk import aws_ec2 as ec2
@@ -11,6 +13,7 @@ from pcluster.config.cluster_config import SharedStorageType, SlurmClusterConfig
 from pcluster.config.common import DefaultUserHomeType
 from pcluster.constants import (
     DEFAULT_EPHEMERAL_DIR,
+    MAX_NUMBER_OF_QUEUES,
     NODE_BOOTSTRAP_TIMEOUT,
     OS_MAPPING,
     PCLUSTER_COMPUTE_RESOURCE_NAME_TAG,
@@ -36,6 +39,24 @@ from pcluster.templates.slurm_builder import SlurmConstruct
 from pcluster.utils import get_attr, get_http_tokens_setting, get_resource_name_from_resource_arn, get_service_endpoint
 
 
+def get_queues_stack_shards(queues: List[SlurmQueue], shard_size: int) -> Dict[int, List[SlurmQueue]]:
+    """
+    Distribute the queues across the shards of the queues stack, returning the queues of every non-empty shard.
+
+    The shard of a queue depends only on its name and on the number of shards, which in turn depends only on the
+    shard size, so adding, removing or changing a queue never moves the other queues to a different nested stack.
+    """
+    shards_count = math.ceil(MAX_NUMBER_OF_QUEUES / shard_size)
+    shards = {}
+    for queue in queues:
+        # A nosec comment is appended to the following line in order to disable the B324 check.
+        # The sha1 is used just as a hashing function.
+        # [B324:hashlib] Use of weak MD4, MD5, or SHA1 hash for security. Consider usedforsecurity=False
+        queue_hash = int(sha1(queue.name.encode("utf-8")).hexdigest(), 16)  # nosec nosemgrep
+        shards.setdefault(queue_hash % shards_count, []).append(queue)
+    return dict(sorted(shards.items()))
+
+
 class QueuesStack(NestedStack):
     """Stack encapsulating a set of queues and the associated resources."""
 
@@ -10,7 +10,9 @@
 # limitations under the License.
 import math
 import re
+from bisect import bisect_right
 from collections import defaultdict
+from dataclasses import dataclass
 from enum import Enum
 from ipaddress import collapse_addresses, ip_network
 from itertools import combinations, product
@@ -22,6 +24,7 @@ from pcluster.aws.common import AWSClientError
 from pcluster.cli.commands.dcv_util import get_supported_dcv_os
 from pcluster.config.common import CapacityType
 from pcluster.constants import (
+    ALL_PORTS_RANGE,
     CIDR_ALL_IPS,
     DELETE_POLICY,
     EFS_PORT,
@@ -462,119 +465,154 @@ class EfaMultiAzValidator(Validator):
 # --------------- Storage validators --------------- #
 
 
-def _is_access_allowed(
-    security_groups_ids, subnets, port, security_groups_by_nodes, protocol="tcp", check_outbound=True
-):
-    """
-    Verify given list of security groups to check if they allow in and out access on the given port.
-
-    :param security_groups_ids: list of security groups to verify
-    :param port: port to verify
-    :param security_groups_by_nodes: all security groups from cluster. This is a set of frozen sets.
-    Each frozen set contains sg combination of a queue.
-    :param protocol: the IP protocol to be checked.
-    :return: True if both in and out access are allowed
-    :raise: ClientError if a given security group doesn't exist
-    """
-    in_access = False
-    out_access = False
-    src_ip_ranges = []
-    dst_ip_ranges = []
-    src_security_groups = set()
-    dst_security_groups = set()
-
-    for sec_group in AWSApi.instance().ec2.describe_security_groups(security_groups_ids):
-        # Check all inbound rules
-        for rule in sec_group.get("IpPermissions"):
-            if in_access:
-                break
-            if _is_port_allowed_by_sg_rule(rule, port, protocol):
-                in_access = _populate_allowed_src_or_dst(rule, src_ip_ranges, src_security_groups)
+# Protocol names used in the security group rules for the protocols specified by number.
+_IP_PROTOCOL_NAMES = {"6": "tcp", "17": "udp", "1": "icmp", "58": "icmpv6"}
 
-        # Check all outbound rules
-        for rule in sec_group.get("IpPermissionsEgress"):
-            if out_access:
-                break
-            if _is_port_allowed_by_sg_rule(rule, port, protocol):
-                out_access = _populate_allowed_src_or_dst(rule, dst_ip_ranges, dst_security_groups)
-
-        if in_access and out_access:
-            return True
-    # If in_access or out_access is still False, check allowed ip ranges and security groups.
-    # The in_access or out_access could only have been true, if previous logics had found prefix list in SG rules.
-    # Rules of ip ranges have to be checked at the end because the union of all ip ranges may cover the subnets,
-    # even when individual ip ranges do not cover the subnets. The same reason applies to allowed security groups.
-    in_access = in_access or _are_ip_ranges_and_sg_accessible(
-        security_groups_by_nodes, src_ip_ranges, src_security_groups, subnets
-    )
-    out_access = out_access or _are_ip_ranges_and_sg_accessible(
-        security_groups_by_nodes, dst_ip_ranges, dst_security_groups, subnets
-    )
-    if check_outbound:
-        return in_access and out_access
-    return in_access
-
-
-def _are_ip_ranges_and_sg_accessible(security_groups_by_nodes, allowed_ip_ranges, allowed_security_groups, subnets):
-    # For all cluster nodes, at least one of the security groups attached need to be in the UserIdGroupPairs.
-    return all(
-        node_security_groups & allowed_security_groups for node_security_groups in security_groups_by_nodes
-    ) or _are_subnets_covered_by_cidrs(allowed_ip_ranges, subnets)
-
-
-def _populate_allowed_src_or_dst(rule, ip_ranges, allowed_security_groups):
-    """
-    Collect Ip ranges or security groups allowed by the rule.
 
-    :param rule: A rule of a security group
-    :param ip_ranges: A list of ip ranges.
-    :param allowed_security_groups: A list of allowed security group.
-    :return: True if we can determine the current rule allows connection.
-    False if it does not allow connection or cannot be determined.
-    """
-    if rule.get("PrefixListIds"):
-        return True  # Always assume prefix list is properly set for code simplicity
-    elif rule.get("IpRanges"):
-        ip_ranges.extend(rule.get("IpRanges"))
-        return False  # Ip Ranges have to be checked later. Return False because the rule allowance is not determined.
-    elif rule.get("UserIdGroupPairs"):
-        allowed_security_groups.update(
-            {user_id_group_pair.get("GroupId") for user_id_group_pair in rule.get("UserIdGroupPairs")}
+@dataclass(frozen=True)
+class _AllowedPeers:
+    """Prefix lists, CIDRs and security groups allowed by the security group rules on a port."""
+
+    prefix_list: bool = False
+    cidrs: frozenset = frozenset()
+    security_groups: frozenset = frozenset()
+
+    @staticmethod
+    def from_rule(rule):
+        return _AllowedPeers(
+            prefix_list=bool(rule.get("PrefixListIds")),
+            cidrs=frozenset(ip_range.get("CidrIp") for ip_range in rule.get("IpRanges", [])),
+            security_groups=frozenset(pair.get("GroupId") for pair in rule.get("UserIdGroupPairs", [])),
         )
-        # Security groups have to be checked later. Return False because the rule allowance is not determined.
-        return False
-    return False
 
+    def union(self, other):
+        return _AllowedPeers(
+            prefix_list=self.prefix_list or other.prefix_list,
+            cidrs=self.cidrs | other.cidrs,
+            security_groups=self.security_groups | other.security_groups,
+        )
 
-def _is_port_allowed_by_sg_rule(rule, port_to_check, protocol):
-    """
-    Verify if the security group rule accepts connections on the given port.
 
-    :param rule: The rule to check
-    :param port_to_check: The port to check
-    :param protocol: the IP protocol to be checked.
-    :return: True if the rule accepts connection, False otherwise
+class SecurityGroupReachability:
     """
-    from_port = rule.get("FromPort")
-    to_port = rule.get("ToPort")
-    ip_protocol = rule.get("IpProtocol")
+    Reachability engine verifying if the cluster nodes can reach a network interface on a given set of ports.
 
-    # if ip_protocol is -1, all ports are allowed
-    if ip_protocol == "-1":
-        return True
-    # Add protocol number in addition to the protocol name
-    if protocol == "tcp":
-        expected_protocol = [protocol, "6"]
-    elif protocol == "udp":
-        expected_protocol = [protocol, "17"]
-    else:
-        # ToDo: When adding new checks for other protocols, change the code to include the protocol number too.
-        expected_protocol = [protocol]
+    The rules of every set of security groups are compiled once into a sorted index of port intervals per protocol
+    and direction, each interval holding the prefix lists, CIDRs and security groups allowed on it.
+    Queries on many ports and on network interfaces sharing the same security groups reuse the compiled indexes.
 
-    if (ip_protocol in expected_protocol) and (from_port <= port_to_check <= to_port):
-        return True
+    Traffic is considered allowed in a direction if the rules on the port:
+    - reference a prefix list (prefix lists are always assumed to be properly set), or
+    - reference at least one of the security groups of every cluster node, or
+    - allow CIDRs whose union covers all the cluster subnets.
+    """
 
-    return False
+    INBOUND = "inbound"
+    OUTBOUND = "outbound"
+    _RULES_KEYS = {INBOUND: "IpPermissions", OUTBOUND: "IpPermissionsEgress"}
+
+    def __init__(self, security_groups_by_nodes):
+        """
+        Initialize the engine.
+
+        :param security_groups_by_nodes: all security groups from cluster. This is a set of frozen sets.
+        Each frozen set contains sg combination of a queue.
+        """
+        self._security_groups_by_nodes = security_groups_by_nodes
+        self._port_indexes = {}
+        self._allowed_peers_results = {}
+
+    def _get_port_index(self, security_group_ids, direction, protocol):
+        """Return the port interval boundaries and the peers allowed on every interval for the given rules."""
+        key = (tuple(security_group_ids), direction, protocol)
+        if key not in self._port_indexes:
+            rules = []
+            for security_group in AWSApi.instance().ec2.describe_security_groups(list(security_group_ids)):
+                for rule in security_group.get(self._RULES_KEYS[direction]) or []:
+                    ip_protocol = rule.get("IpProtocol")
+                    if ip_protocol == "-1":
+                        # if ip_protocol is -1, all ports are allowed
+                        rules.append((ALL_PORTS_RANGE[0], ALL_PORTS_RANGE[1], _AllowedPeers.from_rule(rule)))
+                    elif _IP_PROTOCOL_NAMES.get(ip_protocol, ip_protocol) == protocol:
+                        rules.append((rule.get("FromPort"), rule.get("ToPort"), _AllowedPeers.from_rule(rule)))
+
+            # Split the port space in the elementary intervals delimited by the rules and merge the peers of the
+            # rules covering every interval, so that a port lookup is a binary search on the boundaries.
+            boundaries = sorted({from_port for from_port, _, _ in rules} | {to_port + 1 for _, to_port, _ in rules})
+            interval_peers = []
+            for interval_start in boundaries:
+                peers = None
+                for from_port, to_port, rule_peers in rules:
+                    if from_port <= interval_start <= to_port:
+                        peers = rule_peers if peers is None else peers.union(rule_peers)
+                interval_peers.append(peers)
+            self._port_indexes[key] = (boundaries, interval_peers)
+        return self._port_indexes[key]
+
+    def _is_allowed(self, peers, subnet_ids):
+        if peers is None:
+            return False
+        key = (peers, frozenset(subnet_ids))
+        if key not in self._allowed_peers_results:
+            # For all cluster nodes, at least one of the security groups attached need to be in the allowed ones.
+            # The union of all ip ranges may cover the subnets, even when individual ip ranges do not.
+            self._allowed_peers_results[key] = (
+                peers.prefix_list
+                or all(
+                    node_security_groups & peers.security_groups
+                    for node_security_groups in self._security_groups_by_nodes
+                )
+                or _are_subnets_covered_by_cidrs([{"CidrIp": cidr} for cidr in peers.cidrs], subnet_ids)
+            )
+        return self._allowed_peers_results[key]
+
+    def get_blocked_directions(self, security_group_ids, subnet_ids, ports, protocol="tcp", check_outbound=True):
+        """
+        Return the directions in which traffic is not allowed for every given port.
+
+        :param security_group_ids: security groups of the network interface to reach
+        :param subnet_ids: subnets of the cluster nodes
+        :param ports: ports to verify
+        :param protocol: the IP protocol to be checked
+        :param check_outbound: verify outbound traffic in addition to inbound traffic
+        :return: dict mapping every port to the list of directions not allowed, empty if the port is reachable
+        :raise: AWSClientError if a given security group doesn't exist
+        """
+        directions = [self.INBOUND, self.OUTBOUND] if check_outbound else [self.INBOUND]
+        blocked_directions = {port: [] for port in ports}
+        for direction in directions:
+            boundaries, interval_peers = self._get_port_index(security_group_ids, direction, protocol)
+            for port in ports:
+                interval = bisect_right(boundaries, port) - 1
+                if interval < 0 or not self._is_allowed(interval_peers[interval], subnet_ids):
+                    blocked_directions[port].append(direction)
+        return blocked_directions
+
+    def get_unreachable_ports(self, security_group_ids_list, subnet_ids, ports, protocol="tcp", check_outbound=True):
+        """
+        Return the ports that cannot be reached on any of the given network interfaces.
+
+        :param security_group_ids_list: list of the security groups of every network interface
+        :return: dict mapping every unreachable port to the directions not allowed on any network interface
+        """
+        unreachable_ports = {port: None for port in ports}
+        for security_group_ids in security_group_ids_list:
+            blocked_directions = self.get_blocked_directions(
+                security_group_ids, subnet_ids, list(unreachable_ports), protocol, check_outbound
+            )
+            for port, directions in blocked_directions.items():
+                if directions:
+                    previous_directions = unreachable_ports[port]
+                    unreachable_ports[port] = (
+                        directions
+                        if previous_directions is None
+                        else [direction for direction in previous_directions if direction in directions]
+                    )
+                else:
+                    del unreachable_ports[port]
+            if not unreachable_ports:
+                break
+        return {port: directions or [] for port, directions in unreachable_ports.items()}
 
 
 def _are_subnets_covered_by_cidrs(ip_ranges, subnets):
@@ -617,18 +655,20 @@ class ExistingFsxNetworkingValidator(Validator):
 
     def _validate(self, file_storage_ids, subnet_ids, security_groups_by_nodes):
         try:
+            # The same engine is used for all the file storages, which often share the same security groups
+            reachability = SecurityGroupReachability(security_groups_by_nodes)
             file_cache_ids = [file_cache_id for file_cache_id in file_storage_ids if file_cache_id.startswith("fc-")]
             if file_cache_ids:
                 file_storage_ids = [id for id in file_storage_ids if id not in file_cache_ids]
                 file_caches = AWSApi.instance().fsx.describe_file_caches(file_cache_ids)
-                self._check_file_storage(security_groups_by_nodes, file_caches, subnet_ids)
+                self._check_file_storage(reachability, file_caches, subnet_ids)
 
             file_systems = AWSApi.instance().fsx.get_file_systems_info(file_storage_ids)
-            self._check_file_storage(security_groups_by_nodes, file_systems, subnet_ids)
+            self._check_file_storage(reachability, file_systems, subnet_ids)
         except AWSClientError as e:
             self._add_failure(str(e), FailureLevel.ERROR)
 
-    def _check_file_storage(self, security_groups_by_nodes, file_storages, subnet_ids):
+    def _check_file_storage(self, reachability, file_storages, subnet_ids):
         vpc_id = AWSApi.instance().ec2.get_subnet_vpc(subnet_ids[0])
         network_interfaces_data = self._describe_network_interfaces(file_storages)
         for file_storage in file_storages:
@@ -655,54 +695,37 @@ class ExistingFsxNetworkingValidator(Validator):
                     network_interface_responses.append(network_interfaces_data[network_interface_id])
 
                 network_interfaces = [ni for ni in network_interface_responses if ni.get("VpcId") == vpc_id]
+                # Get list of security group IDs of every network interface
+                security_group_ids_list = [
+                    [sg.get("GroupId") for sg in network_interface.get("Groups")]
+                    for network_interface in network_interfaces
+                ]
+                check_outbound = file_storage.file_storage_type != "OPENZFS"
 
                 for protocol, ports in FSX_PORTS[file_storage.file_storage_type].items():
-                    missing_ports = self._get_missing_ports(
-                        security_groups_by_nodes,
-                        subnet_ids,
-                        network_interfaces,
-                        ports,
-                        protocol,
-                        file_storage.file_storage_type,
+                    unreachable_ports = reachability.get_unreachable_ports(
+                        security_group_ids_list, subnet_ids, ports, protocol, check_outbound
                     )
 
-                    if missing_ports:
-                        direction = "inbound and outbound"
-                        if file_storage.file_storage_type == "OPENZFS":
-                            direction = "inbound"
+                    if unreachable_ports:
+                        direction = "inbound and outbound" if check_outbound else "inbound"
                         self._add_failure(
                             f"The current security group settings on file storage '{file_storage_id}' does not"
                             " satisfy mounting requirement. The file storage must be associated to a security group"
                             f" that allows {direction } {protocol.upper()} traffic through ports {ports}. "
-                            f"Missing ports: {missing_ports}",
+                            f"Missing ports: {list(unreachable_ports)}"
+                            + self._get_blocked_directions_details(unreachable_ports),
                             FailureLevel.ERROR,
                         )
 
-    def _get_missing_ports(
-        self, security_groups_by_nodes, subnet_ids, network_interfaces, ports, protocol, storage_type
-    ):
-        missing_ports = []
-        for port in ports:
-            fs_access = False
-            for network_interface in network_interfaces:
-                # Get list of security group IDs
-                sg_ids = [sg.get("GroupId") for sg in network_interface.get("Groups")]
-                check_outbound = True
-                if storage_type == "OPENZFS":
-                    check_outbound = False
-                if _is_access_allowed(
-                    sg_ids,
-                    subnet_ids,
-                    port=port,
-                    security_groups_by_nodes=security_groups_by_nodes,
-                    protocol=protocol,
-                    check_outbound=check_outbound,
-                ):
-                    fs_access = True
-                    break
-            if not fs_access:
-                missing_ports.append(port)
-        return missing_ports
+    @staticmethod
+    def _get_blocked_directions_details(unreachable_ports):
+        details = ""
+        for direction in [SecurityGroupReachability.INBOUND, SecurityGroupReachability.OUTBOUND]:
+            ports = [port for port, directions in unreachable_ports.items() if direction in directions]
+            if ports:
+                details += f". {direction.capitalize()} traffic is not allowed through ports {ports}"
+        return details
 
 
 class FsxArchitectureOsValidator(Validator):
@@ -882,15 +905,14 @@ class EfsIdValidator(Validator):  # TODO add tests
             )
 
         avail_zones_missing_mount_target_for_efs_standard = []
+        reachability = SecurityGroupReachability(security_groups_by_nodes)
         for avail_zone, subnets in avail_zones_mapping.items():
             head_node_target_id = AWSApi.instance().efs.get_efs_mount_target_id(efs_id, avail_zone)
             # If there is an existing mt in the az, need to check the inbound and outbound rules of the security groups
             if head_node_target_id:
                 # Get list of security group IDs of the mount target
                 sg_ids = AWSApi.instance().efs.get_efs_mount_target_security_groups(head_node_target_id)
-                if not _is_access_allowed(
-                    sg_ids, subnets, port=EFS_PORT, security_groups_by_nodes=security_groups_by_nodes
-                ):
+                if reachability.get_blocked_directions(sg_ids, subnets, [EFS_PORT])[EFS_PORT]:
                     self._add_failure(
                         "There is an existing Mount Target {0} in the Availability Zone {1} for EFS {2}, "
                         "but it does not have a security group that allows inbound and outbound rules to support NFS. "
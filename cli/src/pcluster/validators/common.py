@@ -62,6 +62,17 @@ class Validator(ABC):
         """Identify the type of validator."""
         return self.__class__.__name__
 
+    @classmethod
+    def invocation_key(cls, **validator_args):
+        """
+        Return the key identifying the invocation of the validator with the given arguments.
+
+        Validators whose result depends only on their arguments return a hashable key over them,
+        so that the invocations registered with the same key by different resources are executed once.
+        The default None means that every invocation is executed.
+        """
+        return None
+
     def execute(self, *arg, **kwargs) -> List[ValidationResult]:
         """Entry point of all validators to verify all input params are valid."""
         self._validate(*arg, **kwargs)
@@ -144,9 +155,11 @@ def get_async_timed_validator_type_for(validator_type: type) -> AsyncValidator:
 class ValidatorContext:
     """Context containing information about cluster environment meant to be passed to validators."""
 
-    def __init__(self, head_node_instance_id: str = None, during_update: bool = None):
+    def __init__(self, head_node_instance_id: str = None, during_update: bool = None, validation_scope=None):
         self.head_node_instance_id = head_node_instance_id
         self.during_update = during_update
+        # Part of the configuration to validate, all of it when not set
+        self.validation_scope = validation_scope
 
 
 def get_arn_components(arn: str):
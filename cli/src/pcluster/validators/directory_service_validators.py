@@ -78,6 +78,11 @@ class DomainNameValidator(Validator):
 class PasswordSecretArnValidator(Validator):
     """PasswordSecretArn validator."""
 
+    @classmethod
+    def invocation_key(cls, password_secret_arn: str, region: str):
+        """Return the secret ARN and the region it is checked against."""
+        return password_secret_arn, region
+
     def _validate(self, password_secret_arn: str, region: str):
         """Validate that PasswordSecretArn contains a valid ARN for the given region.
 
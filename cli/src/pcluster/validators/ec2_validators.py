@@ -16,7 +16,7 @@ from typing import Dict, List, Optional
 
 from pcluster import imagebuilder_utils
 from pcluster.aws.aws_api import AWSApi, KeyPairInfo
-from pcluster.aws.aws_resources import CapacityReservationInfo
+from pcluster.aws.aws_resources import CapacityReservationsIndex
 from pcluster.aws.common import AWSClientError
 from pcluster.config.common import CapacityType
 from pcluster.constants import NVIDIA_OPENRM_UNSUPPORTED_INSTANCE_TYPES, UNSUPPORTED_OSES_FOR_MICRO_NANO
@@ -135,6 +135,11 @@ class InstanceTypeMemoryInfoValidator(Validator):
 class InstanceTypeBaseAMICompatibleValidator(Validator):
     """EC2 Instance type and base ami compatibility validator."""
 
+    @classmethod
+    def invocation_key(cls, instance_type: str, image: str):
+        """Return the instance type and the AMI whose architectures are compared."""
+        return instance_type, image
+
     def _validate(self, instance_type: str, image: str):
         image_info = self._validate_base_ami(image)
         instance_architectures = self._validate_instance_type(instance_type)
@@ -294,6 +299,11 @@ class AmiOsCompatibleValidator(Validator):
     If image has tag of OS, compare AMI OS with cluster OS, else print out a warning message.
     """
 
+    @classmethod
+    def invocation_key(cls, os: str, image_id: str):
+        """Return the OS and the AMI whose OS is compared with it."""
+        return os, image_id
+
     def _validate(self, os: str, image_id: str):
         image_info = AWSApi.instance().ec2.describe_image(ami_id=image_id)
         image_os = image_info.image_os
@@ -405,20 +415,12 @@ class CapacityReservationSizeValidator(Validator):
                 )
 
 
-def get_capacity_reservations(capacity_reservation_resource_group_arn: str):
-    """Get capacity reservations info for a given Reservation Resource Group Arn."""
+def get_capacity_reservations_index(capacity_reservation_resource_group_arn: str) -> CapacityReservationsIndex:
+    """Get capacity reservations info for a given Reservation Resource Group Arn, indexed by instance type and AZ."""
     capacity_reservation_ids = AWSApi.instance().resource_groups.get_capacity_reservation_ids_from_group_resources(
         capacity_reservation_resource_group_arn
     )
-    return AWSApi.instance().ec2.describe_capacity_reservations(capacity_reservation_ids)
-
-
-def capacity_reservation_matches_instance(capacity_reservation: CapacityReservationInfo, instance_type: str) -> bool:
-    return capacity_reservation.instance_type() == instance_type
-
-
-def capacity_reservation_matches_avail_zone(capacity_reservation: CapacityReservationInfo, subnet_id: str) -> bool:
-    return capacity_reservation.availability_zone() == AWSApi.instance().ec2.get_subnet_avail_zone(subnet_id)
+    return AWSApi.instance().ec2.get_capacity_reservations_index(capacity_reservation_ids)
 
 
 def capacity_reservation_resource_group_is_service_linked_group(capacity_reservation_resource_group_arn: str):
@@ -435,16 +437,6 @@ def capacity_reservation_resource_group_is_service_linked_group(capacity_reserva
         return False
 
 
-def get_capacity_reservations_per_az(
-    capacity_reservations: List[CapacityReservationInfo],
-) -> Dict[str, List[CapacityReservationInfo]]:
-    """Create a mapping of an AZ and its related Capacity Reservations."""
-    capacity_reservations_per_az = defaultdict(list)
-    for capacity_reservation in capacity_reservations:
-        capacity_reservations_per_az[capacity_reservation.availability_zone()].append(capacity_reservation)
-    return capacity_reservations_per_az
-
-
 class CapacityReservationResourceGroupValidator(Validator):
     """Validate capacity reservation group is can be used with existing instance types and subnets.
 
@@ -471,39 +463,43 @@ class CapacityReservationResourceGroupValidator(Validator):
                     FailureLevel.ERROR,
                 )
             else:
-                capacity_reservations = get_capacity_reservations(capacity_reservation_resource_group_arn)
+                capacity_reservations_index = get_capacity_reservations_index(capacity_reservation_resource_group_arn)
+                availability_zones = {subnet_id_az_mapping[subnet_id] for subnet_id in subnet_ids}
                 self._validate_unreserved_instance_types_for_azs(
-                    capacity_reservations,
+                    capacity_reservations_index,
                     capacity_reservation_resource_group_arn,
-                    {subnet_id_az_mapping[subnet_id] for subnet_id in subnet_ids},
+                    availability_zones,
+                    instance_types,
+                )
+                self._validate_remaining_capacity(
+                    queue_name,
+                    capacity_reservations_index,
+                    capacity_reservation_resource_group_arn,
+                    availability_zones,
                     instance_types,
                 )
                 self._validate_with_subnets(
                     queue_name,
                     capacity_reservation_resource_group_arn,
-                    capacity_reservations,
+                    capacity_reservations_index,
                     subnet_ids,
                     subnet_id_az_mapping,
                 )
 
     def _validate_unreserved_instance_types_for_azs(
         self,
-        capacity_reservations: List[CapacityReservationInfo],
+        capacity_reservations_index: CapacityReservationsIndex,
         capacity_reservation_resource_group_arn,
         availability_zones,
         instance_types,
     ):
-        capacity_reservations_per_az = get_capacity_reservations_per_az(capacity_reservations)
         unreserved_instance_types_per_az = defaultdict(list)
         for instance_type in instance_types:
             found_reservation_for_instance_type_in_group = False
             for availability_zone in availability_zones:
-                found_reservation_for_instance_type_in_az = False
-                for capacity_reservation in capacity_reservations_per_az.get(availability_zone, []):
-                    if capacity_reservation_matches_instance(capacity_reservation, instance_type):
-                        found_reservation_for_instance_type_in_az = found_reservation_for_instance_type_in_group = True
-                        break
-                if not found_reservation_for_instance_type_in_az:
+                if capacity_reservations_index.get(instance_type, availability_zone):
+                    found_reservation_for_instance_type_in_group = True
+                else:
                     unreserved_instance_types_per_az[availability_zone].append(instance_type)
             if not found_reservation_for_instance_type_in_group:
                 self._add_failure(
@@ -520,7 +516,10 @@ class CapacityReservationResourceGroupValidator(Validator):
                 "instance types: '{unreserved_instance_types}'.".format(
                     crrg_arn=capacity_reservation_resource_group_arn,
                     cr_instance_az=", ".join(
-                        ["(%s: %s)" % (cr.instance_type(), cr.availability_zone()) for cr in capacity_reservations]
+                        [
+                            "(%s: %s)" % (cr.instance_type(), cr.availability_zone())
+                            for cr in capacity_reservations_index.capacity_reservations
+                        ]
                     ),
                     unreserved_instance_types=", ".join(
                         "{%s: %s}" % (az, instance_types)
@@ -530,11 +529,38 @@ class CapacityReservationResourceGroupValidator(Validator):
                 FailureLevel.WARNING,
             )
 
+    def _validate_remaining_capacity(
+        self,
+        queue_name,
+        capacity_reservations_index: CapacityReservationsIndex,
+        capacity_reservation_resource_group_arn,
+        availability_zones,
+        instance_types,
+    ):
+        for instance_type in instance_types:
+            reserved_availability_zones = sorted(
+                availability_zone
+                for availability_zone in availability_zones
+                if capacity_reservations_index.get(instance_type, availability_zone)
+            )
+            if reserved_availability_zones and not any(
+                capacity_reservations_index.remaining_capacity(instance_type, availability_zone)
+                for availability_zone in reserved_availability_zones
+            ):
+                self._add_failure(
+                    f"The capacity reservations for {instance_type} of the Capacity Reservation Resource Group "
+                    f"'{capacity_reservation_resource_group_arn}' have no available instances left in the "
+                    f"availability zones of queue '{queue_name}': '{', '.join(reserved_availability_zones)}'. "
+                    "The instances of the queue will be launched outside of the capacity reservations until "
+                    "reserved capacity is released.",
+                    FailureLevel.WARNING,
+                )
+
     def _validate_with_subnets(
         self,
         queue_name,
         cr_group_arn,
-        capacity_reservations: List[CapacityReservationInfo],
+        capacity_reservations_index: CapacityReservationsIndex,
         subnet_ids,
         subnet_id_az_mapping: Dict[str, str],
     ):
@@ -542,11 +568,12 @@ class CapacityReservationResourceGroupValidator(Validator):
         found_qualified_capacity_reservation = False
 
         capacity_reservation_availability_zones = [
-            capacity_reservation.availability_zone() for capacity_reservation in capacity_reservations
+            capacity_reservation.availability_zone()
+            for capacity_reservation in capacity_reservations_index.capacity_reservations
         ]
         for subnet_id in subnet_ids:
             subnet_az = subnet_id_az_mapping[subnet_id]
-            if subnet_az not in capacity_reservation_availability_zones:
+            if subnet_az not in capacity_reservations_index.availability_zones:
                 subnets_without_reservations.append(subnet_id)
             else:
                 found_qualified_capacity_reservation = True
@@ -603,22 +630,18 @@ class PlacementGroupCapacityReservationValidator(Validator):
     """Validate the placement group is compatible with the capacity reservation target."""
 
     def _validate_chosen_pg(
-        self, subnet, instance_types, capacity_reservations: List[CapacityReservationInfo], chosen_pg
+        self, subnet, instance_types, capacity_reservations_index: CapacityReservationsIndex, chosen_pg
     ):
+        availability_zone = AWSApi.instance().ec2.get_subnet_avail_zone(subnet)
         pg_match, open_or_targeted = False, False
         for instance_type in instance_types:
-            for capacity_reservation in capacity_reservations:
-                if capacity_reservation_matches_instance(
-                    capacity_reservation=capacity_reservation, instance_type=instance_type
-                ) and capacity_reservation_matches_avail_zone(
-                    capacity_reservation=capacity_reservation, subnet_id=subnet
-                ):
-                    odcr_pg = get_resource_name_from_resource_arn(capacity_reservation.placement_group_arn())
-                    if odcr_pg:
-                        if odcr_pg == chosen_pg:
-                            pg_match = True
-                    else:
-                        open_or_targeted = True
+            for capacity_reservation in capacity_reservations_index.get(instance_type, availability_zone):
+                odcr_pg = get_resource_name_from_resource_arn(capacity_reservation.placement_group_arn())
+                if odcr_pg:
+                    if odcr_pg == chosen_pg:
+                        pg_match = True
+                else:
+                    open_or_targeted = True
             if not (pg_match or open_or_targeted):
                 self._add_failure(
                     f"The placement group provided '{chosen_pg}' targets the '{instance_type}' instance type but there "
@@ -636,22 +659,15 @@ class PlacementGroupCapacityReservationValidator(Validator):
                 )
 
     def _validate_no_pg(
-        self, instance_types, capacity_reservations: List[CapacityReservationInfo], subnet, subnet_id_az_mapping
+        self, instance_types, capacity_reservations_index: CapacityReservationsIndex, subnet, subnet_id_az_mapping
     ):
+        availability_zone = AWSApi.instance().ec2.get_subnet_avail_zone(subnet)
         for instance_type in instance_types:
-            odcr_without_pg = False
-            for capacity_reservation in capacity_reservations:
-                odcr_pg = get_resource_name_from_resource_arn(capacity_reservation.placement_group_arn())
-                # search for a capacity reservation without a placement group and matching instance type and avail zone
-                if not odcr_pg and (
-                    capacity_reservation_matches_instance(
-                        capacity_reservation=capacity_reservation, instance_type=instance_type
-                    )
-                    and capacity_reservation_matches_avail_zone(
-                        capacity_reservation=capacity_reservation, subnet_id=subnet
-                    )
-                ):
-                    odcr_without_pg = True
+            # search for a capacity reservation without a placement group and matching instance type and avail zone
+            odcr_without_pg = any(
+                not get_resource_name_from_resource_arn(capacity_reservation.placement_group_arn())
+                for capacity_reservation in capacity_reservations_index.get(instance_type, availability_zone)
+            )
             if not odcr_without_pg:
                 self._add_failure(
                     f"There are no open or targeted ODCRs that match the instance_type '{instance_type}' in "
@@ -666,23 +682,23 @@ class PlacementGroupCapacityReservationValidator(Validator):
             odcr_id = getattr(odcr, "capacity_reservation_id", None)
             odcr_arn = getattr(odcr, "capacity_reservation_resource_group_arn", None)
             if odcr_id:
-                capacity_reservations = AWSApi.instance().ec2.describe_capacity_reservations([odcr_id])
+                capacity_reservations_index = AWSApi.instance().ec2.get_capacity_reservations_index([odcr_id])
             elif odcr_arn:
-                capacity_reservations = get_capacity_reservations(odcr_arn)
+                capacity_reservations_index = get_capacity_reservations_index(odcr_arn)
             else:
-                capacity_reservations = None
-            if capacity_reservations:
+                capacity_reservations_index = None
+            if capacity_reservations_index and capacity_reservations_index.capacity_reservations:
                 if placement_group:
                     self._validate_chosen_pg(
                         subnet=subnet,
                         instance_types=instance_types,
-                        capacity_reservations=capacity_reservations,
+                        capacity_reservations_index=capacity_reservations_index,
                         chosen_pg=placement_group,
                     )
                 else:
                     self._validate_no_pg(
                         subnet=subnet,
                         instance_types=instance_types,
-                        capacity_reservations=capacity_reservations,
+                        capacity_reservations_index=capacity_reservations_index,
                         subnet_id_az_mapping=subnet_id_az_mapping,
                     )
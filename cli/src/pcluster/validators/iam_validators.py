@@ -25,6 +25,11 @@ class RoleValidator(Validator):
     Verify the given role exists.
     """
 
+    @classmethod
+    def invocation_key(cls, role_arn: str):
+        """Return the role ARN, each role is checked once."""
+        return role_arn
+
     def _validate(self, role_arn: str):
         try:
             AWSApi.instance().iam.get_role(get_resource_name_from_resource_arn(role_arn))
@@ -39,6 +44,11 @@ class InstanceProfileValidator(Validator):
     Verify the given instance profile exists.
     """
 
+    @classmethod
+    def invocation_key(cls, instance_profile_arn: str):
+        """Return the instance profile ARN, each instance profile is checked once."""
+        return instance_profile_arn
+
     def _validate(self, instance_profile_arn: str):
         try:
             AWSApi.instance().iam.get_instance_profile(get_resource_name_from_resource_arn(instance_profile_arn))
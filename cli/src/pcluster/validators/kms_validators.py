@@ -17,6 +17,11 @@ from pcluster.validators.common import FailureLevel, Validator
 class KmsKeyValidator(Validator):
     """Kms key validator."""
 
+    @classmethod
+    def invocation_key(cls, kms_key_id: str):
+        """Return the KMS key id, each key is described once."""
+        return kms_key_id
+
     def _validate(self, kms_key_id: str):
         try:
             AWSApi.instance().kms.describe_key(kms_key_id=kms_key_id)
@@ -19,6 +19,11 @@ from pcluster.validators.common import FailureLevel, Validator
 class SecurityGroupsValidator(Validator):
     """Security groups validator."""
 
+    @classmethod
+    def invocation_key(cls, security_group_ids: List[str]):
+        """Return the security group ids, the same list of groups is validated once."""
+        return tuple(security_group_ids or ())
+
     def _validate(self, security_group_ids: List[str]):
         if security_group_ids:
             for sg_id in security_group_ids:
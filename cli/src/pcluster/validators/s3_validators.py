@@ -1,12 +1,11 @@
 import re
 from urllib.error import HTTPError, URLError
-from urllib.request import urlopen
 
 from pcluster.aws.aws_api import AWSApi
 from pcluster.aws.common import AWSClientError
 from pcluster.utils import AsyncUtils, get_url_scheme
 from pcluster.validators.common import AsyncValidator, FailureLevel, Validator
-from pcluster.validators.utils import get_bucket_name_from_s3_url
+from pcluster.validators.utils import UrlProber, get_bucket_name_from_s3_url
 
 
 class UrlValidator(AsyncValidator):
@@ -81,11 +80,7 @@ class UrlValidator(AsyncValidator):
 
     def _validate_https_uri(self, url: str, fail_on_error: bool):
         try:
-            # A nosec comment is appended to the following line in order to disable the B310 check.
-            # The urlopen argument is properly validated
-            # [B310:blacklist] Audit url open for permitted schemes.
-            with urlopen(url):  # nosec B310 nosemgrep
-                pass
+            UrlProber.instance().probe(url)
         except HTTPError as e:
             self._add_failure(
                 f"The url '{url}' causes HTTPError, the error code is '{e.code}',"
@@ -128,6 +123,11 @@ class S3BucketUriValidator(Validator):
 class S3BucketValidator(Validator):
     """S3 Bucket Validator."""
 
+    @classmethod
+    def invocation_key(cls, bucket):
+        """Return the bucket name, each bucket is checked once."""
+        return bucket
+
     def _validate(self, bucket):
         try:
             AWSApi.instance().s3.head_bucket(bucket_name=bucket)
@@ -12,7 +12,190 @@
 # This module contains all the classes representing the Resources objects.
 # These objects are obtained from the configuration file through a conversion based on the Schema classes.
 #
+import socket
+import threading
+from base64 import b64encode
+from collections import defaultdict
+from http.client import HTTPConnection, HTTPException, HTTPSConnection
+from urllib.error import HTTPError, URLError
+from urllib.parse import unquote, urljoin, urlsplit
+from urllib.request import getproxies, proxy_bypass
 
 
 def get_bucket_name_from_s3_url(import_path):
     return import_path.split("/")[2]
+
+
+class UrlProber:
+    """
+    Probe the reachability of http(s) urls without downloading their content.
+
+    A url is probed with a HEAD request, falling back to a GET of its first byte when the server does not allow HEAD.
+    Connections are kept alive and reused per host, redirects are followed up to a limit and the results are
+    memoized per url until the prober is reset, at the beginning of every validation run. The proxies of the
+    environment (http_proxy, https_proxy, no_proxy) are honored: https urls are reached through a tunnel.
+    """
+
+    CONNECT_TIMEOUT = 5
+    READ_TIMEOUT = 10
+    MAX_REDIRECTS = 5
+    REDIRECT_CODES = {301, 302, 303, 307, 308}
+    # Status codes of the servers not supporting HEAD requests, and of the presigned S3 urls, signed for GET only
+    HEAD_NOT_SUPPORTED_CODES = {403, 405, 501}
+
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    def __init__(
+        self, connect_timeout: float = CONNECT_TIMEOUT, read_timeout: float = READ_TIMEOUT, max_redirects=MAX_REDIRECTS
+    ):
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.max_redirects = max_redirects
+        self._results = {}
+        self._url_locks = {}
+        self._idle_connections = defaultdict(list)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def instance():
+        """Return the prober shared by the validators."""
+        with UrlProber._instance_lock:
+            if not UrlProber._instance:
+                UrlProber._instance = UrlProber()
+            return UrlProber._instance
+
+    @staticmethod
+    def reset():
+        """Discard the shared prober, with its memoized results and its connections."""
+        with UrlProber._instance_lock:
+            if UrlProber._instance:
+                UrlProber._instance.close()
+            UrlProber._instance = None
+
+    def close(self):
+        """Close the idle connections."""
+        with self._lock:
+            for connections in self._idle_connections.values():
+                for connection in connections:
+                    connection.close()
+            self._idle_connections.clear()
+
+    def probe(self, url: str) -> int:
+        """
+        Probe the url and return the status code of the response, after following the redirects.
+
+        Raise HTTPError if the response is an error, URLError if the url cannot be reached or the connection is lost
+        while waiting for the response. The errors are memoized as well.
+        """
+        with self._lock:
+            url_lock = self._url_locks.setdefault(url, threading.Lock())
+        with url_lock:
+            if url not in self._results:
+                try:
+                    self._results[url] = self._probe(url)
+                except URLError as e:
+                    self._results[url] = e
+            result = self._results[url]
+        if isinstance(result, URLError):
+            raise result
+        return result
+
+    def _probe(self, url: str) -> int:
+        for _ in range(self.max_redirects + 1):
+            status, reason, location = self._request(url, "HEAD")
+            if status in self.HEAD_NOT_SUPPORTED_CODES:
+                status, reason, location = self._request(url, "GET", headers={"Range": "bytes=0-0"})
+            if status in self.REDIRECT_CODES and location:
+                url = urljoin(url, location)
+            elif status >= 400:
+                raise HTTPError(url, status, reason, None, None)
+            else:
+                return status
+        raise URLError(f"more than {self.max_redirects} redirects")
+
+    def _request(self, url: str, method: str, headers: dict = None):
+        """Send a request reusing an idle connection to the host, if any, and return status, reason and location."""
+        parsed_url = urlsplit(url)
+        if parsed_url.scheme not in ["http", "https"] or not parsed_url.hostname:
+            raise ValueError(f"Invalid url {url}")
+        host_key = (parsed_url.scheme, parsed_url.netloc)
+        path = (parsed_url.path or "/") + (f"?{parsed_url.query}" if parsed_url.query else "")
+        proxy = self._get_proxy(parsed_url)
+        headers = dict(headers or {})
+        if proxy and parsed_url.scheme == "http":
+            # Plain http requests are forwarded by the proxy, which needs the absolute url
+            path = f"http://{parsed_url.netloc}{path}"
+            headers.update(self._get_proxy_headers(proxy))
+
+        connection = self._get_idle_connection(host_key)
+        if connection:
+            try:
+                return self._send(host_key, connection, method, path, headers)
+            except ConnectionError:
+                # The server closed the idle connection, the request is sent again on a new connection
+                pass
+        try:
+            return self._send(host_key, self._connect(parsed_url, proxy), method, path, headers)
+        except ConnectionError as e:
+            raise URLError(e)
+
+    @staticmethod
+    def _get_proxy(parsed_url):
+        """Return the parsed url of the proxy to use for the given url, None if it must be reached directly."""
+        proxy = getproxies().get(parsed_url.scheme)
+        if not proxy or proxy_bypass(parsed_url.hostname):
+            return None
+        return urlsplit(proxy if "://" in proxy else f"http://{proxy}")
+
+    @staticmethod
+    def _get_proxy_headers(proxy):
+        if proxy.username is None:
+            return {}
+        credentials = f"{unquote(proxy.username)}:{unquote(proxy.password or '')}"
+        return {"Proxy-Authorization": f"Basic {b64encode(credentials.encode()).decode()}"}
+
+    def _get_idle_connection(self, host_key):
+        with self._lock:
+            connections = self._idle_connections[host_key]
+            return connections.pop() if connections else None
+
+    def _connect(self, parsed_url, proxy=None):
+        connection_class = HTTPSConnection if parsed_url.scheme == "https" else HTTPConnection
+        if proxy:
+            connection = connection_class(proxy.hostname, proxy.port or 80, timeout=self.connect_timeout)
+            if parsed_url.scheme == "https":
+                connection.set_tunnel(parsed_url.hostname, parsed_url.port, headers=self._get_proxy_headers(proxy))
+        else:
+            connection = connection_class(parsed_url.hostname, parsed_url.port, timeout=self.connect_timeout)
+        try:
+            connection.connect()
+        except OSError as e:
+            connection.close()
+            raise URLError(e)
+        connection.sock.settimeout(self.read_timeout)
+        return connection
+
+    def _send(self, host_key, connection, method: str, path: str, headers: dict):
+        try:
+            connection.request(method, path, headers=headers)
+            response = connection.getresponse()
+            if method == "HEAD":
+                response.read()
+        except socket.timeout:
+            connection.close()
+            raise URLError(f"timed out after {self.read_timeout} seconds")
+        except ConnectionError:
+            connection.close()
+            raise
+        except (OSError, HTTPException) as e:
+            connection.close()
+            raise URLError(e)
+
+        if method == "HEAD" and not response.will_close:
+            with self._lock:
+                self._idle_connections[host_key].append(connection)
+        else:
+            # The body of the other responses is not read, it could be the whole content if Range is not supported
+            connection.close()
+        return response.status, response.reason, response.getheader("Location")
@@ -8,11 +8,15 @@
 #  OR CONDITIONS OF ANY KIND, express or implied. See the License for the specific language governing permissions and
 #  limitations under the License.
 import errno
+import functools
+import glob
 import json
 import os
 import re
 import stat
 import sys
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stdout
 
 import argparse
 import boto3
@@ -30,29 +34,63 @@ class ConfigDumper(yaml.Dumper):
         return super(ConfigDumper, self).increase_indent(flow, False)
 
 
+# Results of the AWS lookups, shared by all the conversions run by the process.
+# In batch mode the worker processes are seeded with the lookups done by the parent process.
+_aws_lookups = {}
+
+# Warnings and notes of the conversion in progress, collected only in batch mode to build the report
+_collected_messages = None
+
+
+def _memoize_aws_lookup(function):
+    """Run the given AWS lookup once per process and set of arguments."""
+
+    @functools.wraps(function)
+    def _wrapper(*args):
+        key = (function.__name__, *args)
+        if key not in _aws_lookups:
+            _aws_lookups[key] = function(*args)
+        return _aws_lookups[key]
+
+    return _wrapper
+
+
 def _role_name_to_arn(role_name, partition):
     """Convert role name to arn."""
     return "arn:{0}:iam::{1}:role/{2}".format(partition, _get_account_id(), role_name)
 
 
+@_memoize_aws_lookup
 def _get_account_id():
     """Get account id from boto3 call."""
     return boto3.client("sts").get_caller_identity().get("Account")
 
 
+@_memoize_aws_lookup
+def _get_default_region():
+    """Get the region set in the environment or in the AWS config file."""
+    return boto3.Session().region_name
+
+
 def _error(message):
     """Raise SystemExit exception to the stderr."""
     sys.exit("ERROR: {0}".format(message))
 
 
+def _print_message(level, message):
+    print("{0}: {1}".format(level, message))
+    if _collected_messages is not None:
+        _collected_messages.append({"Level": level, "Message": message.strip()})
+
+
 def _warn(message):
     """Print warning message to stdout."""
-    print("Warning: {0}".format(message))
+    _print_message("Warning", message)
 
 
 def _note(message):
     """Print a note to stdout."""
-    print("Note: {0}".format(message))
+    _print_message("Note", message)
 
 
 def _add_if(section, section_name, value):
@@ -914,7 +952,7 @@ class Pcluster3ConfigConverter(object):
     def get_region(self):
         """Get region to use for instance role arn and instance profile arn."""
         config_region = self.config_parser.get("aws", "aws_region_name", fallback=None)
-        boto_region = boto3.Session().region_name
+        boto_region = _get_default_region()
         if not config_region and not boto_region:
             _error("Region not found. Please specify aws_region_name in the configuration or set region in aws_config.")
         return config_region or boto_region
@@ -1076,11 +1114,19 @@ def _parse_args(argv=None):
     convert_parser = argparse.ArgumentParser(
         description="Convert AWS ParallelCluster configuration file.",
     )
-    convert_parser.add_argument(
+    input_group = convert_parser.add_mutually_exclusive_group(required=True)
+    input_group.add_argument(
         "-c",
         "--config-file",
         help="Configuration file to be used as input.",
-        required=True,
+    )
+    input_group.add_argument(
+        "-b",
+        "--batch",
+        help=(
+            "Directory or glob pattern (e.g. 'configs/**/*.ini') of the configuration files to convert in batch mode. "
+            "Requires --output-dir."
+        ),
     )
     convert_parser.add_argument(
         "-t",
@@ -1098,6 +1144,27 @@ def _parse_args(argv=None):
         help="Configuration file to be written as output. By default the output will be written to stdout.",
         required=False,
     )
+    convert_parser.add_argument(
+        "--output-dir",
+        help=(
+            "Directory where the converted configuration files are written in batch mode, "
+            "with the same relative path as the input files and the .yaml extension."
+        ),
+        required=False,
+    )
+    convert_parser.add_argument(
+        "--report-file",
+        help="File where the JSON report of the batch conversion is written. Defaults to <output-dir>/report.json.",
+        required=False,
+    )
+    convert_parser.add_argument(
+        "-j",
+        "--jobs",
+        help="Number of configuration files converted in parallel in batch mode. Defaults to the number of CPUs.",
+        type=int,
+        default=os.cpu_count() or 1,
+        required=False,
+    )
     convert_parser.add_argument(
         "--force-convert",
         help="Convert parameters that are not officially supported and not recommended.",
@@ -1106,7 +1173,16 @@ def _parse_args(argv=None):
     )
     convert_parser.set_defaults(func=convert)
 
-    return convert_parser.parse_args(argv)
+    args = convert_parser.parse_args(argv)
+    if args.batch:
+        if not args.output_dir:
+            convert_parser.error("--output-dir is required in batch mode")
+        if args.output_file:
+            convert_parser.error("--output-file cannot be used in batch mode, use --output-dir")
+        if args.jobs < 1:
+            convert_parser.error("--jobs must be a positive number")
+        args.func = convert_batch
+    return args
 
 
 def convert(args=None):
@@ -1125,6 +1201,125 @@ def convert(args=None):
         sys.exit(1)
 
 
+def _find_batch_config_files(batch_input):
+    """Return the configuration files matching the batch input and the directory their output path is relative to."""
+    if os.path.isdir(batch_input):
+        base_dir = os.path.abspath(batch_input)
+        config_files = [
+            os.path.join(base_dir, file_name)
+            for file_name in os.listdir(base_dir)
+            if not file_name.startswith(".") and os.path.isfile(os.path.join(base_dir, file_name))
+        ]
+    else:
+        config_files = [
+            os.path.abspath(path) for path in glob.glob(batch_input, recursive=True) if os.path.isfile(path)
+        ]
+        base_dir = os.path.commonpath([os.path.dirname(path) for path in config_files]) if config_files else None
+    return sorted(config_files), base_dir
+
+
+def _get_batch_output_file(config_file, base_dir, output_dir):
+    """
+    Return the path of the converted configuration file.
+
+    e.g. <base_dir>/team1/cluster.ini -> <output_dir>/team1/cluster.yaml
+    """
+    relative_path = os.path.splitext(os.path.relpath(config_file, base_dir))[0]
+    return os.path.join(output_dir, relative_path + ".yaml")
+
+
+def _prefetch_aws_lookups():
+    """
+    Run the AWS lookups needed by most conversions once, before starting the worker processes.
+
+    Failures are ignored here: the lookups are retried by the conversions needing them, which then report the error.
+    """
+    for lookup in (_get_default_region, _get_account_id):
+        try:
+            lookup()
+        except Exception:  # nosec B112
+            continue
+    return dict(_aws_lookups)
+
+
+def _init_batch_worker(aws_lookups):
+    """Seed the AWS lookups of a worker process with the ones done by the parent process."""
+    _aws_lookups.update(aws_lookups)
+
+
+def _convert_batch_file(config_file, output_file, cluster_template, force_convert):
+    """Convert a single configuration file in batch mode and return its entry of the report."""
+    global _collected_messages  # pylint: disable=global-statement
+    _collected_messages = []
+    result = {"ConfigFile": config_file, "OutputFile": output_file}
+    try:
+        # The messages of the conversions running in parallel are reported at the end, in the report
+        with open(os.devnull, "w", encoding="utf-8") as devnull, redirect_stdout(devnull):
+            converter = Pcluster3ConfigConverter(config_file, cluster_template, output_file, False, force_convert)
+            converter.validate()
+            converter.convert_to_pcluster3_config()
+            converter.write_configuration_file()
+        result["Status"] = "CONVERTED"
+    except SystemExit as e:
+        result.update({"Status": "FAILED", "Error": str(e.code)})
+    except Exception as e:
+        result.update({"Status": "FAILED", "Error": f"Unexpected error of type {type(e).__name__}: {e}"})
+    finally:
+        result["Messages"] = _collected_messages
+        _collected_messages = None
+    return result
+
+
+def convert_batch(args):
+    """Convert all the configuration files matching the batch input, in parallel, and write a consolidated report."""
+    config_files, base_dir = _find_batch_config_files(args.batch)
+    report_file = args.report_file or os.path.join(args.output_dir, "report.json")
+    conversions = [
+        (config_file, _get_batch_output_file(config_file, base_dir, args.output_dir))
+        for config_file in config_files
+        if os.path.abspath(config_file) != os.path.abspath(report_file)
+    ]
+    if not conversions:
+        _error(f"No configuration files found matching {args.batch}.")
+
+    try:
+        aws_lookups = _prefetch_aws_lookups()
+        jobs = min(args.jobs, len(conversions))
+        convert_file = functools.partial(
+            _convert_batch_file, cluster_template=args.cluster_template, force_convert=args.force_convert
+        )
+        if jobs == 1:
+            results = [convert_file(config_file, output_file) for config_file, output_file in conversions]
+        else:
+            with ProcessPoolExecutor(
+                max_workers=jobs, initializer=_init_batch_worker, initargs=(aws_lookups,)
+            ) as executor:
+                results = list(executor.map(convert_file, *zip(*conversions)))
+    except KeyboardInterrupt:
+        print("Exiting...")
+        sys.exit(1)
+
+    failures = [result for result in results if result["Status"] == "FAILED"]
+    for result in failures:
+        print(f"Failed to convert {result['ConfigFile']}: {result['Error']}")
+    report = {
+        "Summary": {
+            "Total": len(results),
+            "Converted": len(results) - len(failures),
+            "Failed": len(failures),
+            "Warnings": sum(1 for result in results for message in result["Messages"] if message["Level"] == "Warning"),
+        },
+        "Results": results,
+    }
+    os.makedirs(os.path.dirname(report_file) or ".", exist_ok=True)
+    with open(report_file, "w", encoding="utf-8") as report_output:
+        json.dump(report, report_output, indent=2)
+    print("Converted {Converted} of {Total} configuration files with {Warnings} warnings.".format(**report["Summary"]))
+    print(f"Report written to {report_file}")
+    if failures:
+        sys.exit(1)
+
+
 def main(argv=None):
     args = _parse_args(argv)
     args.func(args)
@@ -40,6 +40,39 @@ def reset_aws_api():
     AWSApi._instance = None
 
 
+@pytest.fixture(autouse=True)
+def reset_stack_event_stores():
+    """Remove the stack events cached by previous tests."""
+    from pcluster.models.common import StackEventStore
+
+    StackEventStore.clear_all()
+
+
+@pytest.fixture(autouse=True)
+def reset_instance_type_offering_matrices(mocker, tmp_path):
+    """Remove the instance type offering matrices built by previous tests and isolate their persistence."""
+    from pcluster.aws.ec2 import InstanceTypeOfferingMatrix
+
+    InstanceTypeOfferingMatrix.clear_all()
+    mocker.patch.object(InstanceTypeOfferingMatrix, "CACHE_DIR", str(tmp_path / "cache"))
+
+
+@pytest.fixture(autouse=True)
+def reset_url_prober():
+    """Remove the url probe results memoized by previous tests."""
+    from pcluster.validators.utils import UrlProber
+
+    UrlProber.reset()
+
+
+@pytest.fixture(autouse=True)
+def reset_image_list_cache():
+    """Remove the pages of images cached by previous tests."""
+    from pcluster.aws.ec2 import ImageListCache
+
+    ImageListCache.clear_all()
+
+
 @pytest.fixture
 def failed_with_message(capsys):
     """Assert that the command exited with a specific error message."""
@@ -0,0 +1,123 @@
+#  Copyright 2024 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License"). You may not use this file except in compliance
+#  with the License. A copy of the License is located at http://aws.amazon.com/apache2.0/
+#  or in the "LICENSE.txt" file accompanying this file. This file is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES
+#  OR CONDITIONS OF ANY KIND, express or implied. See the License for the specific language governing permissions and
+#  limitations under the License.
+import base64
+import gzip
+import json
+
+import pytest
+from assertpy import assert_that
+from flask import Flask, Response, jsonify
+
+from pcluster.api.awslambda import serverless_wsgi
+from pcluster.api.awslambda.serverless_wsgi import handle_request, select_content_encoding
+
+
+@pytest.fixture
+def app():
+    app = Flask(__name__)
+
+    @app.route("/events/<int:size>")
+    def events(size):
+        return jsonify(
+            {"events": [{"message": f"message {i}", "timestamp": "2021-07-15T01:22:02.655Z"} for i in range(size)]}
+        )
+
+    @app.route("/binary")
+    def binary():
+        return Response(bytes(range(256)) * 10, mimetype="application/octet-stream")
+
+    return app
+
+
+def _v1_event(path, headers):
+    return {
+        "version": "1.0",
+        "path": path,
+        "httpMethod": "GET",
+        "headers": headers,
+        "multiValueHeaders": {key: [value] for key, value in headers.items()},
+        "queryStringParameters": None,
+        "body": None,
+        "isBase64Encoded": False,
+        "requestContext": {"stage": "prod"},
+    }
+
+
+def _v2_event(path, headers):
+    return {
+        "version": "2.0",
+        "rawPath": path,
+        "rawQueryString": "",
+        "headers": headers,
+        "isBase64Encoded": False,
+        "requestContext": {"stage": "prod", "http": {"method": "GET"}},
+    }
+
+
+def _get_header(response, name):
+    if "multiValueHeaders" in response:
+        return response["multiValueHeaders"].get(name, [None])[0]
+    return response["headers"].get(name)
+
+
+@pytest.mark.parametrize(
+    "accept_encoding, brotli_available, expected_encoding",
+    [
+        (None, True, None),
+        ("", True, None),
+        ("gzip", True, "gzip"),
+        ("gzip, deflate, br", True, "br"),
+        ("gzip, deflate, br", False, "gzip"),
+        ("br;q=0.5, gzip", True, "gzip"),
+        ("gzip;q=0, deflate", True, None),
+        ("identity", True, None),
+        ("*", False, "gzip"),
+    ],
+)
+def test_select_content_encoding(mocker, accept_encoding, brotli_available, expected_encoding):
+    mocker.patch.object(serverless_wsgi, "brotli", object() if brotli_available else None)
+    assert_that(select_content_encoding(accept_encoding)).is_equal_to(expected_encoding)
+
+
+@pytest.mark.parametrize("build_event", [_v1_event, _v2_event])
+@pytest.mark.parametrize(
+    "path, accept_encoding, min_size, expect_compressed",
+    [
+        ("/events/1000", "gzip", None, True),
+        ("/events/1000", None, None, False),
+        ("/events/1000", "deflate", None, False),
+        ("/events/1", "gzip", None, False),
+        ("/events/1", "gzip", "0", True),
+        ("/events/1000", "gzip", "-1", False),
+        ("/binary", "gzip", None, False),
+    ],
+)
+def test_response_compression(set_env, app, build_event, path, accept_encoding, min_size, expect_compressed):
+    if min_size is not None:
+        set_env("COMPRESSION_MIN_SIZE", min_size)
+    headers = {"Host": "localhost"}
+    if accept_encoding:
+        headers["Accept-Encoding"] = accept_encoding
+
+    response = handle_request(app, build_event(path, headers), None)
+    expected_body = app.test_client().get(path).get_data()
+
+    assert_that(response["statusCode"]).is_equal_to(200)
+    if expect_compressed:
+        assert_that(response["isBase64Encoded"]).is_true()
+        assert_that(_get_header(response, "Content-Encoding")).is_equal_to("gzip")
+        assert_that(_get_header(response, "Vary")).is_equal_to("Accept-Encoding")
+        compressed_body = base64.b64decode(response["body"])
+        assert_that(_get_header(response, "Content-Length")).is_equal_to(str(len(compressed_body)))
+        assert_that(gzip.decompress(compressed_body)).is_equal_to(expected_body)
+    else:
+        assert_that(_get_header(response, "Content-Encoding")).is_none()
+        if response["isBase64Encoded"]:
+            assert_that(base64.b64decode(response["body"])).is_equal_to(expected_body)
+        else:
+            assert_that(json.loads(response["body"])).is_equal_to(json.loads(expected_body))
@@ -1110,8 +1110,16 @@ class TestDescribeCluster:
             ),
         )
         mocker.patch(
-            "pcluster.models.cluster_resources.get_all_stack_events",
-            return_value=get_stack_events_response,
+            "pcluster.aws.cfn.CfnClient.get_stack_events",
+            side_effect=[
+                (
+                    {"StackEvents": events, "nextToken": f"token-{index}"}
+                    if index < len(get_stack_events_response) - 1
+                    else {"StackEvents": events}
+                )
+                for index, events in enumerate(get_stack_events_response)
+            ]
+            or [{"StackEvents": []}],
         )
         mocker.patch(
             "pcluster.aws.ec2.Ec2Client.describe_instances",
@@ -1818,6 +1826,7 @@ class TestUpdateCluster:
         validation_failure_level=None,
         dryrun=None,
         force_update=None,
+        full_validation=None,
     ):
         query_string = []
         if region:
@@ -1830,6 +1839,8 @@ class TestUpdateCluster:
             query_string.append(("dryrun", dryrun))
         if force_update is not None:
             query_string.append(("forceUpdate", force_update))
+        if full_validation is not None:
+            query_string.append(("fullValidation", full_validation))
 
         headers = {"Accept": "application/json", "Content-Type": "application/json"}
         return client.open(
@@ -1841,7 +1852,8 @@ class TestUpdateCluster:
         )
 
     @pytest.mark.parametrize(
-        "update_cluster_request_content, errors, suppress_validators, validation_failure_level, force_update",
+        "update_cluster_request_content, errors, suppress_validators, validation_failure_level, force_update, "
+        "full_validation",
         [
             pytest.param(
                 {"clusterConfiguration": CONFIG},
@@ -1849,6 +1861,7 @@ class TestUpdateCluster:
                 None,
                 None,
                 None,
+                None,
                 id="test with all errors",
             ),
             pytest.param(
@@ -1857,6 +1870,7 @@ class TestUpdateCluster:
                 ["type:type1", "type:type2"],
                 ValidationLevel.WARNING,
                 False,
+                False,
                 id="test with filtered errors",
             ),
             pytest.param(
@@ -1865,7 +1879,8 @@ class TestUpdateCluster:
                 ["type:type1", "type:type2"],
                 ValidationLevel.WARNING,
                 False,
-                id="test with no errors",
+                True,
+                id="test with no errors and full validation",
             ),
         ],
     )
@@ -1878,6 +1893,7 @@ class TestUpdateCluster:
         suppress_validators,
         validation_failure_level,
         force_update,
+        full_validation,
     ):
         change_set = [
             ["param_path", "parameter", "old value", "new value", "check", "reason", "action_needed"],
@@ -1896,6 +1912,7 @@ class TestUpdateCluster:
             validation_failure_level,
             False,
             force_update,
+            full_validation,
         )
 
         expected_response = {
@@ -1924,6 +1941,7 @@ class TestUpdateCluster:
             target_source_config="Image:\n  Os: alinux2\nHeadNode:\n  InstanceType: t3.micro",
             validator_suppressors=mocker.ANY,
             validation_failure_level=FailureLevel[validation_failure_level or ValidationLevel.ERROR],
+            full_validation=full_validation is True,
         )
         cluster_update_mock.assert_called_once()
         if suppress_validators:
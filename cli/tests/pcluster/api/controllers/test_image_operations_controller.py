@@ -84,7 +84,7 @@ class TestListImages:
     url = "v3/images/custom"
     method = "GET"
 
-    def _send_test_request(self, client, image_status, next_token=None, region="us-east-1"):
+    def _send_test_request(self, client, image_status, next_token=None, region="us-east-1", filters=None):
         query_string = []
 
         if region:
@@ -96,11 +96,20 @@ class TestListImages:
         if next_token:
             query_string.append(("nextToken", next_token))
 
+        query_string.extend((filters or {}).items())
+
         headers = {"Accept": "application/json"}
 
         return client.open(self.url, method=self.method, headers=headers, query_string=query_string)
 
-    def test_list_available_images_successful(self, client, mocker):
+    @pytest.mark.parametrize(
+        "next_token, filters, expected_next_token",
+        [
+            (None, {}, None),
+            ("nextToken", {"os": "alinux2", "architecture": "arm64", "version": "3.0.0"}, "nextPage"),
+        ],
+    )
+    def test_list_available_images_successful(self, client, mocker, next_token, filters, expected_next_token):
         describe_result = [_create_image_info("image1"), _create_image_info("image2")]
         expected_response = {
             "images": [
@@ -120,16 +129,67 @@ class TestListImages:
                 },
             ]
         }
-        mocker.patch("pcluster.aws.ec2.Ec2Client.get_images", return_value=describe_result)
+        if expected_next_token:
+            expected_response["nextToken"] = expected_next_token
+        get_images_page_mock = mocker.patch(
+            "pcluster.aws.ec2.Ec2Client.get_images_page", return_value=(describe_result, expected_next_token)
+        )
 
         # Ensure we don't hit AWS when creating ImageBuilderStack(s)
         mocker.patch("pcluster.aws.cfn.CfnClient.describe_stack_resource", return_value=None)
 
-        response = self._send_test_request(client, ImageStatusFilteringOption.AVAILABLE)
+        response = self._send_test_request(client, ImageStatusFilteringOption.AVAILABLE, next_token, filters=filters)
 
         with soft_assertions():
             assert_that(response.status_code).is_equal_to(200)
             assert_that(response.get_json()).is_equal_to(expected_response)
+        get_images_page_mock.assert_called_with(
+            os=filters.get("os"),
+            architecture=filters.get("architecture"),
+            version=filters.get("version"),
+            next_token=next_token,
+        )
+
+    @pytest.mark.parametrize(
+        "image_status, filters, expected_message",
+        [
+            (ImageStatusFilteringOption.AVAILABLE, {"os": "windows"}, "Bad Request: windows is not one of"),
+            (ImageStatusFilteringOption.AVAILABLE, {"architecture": "sparc"}, "Bad Request: sparc is not one of"),
+            (
+                ImageStatusFilteringOption.FAILED,
+                {"os": "alinux2"},
+                "Bad Request: The os and architecture filters are supported only for AVAILABLE images.",
+            ),
+        ],
+    )
+    def test_list_images_with_invalid_filters(self, client, mocker, image_status, filters, expected_message):
+        get_images_page_mock = mocker.patch("pcluster.aws.ec2.Ec2Client.get_images_page")
+        get_stacks_mock = mocker.patch("pcluster.aws.cfn.CfnClient.get_imagebuilder_stacks")
+
+        response = self._send_test_request(client, image_status, filters=filters)
+
+        with soft_assertions():
+            assert_that(response.status_code).is_equal_to(400)
+            assert_that(response.get_json()["message"]).starts_with(expected_message)
+        get_images_page_mock.assert_not_called()
+        get_stacks_mock.assert_not_called()
+
+    def test_list_failed_images_by_version(self, client, mocker):
+        old_stack = _create_stack("image1", CloudFormationStackStatus.CREATE_FAILED)
+        new_stack = _create_stack("image2", CloudFormationStackStatus.CREATE_FAILED)
+        new_stack["Tags"][1]["Value"] = "3.1.0"
+        mocker.patch("pcluster.aws.cfn.CfnClient.get_imagebuilder_stacks", return_value=([old_stack, new_stack], None))
+        describe_stack_resource_mock = mocker.patch(
+            "pcluster.aws.cfn.CfnClient.describe_stack_resource", return_value=None
+        )
+
+        response = self._send_test_request(client, ImageStatusFilteringOption.FAILED, filters={"version": "3.1.0"})
+
+        with soft_assertions():
+            assert_that(response.status_code).is_equal_to(200)
+            assert_that([image["imageId"] for image in response.get_json()["images"]]).is_equal_to(["image2"])
+        # Only the image resource of the selected stack is described
+        describe_stack_resource_mock.assert_called_once()
 
     @pytest.mark.parametrize("next_token", [None, "nextToken"], ids=["nextToken is None", "nextToken is not None"])
     def test_list_pending_images_successful(self, client, mocker, next_token):
@@ -270,7 +330,8 @@ class TestListImages:
     )
     def test_that_errors_are_converted(self, client, mocker, error, status_code):
         mocker.patch(
-            "pcluster.aws.ec2.Ec2Client.get_images", side_effect=error(function_name="get_images", message="test error")
+            "pcluster.aws.ec2.Ec2Client.get_images_page",
+            side_effect=error(function_name="describe_images", message="test error"),
         )
         expected_error = {"message": "test error"}
         if error == BadRequestError:
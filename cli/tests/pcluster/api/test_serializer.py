@@ -0,0 +1,155 @@
+#  Copyright 2024 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License"). You may not use this file except in compliance
+#  with the License. A copy of the License is located at http://aws.amazon.com/apache2.0/
+#  or in the "LICENSE.txt" file accompanying this file. This file is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES
+#  OR CONDITIONS OF ANY KIND, express or implied. See the License for the specific language governing permissions and
+#  limitations under the License.
+import datetime
+import json
+from decimal import Decimal
+
+import pytest
+from assertpy import assert_that
+from flask import Flask
+
+from pcluster.api import encoder, serializer
+from pcluster.api.models import (
+    ClusterInstance,
+    DescribeClusterInstancesResponseContent,
+    GetClusterLogEventsResponseContent,
+    LogEvent,
+    Tag,
+)
+from pcluster.api.serializer import SerializationPlan
+
+
+@pytest.fixture(autouse=True)
+def clear_serialization_plans():
+    SerializationPlan.clear_all()
+    yield
+    SerializationPlan.clear_all()
+
+
+def _legacy_default(obj):
+    """Per object serialization performed before the introduction of the serialization plans."""
+    if isinstance(obj, serializer.Model):
+        return {
+            obj.attribute_map[attr]: getattr(obj, attr) for attr in obj.openapi_types if getattr(obj, attr) is not None
+        }
+    if isinstance(obj, datetime.date):
+        return serializer.to_iso_timestr(obj)
+    raise TypeError(obj)
+
+
+def _log_events_response(size):
+    timestamp = datetime.datetime(2021, 7, 15, 1, 22, 2, 655000, tzinfo=datetime.timezone.utc)
+    return GetClusterLogEventsResponseContent(
+        next_token="next",
+        events=[LogEvent(message=f"message {i}", timestamp=timestamp) for i in range(size)],
+    )
+
+
+def _instances_response(size):
+    return DescribeClusterInstancesResponseContent(
+        instances=[
+            ClusterInstance(
+                launch_time=datetime.datetime(2021, 7, 15, 1, 22, 2),
+                instance_id=f"i-{i:017d}",
+                queue_name="queue",
+                instance_type="c5.xlarge",
+                state="running",
+                node_type="ComputeNode",
+                private_ip_address="10.0.0.1",
+            )
+            for i in range(size)
+        ]
+    )
+
+
+@pytest.mark.parametrize(
+    "response",
+    [
+        _log_events_response(0),
+        _log_events_response(10),
+        _instances_response(10),
+        [Tag(key="key", value="value"), LogEvent(message="message"), "string", 1, None],
+        {"nested": {"tags": (Tag(key="key"),), "time": datetime.datetime(2021, 1, 1)}},
+    ],
+)
+def test_to_serializable_matches_legacy_encoder(response):
+    expected = json.loads(json.dumps(response, default=_legacy_default))
+    assert_that(serializer.to_serializable(response)).is_equal_to(expected)
+    assert_that(json.loads(encoder.JSONEncoder().encode(response))).is_equal_to(expected)
+
+
+def test_to_serializable_include_nulls():
+    assert_that(serializer.to_serializable(Tag(key="key"))).is_equal_to({"key": "key"})
+    assert_that(serializer.to_serializable(Tag(key="key"), include_nulls=True)).is_equal_to(
+        {"key": "key", "value": None}
+    )
+    assert_that(serializer.to_serializable({"value": Decimal("1.5")})).is_equal_to({"value": "1.5"})
+
+
+def test_serialization_plan_is_built_once_per_class():
+    serializer.to_serializable(_log_events_response(100))
+    # One plan for the response content and one for the log events
+    assert_that(SerializationPlan._plans).is_length(2)
+
+    plan = SerializationPlan.get(LogEvent())
+    serializer.to_serializable(_log_events_response(100))
+    assert_that(SerializationPlan.get(LogEvent())).is_same_as(plan)
+    assert_that(plan.direct_access).is_true()
+    assert_that(plan.fields).is_equal_to((("_message", "message"), ("_timestamp", "timestamp")))
+
+
+def test_serialization_plan_without_backing_fields():
+    class _PropertyModel(serializer.Model):
+        def __init__(self):
+            self.openapi_types = {"computed_value": str}
+            self.attribute_map = {"computed_value": "computedValue"}
+
+        @property
+        def computed_value(self):
+            return "value"
+
+    plan = SerializationPlan.get(_PropertyModel())
+    assert_that(plan.direct_access).is_false()
+    assert_that(serializer.to_serializable(_PropertyModel())).is_equal_to({"computedValue": "value"})
+
+
+@pytest.mark.parametrize("orjson_available", [True, False])
+@pytest.mark.parametrize(
+    "kwargs",
+    [{"indent": 2}, {"indent": 2, "sort_keys": True}, {"separators": (",", ":")}, {}],
+)
+def test_dumps(mocker, orjson_available, kwargs):
+    if not orjson_available:
+        mocker.patch("pcluster.api.serializer.orjson", None)
+    elif serializer.orjson is None:
+        pytest.skip("orjson is not installed")
+    response = _instances_response(3)
+
+    expected = json.dumps(json.loads(json.dumps(response, default=_legacy_default)), **kwargs)
+    assert_that(serializer.dumps(response, **kwargs)).is_equal_to(expected)
+
+
+@pytest.mark.parametrize("orjson_available", [True, False])
+def test_dumps_default(mocker, orjson_available):
+    if not orjson_available:
+        mocker.patch("pcluster.api.serializer.orjson", None)
+    elif serializer.orjson is None:
+        pytest.skip("orjson is not installed")
+
+    class _Markup:
+        def __html__(self):
+            return "<b>markup</b>"
+
+    with pytest.raises(TypeError):
+        serializer.dumps({"value": _Markup()}, separators=(",", ":"))
+    assert_that(
+        serializer.dumps({"value": _Markup()}, separators=(",", ":"), default=lambda obj: obj.__html__())
+    ).is_equal_to('{"value":"<b>markup</b>"}')
+    # The Flask JSON provider falls back to the default of the Flask provider
+    provider = encoder.JSONProvider(Flask(__name__))
+    assert_that(provider.dumps({"value": _Markup()}, separators=(",", ":"))).is_equal_to('{"value":"<b>markup</b>"}')
@@ -73,6 +73,7 @@ def test_retry_on_boto3_throttling(boto3_stubber, mocker):
         client.describe_stack_resources(StackName=FAKE_NAME)
 
     sleep_mock = mocker.patch("pcluster.utils.time.sleep")
+    backoff_mock = mocker.patch("pcluster.aws.common.compute_backoff_with_jitter", return_value=5)
     mocked_requests = [
         MockedBoto3Request(
             method="describe_stack_resources",
@@ -93,6 +94,7 @@ def test_retry_on_boto3_throttling(boto3_stubber, mocker):
     client = boto3_stubber("cloudformation", mocked_requests)
     describe_stack_resources(client)
     sleep_mock.assert_called_with(5)
+    assert_that([call.args for call in backoff_mock.call_args_list]).is_equal_to([(0,), (1,)])
 
 
 FAKE_SSM_PARAMETER = "fake-ssm-parameter-name"
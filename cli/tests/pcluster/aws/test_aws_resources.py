@@ -16,7 +16,7 @@
 import pytest
 from assertpy import assert_that
 
-from pcluster.aws.aws_resources import CapacityReservationInfo
+from pcluster.aws.aws_resources import CapacityReservationInfo, CapacityReservationsIndex
 
 
 @pytest.fixture()
@@ -77,3 +77,32 @@ class TestCapacityReservationInfo:
     )
     def test_reservation_type(self, capacity_reservation_data, expected_value):
         assert_that(CapacityReservationInfo(capacity_reservation_data).reservation_type()).is_equal_to(expected_value)
+
+
+def test_capacity_reservations_index():
+    capacity_reservations = [
+        CapacityReservationInfo(
+            {
+                "CapacityReservationId": capacity_reservation_id,
+                "InstanceType": instance_type,
+                "AvailabilityZone": availability_zone,
+                "AvailableInstanceCount": available_instance_count,
+            }
+        )
+        for capacity_reservation_id, instance_type, availability_zone, available_instance_count in [
+            ("cr-1", "c5.xlarge", "us-east-1a", 2),
+            ("cr-2", "c5.xlarge", "us-east-1a", 3),
+            ("cr-3", "c5.xlarge", "us-east-1b", 0),
+            ("cr-4", "p5.48xlarge", "us-east-1b", 1),
+        ]
+    ]
+    capacity_reservations_index = CapacityReservationsIndex(capacity_reservations)
+
+    assert_that(capacity_reservations_index.capacity_reservations).is_equal_to(capacity_reservations)
+    assert_that(capacity_reservations_index.availability_zones).is_equal_to({"us-east-1a", "us-east-1b"})
+    assert_that(capacity_reservations_index.get("c5.xlarge", "us-east-1a")).is_equal_to(capacity_reservations[:2])
+    assert_that(capacity_reservations_index.get("p5.48xlarge", "us-east-1a")).is_empty()
+    assert_that(capacity_reservations_index.remaining_capacity("c5.xlarge", "us-east-1a")).is_equal_to(5)
+    assert_that(capacity_reservations_index.remaining_capacity("c5.xlarge", "us-east-1b")).is_equal_to(0)
+    assert_that(capacity_reservations_index.remaining_capacity("p5.48xlarge", "us-east-1b")).is_equal_to(1)
+    assert_that(capacity_reservations_index.remaining_capacity("p5.48xlarge", "us-east-1c")).is_equal_to(0)
@@ -100,6 +100,7 @@ class TestCfnClient:
 
     def test_get_stack_events_retry(self, boto3_stubber, mocker):
         sleep_mock = mocker.patch("pcluster.aws.common.time.sleep")
+        mocker.patch("pcluster.aws.common.compute_backoff_with_jitter", return_value=5)
         expected_events = [_generate_stack_event()]
         mocked_requests = [
             MockedBoto3Request(
@@ -121,6 +122,7 @@ class TestCfnClient:
 
     def test_get_stack_retry(self, boto3_stubber, mocker):
         sleep_mock = mocker.patch("pcluster.aws.common.time.sleep")
+        mocker.patch("pcluster.aws.common.compute_backoff_with_jitter", return_value=5)
         expected_stack = {"StackName": FAKE_NAME, "CreationTime": 0, "StackStatus": "CREATED"}
         mocked_requests = [
             MockedBoto3Request(
@@ -143,6 +145,7 @@ class TestCfnClient:
 
     def test_verify_stack_status_retry(self, boto3_stubber, mocker):
         sleep_mock = mocker.patch("pcluster.aws.common.time.sleep")
+        mocker.patch("pcluster.aws.common.compute_backoff_with_jitter", return_value=5)
         mocker.patch(
             "pcluster.aws.cfn.CfnClient.describe_stack",
             side_effect=[{"StackStatus": "CREATE_IN_PROGRESS"}, {"StackStatus": "CREATE_FAILED"}],
@@ -17,7 +17,7 @@ from assertpy import assert_that, soft_assertions
 from pcluster.aws.aws_api import AWSApi
 from pcluster.aws.aws_resources import CapacityReservationInfo, ImageInfo, InstanceTypeInfo
 from pcluster.aws.common import AWSClientError
-from pcluster.aws.ec2 import Ec2Client
+from pcluster.aws.ec2 import LIST_IMAGES_PAGE_SIZE, Ec2Client, ImageListCache, InstanceTypeOfferingMatrix
 from pcluster.config.cluster_config import AmiSearchFilters, Tag
 from pcluster.constants import OS_TO_IMAGE_NAME_PART_MAP
 from pcluster.utils import get_installed_version, to_iso_timestr
@@ -91,6 +91,88 @@ def test_list_instance_types(boto3_stubber, generate_error):
         assert_that(return_value).is_equal_to(dummy_instance_types)
 
 
+def _describe_az_offerings_request(offerings):
+    return MockedBoto3Request(
+        method="describe_instance_type_offerings",
+        expected_params={"LocationType": "availability-zone"},
+        response={
+            "InstanceTypeOfferings": [
+                {"InstanceType": instance_type, "LocationType": "availability-zone", "Location": az}
+                for instance_type, az in offerings
+            ]
+        },
+    )
+
+
+def test_instance_type_offering_matrix(boto3_stubber, set_env, mocker):
+    set_env("AWS_DEFAULT_REGION", "us-east-1")
+    mocker.patch("pcluster.aws.aws_api.StsClient").return_value.get_account_id.return_value = "123456789012"
+    offerings = [
+        ("c5.xlarge", "us-east-1a"),
+        ("c5.xlarge", "us-east-1b"),
+        ("c5.xlarge", "us-east-1c"),
+        ("p4d.24xlarge", "us-east-1c"),
+        ("p4d.24xlarge", "us-east-1a"),
+        ("t3.micro", "us-east-1b"),
+    ]
+    # A single call retrieves the offerings of all the instance types
+    boto3_stubber("ec2", [_describe_az_offerings_request(offerings)])
+    ec2_client = Ec2Client()
+
+    assert_that(ec2_client.get_supported_az_for_instance_type("p4d.24xlarge")).is_equal_to(("us-east-1a", "us-east-1c"))
+    assert_that(ec2_client.get_supported_az_for_instance_types(["t3.micro", "unknown.type"])).is_equal_to(
+        {"t3.micro": ("us-east-1b",), "unknown.type": ()}
+    )
+    assert_that(ec2_client.get_common_supported_az_for_instance_types(["c5.xlarge", "p4d.24xlarge"])).is_equal_to(
+        ("us-east-1a", "us-east-1c")
+    )
+    assert_that(ec2_client.get_common_supported_az_for_instance_types(["t3.micro", "p4d.24xlarge"])).is_empty()
+
+    # The matrix saved on disk is reused by a new process
+    InstanceTypeOfferingMatrix.clear_all()
+    assert_that(Ec2Client().get_supported_az_for_instance_type("c5.xlarge")).is_equal_to(
+        ("us-east-1a", "us-east-1b", "us-east-1c")
+    )
+
+
+@pytest.mark.parametrize("ttl, expired, expected_calls", [("0", False, 2), (None, True, 2), (None, False, 1)])
+def test_instance_type_offering_matrix_persistence(boto3_stubber, set_env, mocker, ttl, expired, expected_calls):
+    set_env("AWS_DEFAULT_REGION", "us-east-1")
+    mocker.patch("pcluster.aws.aws_api.StsClient").return_value.get_account_id.return_value = "123456789012"
+    if ttl:
+        set_env("PCLUSTER_INSTANCE_TYPE_OFFERINGS_CACHE_TTL", ttl)
+    boto3_stubber("ec2", [_describe_az_offerings_request([("c5.xlarge", "us-east-1a")])] * expected_calls)
+    time_mock = mocker.patch("pcluster.aws.ec2.time.time", return_value=1000)
+
+    Ec2Client().get_supported_az_for_instance_type("c5.xlarge")
+    InstanceTypeOfferingMatrix.clear_all()
+    if expired:
+        time_mock.return_value = 1000 + InstanceTypeOfferingMatrix.DEFAULT_TTL + 1
+    assert_that(Ec2Client().get_supported_az_for_instance_type("c5.xlarge")).is_equal_to(("us-east-1a",))
+
+
+def test_instance_type_offering_matrix_per_account(boto3_stubber, set_env, mocker):
+    set_env("AWS_DEFAULT_REGION", "us-east-1")
+    get_account_id_mock = mocker.patch("pcluster.aws.aws_api.StsClient").return_value.get_account_id
+    get_account_id_mock.return_value = "111111111111"
+    # The same availability zone names are mapped to different zones in different accounts
+    boto3_stubber(
+        "ec2",
+        [
+            _describe_az_offerings_request([("c5.xlarge", "us-east-1a")]),
+            _describe_az_offerings_request([("c5.xlarge", "us-east-1b")]),
+        ],
+    )
+
+    assert_that(Ec2Client().get_supported_az_for_instance_type("c5.xlarge")).is_equal_to(("us-east-1a",))
+    InstanceTypeOfferingMatrix.clear_all()
+    get_account_id_mock.return_value = "222222222222"
+    assert_that(Ec2Client().get_supported_az_for_instance_type("c5.xlarge")).is_equal_to(("us-east-1b",))
+    # The matrix of the first account is still on disk
+    get_account_id_mock.return_value = "111111111111"
+    assert_that(Ec2Client().get_supported_az_for_instance_type("c5.xlarge")).is_equal_to(("us-east-1a",))
+
+
 @pytest.mark.parametrize(
     "instance_type, supported_architectures, error_message",
     [
@@ -509,9 +591,8 @@ def test_describe_subnets_cache(boto3_stubber):
 def test_get_subnet_ids_az_mapping(boto3_stubber):
     subnet_ids = ["subnet-123", "subnet-456"]
     avail_zones = {"subnet-123": "us-east-1a", "subnet-456": "us-east-1b"}
-    mocked_requests = [
-        get_describe_subnets_mocked_request([subnet_id], "available", avail_zones) for subnet_id in subnet_ids
-    ]
+    # All the subnets are described with a single call
+    mocked_requests = [get_describe_subnets_mocked_request(subnet_ids, "available", avail_zones)]
     boto3_stubber("ec2", mocked_requests)
     response = AWSApi.instance().ec2.get_subnets_az_mapping(subnet_ids)
     assert_that(response["subnet-123"]).is_equal_to("us-east-1a")
@@ -699,3 +780,99 @@ def test_is_subnet_public(boto3_stubber):
 
     # Third boto3 call. The result should be from the latest response even if the gateway id of the subnet is different
     assert AWSApi.instance().ec2.is_subnet_public(subnet_id) is True
+
+
+def test_get_in_use_image_ids(boto3_stubber):
+    expected_params = {
+        "Filters": [{"Name": "instance-state-name", "Values": ["pending", "running", "stopping", "stopped"]}]
+    }
+    mocked_requests = [
+        MockedBoto3Request(
+            method="describe_instances",
+            expected_params=expected_params,
+            response={
+                "Reservations": [
+                    {
+                        "Instances": [
+                            {"InstanceId": "i-1", "ImageId": "ami-1"},
+                            {"InstanceId": "i-2", "ImageId": "ami-2"},
+                        ]
+                    }
+                ],
+                "NextToken": "token",
+            },
+        ),
+        MockedBoto3Request(
+            method="describe_instances",
+            expected_params={**expected_params, "NextToken": "token"},
+            response={"Reservations": [{"Instances": [{"InstanceId": "i-3", "ImageId": "ami-1"}]}]},
+        ),
+    ]
+    boto3_stubber("ec2", mocked_requests)
+    assert_that(Ec2Client().get_in_use_image_ids()).is_equal_to({"ami-1", "ami-2"})
+
+
+def _describe_images_request(filters, response, next_token=None):
+    expected_params = {"Owners": ["self"], "Filters": filters, "MaxResults": LIST_IMAGES_PAGE_SIZE}
+    if next_token:
+        expected_params["NextToken"] = next_token
+    return MockedBoto3Request(method="describe_images", expected_params=expected_params, response=response)
+
+
+def test_get_images_page(boto3_stubber, set_env):
+    set_env("AWS_DEFAULT_REGION", "us-east-1")
+    filters = [
+        {"Name": "tag-key", "Values": ["parallelcluster:image_id"]},
+        {"Name": "tag:parallelcluster:build_status", "Values": ["available"]},
+        {"Name": "tag:parallelcluster:os", "Values": ["alinux2"]},
+        {"Name": "architecture", "Values": ["arm64"]},
+        {"Name": "tag:parallelcluster:version", "Values": ["3.0.0"]},
+    ]
+    mocked_requests = [
+        # Empty pages are skipped
+        _describe_images_request(filters, {"Images": [], "NextToken": "token1"}, next_token="token0"),
+        _describe_images_request(filters, {"Images": [{"ImageId": "ami-1"}], "NextToken": "token2"}, "token1"),
+        _describe_images_request(filters[:2], {"Images": [{"ImageId": "ami-2"}]}),
+    ]
+    boto3_stubber("ec2", mocked_requests)
+
+    images, next_token = Ec2Client().get_images_page(
+        os="alinux2", architecture="arm64", version="3.0.0", next_token="token0"
+    )
+    assert_that([image.id for image in images]).is_equal_to(["ami-1"])
+    assert_that(next_token).is_equal_to("token2")
+
+    # The same page is served from memory, without calling EC2 again
+    cached_images, cached_next_token = Ec2Client().get_images_page(
+        os="alinux2", architecture="arm64", version="3.0.0", next_token="token0"
+    )
+    assert_that(cached_images).is_same_as(images)
+    assert_that(cached_next_token).is_equal_to("token2")
+
+    images, next_token = Ec2Client().get_images_page()
+    assert_that([image.id for image in images]).is_equal_to(["ami-2"])
+    assert_that(next_token).is_none()
+
+
+def test_image_list_cache(mocker, set_env):
+    clock = mocker.patch("pcluster.aws.ec2.time.monotonic", return_value=0)
+    describe_page = mocker.MagicMock(side_effect=lambda: (["image"], None))
+
+    ImageListCache.get("us-east-1", ("key",), describe_page)
+    ImageListCache.get("us-east-1", ("key",), describe_page)
+    assert_that(describe_page.call_count).is_equal_to(1)
+
+    # Pages are not shared across regions and expire
+    ImageListCache.get("eu-west-1", ("key",), describe_page)
+    assert_that(describe_page.call_count).is_equal_to(2)
+    clock.return_value = ImageListCache.DEFAULT_TTL
+    ImageListCache.get("us-east-1", ("key",), describe_page)
+    assert_that(describe_page.call_count).is_equal_to(3)
+
+    ImageListCache.invalidate("us-east-1")
+    ImageListCache.get("us-east-1", ("key",), describe_page)
+    assert_that(describe_page.call_count).is_equal_to(4)
+
+    set_env(ImageListCache.TTL_ENV, "0")
+    ImageListCache.get("eu-west-1", ("key",), describe_page)
+    assert_that(describe_page.call_count).is_equal_to(5)
@@ -0,0 +1,178 @@
+# Copyright 2024 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"). You may not use this file except in compliance
+# with the License. A copy of the License is located at
+#
+# http://aws.amazon.com/apache2.0/
+#
+# or in the "LICENSE.txt" file accompanying this file. This file is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES
+# OR CONDITIONS OF ANY KIND, express or implied. See the License for the specific language governing permissions and
+# limitations under the License.
+import pytest
+from assertpy import assert_that
+from botocore.awsrequest import AWSResponse
+
+from pcluster.aws.common import AWSClientError, AWSExceptionHandler
+from pcluster.aws.rate_limiter import (
+    DECREASE_FACTOR,
+    MIN_RATE,
+    RateLimiterRegistry,
+    TokenBucketRateLimiter,
+    compute_backoff_with_jitter,
+    get_configured_rate,
+)
+from pcluster.aws.sts import StsClient
+
+STS_THROTTLING_RESPONSE = (
+    b"<ErrorResponse><Error><Type>Sender</Type><Code>Throttling</Code><Message>Rate exceeded</Message></Error>"
+    b"<RequestId>request-id</RequestId></ErrorResponse>"
+)
+STS_SUCCESS_RESPONSE = (
+    b'<GetCallerIdentityResponse xmlns="https://sts.amazonaws.com/doc/2011-06-15/"><GetCallerIdentityResult>'
+    b"<Arn>arn:aws:iam::123456789012:user/user</Arn><UserId>user</UserId><Account>123456789012</Account>"
+    b"</GetCallerIdentityResult><ResponseMetadata><RequestId>request-id</RequestId></ResponseMetadata>"
+    b"</GetCallerIdentityResponse>"
+)
+
+
+class _FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+class _RawResponse:
+    def __init__(self, body):
+        self._body = body
+
+    def stream(self, **kwargs):
+        yield self._body
+
+
+class _ThrottlingEndpointSimulator:
+    """Answer the requests in place of the AWS endpoint, throttling the first throttled_attempts of them."""
+
+    def __init__(self, throttled_attempts):
+        self.throttled_attempts = throttled_attempts
+        self.attempts = 0
+
+    def __call__(self, request, **kwargs):
+        self.attempts += 1
+        if self.attempts <= self.throttled_attempts:
+            return AWSResponse(request.url, 400, {}, _RawResponse(STS_THROTTLING_RESPONSE))
+        return AWSResponse(request.url, 200, {}, _RawResponse(STS_SUCCESS_RESPONSE))
+
+
+@pytest.fixture()
+def fake_aws_environment(set_env):
+    set_env("AWS_DEFAULT_REGION", "us-east-1")
+    set_env("AWS_ACCESS_KEY_ID", "fake-access-key")
+    set_env("AWS_SECRET_ACCESS_KEY", "fake-secret-key")
+    RateLimiterRegistry.reset()
+    yield
+    RateLimiterRegistry.reset()
+
+
+def test_token_bucket_burst_and_refill():
+    clock = _FakeClock()
+    limiter = TokenBucketRateLimiter(max_rate=2, burst=2, clock=clock, sleep=clock.sleep)
+
+    # The burst is served without waiting, then callers are spaced at the bucket rate
+    assert_that([limiter.acquire() for _ in range(2)]).is_equal_to([0, 0])
+    assert_that(limiter.acquire()).is_close_to(0.5, 1e-9)
+    assert_that(limiter.acquire()).is_close_to(0.5, 1e-9)
+    assert_that(clock.now).is_close_to(1.0, 1e-9)
+
+    # Idle time refills the bucket up to the burst size only
+    clock.now += 10
+    assert_that([limiter.acquire() for _ in range(3)]).is_equal_to([0, 0, 0.5])
+
+
+def test_token_bucket_aimd_adaptation():
+    clock = _FakeClock()
+    limiter = TokenBucketRateLimiter(max_rate=10, clock=clock, sleep=clock.sleep)
+
+    limiter.on_throttle()
+    assert_that(limiter.rate).is_equal_to(10 * DECREASE_FACTOR)
+    # After a throttle the burst credit is dropped and the reduced rate applies right away
+    assert_that(limiter.acquire()).is_close_to(1 / limiter.rate, 1e-9)
+
+    for _ in range(20):
+        limiter.on_throttle()
+    assert_that(limiter.rate).is_equal_to(MIN_RATE)
+
+    for _ in range(100):
+        limiter.on_success()
+    assert_that(limiter.rate).is_equal_to(10)
+
+
+@pytest.mark.parametrize(
+    "rate_limits, service, expected_rate",
+    [
+        (None, "ec2", 20.0),
+        (None, "cloudformation", 5.0),
+        ("ec2=30, cloudformation=2", "cloudformation", 2.0),
+        ("ec2=30,default=7", "ssm", 7.0),
+        ("ec2=invalid", "ec2", 20.0),
+    ],
+)
+def test_get_configured_rate(set_env, rate_limits, service, expected_rate):
+    if rate_limits:
+        set_env("PCLUSTER_RATE_LIMITS", rate_limits)
+    assert_that(get_configured_rate(service)).is_equal_to(expected_rate)
+
+
+def test_compute_backoff_with_jitter():
+    for attempt in range(10):
+        assert_that(compute_backoff_with_jitter(attempt, base=1, cap=20)).is_between(0, min(20, 2**attempt))
+
+
+def test_throttling_is_shared_across_clients(mocker, fake_aws_environment):
+    """Simulate throttling on one client and verify that the adapted rate applies to every client of the service."""
+    mocker.patch("time.sleep")
+    first_client = StsClient()
+    second_client = StsClient()
+    simulator = _ThrottlingEndpointSimulator(throttled_attempts=2)
+    first_client._client.meta.events.register("before-send.sts.GetCallerIdentity", simulator)
+
+    assert_that(first_client._client.get_caller_identity()["Account"]).is_equal_to("123456789012")
+    # botocore retried the throttled attempts, each of them went through the limiter
+    assert_that(simulator.attempts).is_equal_to(3)
+
+    limiter = RateLimiterRegistry.get("sts", "us-east-1")
+    assert_that(limiter.rate).is_less_than(limiter.max_rate)
+    assert_that(RateLimiterRegistry.get("sts", "us-west-2")).is_not_same_as(limiter)
+
+    rate_after_throttling = limiter.rate
+    second_client._client.meta.events.register("before-send.sts.GetCallerIdentity", _ThrottlingEndpointSimulator(0))
+    second_client._client.get_caller_identity()
+    assert_that(limiter.rate).is_greater_than(rate_after_throttling)
+
+
+def test_rate_limiter_disabled(mocker, fake_aws_environment, set_env):
+    set_env("PCLUSTER_RATE_LIMITER_DISABLED", "true")
+    client = StsClient()
+    client._client.meta.events.register("before-send.sts.GetCallerIdentity", _ThrottlingEndpointSimulator(0))
+    client._client.get_caller_identity()
+    assert_that(RateLimiterRegistry._limiters).is_empty()
+
+
+def test_retry_on_boto3_throttling_gives_up(mocker, fake_aws_environment):
+    sleep_mock = mocker.patch("pcluster.aws.common.time.sleep")
+    client = StsClient()
+    client._client.meta.events.register("before-send.sts.GetCallerIdentity", _ThrottlingEndpointSimulator(1000))
+
+    @AWSExceptionHandler.handle_client_exception
+    @AWSExceptionHandler.retry_on_boto3_throttling
+    def get_caller_identity():
+        return client._client.get_caller_identity()
+
+    with pytest.raises(AWSClientError) as e:
+        get_caller_identity()
+    assert_that(e.value.error_code).is_equal_to("Throttling")
+    assert_that(sleep_mock.call_count).is_greater_than_or_equal_to(AWSExceptionHandler.THROTTLING_MAX_ATTEMPTS - 1)
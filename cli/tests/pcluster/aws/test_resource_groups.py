@@ -84,6 +84,33 @@ def test_capacity_reservation_ids_from_group_resources(boto3_stubber, resources,
     ).is_equal_to(expected_capacity_reservation_ids)
 
 
+def test_capacity_reservation_ids_from_paginated_group_resources(boto3_stubber):
+    os_lib.environ["AWS_DEFAULT_REGION"] = "us-east-1"
+    resource_group_name = "mocked_resource_group_name"
+    mocked_requests = [
+        MockedBoto3Request(
+            method="list_group_resources",
+            response={
+                "Resources": [
+                    {
+                        "Identifier": {
+                            "ResourceType": "AWS::EC2::CapacityReservation",
+                            "ResourceArn": f"arn:aws:ec2:us-east-1:123456789123:capacity-reservation/cr-{page}",
+                        }
+                    }
+                ],
+                **({"NextToken": f"token-{page}"} if page < 2 else {}),
+            },
+            expected_params={"Group": resource_group_name, **({"NextToken": f"token-{page - 1}"} if page else {})},
+        )
+        for page in range(3)
+    ]
+    boto3_stubber("resource-groups", mocked_requests)
+    assert_that(
+        ResourceGroupsClient().get_capacity_reservation_ids_from_group_resources(resource_group_name)
+    ).is_equal_to(["cr-0", "cr-1", "cr-2"])
+
+
 mock_good_config = {"GroupConfiguration": {"Configuration": [{"Type": "AWS::EC2::CapacityReservationPool"}]}}
 mock_bad_config = {"GroupConfiguration": {"Configuration": [{"Type": "AWS::EC2::MockService"}]}}
 
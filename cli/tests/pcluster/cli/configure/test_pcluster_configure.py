@@ -7,10 +7,11 @@ import yaml
 from assertpy import assert_that
 
 from pcluster.aws.aws_resources import InstanceTypeInfo
-from pcluster.cli.commands.configure.easyconfig import configure
+from pcluster.cli.commands.configure.easyconfig import _get_vpcs_and_subnets, configure
 from pcluster.cli.commands.configure.networking import NetworkConfiguration
 from pcluster.schemas.cluster_schema import ClusterSchema
 from tests.pcluster.aws.dummy_aws_api import _DummyInstanceTypeInfo, mock_aws_api
+from tests.utils import MockedBoto3Request
 
 EASYCONFIG = "pcluster.cli.commands.configure.easyconfig."
 NETWORKING = "pcluster.cli.commands.configure.networking."
@@ -25,6 +26,11 @@ def temp_path_for_config(tmp_path):
     return str(tmp_path / "cluster_config")
 
 
+@pytest.fixture()
+def boto3_stubber_path():
+    return EASYCONFIG + "boto3"
+
+
 def _mock_instance_type_info(mocker, instance_type="t3.micro"):
     mocker.patch(
         "pcluster.aws.ec2.Ec2Client.get_instance_type_info",
@@ -857,3 +863,66 @@ def test_valid_subnet(mocker, temp_path_for_config, vpc_id, head_node_id, comput
             mocker, temp_path_for_config, vpc_id=vpc_id, head_node_id=head_node_id, compute_id=compute_id
         )
     ).is_true()
+
+
+@pytest.mark.parametrize(
+    "region, expected_filters", [("us-east-1", [{"Name": "ipv6-native", "Values": ["false"]}]), ("us-iso-east-1", [])]
+)
+def test_get_vpcs_and_subnets(boto3_stubber, set_env, region, expected_filters):
+    set_env("AWS_DEFAULT_REGION", region)
+    boto3_stubber(
+        "ec2",
+        [
+            MockedBoto3Request(
+                method="describe_vpcs",
+                response={"Vpcs": [{"VpcId": "vpc-1", "Tags": [{"Key": "Name", "Value": "vpc1"}]}], "NextToken": "t"},
+                expected_params={},
+            ),
+            MockedBoto3Request(
+                method="describe_vpcs", response={"Vpcs": [{"VpcId": "vpc-2"}]}, expected_params={"NextToken": "t"}
+            ),
+            # All the subnets are retrieved with a single sweep, independently from the number of VPCs
+            MockedBoto3Request(
+                method="describe_subnets",
+                response={
+                    "Subnets": [
+                        {"SubnetId": "subnet-1", "VpcId": "vpc-1", "CidrBlock": "10.0.0.0/24", "AvailabilityZone": "a"},
+                        {"SubnetId": "subnet-2", "VpcId": "vpc-other", "CidrBlock": "10.0.0.0/24"},
+                    ],
+                    "NextToken": "t",
+                },
+                expected_params={"Filters": expected_filters},
+            ),
+            MockedBoto3Request(
+                method="describe_subnets",
+                response={
+                    "Subnets": [
+                        {
+                            "SubnetId": "subnet-3",
+                            "VpcId": "vpc-1",
+                            "CidrBlock": "10.0.16.0/20",
+                            "AvailabilityZone": "b",
+                            "Tags": [{"Key": "Name", "Value": "subnet3"}],
+                        }
+                    ]
+                },
+                expected_params={"Filters": expected_filters, "NextToken": "t"},
+            ),
+        ],
+    )
+
+    assert_that(_get_vpcs_and_subnets()).is_equal_to(
+        {
+            "vpc_list": [
+                OrderedDict([("id", "vpc-1"), ("name", "vpc1"), ("number_of_subnets", 2)]),
+                OrderedDict([("id", "vpc-2"), ("name", None), ("number_of_subnets", 0)]),
+            ],
+            "vpc_subnets": {
+                "vpc-1": [
+                    OrderedDict([("id", "subnet-1"), ("name", None), ("size", 256), ("availability_zone", "a")]),
+                    OrderedDict([("id", "subnet-3"), ("name", "subnet3"), ("size", 4096), ("availability_zone", "b")]),
+                ],
+                "vpc-2": [],
+            },
+        }
+    )
@@ -1,6 +1,10 @@
+from ipaddress import ip_network
+
 from assertpy import assert_that
+from hypothesis import given, settings
+from hypothesis import strategies as st
 
-from pcluster.cli.commands.configure.subnet_computation import evaluate_cidr, get_subnet_cidr
+from pcluster.cli.commands.configure.subnet_computation import CidrAllocator, evaluate_cidr, get_subnet_cidr
 
 
 def test_empty_vpc():
@@ -81,3 +85,70 @@ def test_get_subnet_cidr():
         )
     ).is_equal_to("10.0.56.0/21")
     assert_that(get_subnet_cidr("10.0.0.0/16", ["10.0.0.0/24"], 256)).is_equal_to("10.0.16.0/20")
+
+
+def test_last_block_of_the_vpc_is_allocated():
+    assert_that(evaluate_cidr(vpc_cidr="10.0.0.0/16", occupied_cidrs=["10.0.0.0/17"], target_size=30000)).is_equal_to(
+        "10.0.128.0/17"
+    )
+
+
+def test_get_subnet_cidr_never_below_min_size():
+    # Only a /18 is left, smaller than the /17 needed for 17000 IPs
+    assert_that(get_subnet_cidr("10.0.0.0/16", ["10.0.0.0/17", "10.0.128.0/18"], 17000)).is_none()
+
+
+def test_plan_subnets():
+    allocator = CidrAllocator("10.0.0.0/16", ["10.0.0.0/24", "10.0.2.0/23", "10.0.64.0/18"])
+    assert_that(allocator.plan(target_size=250, count=3)).is_equal_to(["10.0.1.0/24", "10.0.4.0/24", "10.0.5.0/24"])
+    # The planned subnets are now occupied
+    assert_that(allocator.plan(target_size=1000, count=2)).is_equal_to(["10.0.8.0/22", "10.0.12.0/22"])
+    assert_that(allocator.plan(target_size=16000, count=3)).is_none()
+    assert_that(allocator.plan(target_size=16000, count=2)).is_equal_to(["10.0.128.0/18", "10.0.192.0/18"])
+
+
+@st.composite
+def _vpc_with_subnets(draw):
+    vpc_prefix = draw(st.integers(min_value=16, max_value=24))
+    vpc = ip_network((draw(st.integers(min_value=0, max_value=2**32 - 1)), vpc_prefix), strict=False)
+    occupied = []
+    for _ in range(draw(st.integers(min_value=0, max_value=8))):
+        prefix = draw(st.integers(min_value=vpc_prefix, max_value=28))
+        subnet_index = draw(st.integers(min_value=0, max_value=2 ** (prefix - vpc_prefix) - 1))
+        candidate = list(vpc.subnets(new_prefix=prefix))[subnet_index] if prefix - vpc_prefix < 12 else None
+        if candidate and not any(candidate.overlaps(subnet) for subnet in occupied):
+            occupied.append(candidate)
+    return str(vpc), [str(subnet) for subnet in occupied]
+
+
+@settings(max_examples=200, deadline=None)
+@given(
+    vpc_and_subnets=_vpc_with_subnets(),
+    target_size=st.integers(min_value=1, max_value=5000),
+    count=st.integers(min_value=1, max_value=6),
+)
+def test_plan_subnets_properties(vpc_and_subnets, target_size, count):
+    vpc_cidr, occupied_cidrs = vpc_and_subnets
+    vpc = ip_network(vpc_cidr)
+    occupied = [ip_network(cidr) for cidr in occupied_cidrs]
+
+    cidrs = CidrAllocator(vpc_cidr, occupied_cidrs).plan(target_size, count)
+
+    # Brute force: the first free blocks big enough for the target size plus the 6 IPs reserved by AWS
+    prefix = min(28, 32 - (target_size + 6 - 1).bit_length())
+    free_blocks = (
+        [str(block) for block in vpc.subnets(new_prefix=prefix) if not any(block.overlaps(o) for o in occupied)]
+        if prefix >= vpc.prefixlen
+        else []
+    )
+    if len(free_blocks) < count:
+        assert_that(cidrs).is_none()
+    else:
+        assert_that(cidrs).is_equal_to(free_blocks[:count])
+        planned = [ip_network(cidr) for cidr in cidrs]
+        for index, subnet in enumerate(planned):
+            assert_that(subnet.subnet_of(vpc)).is_true()
+            assert_that(subnet.num_addresses).is_greater_than_or_equal_to(target_size + 6)
+            assert_that(any(subnet.overlaps(other) for other in occupied + planned[:index])).is_false()
+        # The first planned subnet is the one a single allocation would choose
+        assert_that(cidrs[0]).is_equal_to(evaluate_cidr(vpc_cidr, occupied_cidrs, target_size))
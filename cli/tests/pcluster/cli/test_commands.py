@@ -327,7 +327,7 @@ def test_setup_bucket_with_resources_upload_failure(
         cluster._upload_config()
 
     with pytest.raises(ClusterActionError, match=upload_resource_cluster_action_error):
-        cluster._upload_artifacts()
+        cluster._upload_resources()
 
     with pytest.raises(ClusterActionError, match=upload_instance_types_data_action_error):
         cluster._upload_instance_types_data()
@@ -52,7 +52,17 @@ class TestListImagesCommand:
         out, err = capsys.readouterr()
         assert_that(out + err).contains(error_message)
 
-    def test_execute(self, mocker):
+    @pytest.mark.parametrize(
+        "args, expected_filters",
+        [
+            ([], {}),
+            (
+                ["--os", "alinux2", "--architecture", "arm64", "--version", "3.0.0"],
+                {"os": "alinux2", "architecture": "arm64", "version": "3.0.0"},
+            ),
+        ],
+    )
+    def test_execute(self, mocker, args, expected_filters):
         response_dict = {
             "images": [
                 {
@@ -78,10 +88,18 @@ class TestListImagesCommand:
             autospec=True,
         )
 
-        out = run(["list-images", "--image-status", "AVAILABLE"])
+        out = run(["list-images", "--image-status", "AVAILABLE"] + args)
         assert_that(out).is_equal_to(response_dict)
         assert_that(list_images_mock.call_args).is_length(2)  # this is due to the decorator on list_clusters
-        expected_args = {"region": None, "next_token": None, "image_status": "AVAILABLE"}
+        expected_args = {
+            "region": None,
+            "next_token": None,
+            "image_status": "AVAILABLE",
+            "os": None,
+            "architecture": None,
+            "version": None,
+            **expected_filters,
+        }
         list_images_mock.assert_called_with(**expected_args)
 
     def test_error(self, mocker):
@@ -0,0 +1,91 @@
+#  Copyright 2024 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License"). You may not use this file except in compliance
+#  with the License. A copy of the License is located at http://aws.amazon.com/apache2.0/
+#  or in the "LICENSE.txt" file accompanying this file. This file is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES
+#  OR CONDITIONS OF ANY KIND, express or implied. See the License for the specific language governing permissions and
+#  limitations under the License.
+
+import pytest
+from assertpy import assert_that
+
+from pcluster.cli.entrypoint import run
+from pcluster.constants import Operation
+from pcluster.models.imagebuilder import ImageGarbageStatus, ImageRetentionPolicy
+
+BASE_COMMAND = ["pcluster", "prune-images"]
+
+
+class TestPruneImagesCommand:
+    def test_helper(self, test_datadir, run_cli, assert_out_err):
+        command = BASE_COMMAND + ["--help"]
+        run_cli(command, expect_failure=False)
+
+        assert_out_err(expected_out=(test_datadir / "pcluster-help.txt").read_text().strip(), expected_err="")
+
+    def test_invalid_image_status(self, run_cli, capsys):
+        run_cli(BASE_COMMAND + ["--image-status", "PENDING"], expect_failure=True)
+
+        out, err = capsys.readouterr()
+        assert_that(out + err).contains("argument --image-status: invalid choice: 'PENDING'")
+
+    @pytest.mark.parametrize(
+        "args, error_message",
+        [
+            ([], "At least one of --older-than-days and --image-version must be specified."),
+            (["--older-than-days", "7", "--max-parallelism", "0"], "--max-parallelism must be greater than 0."),
+        ],
+    )
+    def test_invalid_args(self, mocker, set_env, args, error_message, run_cli):
+        set_env("AWS_DEFAULT_REGION", "us-east-1")
+        mocker.patch("pcluster.cli.commands.prune_images.assert_supported_operation")
+        collect_mock = mocker.patch("pcluster.cli.commands.prune_images.ImageGarbageCollector.collect")
+        run_cli(BASE_COMMAND + args, expect_failure=True, expect_message=error_message)
+        collect_mock.assert_not_called()
+
+    @pytest.mark.parametrize(
+        "args, expected_policy, expected_force, expected_max_workers, expected_dry_run",
+        [
+            (
+                ["--older-than-days", "30", "--dry-run"],
+                ImageRetentionPolicy(older_than_days=30),
+                False,
+                4,
+                True,
+            ),
+            (
+                [
+                    "--image-version",
+                    "3.0.0",
+                    "--image-version",
+                    "3.1.0",
+                    "--image-status",
+                    "FAILED",
+                    "--force",
+                    "--max-parallelism",
+                    "10",
+                ],
+                ImageRetentionPolicy(versions=("3.0.0", "3.1.0"), statuses=(ImageGarbageStatus.FAILED,)),
+                True,
+                10,
+                False,
+            ),
+        ],
+    )
+    def test_execute(
+        self, mocker, set_env, args, expected_policy, expected_force, expected_max_workers, expected_dry_run
+    ):
+        mocked_assert_supported_operation = mocker.patch(
+            "pcluster.cli.commands.prune_images.assert_supported_operation"
+        )
+        report = [{"imageId": "image", "action": "DELETED"}]
+        collector_mock = mocker.patch("pcluster.cli.commands.prune_images.ImageGarbageCollector")
+        collector_mock.return_value.collect.return_value = report
+        set_env("AWS_DEFAULT_REGION", "us-east-1")
+
+        out = run(["prune-images"] + args)
+
+        assert_that(out).is_equal_to({"dryRun": expected_dry_run, "images": report})
+        collector_mock.assert_called_with(expected_policy, force=expected_force, max_workers=expected_max_workers)
+        collector_mock.return_value.collect.assert_called_with(dry_run=expected_dry_run)
+        mocked_assert_supported_operation.assert_called_with(operation=Operation.DELETE_IMAGE, region="us-east-1")
@@ -122,6 +122,7 @@ class TestUpdateClusterCommand:
             "cluster_name": "cluster",
             "dryrun": None,
             "force_update": None,
+            "full_validation": None,
             "region": None,
             "suppress_validators": None,
             "validation_failure_level": None,
@@ -166,6 +167,7 @@ class TestUpdateClusterCommand:
             "cluster_name": "cluster",
             "dryrun": None,
             "force_update": None,
+            "full_validation": None,
             "region": None,
             "suppress_validators": None,
             "validation_failure_level": None,
@@ -193,27 +195,27 @@ class TestUpdateClusterCommand:
 
         # Start with the all the queues
         _, cdk_assets = load_cfn_templates_from_config("pcluster_max_queue.config.yaml", pcluster_config_reader)
-        initial_nested_stack_content = str(next(asset["content"] for asset in cdk_assets))
+        initial_nested_stacks_content = "".join(str(asset["content"]) for asset in cdk_assets)
 
         # Confirm all resources are in the template
-        assert_that(initial_nested_stack_content).contains(*expected_unchanged_node_resource_ids)
-        assert_that(initial_nested_stack_content).contains(*expected_changed_node_resource_ids)
+        assert_that(initial_nested_stacks_content).contains(*expected_unchanged_node_resource_ids)
+        assert_that(initial_nested_stacks_content).contains(*expected_changed_node_resource_ids)
 
         # Load a new config that removes all queues except one (queue-a)
         _, cdk_assets = load_cfn_templates_from_config("pcluster_1_queue.config.yaml", pcluster_config_reader)
-        updated_nested_stack_content = str(next(asset["content"] for asset in cdk_assets))
+        updated_nested_stacks_content = "".join(str(asset["content"]) for asset in cdk_assets)
 
         # Confirm the (queue-a) resources remain unchanged in the CFN template
-        assert_that(updated_nested_stack_content).contains(*expected_unchanged_node_resource_ids)
-        assert_that(updated_nested_stack_content).does_not_contain(*expected_changed_node_resource_ids)
+        assert_that(updated_nested_stacks_content).contains(*expected_unchanged_node_resource_ids)
+        assert_that(updated_nested_stacks_content).does_not_contain(*expected_changed_node_resource_ids)
 
         # Restore use of all the queues
         _, cdk_assets = load_cfn_templates_from_config("pcluster_max_queue.config.yaml", pcluster_config_reader)
-        updated_nested_stack_content = str(next(asset["content"] for asset in cdk_assets))
+        updated_nested_stacks_content = "".join(str(asset["content"]) for asset in cdk_assets)
 
         # Confirm all resources are in the template
-        assert_that(updated_nested_stack_content).contains(*expected_unchanged_node_resource_ids)
-        assert_that(updated_nested_stack_content).contains(*expected_changed_node_resource_ids)
+        assert_that(updated_nested_stacks_content).contains(*expected_unchanged_node_resource_ids)
+        assert_that(updated_nested_stacks_content).contains(*expected_changed_node_resource_ids)
 
     def test_error(self, mocker, test_datadir):
         api_response = {"message": "error"}, 400
@@ -8,7 +8,7 @@
 import pytest
 from assertpy import assert_that
 
-from pcluster.api.models import UpdateComputeFleetResponseContent
+from pcluster.api.models import DescribeComputeFleetResponseContent, UpdateComputeFleetResponseContent
 from pcluster.cli.entrypoint import run
 from pcluster.cli.exceptions import APIOperationException
 from tests.utils import wire_translate
@@ -65,6 +65,50 @@ class TestUpdateComputeFleetCommand:
         }
         update_compute_fleet_status_mock.assert_called_with(**expected_args)
 
+    @pytest.mark.parametrize(
+        "requested_status, describe_statuses, expected_status, expected_error",
+        [
+            ("START_REQUESTED", ["START_REQUESTED", "STARTING", "RUNNING"], "RUNNING", None),
+            ("START_REQUESTED", ["STARTING", "PROTECTED"], None, "PROTECTED"),
+            ("STOP_REQUESTED", ["STOPPING", "STOPPED"], "STOPPED", None),
+            ("ENABLED", ["DISABLED", "ENABLED"], "ENABLED", None),
+            ("DISABLED", ["DISABLED"], "DISABLED", None),
+            ("DISABLED", ["ENABLED", "UNKNOWN"], None, "UNKNOWN"),
+        ],
+    )
+    def test_execute_with_wait(self, mocker, requested_status, describe_statuses, expected_status, expected_error):
+        response_dict = {"status": requested_status, "lastStatusUpdatedTime": "2021-01-01 00:00:00.000000+00:00"}
+        mocker.patch(
+            "pcluster.api.controllers.cluster_compute_fleet_controller.update_compute_fleet",
+            return_value=UpdateComputeFleetResponseContent().from_dict(response_dict),
+            autospec=True,
+        )
+        describe_compute_fleet_mock = mocker.patch(
+            "pcluster.api.controllers.cluster_compute_fleet_controller.describe_compute_fleet",
+            side_effect=[
+                DescribeComputeFleetResponseContent().from_dict(
+                    {"status": status, "lastStatusUpdatedTime": "2021-01-01 00:00:00.000000+00:00"}
+                )
+                for status in describe_statuses
+            ],
+            autospec=True,
+        )
+        sleep_mock = mocker.patch("pcluster.models.compute_fleet_status_manager.time.sleep")
+
+        command = ["update-compute-fleet", "--cluster-name", "cluster", "--status", requested_status, "--wait"]
+        if expected_error:
+            with pytest.raises(APIOperationException) as exc_info:
+                run(command)
+            assert_that(exc_info.value.data["status"]).is_equal_to(expected_error)
+        else:
+            out = run(command)
+            assert_that(out["status"]).is_equal_to(expected_status)
+        assert_that(describe_compute_fleet_mock.call_count).is_equal_to(len(describe_statuses))
+        # The compute fleet status is polled at least once per second
+        assert_that(sleep_mock.call_args_list).is_length(len(describe_statuses) - 1)
+        for call in sleep_mock.call_args_list:
+            assert_that(call.args[0]).is_less_than_or_equal_to(1)
+
     def test_error(self, mocker):
         api_response = {"message": "error"}, 400
         mocker.patch(
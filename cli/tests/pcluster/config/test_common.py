@@ -15,7 +15,7 @@ from unittest.mock import MagicMock
 import pytest
 from assertpy import assert_that
 
-from pcluster.config.common import Resource, TypeMatchValidatorsSuppressor
+from pcluster.config.common import Resource, TypeMatchValidatorsSuppressor, ValidatorInvocations
 from pcluster.validators.common import (
     AsyncValidator,
     FailureLevel,
@@ -326,6 +326,89 @@ def test_nested_resource_validate():
     assert_validation_result(validation_failures[2], FailureLevel.INFO, "Wrong value other-value.")
 
 
+class FakeKeyedErrorValidator(Validator):
+    """Dummy validator of error level sharing the invocations with the same param."""
+
+    executions = []
+
+    @classmethod
+    def invocation_key(cls, param, other_param=None):
+        return param
+
+    def _validate(self, param, other_param=None):
+        self.executions.append(param)
+        self._add_failure(f"Keyed error {param}.", FailureLevel.ERROR)
+
+
+class FakeKeyedAsyncErrorValidator(AsyncValidator):
+    """Dummy async validator of error level sharing the invocations with the same param."""
+
+    executions = []
+
+    @classmethod
+    def invocation_key(cls, param):
+        return param
+
+    async def _validate_async(self, param):
+        self.executions.append(param)
+        await asyncio.sleep(0.1)
+        self._add_failure(f"Keyed async error {param}.", FailureLevel.ERROR)
+
+
+def test_identical_validator_invocations_executed_once(mocker):
+    """Verify that the invocations with the same key are executed once and their failures reported by each resource."""
+    mocker.patch.object(FakeKeyedErrorValidator, "executions", [])
+    mocker.patch.object(FakeKeyedAsyncErrorValidator, "executions", [])
+
+    class FakeQueue(Resource):
+        """Fake queue registering validators on shared and own values."""
+
+        def __init__(self, name, role):
+            super().__init__()
+            self.name = name
+            self.role = role
+
+        def _register_validators(self, context: ValidatorContext = None):
+            self._register_validator(FakeKeyedErrorValidator, param=self.role, other_param=self.name)
+            self._register_validator(FakeKeyedAsyncErrorValidator, param=self.role)
+            self._register_validator(FakeKeyedErrorValidator, param=self.name)
+            self._register_validator(FakeErrorValidator, param=self.role)
+
+    class FakeCluster(Resource):
+        """Fake cluster with many queues."""
+
+        def __init__(self, queues):
+            super().__init__()
+            self.queues = queues
+
+    queues = [FakeQueue(f"queue{i}", "shared-role" if i < 3 else "other-role") for i in range(4)]
+    invocations = ValidatorInvocations()
+    validation_failures = FakeCluster(queues).validate(invocations=invocations)
+
+    assert_that(FakeKeyedErrorValidator.executions).contains_only(
+        "shared-role", "other-role", "queue0", "queue1", "queue2", "queue3"
+    ).is_length(6)
+    assert_that(FakeKeyedAsyncErrorValidator.executions).contains_only("shared-role", "other-role").is_length(2)
+    # The validators without invocation key are always executed
+    assert_that(invocations.total).is_equal_to(16)
+    assert_that(invocations.executed).is_equal_to(12)
+    # The failures are reported by every resource registering the invocation
+    assert_that([failure.message for failure in validation_failures]).contains_sequence(
+        "Keyed error shared-role.", "Keyed error queue0.", "Error shared-role."
+    )
+    for queue in queues:
+        assert_that([failure.message for failure in queue._validation_failures]).is_equal_to(
+            [f"Keyed error {queue.role}.", f"Keyed error {queue.name}.", f"Error {queue.role}."]
+        )
+    assert_that([failure.message for failure in validation_failures[12:]]).is_equal_to(
+        ["Keyed async error shared-role."] * 3 + ["Keyed async error other-role."]
+    )
+
+    # A new validation run executes the invocations again
+    FakeCluster(queues).validate()
+    assert_that(FakeKeyedAsyncErrorValidator.executions).is_length(4)
+
+
 @pytest.mark.parametrize(
     "value, default, expected_value, expected_implied",
     [
@@ -10,17 +10,20 @@
 # limitations under the License.
 import os
 import shutil
+from copy import deepcopy
 
 import pytest
 from assertpy import assert_that
 
 from pcluster.config.cluster_config import QueueUpdateStrategy
+from pcluster.config.common import Resource
 from pcluster.config.config_patch import Change, ConfigPatch
 from pcluster.config.update_policy import UpdatePolicy
 from pcluster.schemas.cluster_schema import ClusterSchema
 from pcluster.utils import load_yaml_dict
 from tests.pcluster.aws.dummy_aws_api import mock_aws_api
 from tests.pcluster.test_utils import dummy_cluster
+from tests.pcluster.utils import load_cluster_model_from_yaml
 
 default_cluster_params = {
     "custom_ami": "ami-12345678",
@@ -1004,3 +1007,64 @@ def test_patch_check_cluster_resource_bucket(
         line = ["{0}".format(element) if isinstance(element, str) else element for element in line]
         assert_that(expected_message_rows).contains(line)
     assert_that(patch_allowed).is_equal_to(not expected_error_row)
+
+
+@pytest.mark.parametrize(
+    "update_config, expected_inputs_in_scope, expected_inputs_out_of_scope",
+    [
+        pytest.param(
+            lambda config: config["Scheduling"]["SlurmQueues"][1]["ComputeResources"][0].update(MaxCount=20),
+            ["queue2", "queue2.compute-resource-1", "Scheduling", "Scheduling.SlurmQueues"],
+            ["queue1", "queue2.compute-resource-2", "HeadNode", "Scheduling.SlurmSettings"],
+            id="compute resource change",
+        ),
+        pytest.param(
+            lambda config: config["HeadNode"].update(InstanceType="c5.2xlarge"),
+            ["HeadNode"],
+            ["queue1", "queue2", "queue2.compute-resource-1", "HeadNode.Networking", "Scheduling"],
+            id="head node change",
+        ),
+        pytest.param(
+            lambda config: config["Scheduling"]["SlurmQueues"].pop(),
+            ["queue1", "queue1.compute-resource-1", "Scheduling.SlurmQueues"],
+            ["HeadNode", "Scheduling.SlurmSettings"],
+            id="queue removed",
+        ),
+        pytest.param(
+            lambda config: config["Scheduling"]["SlurmSettings"].update(ScaledownIdletime=20),
+            ["Scheduling.SlurmSettings", "Scheduling"],
+            ["queue1", "queue2", "HeadNode"],
+            id="slurm settings change",
+        ),
+    ],
+)
+def test_validation_scope(mocker, update_config, expected_inputs_in_scope, expected_inputs_out_of_scope):
+    mock_aws_api(mocker)
+    base_config, _ = load_cluster_model_from_yaml("slurm.full.yaml")
+    target_config = deepcopy(base_config)
+    update_config(target_config)
+    target_cluster_config = ClusterSchema(cluster_name="clustername").load(deepcopy(target_config))
+    queues = {queue.name: queue for queue in target_cluster_config.scheduling.queues}
+
+    def _get_input(name):
+        # Validator inputs are resources of the config or paths of config sections
+        queue_name, _, compute_resource_name = name.partition(".")
+        if queue_name not in queues:
+            return name
+        queue = queues[queue_name]
+        if compute_resource_name:
+            return next(resource for resource in queue.compute_resources if resource.name == compute_resource_name)
+        return queue
+
+    validation_scope = ConfigPatch(dummy_cluster(), base_config, target_config).validation_scope(target_cluster_config)
+
+    for name in expected_inputs_in_scope:
+        assert_that(validation_scope.includes(_get_input(name))).described_as(name).is_true()
+    for name in expected_inputs_out_of_scope:
+        assert_that(validation_scope.includes(_get_input(name))).described_as(name).is_false()
+    # A validator is executed if any of its inputs is in scope
+    assert_that(
+        validation_scope.includes(_get_input(expected_inputs_out_of_scope[0]), _get_input(expected_inputs_in_scope[0]))
+    ).is_true()
+    # Resources not part of the configuration are always in scope
+    assert_that(validation_scope.includes(Resource())).is_true()
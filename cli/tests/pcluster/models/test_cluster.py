@@ -10,6 +10,7 @@
 # limitations under the License.
 import datetime
 import json
+import logging
 from copy import deepcopy
 from unittest.mock import PropertyMock
 
@@ -24,10 +25,17 @@ from pcluster.aws.common import AWSClientError
 from pcluster.config.cluster_config import Tag
 from pcluster.config.common import AllValidatorsSuppressor
 from pcluster.config.update_policy import UpdatePolicy
-from pcluster.constants import PCLUSTER_CLUSTER_NAME_TAG, PCLUSTER_NODE_TYPE_TAG, PCLUSTER_VERSION_TAG
+from pcluster.constants import (
+    PCLUSTER_CLUSTER_NAME_TAG,
+    PCLUSTER_NODE_TYPE_TAG,
+    PCLUSTER_QUEUE_NAME_TAG,
+    PCLUSTER_VERSION_TAG,
+)
 from pcluster.models.cluster import BadRequestClusterActionError, Cluster, ClusterActionError, NodeType
-from pcluster.models.cluster_resources import ClusterStack
+from pcluster.models.cluster_resources import ClusterInstance, ClusterStack
+from pcluster.models.compute_fleet_status_manager import ComputeFleetStatus
 from pcluster.models.s3_bucket import S3Bucket, S3FileFormat
+from pcluster.models.stage_graph import StageGraph
 from pcluster.schemas.cluster_schema import ClusterSchema
 from tests.pcluster.aws.dummy_aws_api import mock_aws_api
 from tests.pcluster.config.dummy_cluster_config import dummy_slurm_cluster_config
@@ -150,48 +158,68 @@ class TestCluster:
         return sorted(tags, key=lambda tag: tag["Key"])
 
     @pytest.mark.parametrize(
-        "stack_statuses",
+        "previous_event, stack_events, expected_status",
         [
-            [
-                "UPDATE_IN_PROGRESS",
-                "UPDATE_IN_PROGRESS",
-                "UPDATE_IN_PROGRESS",
-                "UPDATE_IN_PROGRESS",
-                "UPDATE_COMPLETE",
+            (
+                {"EventId": "previous", "ResourceStatus": "CREATE_COMPLETE"},
+                [
+                    {"EventId": "previous", "ResourceStatus": "CREATE_COMPLETE"},
+                    {"EventId": "previous", "ResourceStatus": "CREATE_COMPLETE"},
+                    {"EventId": "1", "ResourceStatus": "UPDATE_IN_PROGRESS"},
+                    {"EventId": "2", "ResourceStatus": "UPDATE_COMPLETE_CLEANUP_IN_PROGRESS"},
+                    {"EventId": "3", "ResourceStatus": "UPDATE_COMPLETE"},
+                ],
                 "UPDATE_COMPLETE",
-            ],
-            [
-                "UPDATE_IN_PROGRESS",
-                "UPDATE_IN_PROGRESS",
-                "UPDATE_IN_PROGRESS",
-                "UPDATE_IN_PROGRESS",
-                "anything other than UPDATE_IN_PROGRESS",
-                "anything other than UPDATE_IN_PROGRESS",
-            ],
-            [
-                "UPDATE_IN_PROGRESS",
-                "UPDATE_IN_PROGRESS",
-                "UPDATE_IN_PROGRESS",
-                "UPDATE_COMPLETE_CLEANUP_IN_PROGRESS",
+            ),
+            (
+                {"EventId": "previous", "ResourceStatus": "UPDATE_COMPLETE"},
+                [
+                    {"EventId": "previous", "ResourceStatus": "UPDATE_COMPLETE"},
+                    {"EventId": "1", "ResourceStatus": "UPDATE_IN_PROGRESS"},
+                    {"EventId": "2", "ResourceStatus": "UPDATE_ROLLBACK_IN_PROGRESS"},
+                    {"EventId": "3", "ResourceStatus": "UPDATE_ROLLBACK_COMPLETE_CLEANUP_IN_PROGRESS"},
+                    {"EventId": "4", "ResourceStatus": "UPDATE_ROLLBACK_COMPLETE"},
+                ],
+                "UPDATE_ROLLBACK_COMPLETE",
+            ),
+            (
+                None,
+                [
+                    None,
+                    {"EventId": "1", "ResourceStatus": "UPDATE_IN_PROGRESS"},
+                    {"EventId": "2", "ResourceStatus": "UPDATE_COMPLETE"},
+                ],
                 "UPDATE_COMPLETE",
-            ],
-            ["UPDATE_COMPLETE", "UPDATE_COMPLETE"],
+            ),
+            (None, [{"EventId": "1", "ResourceStatus": "UPDATE_COMPLETE"}], "UPDATE_COMPLETE"),
         ],
     )
-    def test_wait_for_stack_update(self, cluster, mocker, stack_statuses):
+    def test_wait_for_stack_update(self, cluster, mocker, caplog, previous_event, stack_events, expected_status):
         """
         Verify that _wait_for_stack_update behaves as expected.
 
-        _wait_for_stack_update should call updated_status until the StackStatus is anything besides UPDATE_IN_PROGRESS
-        and UPDATE_COMPLETE_CLEANUP_IN_PROGRESS.
-        use that to get expected call count for updated_status
+        _wait_for_stack_update should poll the last stack event until its status is not an update in progress,
+        ignoring the event preceding the update request.
         """
-        expected_call_count = len(stack_statuses)
-        updated_status_mock = mocker.patch.object(cluster, "_get_updated_stack_status", side_effect=stack_statuses)
-        mocker.patch("pcluster.models.cluster.time.sleep")  # so we don't actually have to wait
+        caplog.set_level(logging.INFO)
+        last_stack_event_mock = mocker.patch.object(cluster, "_get_last_stack_event", side_effect=stack_events)
+        sleep_mock = mocker.patch("pcluster.models.compute_fleet_status_manager.time.sleep")
+
+        cluster._wait_for_stack_update(previous_event)
 
-        cluster._wait_for_stack_update()
-        assert_that(updated_status_mock.call_count).is_equal_to(expected_call_count)
+        assert_that(last_stack_event_mock.call_count).is_equal_to(len(stack_events))
+        assert_that(sleep_mock.call_count).is_equal_to(len(stack_events) - 1)
+        assert_that(caplog.text).contains(f"terminated with status {expected_status}")
+
+    def test_get_last_stack_event(self, cluster, mocker):
+        """Verify that _get_last_stack_event maps the errors retrieving the stack events."""
+        mock_aws_api(mocker)
+        mocker.patch(
+            "pcluster.aws.cfn.CfnClient.get_stack_events",
+            side_effect=AWSClientError(function_name="describe_stack_events", message="error"),
+        )
+        with pytest.raises(ClusterActionError, match=f"Unable to retrieve status of stack {FAKE_NAME}"):
+            cluster._get_last_stack_event()
 
     @pytest.mark.parametrize(
         "template_body,error_message",
@@ -256,12 +284,14 @@ class TestCluster:
         # mock bucket object utils
         mock_bucket_object_utils(mocker)
 
+        previous_event = {"EventId": "previous"}
+        mocker.patch.object(cluster, "_get_last_stack_event", return_value=previous_event)
         wait_for_update_mock = mocker.patch.object(cluster, "_wait_for_stack_update")
 
         if error_message is None or "no updates are to be performed" in error_message.lower():
             cluster._update_stack_template(template_body)
             if error_message is None or "no updates are to be performed" not in error_message.lower():
-                assert_that(wait_for_update_mock.called).is_true()
+                wait_for_update_mock.assert_called_once_with(previous_event)
             else:
                 assert_that(wait_for_update_mock.called).is_false()
         else:
@@ -321,7 +351,9 @@ class TestCluster:
     def test_persist_cloudwatch_log_groups(self, cluster, mocker, caplog, template, expected_retain, fail_on_persist):
         """Verify that _persist_cloudwatch_log_groups behaves as expected."""
         mocker.patch("pcluster.models.cluster.Cluster._get_artifact_dir")
-        mocker.patch("pcluster.models.cluster.Cluster._get_stack_template", return_value=template)
+        get_stack_template_mock = mocker.patch(
+            "pcluster.models.cluster.Cluster._get_stack_template", return_value=template
+        )
 
         client_error = AWSClientError("function", "Generic error.")
         update_template_mock = mocker.patch.object(
@@ -348,7 +380,9 @@ class TestCluster:
         else:
             cluster._persist_cloudwatch_log_groups()
 
-        assert_that(get_unretained_cw_log_group_resource_keys_mock.call_count).is_equal_to(1)
+        # the template is retrieved once and shared by the lookup of the log groups and their update
+        assert_that(get_stack_template_mock.call_count).is_equal_to(1)
+        get_unretained_cw_log_group_resource_keys_mock.assert_called_once_with(template)
         assert_that(update_template_mock.call_count).is_equal_to(1 if expected_retain else 0)
 
     @pytest.mark.parametrize(
@@ -365,7 +399,6 @@ class TestCluster:
     def test_persist_stack_resources(self, cluster, mocker, template):
         """Verify that _persist_stack_resources behaves as expected."""
         mocker.patch("pcluster.models.cluster.Cluster._get_artifact_dir")
-        mocker.patch("pcluster.models.cluster.Cluster._get_stack_template", return_value=template)
         update_stack_template_mock = mocker.patch("pcluster.models.cluster.Cluster._update_stack_template")
         mock_aws_api(mocker)
         mocker.patch("pcluster.aws.cfn.CfnClient.update_stack_from_url")
@@ -382,12 +415,12 @@ class TestCluster:
 
         if expected_error_message:
             with pytest.raises(KeyError, match=expected_error_message):
-                cluster._persist_stack_resources(["key"])
+                cluster._persist_stack_resources(["key"], template)
             assert_that(update_stack_template_mock.called).is_false()
         else:
-            cluster._persist_stack_resources(["key"])
+            cluster._persist_stack_resources(["key"], template)
             assert_that(update_stack_template_mock.called).is_true()
-            assert_that(cluster._get_stack_template()["Resources"]["key"]["DeletionPolicy"]).is_equal_to("Retain")
+            assert_that(template["Resources"]["key"]["DeletionPolicy"]).is_equal_to("Retain")
 
     @pytest.mark.parametrize(
         "template,expected_return",
@@ -401,8 +434,7 @@ class TestCluster:
     )
     def test_get_unretained_cw_log_group_resource_keys(self, cluster, mocker, template, expected_return):
         """Verify that _get_unretained_cw_log_group_resource_keys behaves as expected."""
-        mocker.patch("pcluster.models.cluster.Cluster._get_stack_template", return_value=template)
-        observed_return = cluster._get_unretained_cw_log_group_resource_keys()
+        observed_return = cluster._get_unretained_cw_log_group_resource_keys(template)
         assert_that(observed_return).is_equal_to(expected_return)
 
     @pytest.mark.parametrize(
@@ -753,6 +785,69 @@ class TestCluster:
         else:
             assert_that(bucket_object_utils_dict.get("upload_config").call_count).is_equal_to(0)
 
+    @pytest.mark.parametrize(
+        "changes, cluster_template, expected_stages",
+        [
+            (
+                None,
+                None,
+                [
+                    "upload_config",
+                    "upload_instance_types_data",
+                    "upload_resources",
+                    "build_template",
+                    "upload_template",
+                ],
+            ),
+            (
+                [["param_path"], ["change"]],
+                None,
+                [
+                    "upload_config",
+                    "upload_instance_types_data",
+                    "upload_resources",
+                    "upload_change_set",
+                    "build_template",
+                    "upload_template",
+                ],
+            ),
+            (
+                None,
+                "https://bucket/template.yaml",
+                ["upload_config", "upload_instance_types_data", "upload_resources", "upload_template"],
+            ),
+        ],
+    )
+    def test_upload_artifacts_and_build_template(self, cluster, mocker, changes, cluster_template, expected_stages):
+        """Verify that the template is generated once the config versions are known, and then uploaded."""
+        cluster.config = mocker.MagicMock(dev_settings=mocker.MagicMock(cluster_template=cluster_template))
+        calls = []
+
+        def _record(name, result=None):
+            return lambda *args, **kwargs: calls.append((name, args)) or result
+
+        for method in ["_upload_config", "_upload_instance_types_data", "_upload_resources", "_upload_template"]:
+            mocker.patch.object(cluster, method, side_effect=_record(method))
+        mocker.patch.object(cluster, "_upload_change_set", side_effect=_record("_upload_change_set"))
+        mocker.patch.object(cluster, "_build_template", side_effect=_record("_build_template", ["asset"]))
+        stage_graph_run = mocker.spy(StageGraph, "run")
+
+        assets_metadata = cluster._upload_artifacts_and_build_template(changes=changes, log_group_name="log-group")
+
+        assert_that(assets_metadata).is_equal_to(["asset"] if not cluster_template else None)
+        stage_graph = stage_graph_run.call_args[0][0]
+        assert_that(list(stage_graph.timings)).contains_only(*expected_stages)
+        called_methods = [name for name, _ in calls]
+        assert_that(called_methods[-1]).is_equal_to("_upload_template")
+        if not cluster_template:
+            assert_that(called_methods.index("_build_template")).is_greater_than(called_methods.index("_upload_config"))
+            assert_that(called_methods.index("_build_template")).is_greater_than(
+                called_methods.index("_upload_instance_types_data")
+            )
+            assert_that(calls).contains(("_build_template", ("log-group",)))
+        if changes:
+            assert_that(calls).contains(("_upload_change_set", (changes,)))
+
     @pytest.mark.parametrize(
         "assets_metadata, expected_parameters",
         [
@@ -842,6 +937,53 @@ class TestCluster:
         lns = cluster.login_nodes_status
         assert_that(lns.get_login_nodes_pool_available()).is_false()
 
+    def test_running_capacity_snapshot(self, mocker, cluster):
+        mock_aws_api(mocker)
+        cluster.config = dummy_slurm_cluster_config(mocker)
+        mocker.patch(
+            "pcluster.models.cluster_resources.ClusterStack.scheduler", new_callable=PropertyMock(return_value="slurm")
+        )
+        compute_fleet_status_manager = mocker.MagicMock()
+        compute_fleet_status_manager.get_status.return_value = ComputeFleetStatus.RUNNING
+        mocker.patch(
+            "pcluster.models.cluster.Cluster.compute_fleet_status_manager",
+            new_callable=PropertyMock(return_value=compute_fleet_status_manager),
+        )
+
+        def _instances(*queue_names):
+            return [
+                ClusterInstance({"Tags": [{"Key": PCLUSTER_QUEUE_NAME_TAG, "Value": queue_name}]})
+                for queue_name in queue_names
+            ]
+
+        describe_instances_mock = mocker.patch(
+            "pcluster.models.cluster.Cluster.describe_instances",
+            side_effect=[(_instances("queue1", "queue2"), "token"), (_instances("queue1"), None)] * 2,
+        )
+        retrieve_data_mock = mocker.patch("pcluster.models.login_nodes_status.LoginNodesStatus.retrieve_data")
+        mocker.patch("pcluster.models.login_nodes_status.LoginNodesStatus.get_healthy_nodes", return_value=1)
+        mocker.patch("pcluster.models.login_nodes_status.LoginNodesStatus.get_unhealthy_nodes", return_value=0)
+
+        # The checks on the same snapshot retrieve each value once
+        for _ in range(3):
+            assert_that(cluster.has_running_capacity()).is_true()
+            assert_that(cluster.get_running_capacity()).is_equal_to(3)
+            assert_that(cluster.has_running_login_nodes()).is_true()
+            assert_that(cluster.has_running_login_nodes(pool_name="pool1")).is_true()
+        assert_that(cluster.running_capacity_snapshot.instances_per_queue).is_equal_to({"queue1": 2, "queue2": 1})
+        compute_fleet_status_manager.get_status.assert_called_once()
+        assert_that(describe_instances_mock.call_count).is_equal_to(2)
+        describe_instances_mock.assert_called_with(node_type=NodeType.COMPUTE, next_token="token")
+        retrieve_data_mock.assert_called_once()
+
+        # Refreshing the snapshot retrieves the values again
+        compute_fleet_status_manager.get_status.return_value = ComputeFleetStatus.STOPPED
+        assert_that(cluster.has_running_capacity(updated_value=True)).is_false()
+        assert_that(cluster.get_running_capacity()).is_equal_to(3)
+        assert_that(compute_fleet_status_manager.get_status.call_count).is_equal_to(2)
+        assert_that(describe_instances_mock.call_count).is_equal_to(4)
+        retrieve_data_mock.assert_called_once()
+
 
 OLD_CONFIGURATION = """
 Image:
@@ -9,18 +9,21 @@
 # OR CONDITIONS OF ANY KIND, express or implied. See the License for the specific language governing permissions and
 # limitations under the License.
 import datetime
+import json
 import os
 import time
 
 import pytest
 from assertpy import assert_that
 
+from pcluster.api.encoder import JSONEncoder
 from pcluster.aws.common import AWSClientError
 from pcluster.models.common import (
     CloudWatchLogsExporter,
     FiltersParserError,
     LogGroupTimeFiltersParser,
     LogsExporterError,
+    StackEventStore,
 )
 from tests.pcluster.aws.dummy_aws_api import mock_aws_api
 
@@ -305,7 +308,7 @@ class TestCloudWatchLogsExporter:
         )
 
         expected_call_count = len(task_statuses)
-        mocker.patch("pcluster.models.cluster.time.sleep")  # so we don't actually have to wait
+        mocker.patch("pcluster.models.common.time.sleep")  # so we don't actually have to wait
 
         cw_logs_exporter._wait_for_task_completion("task_id")
         assert_that(wait_for_task_mock.call_count).is_equal_to(expected_call_count)
@@ -326,3 +329,90 @@ class TestCloudWatchLogsExporter:
         else:
             task_id = cw_logs_exporter._export_logs_to_s3("log_group_name", "bucket")
             wait_for_completion_mock.assert_called_with(task_id)
+
+
+class _FakeStackEvents:
+    """Fake CloudFormation stack history, returning the events newest first in pages of the given size."""
+
+    def __init__(self, page_size=2):
+        self.events = []
+        self.page_size = page_size
+        self.calls = []
+
+    def add_events(self, count, **kwargs):
+        for _ in range(count):
+            event_id = f"event-{len(self.events)}"
+            self.events.insert(0, {"EventId": event_id, "Timestamp": datetime.datetime(2024, 1, 1), **kwargs})
+
+    def get_stack_events(self, stack_name, next_token=None):
+        self.calls.append(next_token)
+        start = int(next_token or 0)
+        response = {"StackEvents": self.events[start : start + self.page_size]}  # noqa: E203
+        if start + self.page_size < len(self.events):
+            response["nextToken"] = str(start + self.page_size)
+        return response
+
+
+class TestStackEventStore:
+    @pytest.fixture()
+    def stack_events(self, mocker, set_env):
+        mock_aws_api(mocker)
+        set_env("AWS_DEFAULT_REGION", "us-east-1")
+        stack_events = _FakeStackEvents()
+        mocker.patch("pcluster.aws.cfn.CfnClient.get_stack_events", side_effect=stack_events.get_stack_events)
+        return stack_events
+
+    def test_find_stops_at_first_match(self, stack_events):
+        stack_events.add_events(5)
+        stack_events.add_events(1, ResourceStatus="CREATE_FAILED")
+        stack_events.add_events(3)
+
+        event = StackEventStore.get("stack").find(lambda e: e.get("ResourceStatus") == "CREATE_FAILED")
+
+        assert_that(event["EventId"]).is_equal_to("event-5")
+        # only the first two pages out of five have been retrieved
+        assert_that(stack_events.calls).is_equal_to([None, "2"])
+
+    def test_only_newer_events_are_fetched(self, stack_events):
+        stack_events.add_events(5)
+        store = StackEventStore.get("stack")
+        assert_that(store.find(lambda e: False)).is_none()
+        assert_that(stack_events.calls).is_equal_to([None, "2", "4"])
+
+        stack_events.calls.clear()
+        stack_events.add_events(3)
+        all_events = list(StackEventStore.get("stack").iter_events())
+
+        assert_that([event["EventId"] for event in all_events]).is_equal_to([f"event-{i}" for i in range(7, -1, -1)])
+        # the old events are not retrieved again
+        assert_that(stack_events.calls).is_equal_to([None, "2"])
+
+    def test_recreated_stack_events_are_reloaded(self, stack_events):
+        stack_events.add_events(3)
+        assert_that(list(StackEventStore.get("stack").iter_events())).is_length(3)
+
+        stack_events.events = []
+        stack_events.add_events(1, ResourceStatus="CREATE_IN_PROGRESS")
+        stack_events.events[0]["EventId"] = "new-stack-event"
+
+        assert_that(list(StackEventStore.get("stack").iter_events())).is_equal_to(stack_events.events)
+
+    def test_find_stack_event(self, stack_events):
+        stack_events.add_events(1, ResourceType="AWS::CloudFormation::Stack", LogicalResourceId="stack")
+        stack_events.add_events(1, ResourceType="AWS::CloudFormation::Stack", LogicalResourceId="nested-stack")
+        stack_events.add_events(2, ResourceType="AWS::Logs::LogGroup", LogicalResourceId="stack")
+
+        assert_that(StackEventStore.get("stack").find_stack_event()["EventId"]).is_equal_to("event-0")
+        assert_that(StackEventStore.get("other-stack").find_stack_event()).is_none()
+
+    @pytest.mark.parametrize("events_count", [0, 1, 5])
+    def test_write_json(self, stack_events, tmpdir, events_count):
+        stack_events.add_events(events_count, ResourceStatusReason="multi-line\nreason")
+        output_file = str(tmpdir.join("events.json"))
+
+        StackEventStore.get("stack").write_json(output_file)
+
+        with open(output_file, encoding="utf-8") as events_file:
+            content = events_file.read()
+        # the streamed output is the same as serializing the whole list at once
+        assert_that(content).is_equal_to(json.dumps(stack_events.events, cls=JSONEncoder, indent=2))
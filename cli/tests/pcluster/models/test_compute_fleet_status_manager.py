@@ -9,6 +9,7 @@ from pcluster.models.compute_fleet_status_manager import (
     ComputeFleetStatusManager,
     JsonComputeFleetStatusManager,
     PlainTextComputeFleetStatusManager,
+    wait_for_status_change,
 )
 
 
@@ -177,3 +178,25 @@ class TestComputeFleetStatusManager:
     def test_get_manager(self, version, expected_compute_fleet_status_manager_instance):
         compute_fleet_status_manager = ComputeFleetStatusManager.get_manager("cluster-name", version)
         assert_that(compute_fleet_status_manager).is_instance_of(expected_compute_fleet_status_manager_instance)
+
+
+def test_wait_for_status_change(mocker):
+    mocker.patch("pcluster.models.compute_fleet_status_manager.time.time", return_value=0)
+    sleep_mock = mocker.patch("pcluster.models.compute_fleet_status_manager.time.sleep")
+    get_status = mocker.MagicMock(side_effect=[ComputeFleetStatus.STARTING] * 6 + [ComputeFleetStatus.RUNNING])
+
+    status = wait_for_status_change(get_status, {ComputeFleetStatus.STARTING}, timeout=60, max_interval=4)
+
+    assert_that(status).is_equal_to(ComputeFleetStatus.RUNNING)
+    # The status is polled right away, then with an increasing interval up to max_interval
+    assert_that([call.args[0] for call in sleep_mock.call_args_list]).is_equal_to([1, 1.5, 2.25, 3.375, 4, 4])
+
+
+def test_wait_for_status_change_timeout(mocker):
+    mocker.patch("pcluster.models.compute_fleet_status_manager.time.time", side_effect=[0, 0, 19.5, 25])
+    sleep_mock = mocker.patch("pcluster.models.compute_fleet_status_manager.time.sleep")
+
+    with pytest.raises(TimeoutError):
+        wait_for_status_change(lambda: ComputeFleetStatus.STOPPING, {ComputeFleetStatus.STOPPING}, timeout=20)
+    # The last sleep never goes beyond the timeout
+    assert_that([call.args[0] for call in sleep_mock.call_args_list]).is_equal_to([1, 0.5])
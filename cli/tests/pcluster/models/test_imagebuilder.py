@@ -24,6 +24,10 @@ from pcluster.models.imagebuilder import (
     BadRequestImageBuilderActionError,
     ImageBuilder,
     ImageBuilderActionError,
+    ImageGarbageAction,
+    ImageGarbageCollector,
+    ImageGarbageStatus,
+    ImageRetentionPolicy,
     LimitExceededImageBuilderActionError,
 )
 from pcluster.models.imagebuilder_resources import ImageBuilderStack
@@ -310,7 +314,7 @@ def _test_imagebuilder(
     )
     mocker.patch("pcluster.aws.ec2.Ec2Client.list_instance_types", return_value=instance_response)
     mocker.patch("pcluster.aws.s3.S3Client.head_object", return_value=url_response, side_effect=url_side_effect)
-    mocker.patch("pcluster.validators.s3_validators.urlopen", side_effect=url_open_side_effect)
+    mocker.patch("pcluster.validators.utils.UrlProber.probe", side_effect=url_open_side_effect)
     mocker.patch("pcluster.aws.kms.KmsClient.describe_key", return_value=None)
 
     imagebuilder = imagebuilder_factory(resource).get("imagebuilder")
@@ -365,7 +369,7 @@ def _test_dev_settings(
 ):
     mock_aws_api(mocker)
     mocker.patch("pcluster.aws.s3.S3Client.head_object", return_value=url_response, side_effect=url_side_effect)
-    mocker.patch("pcluster.validators.s3_validators.urlopen", side_effect=url_open_side_effect)
+    mocker.patch("pcluster.validators.utils.UrlProber.probe", side_effect=url_open_side_effect)
 
     dev_settings = imagebuilder_factory(resource).get("dev_settings")
     validation_failures = dev_settings.validate()
@@ -633,3 +637,194 @@ class _MockExportImageLogsFiltersParser:
         self.log_stream_prefix = None
         self.start_time = 0
         self.end_time = 0
+
+
+def test_delete_removes_resources_concurrently(mocker):
+    mock_aws_api(mocker)
+    image = ImageInfo(
+        {
+            "ImageId": "ami-123",
+            "BlockDeviceMappings": [{"Ebs": {"SnapshotId": "snap-1"}}, {"Ebs": {"SnapshotId": "snap-2"}}],
+            "Tags": [{"Key": "parallelcluster:image_id", "Value": "imageId"}],
+        }
+    )
+    calls = []
+    mocker.patch("pcluster.aws.cfn.CfnClient.stack_exists", return_value=False)
+    mocker.patch("pcluster.aws.ec2.Ec2Client.image_exists", return_value=True)
+    mocker.patch(
+        "pcluster.aws.ec2.Ec2Client.deregister_image",
+        side_effect=lambda image_id: calls.append(("deregister", image_id)),
+    )
+    mocker.patch(
+        "pcluster.aws.ec2.Ec2Client.delete_snapshot",
+        side_effect=lambda snapshot_id: calls.append(("snap", snapshot_id)),
+    )
+    delete_s3_artifacts_mock = mocker.patch("pcluster.models.imagebuilder.ImageBuilder._delete_s3_artifacts")
+    delete_log_group_mock = mocker.patch("pcluster.models.imagebuilder.ImageBuilder._delete_log_group")
+    invalidate_mock = mocker.patch("pcluster.models.imagebuilder.ImageListCache.invalidate")
+
+    ImageBuilder(image=image, image_id="imageId").delete(force=True)
+
+    # Snapshots are deleted only after the image has been deregistered
+    assert_that(calls[0]).is_equal_to(("deregister", "ami-123"))
+    assert_that(calls[1:]).contains_only(("snap", "snap-1"), ("snap", "snap-2"))
+    delete_s3_artifacts_mock.assert_called_once()
+    delete_log_group_mock.assert_called_once()
+    invalidate_mock.assert_called_once()
+
+
+def test_delete_snapshot_error_is_mapped(mocker):
+    mock_aws_api(mocker)
+    image = ImageInfo({"ImageId": "ami-123", "BlockDeviceMappings": [{"Ebs": {"SnapshotId": "snap-1"}}], "Tags": []})
+    mocker.patch("pcluster.aws.cfn.CfnClient.stack_exists", return_value=False)
+    mocker.patch("pcluster.aws.ec2.Ec2Client.image_exists", return_value=True)
+    mocker.patch("pcluster.aws.ec2.Ec2Client.deregister_image")
+    mocker.patch(
+        "pcluster.aws.ec2.Ec2Client.delete_snapshot",
+        side_effect=LimitExceededError(function_name="delete_snapshot", message="test error"),
+    )
+    mocker.patch("pcluster.models.imagebuilder.ImageBuilder._delete_s3_artifacts")
+    mocker.patch("pcluster.models.imagebuilder.ImageBuilder._delete_log_group")
+
+    with pytest.raises(LimitExceededImageBuilderActionError, match="test error"):
+        ImageBuilder(image=image, image_id="imageId").delete(force=True)
+
+
+def _gc_image(image_id, creation_date, version="3.0.0"):
+    return ImageInfo(
+        {
+            "ImageId": f"ami-{image_id}",
+            "CreationDate": creation_date,
+            "Tags": [
+                {"Key": "parallelcluster:image_id", "Value": image_id},
+                {"Key": "parallelcluster:version", "Value": version},
+            ],
+        }
+    )
+
+
+def _gc_stack(image_id, status, creation_time, version="3.0.0"):
+    return {
+        "StackName": image_id,
+        "StackStatus": status,
+        "CreationTime": creation_time,
+        "Tags": [
+            {"Key": "parallelcluster:image_id", "Value": image_id},
+            {"Key": "parallelcluster:version", "Value": version},
+        ],
+    }
+
+
+@pytest.mark.parametrize(
+    "policy, force, dry_run, expected_actions",
+    [
+        (
+            ImageRetentionPolicy(older_than_days=30),
+            False,
+            True,
+            {
+                "failed-old": ImageGarbageAction.WOULD_DELETE,
+                "old": ImageGarbageAction.WOULD_DELETE,
+                "old-in-use": ImageGarbageAction.SKIPPED_IN_USE,
+                "old-shared": ImageGarbageAction.SKIPPED_SHARED,
+            },
+        ),
+        (
+            ImageRetentionPolicy(older_than_days=30, statuses=(ImageGarbageStatus.AVAILABLE,)),
+            True,
+            False,
+            {
+                "old": ImageGarbageAction.DELETED,
+                "old-in-use": ImageGarbageAction.SKIPPED_IN_USE,
+                "old-shared": ImageGarbageAction.DELETED,
+            },
+        ),
+        (
+            ImageRetentionPolicy(versions=("3.1.0",)),
+            False,
+            False,
+            {"new-3.1.0": ImageGarbageAction.DELETED, "failed-3.1.0": ImageGarbageAction.DELETED},
+        ),
+    ],
+)
+def test_image_garbage_collector(mocker, policy, force, dry_run, expected_actions):
+    mock_aws_api(mocker)
+    now = datetime.datetime.now(tz=datetime.timezone.utc)
+    old, new = now - datetime.timedelta(days=60), now - datetime.timedelta(days=1)
+    mocker.patch(
+        "pcluster.aws.ec2.Ec2Client.get_images",
+        return_value=[
+            _gc_image("old", old.isoformat()),
+            _gc_image("old-in-use", old.isoformat()),
+            _gc_image("old-shared", old.isoformat()),
+            _gc_image("new", new.isoformat()),
+            _gc_image("new-3.1.0", new.isoformat(), version="3.1.0"),
+        ],
+    )
+    get_stacks_mock = mocker.patch(
+        "pcluster.aws.cfn.CfnClient.get_imagebuilder_stacks",
+        side_effect=[
+            ([_gc_stack("old", "CREATE_COMPLETE", old), _gc_stack("failed-old", "ROLLBACK_COMPLETE", old)], "token"),
+            (
+                [
+                    _gc_stack("failed-new", "CREATE_FAILED", new),
+                    _gc_stack("failed-3.1.0", "DELETE_FAILED", new, version="3.1.0"),
+                    _gc_stack("building", "CREATE_IN_PROGRESS", old),
+                ],
+                None,
+            ),
+        ],
+    )
+    in_use_mock = mocker.patch("pcluster.aws.ec2.Ec2Client.get_in_use_image_ids", return_value={"ami-old-in-use"})
+    mocker.patch(
+        "pcluster.aws.ec2.Ec2Client.get_image_shared_account_ids",
+        side_effect=lambda ami_id: ["123456789012"] if ami_id == "ami-old-shared" else [],
+    )
+    mocker.patch("pcluster.aws.cfn.CfnClient.describe_stack_resource", return_value=None)
+    deleted_images = []
+    mocker.patch(
+        "pcluster.models.imagebuilder.ImageBuilder.delete",
+        autospec=True,
+        side_effect=lambda imagebuilder, force: deleted_images.append(imagebuilder.image_id),
+    )
+
+    report = ImageGarbageCollector(policy, force=force).collect(dry_run=dry_run)
+
+    assert_that({entry["imageId"]: entry["action"] for entry in report}).is_equal_to(expected_actions)
+    # Images are reported from the oldest to the newest
+    creation_times = [entry["creationTime"] for entry in report]
+    assert_that(creation_times).is_equal_to(sorted(creation_times))
+    assert_that(sorted(deleted_images)).is_equal_to(
+        sorted(image_id for image_id, action in expected_actions.items() if action == ImageGarbageAction.DELETED)
+    )
+    in_use_mock.assert_called_once()
+    assert_that(get_stacks_mock.call_count).is_equal_to(2 if ImageGarbageStatus.FAILED in policy.statuses else 0)
+
+
+def test_image_garbage_collector_reports_failures(mocker):
+    mock_aws_api(mocker)
+    mocker.patch("pcluster.aws.ec2.Ec2Client.get_images", return_value=[_gc_image("old", "2020-01-01T00:00:00.000Z")])
+    mocker.patch("pcluster.aws.ec2.Ec2Client.get_in_use_image_ids", return_value=set())
+    mocker.patch("pcluster.aws.ec2.Ec2Client.get_image_shared_account_ids", return_value=[])
+    mocker.patch(
+        "pcluster.models.imagebuilder.ImageBuilder.delete",
+        side_effect=BadRequestImageBuilderActionError("EC2 ImageBuilder Image has a running workflow."),
+    )
+
+    report = ImageGarbageCollector(
+        ImageRetentionPolicy(older_than_days=1, statuses=(ImageGarbageStatus.AVAILABLE,))
+    ).collect()
+
+    assert_that(report).is_equal_to(
+        [
+            {
+                "imageId": "old",
+                "imageBuildStatus": ImageGarbageStatus.AVAILABLE,
+                "creationTime": "2020-01-01T00:00:00+00:00",
+                "version": "3.0.0",
+                "ec2AmiId": "ami-old",
+                "action": ImageGarbageAction.FAILED,
+                "reason": "EC2 ImageBuilder Image has a running workflow.",
+            }
+        ]
+    )
@@ -0,0 +1,111 @@
+# Copyright 2024 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"). You may not use this file except in compliance
+# with the License. A copy of the License is located at
+#
+# http://aws.amazon.com/apache2.0/
+#
+# or in the "LICENSE.txt" file accompanying this file. This file is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES
+# OR CONDITIONS OF ANY KIND, express or implied. See the License for the specific language governing permissions and
+# limitations under the License.
+import threading
+import time
+
+import pytest
+from assertpy import assert_that
+
+from pcluster.models.stage_graph import StageGraph
+
+
+class _StageRecorder:
+    """Record the order in which the stages start and complete."""
+
+    def __init__(self):
+        self.events = []
+        self._lock = threading.Lock()
+
+    def stage(self, name, duration=0, result=None, error=None):
+        def _run():
+            with self._lock:
+                self.events.append(f"start {name}")
+            time.sleep(duration)
+            with self._lock:
+                self.events.append(f"end {name}")
+            if error:
+                raise error
+            return result
+
+        return _run
+
+
+def test_stages_run_after_their_dependencies():
+    recorder = _StageRecorder()
+    stage_graph = StageGraph("test")
+    stage_graph.add_stage("upload_config", recorder.stage("upload_config", 0.05, result="config-version"))
+    stage_graph.add_stage("upload_resources", recorder.stage("upload_resources", 0.2))
+    stage_graph.add_stage("build_template", recorder.stage("build_template", 0.05, "template"), ["upload_config"])
+    stage_graph.add_stage("upload_template", recorder.stage("upload_template"), ["build_template"])
+
+    results = stage_graph.run()
+
+    assert_that(results).is_equal_to(
+        {
+            "upload_config": "config-version",
+            "upload_resources": None,
+            "build_template": "template",
+            "upload_template": None,
+        }
+    )
+    events = recorder.events
+    assert_that(events.index("start build_template")).is_greater_than(events.index("end upload_config"))
+    assert_that(events.index("start upload_template")).is_greater_than(events.index("end build_template"))
+    # the resources are uploaded while the template is being built
+    assert_that(events.index("start build_template")).is_less_than(events.index("end upload_resources"))
+    assert_that(stage_graph.timings).contains_only(*results.keys())
+    assert_that([stage.name for stage in stage_graph.critical_path()]).is_equal_to(["upload_resources"])
+
+
+def test_critical_path_follows_the_last_completed_dependency():
+    recorder = _StageRecorder()
+    stage_graph = StageGraph("test")
+    stage_graph.add_stage("upload_config", recorder.stage("upload_config", 0.01))
+    stage_graph.add_stage("upload_instance_types_data", recorder.stage("upload_instance_types_data", 0.1))
+    stage_graph.add_stage(
+        "build_template", recorder.stage("build_template", 0.1), ["upload_config", "upload_instance_types_data"]
+    )
+    stage_graph.add_stage("upload_template", recorder.stage("upload_template"), ["build_template"])
+
+    stage_graph.run()
+
+    assert_that([stage.name for stage in stage_graph.critical_path()]).is_equal_to(
+        ["upload_instance_types_data", "build_template", "upload_template"]
+    )
+
+
+def test_failure_stops_the_dependent_stages():
+    recorder = _StageRecorder()
+    stage_graph = StageGraph("test")
+    stage_graph.add_stage("upload_config", recorder.stage("upload_config", error=ValueError("upload failed")))
+    stage_graph.add_stage("upload_resources", recorder.stage("upload_resources", 0.1))
+    stage_graph.add_stage("build_template", recorder.stage("build_template"), ["upload_config"])
+
+    with pytest.raises(ValueError, match="upload failed"):
+        stage_graph.run()
+
+    # the stages already running are completed, the ones depending on the failed stage are not started
+    assert_that(recorder.events).contains("end upload_resources")
+    assert_that(recorder.events).does_not_contain("start build_template")
+
+
+@pytest.mark.parametrize(
+    "stages, error",
+    [
+        ([("a", ()), ("a", ())], "Stage a already added to test"),
+        ([("a", ()), ("b", ("a", "c"))], r"Stage b depends on stages not added to test: \['c'\]"),
+    ],
+)
+def test_add_stage_errors(stages, error):
+    stage_graph = StageGraph("test")
+    with pytest.raises(ValueError, match=error):
+        for name, depends_on in stages:
+            stage_graph.add_stage(name, lambda: None, depends_on)
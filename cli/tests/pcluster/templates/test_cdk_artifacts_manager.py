@@ -6,10 +6,11 @@
 #  OR CONDITIONS OF ANY KIND, express or implied. See the License for the specific language governing permissions and
 #  limitations under the License.
 import pytest
+from assertpy import assert_that
 from aws_cdk.cloud_assembly_schema import FileAssetMetadataEntry
 
 from pcluster.models.s3_bucket import S3FileFormat
-from pcluster.templates.cdk_artifacts_manager import CDKArtifactsManager
+from pcluster.templates.cdk_artifacts_manager import CDKArtifactsManager, StackQuotaExceededError
 from tests.pcluster.models.dummy_s3_bucket import dummy_cluster_bucket, mock_bucket, mock_bucket_object_utils
 
 
@@ -46,3 +47,40 @@ def test_upload_assets(mocker, mock_cloud_assembly, file_assets, asset_content):
     bucket_upload_asset_mock.assert_called_with(
         asset_file_content=asset_content, asset_name=file_assets[0].id, format=S3FileFormat.MINIFIED_JSON
     )
+
+
+def _template(resources_count, padding=0):
+    return {
+        "Resources": {f"Resource{index}": {"Type": "AWS::SNS::Topic"} for index in range(resources_count)},
+        "Metadata": {"Padding": "x" * padding},
+    }
+
+
+@pytest.mark.parametrize(
+    "asset_content, expected_error",
+    [
+        (_template(500), None),
+        (_template(501), "template asset_logical_id has 501 resources, more than the limit of 500"),
+        (_template(1, padding=1000000), "template asset_logical_id is 1000080 bytes, more than the limit of 1000000"),
+    ],
+)
+def test_check_stack_quotas(mocker, mock_cloud_assembly, asset_content, expected_error):
+    file_asset = FileAssetMetadataEntry(
+        path="asset_path",
+        id="asset_logical_id",
+        s3_bucket_parameter="asset_s3_bucket",
+        s3_key_parameter="asset_s3_key",
+        artifact_hash_parameter="asset_hash_parameter",
+        packaging="File",
+        source_hash="",
+    )
+    cloud_assembly = mock_cloud_assembly(assets=[file_asset], template_content=_template(10))
+    mocker.patch("pcluster.templates.cdk_artifacts_manager.load_json_dict", return_value=asset_content)
+
+    cdk_assets_manager = CDKArtifactsManager(cloud_assembly)
+    if expected_error:
+        with pytest.raises(StackQuotaExceededError) as exc_info:
+            cdk_assets_manager.check_stack_quotas()
+        assert_that(str(exc_info.value)).contains(expected_error)
+    else:
+        cdk_assets_manager.check_stack_quotas()
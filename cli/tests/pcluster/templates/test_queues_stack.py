@@ -1,4 +1,5 @@
 import json
+from copy import deepcopy
 
 import pytest
 from assertpy import assert_that
@@ -6,6 +7,7 @@ from freezegun import freeze_time
 
 from pcluster.schemas.cluster_schema import ClusterSchema
 from pcluster.templates.cdk_builder import CDKTemplateBuilder
+from pcluster.templates.queues_stack import get_queues_stack_shards
 from pcluster.utils import load_json_dict, load_yaml_dict
 from tests.pcluster.aws.dummy_aws_api import mock_aws_api
 from tests.pcluster.models.dummy_s3_bucket import dummy_cluster_bucket, mock_bucket_object_utils
@@ -168,3 +170,99 @@ def render_join(elem: dict):
         else:
             raise ValueError("Found unsupported item type while rendering Fn::Join")
     return sep.join(rendered_body)
+
+
+def _build_queues_stacks(config, shard_size):
+    """Build the cluster template and return the content of the queues stacks by shard."""
+    cluster_config = ClusterSchema(cluster_name="clustername").load(deepcopy(config))
+    _, cdk_assets = CDKTemplateBuilder().build_cluster_template(
+        cluster_config=cluster_config, bucket=dummy_cluster_bucket(), stack_name="clustername"
+    )
+    queue_shards = {
+        queue.name: shard
+        for shard, queues in get_queues_stack_shards(cluster_config.scheduling.queues, shard_size).items()
+        for queue in queues
+    }
+    queues_stacks = {}
+    for cdk_asset in cdk_assets:
+        for resource in cdk_asset["content"]["Resources"].values():
+            if resource["Type"] == "AWS::EC2::LaunchTemplate":
+                # Launch template names are <cluster name>-<queue name>-<compute resource name>
+                queue_name = resource["Properties"]["LaunchTemplateName"].split("-")[1]
+                queues_stacks.setdefault(queue_shards[queue_name], {})[queue_name] = cdk_asset["content"]
+    for shard, stacks in queues_stacks.items():
+        # All the queues of a shard are in the same stack
+        assert_that(set(map(id, stacks.values()))).is_length(1)
+        assert_that(stacks.keys()).contains_only(
+            *[name for name, queue_shard in queue_shards.items() if queue_shard == shard]
+        )
+    return {shard: next(iter(stacks.values())) for shard, stacks in queues_stacks.items()}, queue_shards
+
+
+def _get_config(datadir, queues_count, compute_resources_count, shard_size):
+    config = load_yaml_dict(datadir / "test_queues_stack_shards" / "config.yaml")
+    queue_template = config["Scheduling"]["SlurmQueues"].pop()
+    compute_resource_template = queue_template["ComputeResources"].pop()
+    for queue_index in range(queues_count):
+        queue = deepcopy(queue_template)
+        queue["Name"] = f"queue{queue_index}"
+        for compute_resource_index in range(compute_resources_count):
+            queue["ComputeResources"].append(dict(compute_resource_template, Name=f"cr{compute_resource_index}"))
+        config["Scheduling"]["SlurmQueues"].append(queue)
+    config["DevSettings"] = {"QueuesStackShardSize": shard_size}
+    return config
+
+
+def test_queues_stack_shards(mocker, datadir):
+    mock_aws_api(mocker)
+    mock_bucket_object_utils(mocker)
+    # 50 queues with 10 compute resources each would exceed the template size quota in shards of 10 queues
+    config = _get_config(datadir, queues_count=50, compute_resources_count=10, shard_size=2)
+
+    queues_stacks, queue_shards = _build_queues_stacks(config, shard_size=2)
+
+    assert_that(queues_stacks).is_length(len(set(queue_shards.values())))
+    for queues_stack in queues_stacks.values():
+        assert_that(len(queues_stack["Resources"])).is_less_than_or_equal_to(500)
+        assert_that(len(json.dumps(queues_stack, separators=(",", ":")))).is_less_than_or_equal_to(1000000)
+
+
+def _set_instance_type(config):
+    config["Scheduling"]["SlurmQueues"][3]["ComputeResources"][0]["InstanceType"] = "c5.xlarge"
+    return "queue3"
+
+
+def _add_queue(config):
+    queue = deepcopy(config["Scheduling"]["SlurmQueues"][0])
+    queue["Name"] = "queue12"
+    config["Scheduling"]["SlurmQueues"].append(queue)
+    return "queue12"
+
+
+def _remove_queue(config):
+    config["Scheduling"]["SlurmQueues"].pop(5)
+    return "queue5"
+
+
+@pytest.mark.parametrize("update_config", [_set_instance_type, _add_queue, _remove_queue])
+@freeze_time("2024-01-15T15:30:45")
+def test_queues_stack_shards_update(mocker, datadir, update_config):
+    """Verify that an update changes only the queues stack of the changed queue."""
+    mock_aws_api(mocker)
+    mock_bucket_object_utils(mocker)
+    config = _get_config(datadir, queues_count=12, compute_resources_count=1, shard_size=2)
+    queues_stacks, queue_shards = _build_queues_stacks(config, shard_size=2)
+
+    changed_queue = update_config(config)
+    updated_queues_stacks, updated_queue_shards = _build_queues_stacks(config, shard_size=2)
+
+    # The queues never move to a different shard
+    for queue_name in queue_shards.keys() & updated_queue_shards.keys():
+        assert_that(updated_queue_shards[queue_name]).is_equal_to(queue_shards[queue_name])
+    changed_shard = queue_shards.get(changed_queue, updated_queue_shards.get(changed_queue))
+    for shard in queues_stacks.keys() | updated_queues_stacks.keys():
+        if shard == changed_shard:
+            assert_that(updated_queues_stacks.get(shard)).is_not_equal_to(queues_stacks.get(shard))
+        else:
+            # The uploaded template of an untouched shard must not change at all
+            assert_that(json.dumps(updated_queues_stacks[shard])).is_equal_to(json.dumps(queues_stacks[shard]))
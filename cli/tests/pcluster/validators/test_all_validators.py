@@ -8,12 +8,17 @@
 # or in the "LICENSE.txt" file accompanying this file. This file is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES
 # OR CONDITIONS OF ANY KIND, express or implied. See the License for the specific language governing permissions and
 # limitations under the License.
+import os
+import re
+from copy import deepcopy
 from unittest.mock import PropertyMock, call
 
+import pytest
 from assertpy import assert_that
 
 from pcluster.aws.aws_resources import ImageInfo
-from pcluster.config.common import CapacityType
+from pcluster.config.common import CapacityType, Resource
+from pcluster.config.config_patch import ConfigPatch, ValidationScope
 from pcluster.schemas.cluster_schema import ClusterSchema
 from pcluster.utils import load_yaml_dict
 from pcluster.validators import (
@@ -122,11 +127,8 @@ def _assert_instance_architecture(expected_instance_architecture_validator_input
         assert_that(architecture).is_equal_to(expected_architecture)
 
 
-def test_slurm_all_validators_are_called(test_datadir, mocker):
-    """Verify that all validators are called during validation."""
-    mockers, async_mockers = _mock_all_validators(mocker)
-
-    # mock properties that use boto3 calls
+def _mock_cluster_properties(mocker):
+    """Mock properties that use boto3 calls."""
     mocker.patch(
         "pcluster.config.cluster_config.HeadNode.architecture", new_callable=PropertyMock(return_value="x86_64")
     )
@@ -150,6 +152,11 @@ def test_slurm_all_validators_are_called(test_datadir, mocker):
         return_value=ImageInfo({"BlockDeviceMappings": [{"Ebs": {"VolumeSize": 35}}]}),
     )
 
+
+def test_slurm_all_validators_are_called(test_datadir, mocker):
+    """Verify that all validators are called during validation."""
+    mockers, async_mockers = _mock_all_validators(mocker)
+    _mock_cluster_properties(mocker)
     mock_aws_api(mocker)
 
     # Need to load two configuration files to execute all validators because there are mutually exclusive parameters.
@@ -327,12 +334,12 @@ def test_slurm_validators_are_called_with_correct_argument(test_datadir, mocker)
             call(instance_type="t3.large", image="ami-12345678"),
             call(instance_type="c4.2xlarge", image="ami-12345678"),
             call(instance_type="c5.4xlarge", image="ami-12345678"),
-            call(instance_type="c5d.xlarge", image="ami-12345678"),
-            call(instance_type="t3.large", image="ami-12345678"),
             call(instance_type="t3.xlarge", image="ami-12345678"),
         ],
         any_order=True,
     )
+    # The compute resources with the same instance type and image share the validation
+    assert_that(instance_type_base_ami_compatible_validator.call_count).is_equal_to(5)
     subnets_validator.assert_has_calls([call(subnet_ids=["subnet-12345678", "subnet-23456789", "subnet-12345678"])])
     single_instance_type_subnet_validator.assert_has_calls(
         [
@@ -340,9 +347,7 @@ def test_slurm_validators_are_called_with_correct_argument(test_datadir, mocker)
             call(queue_name="queue2", subnet_ids=["subnet-23456789"]),
         ]
     )
-    security_groups_validator.assert_has_calls(
-        [call(security_group_ids=None), call(security_group_ids=None)], any_order=True
-    )
+    security_groups_validator.assert_called_once_with(security_group_ids=None)
     architecture_os_validator.assert_has_calls([call(os="alinux2", architecture="x86_64")])
     _assert_instance_architecture(
         expected_instance_architecture_validator_input=[
@@ -455,3 +460,96 @@ def test_slurm_validators_are_called_with_correct_argument(test_datadir, mocker)
     log_rotation_validator.assert_called()
     detailed_monitoring_validator.assert_called()
     compute_resource_tags_validator.assert_called()
+
+
+def _set_max_count(config):
+    config["Scheduling"]["SlurmQueues"][-1]["ComputeResources"][0]["MaxCount"] = 20
+
+
+def _set_instance_type(config):
+    config["Scheduling"]["SlurmQueues"][0]["ComputeResources"][1]["InstanceType"] = "c5.2xlarge"
+
+
+def _add_queue(config):
+    queue = deepcopy(config["Scheduling"]["SlurmQueues"][0])
+    queue["Name"] = "queue3"
+    config["Scheduling"]["SlurmQueues"].append(queue)
+
+
+def _remove_queue(config):
+    config["Scheduling"]["SlurmQueues"].pop(0)
+
+
+def _set_slurm_settings(config):
+    config["Scheduling"]["SlurmSettings"]["EnableMemoryBasedScheduling"] = True
+
+
+def _set_head_node_instance_type(config):
+    config["HeadNode"]["InstanceType"] = "c5.2xlarge"
+
+
+def _set_max_vcpus(config):
+    config["Scheduling"]["AwsBatchQueues"][0]["ComputeResources"][0]["MaxvCpus"] = 40
+
+
+@pytest.mark.parametrize(
+    "config_file, update_config",
+    [
+        ("slurm.full.yaml", _set_max_count),
+        ("slurm.full.yaml", _set_instance_type),
+        ("slurm.full.yaml", _add_queue),
+        ("slurm.full.yaml", _remove_queue),
+        ("slurm.full.yaml", _set_slurm_settings),
+        ("slurm.full.yaml", _set_head_node_instance_type),
+        ("slurm.required.yaml", _set_max_count),
+        ("awsbatch.full.yaml", _set_max_vcpus),
+    ],
+)
+def test_incremental_validation_is_equivalent_to_full_validation(mocker, config_file, update_config):
+    """Verify that the validators skipped on update are the ones with the same inputs of the base configuration."""
+    _mock_cluster_properties(mocker)
+    mock_aws_api(mocker)
+    executed_validators = []
+
+    def _validator_key(value, resource_paths):
+        if isinstance(value, Resource):
+            # Resources are identified by their path, their representation includes the validation status
+            return resource_paths.get(id(value))
+        if isinstance(value, dict):
+            return tuple((key, _validator_key(item, resource_paths)) for key, item in sorted(value.items()))
+        if isinstance(value, (list, tuple)):
+            return tuple(_validator_key(item, resource_paths) for item in value)
+        return re.sub(r"0x[0-9a-f]+| id='\d+'", "", repr(value))
+
+    def _validate(config_dict, validation_scope=None):
+        config = ClusterSchema(cluster_name="clustername").load(deepcopy(config_dict))
+        if validation_scope:
+            validation_scope = validation_scope(config)
+        resource_paths = ValidationScope(config, [], ClusterSchema(cluster_name="clustername"))._resource_paths
+        executed_validators.clear()
+        mocker.patch(
+            "pcluster.config.common.Resource._validator_execute",
+            side_effect=lambda validator_class, validator_args, *_: executed_validators.append(
+                (validator_class.__name__, _validator_key(validator_args, resource_paths))
+            ),
+        )
+        config.validate(context=ValidatorContext(during_update=True, validation_scope=validation_scope))
+        return set(executed_validators)
+
+    base_config = load_yaml_dict(f"{os.path.dirname(__file__)}/../example_configs/{config_file}")
+    target_config = deepcopy(base_config)
+    update_config(target_config)
+    cluster = mocker.MagicMock()
+    cluster.name = "clustername"
+
+    base_validators = _validate(base_config)
+    full_validators = _validate(target_config)
+    incremental_validators = _validate(
+        target_config, lambda config: ConfigPatch(cluster, base_config, target_config).validation_scope(config)
+    )
+
+    # Every validator with inputs not already validated with the base configuration is executed
+    assert_that(incremental_validators).is_subset_of(full_validators)
+    assert_that(incremental_validators).contains(*(full_validators - base_validators))
+    # Validators of the unchanged sections are skipped
+    assert_that(len(incremental_validators)).is_less_than(len(full_validators))
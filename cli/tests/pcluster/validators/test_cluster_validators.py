@@ -70,6 +70,7 @@ from pcluster.validators.cluster_validators import (
     SchedulableMemoryValidator,
     SchedulerDisableSudoAccessForDefaultUserValidator,
     SchedulerOsValidator,
+    SecurityGroupReachability,
     SharedFileCacheNotHomeValidator,
     SharedStorageMountDirValidator,
     SharedStorageNameValidator,
@@ -1293,7 +1294,8 @@ def test_queue_name_validator(name, expected_message):
             "The current security group settings on file storage .* does not satisfy mounting requirement. "
             "The file storage must be associated to a security group that "
             r"allows inbound TCP traffic through ports \[111, 2049, 20001, 20002, 20003\]. Missing ports: "
-            r"\[2049, 20001, 20002, 20003\]",
+            r"\[2049, 20001, 20002, 20003\]. "
+            r"Inbound traffic is not allowed through ports \[2049, 20001, 20002, 20003\]$",
         ),
     ],
 )
@@ -3070,6 +3072,68 @@ def test_are_subnets_covered_by_cidrs(mocker, ip_ranges, subnet_cidrs, covered):
     ).is_equal_to(covered)
 
 
+def test_security_group_reachability(mocker):
+    mock_aws_api(mocker)
+    security_groups = {
+        "sg-fs": {
+            "GroupId": "sg-fs",
+            "IpPermissions": [
+                # Rules on overlapping port ranges with different sources
+                {"IpProtocol": "tcp", "FromPort": 100, "ToPort": 200, "IpRanges": [{"CidrIp": "10.0.0.0/25"}]},
+                {"IpProtocol": "6", "FromPort": 150, "ToPort": 300, "IpRanges": [{"CidrIp": "10.0.0.128/25"}]},
+                # Sources of different types in the same rule
+                {
+                    "IpProtocol": "udp",
+                    "FromPort": 111,
+                    "ToPort": 111,
+                    "IpRanges": [{"CidrIp": "192.168.0.0/16"}],
+                    "UserIdGroupPairs": [{"GroupId": "sg-compute"}],
+                },
+                {"IpProtocol": "tcp", "FromPort": 988, "ToPort": 988, "PrefixListIds": [{"PrefixListId": "pl-1"}]},
+            ],
+            "IpPermissionsEgress": [{"IpProtocol": "-1", "IpRanges": [{"CidrIp": "10.0.0.0/16"}]}],
+        },
+        "sg-other": {
+            "GroupId": "sg-other",
+            "IpPermissions": [{"IpProtocol": "-1", "UserIdGroupPairs": [{"GroupId": "sg-head"}]}],
+            "IpPermissionsEgress": [],
+        },
+    }
+    describe_security_groups_mock = mocker.patch(
+        "pcluster.aws.ec2.Ec2Client.describe_security_groups",
+        side_effect=lambda security_group_ids: [security_groups[sg_id] for sg_id in security_group_ids],
+    )
+    mocker.patch("pcluster.aws.ec2.Ec2Client.get_subnet_cidr", return_value="10.0.0.0/24")
+    reachability = SecurityGroupReachability({frozenset({"sg-compute"}), frozenset({"sg-compute", "sg-head"})})
+
+    assert_that(
+        reachability.get_blocked_directions(["sg-fs"], ["subnet-1"], [99, 100, 150, 200, 201, 301, 988])
+    ).is_equal_to(
+        {
+            99: ["inbound"],
+            100: ["inbound"],  # 10.0.0.0/25 does not cover the subnet
+            150: [],  # the union of the two ranges covers the subnet
+            200: [],
+            201: ["inbound"],
+            301: ["inbound"],
+            988: [],
+        }
+    )
+    assert_that(reachability.get_blocked_directions(["sg-fs"], ["subnet-1"], [111], "udp")).is_equal_to({111: []})
+    assert_that(
+        reachability.get_blocked_directions(["sg-other"], ["subnet-1"], [111], check_outbound=False)
+    ).is_equal_to({111: ["inbound"]})
+
+    assert_that(
+        reachability.get_unreachable_ports([["sg-other"], ["sg-fs"]], ["subnet-1"], [100, 150, 988])
+    ).is_equal_to({100: ["inbound"]})
+    assert_that(reachability.get_unreachable_ports([["sg-other"]], ["subnet-1"], [150])).is_equal_to(
+        {150: ["inbound", "outbound"]}
+    )
+    # The rules of every set of security groups are compiled only once per protocol and direction
+    assert_that(describe_security_groups_mock.call_count).is_equal_to(6)
+
+
 @pytest.mark.usefixtures("get_region")
 class TestDictLaunchTemplateBuilder:
     @pytest.mark.parametrize(
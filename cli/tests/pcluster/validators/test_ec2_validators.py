@@ -1003,7 +1003,7 @@ mock_bad_config = {"GroupConfiguration": {"Configuration": [{"Type": "AWS::EC2::
 at_least_one_capacity_reservation_error_message = (
     "Capacity reservation resource group .* must have at least one capacity reservation for c5.xlarge."
 )
-capacity_reservation = namedtuple("CapacityReservation", "id instance_type az")
+capacity_reservation = namedtuple("CapacityReservation", "id instance_type az available_instance_count", defaults=(1,))
 
 
 @pytest.mark.parametrize(
@@ -1154,6 +1154,40 @@ capacity_reservation = namedtuple("CapacityReservation", "id instance_type az")
             "Availability Zones that have no capacity reservations in the Resource Group for the given instance types: "
             "'{us-east-1b: ['c5n.xlarge']}, {us-east-1c: ['c5.xlarge', 'c5n.xlarge']}, {us-east-1d: ['c5.xlarge']}'.",
         ),
+        # The reservations of an instance type have available instances in at least one of the AZs of the queue
+        (
+            [
+                capacity_reservation(
+                    id="cr-test-1", instance_type="c5.xlarge", az="us-east-1a", available_instance_count=0
+                ),
+                capacity_reservation(
+                    id="cr-test-2", instance_type="c5.xlarge", az="us-east-1b", available_instance_count=2
+                ),
+            ],
+            mock_good_config,
+            ["c5.xlarge"],
+            {"subnet-123": "us-east-1a", "subnet-456": "us-east-1b"},
+            None,
+        ),
+        # The reservations of an instance type are fully used in all the AZs of the queue
+        (
+            [
+                capacity_reservation(
+                    id="cr-test-1", instance_type="c5.xlarge", az="us-east-1a", available_instance_count=0
+                ),
+                capacity_reservation(
+                    id="cr-test-2", instance_type="c5.xlarge", az="us-east-1b", available_instance_count=0
+                ),
+                capacity_reservation(id="cr-test-3", instance_type="c5n.xlarge", az="us-east-1b"),
+            ],
+            mock_good_config,
+            ["c5.xlarge", "c5n.xlarge"],
+            {"subnet-123": "us-east-1a", "subnet-456": "us-east-1b"},
+            "The capacity reservations for c5.xlarge of the Capacity Reservation Resource Group "
+            "'arn:aws:resource-groups:eu-west-1:12345678:group/skip_dummy' have no available instances left in the "
+            "availability zones of queue 'TestQueue': 'us-east-1a, us-east-1b'. The instances of the queue will be "
+            "launched outside of the capacity reservations until reserved capacity is released.",
+        ),
     ],
 )
 def test_capacity_reservation_resource_group_validator(
@@ -1182,7 +1216,12 @@ def test_capacity_reservation_resource_group_validator(
         "pcluster.aws.ec2.Ec2Client.describe_capacity_reservations",
         side_effect=lambda capacity_reservation_ids: [
             CapacityReservationInfo(
-                {"CapacityReservationId": cr.id, "InstanceType": cr.instance_type, "AvailabilityZone": cr.az}
+                {
+                    "CapacityReservationId": cr.id,
+                    "InstanceType": cr.instance_type,
+                    "AvailabilityZone": cr.az,
+                    "AvailableInstanceCount": cr.available_instance_count,
+                }
             )
             for cr in capacity_reservations_in_resource_group
         ],
@@ -1,7 +1,15 @@
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.error import HTTPError, URLError
+from urllib.parse import urlsplit
+
 import pytest
+from assertpy import assert_that
 
 from pcluster.aws.common import AWSClientError
 from pcluster.validators.s3_validators import S3BucketRegionValidator, S3BucketUriValidator, UrlValidator
+from pcluster.validators.utils import UrlProber
 from tests.pcluster.validators.utils import assert_failure_messages
 
 
@@ -50,6 +58,14 @@ from tests.pcluster.validators.utils import assert_failure_messages
             ConnectionError(),
             None,
         ),
+        (
+            "https://test/cookbook2.tgz",
+            None,
+            False,
+            "The url 'https://test/cookbook2.tgz' causes URLError, the error reason is 'Connection reset by peer'.",
+            URLError(ConnectionResetError("Connection reset by peer")),
+            None,
+        ),
         (
             "https://test/cookbook.tgz",
             "01234567890",
@@ -65,12 +81,189 @@ def test_url_validator(
 ):
     aws_api_mock.s3.head_object.return_value = response
     aws_api_mock.s3.head_object.side_effect = head_object_error
-    mocker.patch("pcluster.validators.s3_validators.urlopen", side_effect=error)
+    mocker.patch("pcluster.validators.utils.UrlProber.probe", side_effect=error)
 
     actual_failures = UrlValidator().execute(url=url, expected_bucket_owner=expected_bucket_owner)
     assert_failure_messages(actual_failures, expected_message)
 
 
+class _ProbedRequestHandler(BaseHTTPRequestHandler):
+    """
+    Simulate ok, missing, slow, redirecting, resetting, 405-on-HEAD and presigned endpoints, recording the requests.
+
+    Absolute urls and CONNECT requests are accepted as well, to act as proxy.
+    """
+
+    protocol_version = "HTTP/1.1"
+
+    def do_HEAD(self):  # noqa: N802
+        self._handle()
+
+    def do_GET(self):  # noqa: N802
+        self._handle()
+
+    def do_CONNECT(self):  # noqa: N802
+        self.server.requests.append((self.command, self.path, self.client_address[1], None))
+        # The tunnel is closed before the TLS handshake, there is no https server behind it
+        self.send_response(200)
+        self.end_headers()
+        self.close_connection = True
+
+    def _handle(self):
+        self.server.requests.append((self.command, self.path, self.client_address[1], self.headers.get("Range")))
+        path = urlsplit(self.path).path
+        if path == "/ok":
+            self._respond(200)
+        elif path == "/no-head":
+            if self.command == "HEAD":
+                self._respond(405)
+            else:
+                self._respond(206, body=b"x", headers={"Content-Range": "bytes 0-0/1000000"})
+        elif path == "/presigned":
+            # A presigned url is signed for a single method, S3 rejects the HEAD of a url signed for GET
+            if self.command == "HEAD":
+                self._respond(403)
+            else:
+                self._respond(206, body=b"x", headers={"Content-Range": "bytes 0-0/1000000"})
+        elif path == "/reset":
+            # The connection is closed without any response
+            self.close_connection = True
+        elif path == "/slow":
+            time.sleep(1)
+            self._respond(200)
+        elif path.startswith("/redirect/"):
+            hops = int(path.split("/")[-1])
+            self._respond(302, headers={"Location": f"/redirect/{hops - 1}" if hops > 1 else "/ok"})
+        else:
+            self._respond(404)
+
+    def _respond(self, status, body=b"", headers=None):
+        self.send_response(status)
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if self.command == "GET":
+            self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def http_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _ProbedRequestHandler)
+    server.daemon_threads = True
+    server.requests = []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.mark.parametrize(
+    "path, expected_status, expected_error, expected_requests",
+    [
+        ("/ok", 200, None, [("HEAD", "/ok", None)]),
+        ("/no-head", 206, None, [("HEAD", "/no-head", None), ("GET", "/no-head", "bytes=0-0")]),
+        (
+            "/presigned?X-Amz-Expires=3600&X-Amz-Signature=abc",
+            206,
+            None,
+            [
+                ("HEAD", "/presigned?X-Amz-Expires=3600&X-Amz-Signature=abc", None),
+                ("GET", "/presigned?X-Amz-Expires=3600&X-Amz-Signature=abc", "bytes=0-0"),
+            ],
+        ),
+        (
+            "/redirect/2",
+            200,
+            None,
+            [("HEAD", "/redirect/2", None), ("HEAD", "/redirect/1", None), ("HEAD", "/ok", None)],
+        ),
+        (
+            "/redirect/6",
+            None,
+            "more than 5 redirects",
+            [("HEAD", f"/redirect/{hops}", None) for hops in range(6, 0, -1)],
+        ),
+        ("/missing", None, "HTTP Error 404: Not Found", [("HEAD", "/missing", None)]),
+        ("/slow", None, "timed out after 0.2 seconds", [("HEAD", "/slow", None)]),
+    ],
+)
+def test_url_prober(http_server, path, expected_status, expected_error, expected_requests):
+    url_prober = UrlProber(connect_timeout=1, read_timeout=0.2)
+    url = f"http://127.0.0.1:{http_server.server_port}{path}"
+
+    start_time = time.time()
+    if expected_error:
+        with pytest.raises(URLError, match=expected_error):
+            url_prober.probe(url)
+    else:
+        assert_that(url_prober.probe(url)).is_equal_to(expected_status)
+    assert_that(time.time() - start_time).is_less_than(1)
+    assert_that([(method, path, range) for method, path, _, range in http_server.requests]).is_equal_to(
+        expected_requests
+    )
+    url_prober.close()
+
+
+def test_url_prober_memoization_and_keep_alive(http_server):
+    url_prober = UrlProber()
+    base_url = f"http://127.0.0.1:{http_server.server_port}"
+
+    for _ in range(3):
+        assert_that(url_prober.probe(f"{base_url}/ok")).is_equal_to(200)
+        with pytest.raises(HTTPError):
+            url_prober.probe(f"{base_url}/missing")
+    assert_that(url_prober.probe(f"{base_url}/redirect/1")).is_equal_to(200)
+
+    # The results are memoized per url, /ok is requested again only as target of the redirect
+    assert_that([path for _, path, _, _ in http_server.requests]).is_equal_to(["/ok", "/missing", "/redirect/1", "/ok"])
+    # A single connection is used for all the requests
+    assert_that({client_port for _, _, client_port, _ in http_server.requests}).is_length(1)
+    url_prober.close()
+
+
+def test_url_prober_connection_reset(http_server):
+    url_prober = UrlProber()
+    base_url = f"http://127.0.0.1:{http_server.server_port}"
+
+    assert_that(url_prober.probe(f"{base_url}/ok")).is_equal_to(200)
+    # The request is sent again on a new connection once, then the lost connection is reported and memoized
+    for _ in range(2):
+        with pytest.raises(URLError, match="closed connection without response"):
+            url_prober.probe(f"{base_url}/reset")
+
+    requests = [(path, client_port) for _, path, client_port, _ in http_server.requests]
+    assert_that([path for path, _ in requests]).is_equal_to(["/ok", "/reset", "/reset"])
+    assert_that(requests[1][1]).is_equal_to(requests[0][1])
+    assert_that(requests[2][1]).is_not_equal_to(requests[0][1])
+    url_prober.close()
+
+
+def test_url_prober_proxy(http_server, set_env):
+    proxy = f"http://127.0.0.1:{http_server.server_port}"
+    set_env("http_proxy", proxy)
+    set_env("https_proxy", proxy)
+    set_env("no_proxy", "bypassed.invalid")
+    url_prober = UrlProber(connect_timeout=1, read_timeout=1)
+
+    # Plain http requests are forwarded by the proxy, https ones go through a tunnel
+    assert_that(url_prober.probe("http://proxied.invalid/ok")).is_equal_to(200)
+    with pytest.raises(URLError):
+        url_prober.probe("https://proxied.invalid/ok")
+    # The hosts in no_proxy are reached directly, this one does not exist
+    with pytest.raises(URLError):
+        url_prober.probe("http://bypassed.invalid/ok")
+
+    assert_that([(method, path) for method, path, _, _ in http_server.requests]).is_equal_to(
+        [("HEAD", "http://proxied.invalid/ok"), ("CONNECT", "proxied.invalid:443")]
+    )
+    url_prober.close()
+
+
 @pytest.mark.parametrize(
     "url, expected_message",
     [
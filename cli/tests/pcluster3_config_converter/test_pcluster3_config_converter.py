@@ -5,13 +5,16 @@
 #  or in the "LICENSE.txt" file accompanying this file. This file is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES
 #  OR CONDITIONS OF ANY KIND, express or implied. See the License for the specific language governing permissions and
 #  limitations under the License.
+import json
 import os
+import shutil
 import subprocess
 
 import pytest
 import yaml
 from assertpy import assert_that
 
+from pcluster3_config_converter import pcluster3_config_converter
 from pcluster3_config_converter.pcluster3_config_converter import Pcluster3ConfigConverter
 from tests.pcluster3_config_converter import test_data
 
@@ -608,6 +611,75 @@ def test_convert_single_field(
         assert_that(e.args[0]).contains(error_message)
 
 
+@pytest.mark.parametrize("jobs", ["1", "2"])
+def test_pcluster3_config_converter_batch(datadir, tmpdir, mocker, capsys, jobs):
+    # the batch is made of the configurations used by test_pcluster3_config_converter
+    test_datadir = datadir / "test_pcluster3_config_converter"
+    input_dir = tmpdir.mkdir("configs")
+    for config_file in ["sit_base.ini", "awsbatch_full.ini", "compute_subnet_cidr.ini"]:
+        target_dir = input_dir.mkdir("team1") if config_file == "awsbatch_full.ini" else input_dir
+        shutil.copy(test_datadir / config_file, target_dir / config_file)
+    output_dir = tmpdir / "output"
+    mocker.patch.dict(pcluster3_config_converter._aws_lookups, clear=True)
+    boto3_mock = mocker.patch("pcluster3_config_converter.pcluster3_config_converter.boto3")
+    boto3_mock.Session.return_value.region_name = "us-west-1"
+    boto3_mock.client.return_value.get_caller_identity.return_value = {"Account": "1234567"}
+
+    with pytest.raises(SystemExit) as e:
+        pcluster3_config_converter.main(
+            ["--batch", str(input_dir / "**" / "*.ini"), "--output-dir", str(output_dir), "--force-convert", "-j", jobs]
+        )
+
+    assert_that(e.value.code).is_equal_to(1)
+    _assert_files_are_equal(output_dir / "sit_base.yaml", test_datadir / "sit_base.yaml")
+    _assert_files_are_equal(output_dir / "team1" / "awsbatch_full.yaml", test_datadir / "awsbatch_full.yaml")
+    assert_that(os.path.exists(output_dir / "compute_subnet_cidr.yaml")).is_false()
+    # the account and the default region are retrieved once for the whole batch
+    boto3_mock.client.assert_called_once_with("sts")
+    boto3_mock.Session.assert_called_once()
+
+    with open(output_dir / "report.json", encoding="utf-8") as report_file:
+        report = json.load(report_file)
+    assert_that(report["Summary"]).is_equal_to({"Total": 3, "Converted": 2, "Failed": 1, "Warnings": 18})
+    results = {os.path.basename(result["ConfigFile"]): result for result in report["Results"]}
+    assert_that(results["compute_subnet_cidr.ini"]["Status"]).is_equal_to("FAILED")
+    assert_that(results["compute_subnet_cidr.ini"]["Error"]).contains("compute_subnet_cidr = 0.0.0.0/16")
+    assert_that(results["sit_base.ini"]["Messages"]).contains(
+        {
+            "Level": "Warning",
+            "Message": "Parameter vpc_id = vpc-12345678 is no longer supported. Ignoring it during conversion.",
+        }
+    )
+    out = capsys.readouterr().out
+    assert_that(out).contains("Failed to convert " + str(input_dir / "compute_subnet_cidr.ini"))
+    assert_that(out).contains("Converted 2 of 3 configuration files with 18 warnings.")
+
+
+def test_pcluster3_config_converter_batch_only_report_file(tmpdir):
+    # the report of a previous run, written to the input directory, is the only file of the batch
+    tmpdir.join("report.json").write("{}")
+
+    with pytest.raises(SystemExit) as e:
+        pcluster3_config_converter.main(["--batch", str(tmpdir), "--output-dir", str(tmpdir), "-j", "2"])
+
+    assert_that(e.value.code).contains("No configuration files found matching")
+
+
+@pytest.mark.parametrize(
+    "argv, error",
+    [
+        (["--batch", "configs"], "--output-dir is required in batch mode"),
+        (["--batch", "configs", "--output-dir", "out", "-o", "file"], "--output-file cannot be used in batch mode"),
+        (["--batch", "configs", "--output-dir", "out", "-j", "0"], "--jobs must be a positive number"),
+        (["--batch", "configs", "-c", "config"], "not allowed with argument"),
+    ],
+)
+def test_pcluster3_config_converter_batch_arguments(argv, error, capsys):
+    with pytest.raises(SystemExit):
+        pcluster3_config_converter.main(argv)
+    assert_that(capsys.readouterr().err).contains(error)
+
+
 def _assert_files_are_equal(file, expected_file):
     with open(file, "r") as f, open(expected_file, "r") as exp_f:
         expected_file_content = exp_f.read()
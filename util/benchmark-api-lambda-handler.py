@@ -0,0 +1,111 @@
+#!/usr/bin/python
+#
+# Copyright 2024 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"). You may not
+# use this file except in compliance with the License. A copy of the License
+# is located at
+#
+# http://aws.amazon.com/apache2.0/
+#
+# or in the "LICENSE.txt" file accompanying this file. This file is
+# distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, express or implied. See the License for the specific language
+# governing permissions and limitations under the License.
+#
+#
+# Measure the time spent by the Lambda WSGI adapter of the ParallelCluster API to build
+# the payload v1 and v2 responses, and the size of the payload, for synthetic responses of growing size
+# with and without compression.
+# Requires the aws-parallelcluster package to be installed in the current environment.
+#
+import json
+import timeit
+from functools import partial
+
+import argparse
+from flask import Flask, jsonify
+
+from pcluster.api.awslambda.serverless_wsgi import handle_request
+
+
+def _build_app():
+    app = Flask(__name__)
+
+    @app.route("/v3/clusters/<cluster_name>/logstreams/<log_stream_name>")
+    def get_cluster_log_events(cluster_name, log_stream_name):
+        size = int(log_stream_name)
+        return jsonify(
+            {
+                "nextToken": "f/36370880986150819026592452229627981146427340810426466304",
+                "events": [
+                    {
+                        "message": f"2024-01-01 00:00:00,000 - [slurm_resume] - INFO - Message {i} of {cluster_name}",
+                        "timestamp": "2024-01-01T00:00:00.000Z",
+                    }
+                    for i in range(size)
+                ],
+            }
+        )
+
+    return app
+
+
+def _v1_event(path, headers):
+    return {
+        "path": path,
+        "httpMethod": "GET",
+        "headers": headers,
+        "multiValueHeaders": {key: [value] for key, value in headers.items()},
+        "queryStringParameters": None,
+        "body": None,
+        "isBase64Encoded": False,
+        "requestContext": {"stage": "prod", "identity": {"sourceIp": "127.0.0.1"}},
+    }
+
+
+def _v2_event(path, headers):
+    return {
+        "version": "2.0",
+        "rawPath": path,
+        "rawQueryString": "",
+        "headers": headers,
+        "isBase64Encoded": False,
+        "requestContext": {"stage": "prod", "http": {"method": "GET", "sourceIp": "127.0.0.1"}},
+    }
+
+
+EVENTS = {"v1": _v1_event, "v2": _v2_event}
+ACCEPT_ENCODINGS = {"identity": None, "gzip": "gzip", "br": "br, gzip"}
+
+
+def main(args):
+    app = _build_app()
+    print(f"{'Payload':<9}{'Events':>8}{'Encoding':>10}{'Time (ms)':>12}{'Payload (KB)':>14}")
+    for payload_version, build_event in EVENTS.items():
+        for size in args.sizes:
+            for encoding_name, accept_encoding in ACCEPT_ENCODINGS.items():
+                headers = {"Host": "localhost"}
+                if accept_encoding:
+                    headers["Accept-Encoding"] = accept_encoding
+                event = build_event(f"/v3/clusters/mycluster/logstreams/{size}", headers)
+                handler = partial(handle_request, app, event, None)
+                elapsed = min(timeit.repeat(handler, number=1, repeat=args.repeat))
+                payload_size = len(json.dumps(handler()))
+                print(
+                    f"{payload_version:<9}{size:>8}{encoding_name:>10}{elapsed * 1000:>12.2f}"
+                    f"{payload_size / 1024:>14.1f}"
+                )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the Lambda WSGI adapter of the ParallelCluster API")
+    parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=[100, 1000, 10000],
+        help="Number of log events of the responses to build",
+    )
+    parser.add_argument("--repeat", type=int, default=5, help="Number of measurements to take the best of")
+    main(parser.parse_args())
@@ -0,0 +1,126 @@
+#!/usr/bin/python
+#
+# Copyright 2024 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"). You may not
+# use this file except in compliance with the License. A copy of the License
+# is located at
+#
+# http://aws.amazon.com/apache2.0/
+#
+# or in the "LICENSE.txt" file accompanying this file. This file is
+# distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, express or implied. See the License for the specific language
+# governing permissions and limitations under the License.
+#
+#
+# Measure how the serialization time of the API responses scales with their size,
+# comparing the per-object encoding with the serialization plans of pcluster.api.serializer.
+# Requires the aws-parallelcluster package to be installed in the current environment.
+#
+import datetime
+import json
+import timeit
+from functools import partial
+
+import argparse
+
+from pcluster.api import encoder, serializer
+from pcluster.api.models import (
+    ClusterInstance,
+    DescribeClusterInstancesResponseContent,
+    GetClusterLogEventsResponseContent,
+    LogEvent,
+)
+from pcluster.api.models.base_model_ import Model
+from pcluster.utils import to_iso_timestr
+
+
+def _legacy_default(obj):
+    if isinstance(obj, Model):
+        dikt = {}
+        for attr in obj.openapi_types:
+            value = getattr(obj, attr)
+            if value is None:
+                continue
+            dikt[obj.attribute_map[attr]] = value
+        return dikt
+    if isinstance(obj, datetime.date):
+        return to_iso_timestr(obj)
+    raise TypeError(f"Object of type {type(obj)} is not JSON serializable")
+
+
+def _legacy_dumps(obj):
+    return json.dumps(obj, default=_legacy_default, indent=2, sort_keys=True)
+
+
+def _log_events_response(size):
+    now = datetime.datetime.now(tz=datetime.timezone.utc)
+    return GetClusterLogEventsResponseContent(
+        next_token="f/36370880986150819026592452229627981146427340810426466304",
+        events=[
+            LogEvent(message=f"2024-01-01 00:00:00,000 - [slurm_resume] - INFO - Message {i}", timestamp=now)
+            for i in range(size)
+        ],
+    )
+
+
+def _instances_response(size):
+    now = datetime.datetime.now(tz=datetime.timezone.utc)
+    return DescribeClusterInstancesResponseContent(
+        instances=[
+            ClusterInstance(
+                launch_time=now,
+                instance_id=f"i-{i:017x}",
+                queue_name="queue1",
+                pool_name=None,
+                public_ip_address=None,
+                instance_type="c5.xlarge",
+                state="running",
+                node_type="ComputeNode",
+                private_ip_address=f"10.0.{i // 256 % 256}.{i % 256}",
+            )
+            for i in range(size)
+        ]
+    )
+
+
+RESPONSES = {
+    "GetClusterLogEvents": _log_events_response,
+    "DescribeClusterInstances": _instances_response,
+}
+
+
+def _measure(function, repeat):
+    return min(timeit.repeat(function, number=1, repeat=repeat))
+
+
+def main(args):
+    backend = "orjson" if serializer.orjson else "json"
+    print(f"JSON backend: {backend}")
+    print(f"{'Response':<26}{'Size':>8}{'Legacy (ms)':>14}{'Plan (ms)':>12}{'Speedup':>10}")
+    for name, build_response in RESPONSES.items():
+        for size in args.sizes:
+            response = build_response(size)
+            legacy_time = _measure(partial(_legacy_dumps, response), args.repeat)
+            plan_time = _measure(
+                partial(serializer.dumps, response, indent=2, sort_keys=True, default=encoder.JSONProvider.default),
+                args.repeat,
+            )
+            print(
+                f"{name:<26}{size:>8}{legacy_time * 1000:>14.2f}{plan_time * 1000:>12.2f}"
+                f"{legacy_time / plan_time:>9.1f}x"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the serialization of the ParallelCluster API responses")
+    parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=[10, 100, 1000, 10000],
+        help="Number of items (log events, instances) of the responses to serialize",
+    )
+    parser.add_argument("--repeat", type=int, default=5, help="Number of measurements to take the best of")
+    main(parser.parse_args())
@@ -0,0 +1,126 @@
+#!/usr/bin/python
+#
+# Copyright 2024 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"). You may not
+# use this file except in compliance with the License. A copy of the License
+# is located at
+#
+# http://aws.amazon.com/apache2.0/
+#
+# or in the "LICENSE.txt" file accompanying this file. This file is
+# distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, express or implied. See the License for the specific language
+# governing permissions and limitations under the License.
+#
+#
+# Count the validator invocations registered by cluster configurations with many queues,
+# comparing the total number of invocations with the unique ones actually executed.
+# The validators are not executed and the AWS API is mocked, so no AWS account is needed.
+# Requires the aws-parallelcluster package to be installed in the current environment.
+#
+import os
+from collections import Counter
+from unittest.mock import MagicMock, patch
+
+import argparse
+
+from pcluster.config.common import ValidatorInvocations
+from pcluster.schemas.cluster_schema import ClusterSchema
+from pcluster.validators.common import ValidatorContext
+
+INSTANCE_ROLE = "arn:aws:iam::123456789012:role/ComputeRole"
+INSTANCE_TYPES = ["c5.xlarge", "c5.2xlarge", "m5.xlarge"]
+
+
+class _CountingValidatorInvocations(ValidatorInvocations):
+    """Count the invocations and the executions per validator."""
+
+    def __init__(self):
+        super().__init__()
+        self.total_per_validator = Counter()
+        self.executed_per_validator = Counter()
+
+    def execute(self, validator_class, validator_args, execute):
+        executed = self.executed
+        result = super().execute(validator_class, validator_args, execute)
+        self.total_per_validator[validator_class.__name__] += 1
+        self.executed_per_validator[validator_class.__name__] += self.executed - executed
+        return result
+
+
+def _cluster_config(queues, compute_resources):
+    return {
+        "Image": {"Os": "alinux2", "CustomAmi": "ami-12345678"},
+        "HeadNode": {
+            "InstanceType": "t3.large",
+            "Networking": {"SubnetId": "subnet-12345678", "SecurityGroups": ["sg-12345678"]},
+            "Ssh": {"KeyName": "ec2-key-name"},
+            "Iam": {"InstanceRole": INSTANCE_ROLE},
+        },
+        "Scheduling": {
+            "Scheduler": "slurm",
+            "SlurmQueues": [
+                {
+                    "Name": f"queue{queue}",
+                    "Networking": {"SubnetIds": ["subnet-12345678"], "SecurityGroups": ["sg-12345678"]},
+                    "Iam": {"InstanceRole": INSTANCE_ROLE},
+                    "ComputeResources": [
+                        {
+                            "Name": f"compute-resource{compute_resource}",
+                            "InstanceType": INSTANCE_TYPES[compute_resource % len(INSTANCE_TYPES)],
+                        }
+                        for compute_resource in range(compute_resources)
+                    ],
+                }
+                for queue in range(queues)
+            ],
+        },
+        "SharedStorage": [
+            {
+                "MountDir": "/shared",
+                "Name": "ebs",
+                "StorageType": "Ebs",
+                "EbsSettings": {"KmsKeyId": "1234abcd-12ab-34cd-56ef-1234567890ab", "Encrypted": True},
+            }
+        ],
+    }
+
+
+def _count_invocations(queues, compute_resources):
+    config = ClusterSchema(cluster_name="benchmark").load(_cluster_config(queues, compute_resources))
+    invocations = _CountingValidatorInvocations()
+    config.validate(context=ValidatorContext(), invocations=invocations)
+    return invocations
+
+
+def main(args):
+    os.environ.setdefault("AWS_DEFAULT_REGION", "us-east-1")
+    with patch("pcluster.aws.aws_api.AWSApi.instance", return_value=MagicMock()), patch(
+        "pcluster.config.common.Resource._validator_execute", return_value=[]
+    ):
+        print(f"{'Queues':>8}{'Total':>10}{'Unique':>10}{'Shared':>10}")
+        for queues in args.queues:
+            invocations = _count_invocations(queues, args.compute_resources)
+            shared = invocations.total - invocations.executed
+            print(f"{queues:>8}{invocations.total:>10}{invocations.executed:>10}{shared / invocations.total:>9.1%}")
+
+    print(f"\nShared invocations per validator with {args.queues[-1]} queues:")
+    print(f"{'Validator':<44}{'Total':>10}{'Unique':>10}")
+    for name, total in invocations.total_per_validator.most_common():
+        executed = invocations.executed_per_validator[name]
+        if executed < total:
+            print(f"{name:<44}{total:>10}{executed:>10}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the de-duplication of the cluster config validators")
+    parser.add_argument(
+        "--queues",
+        type=int,
+        nargs="+",
+        default=[1, 10, 50, 100],
+        help="Number of queues of the cluster configurations to validate",
+    )
+    parser.add_argument("--compute-resources", type=int, default=5, help="Number of compute resources per queue")
+    main(parser.parse_args())
@@ -13,13 +13,69 @@
 import json
 import logging
 import os
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 
 import boto3
-from s3_factory import S3DocumentManager
 
 PARTITION_TO_MAIN_REGION = {"commercial": "us-east-1", "govcloud": "us-gov-west-1", "china": "cn-north-1"}
 PARTITIONS = ["commercial", "china", "govcloud"]
 FILE_TO_S3_PATH = {"instances": "instances/instances.json", "feature_whitelist": "features/feature_whitelist.json"}
+# Number of (region, object) operations executed in parallel
+DEFAULT_MAX_WORKERS = 16
+# User metadata of the uploaded objects holding the sha256 checksum of their content
+CHECKSUM_METADATA_KEY = "sha256"
+
+# The creation of boto3 clients from the default session is not thread safe, while the created clients are
+_clients_lock = threading.Lock()
+
+
+def create_client(service_name, region_name, **kwargs):
+    """
+    Create a boto3 client, also from the threads of fan_out.
+
+    :param service_name: name of the service, e.g. s3
+    :param region_name: region of the client
+    :param kwargs: other arguments of boto3.client, e.g. the credentials or the config
+    """
+    with _clients_lock:
+        return boto3.client(service_name, region_name=region_name, **kwargs)
+
+
+def fan_out(function, tasks, max_workers=DEFAULT_MAX_WORKERS):
+    """
+    Call function with the arguments of each task, with at most max_workers calls in parallel.
+
+    The results are returned in the order of the tasks, not in the order of completion.
+    All the calls complete before the first exception raised by any of them is raised.
+    :param function: function to call
+    :param tasks: list of tuples of arguments, e.g. (region, file)
+    :param max_workers: maximum number of calls in parallel
+    """
+    tasks = list(tasks)
+    if not tasks:
+        return []
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(tasks))) as executor:
+        futures = [executor.submit(function, *task) for task in tasks]
+    return [future.result() for future in futures]
+
+
+def summarize_by_region(tasks, results):
+    """
+    Log and return the number of results of each kind per region.
+
+    :param tasks: list of tuples of arguments starting with the region, as passed to fan_out
+    :param results: the results of the tasks, in the same order
+    :return: dict with the Counter of the results of each region
+    """
+    summary = {}
+    for task, result in zip(tasks, results):
+        summary.setdefault(task[0], Counter())[result] += 1
+    for region, counter in sorted(summary.items()):
+        counts = sorted(f"{count} {result}" for result, count in counter.items())
+        logging.info("%s: %s", region, ", ".join(counts))
+    return summary
 
 
 def get_aws_regions(partition):
@@ -66,20 +122,23 @@ def retrieve_sts_credentials(credentials, client_region, regions):
     return sts_credentials
 
 
-def generate_rollback_data(regions, dest_bucket, files, sts_credentials):
-    rollback_data = {}
-    for region in regions:
-        bucket_name = dest_bucket.format(region=region)
-        rollback_data[bucket_name] = {"region": region, "files": {}}
-        doc_manager = S3DocumentManager(region, sts_credentials.get(region))
-        for file_type in files:
-            s3_path = FILE_TO_S3_PATH.get(file_type, file_type)
-            version = doc_manager.get_current_version(
-                dest_bucket.format(region=region),
-                s3_path,
-                raise_on_object_not_found=False,
-            )
-            rollback_data[bucket_name]["files"][s3_path] = version
+def generate_rollback_data(regions, dest_bucket, files, sts_credentials, doc_managers=None):
+    # Imported here because s3_factory creates its clients with create_client
+    from s3_factory import S3DocumentManager
+
+    if doc_managers is None:
+        doc_managers = {region: S3DocumentManager(region, sts_credentials.get(region)) for region in regions}
+    tasks = [(region, FILE_TO_S3_PATH.get(file_type, file_type)) for region in regions for file_type in files]
+    versions = fan_out(
+        lambda region, s3_path: doc_managers[region].get_current_version(
+            dest_bucket.format(region=region), s3_path, raise_on_object_not_found=False
+        ),
+        tasks,
+    )
+
+    rollback_data = {dest_bucket.format(region=region): {"region": region, "files": {}} for region in regions}
+    for (region, s3_path), version in zip(tasks, versions):
+        rollback_data[dest_bucket.format(region=region)]["files"][s3_path] = version
 
     logging.info("Rollback data:\n%s", json.dumps(rollback_data, indent=2))
     rollback_file_name = "rollback-data.json"
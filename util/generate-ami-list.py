@@ -21,11 +21,12 @@ import os
 import re
 import sys
 from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 
 import argparse
-import boto3
+from botocore.config import Config
 from botocore.exceptions import ClientError
-from common import PARTITION_TO_MAIN_REGION, PARTITIONS
+from common import PARTITION_TO_MAIN_REGION, PARTITIONS, create_client
 
 DISTROS = OrderedDict(
     [
@@ -34,6 +35,19 @@ DISTROS = OrderedDict(
     ]
 )
 ARCHITECTURES_TO_MAPPING_NAME = {"x86_64": "AWSRegionOS2AMIx86", "arm64": "AWSRegionOS2AMIarm64"}
+# Number of regions scanned in parallel
+DEFAULT_MAX_WORKERS = 8
+# Throttled calls are retried with exponential backoff
+BOTO_CONFIG = Config(retries={"max_attempts": 10, "mode": "standard"})
+
+_ec2_clients = {}
+
+
+def get_ec2_client(region_name):
+    """Return the EC2 client for the given region, reused by all the calls to the region."""
+    if region_name not in _ec2_clients:
+        _ec2_clients[region_name] = create_client("ec2", region_name, config=BOTO_CONFIG)
+    return _ec2_clients[region_name]
 
 
 def get_initialized_mappings_dicts():
@@ -93,21 +107,35 @@ def get_ami_list_from_file(regions, json_amis):
     return amis_json
 
 
-def get_ami_list_from_ec2(main_region, regions, owner, credentials, filters):
-    """Get the AMI mappings structure given the constraints represented by the args."""
+def get_ami_list_from_ec2(main_region, regions, owner, credentials, filters, max_workers=DEFAULT_MAX_WORKERS):
+    """
+    Get the AMI mappings structure given the constraints represented by the args.
+
+    The regions are scanned in parallel by at most max_workers threads, while the mappings are merged in the order
+    of the given regions, so that the result does not depend on the order in which the scans complete.
+    """
     amis_json = get_initialized_mappings_dicts()
-    for region_name in regions:
-        images_for_region = get_images_ec2(filters, owner, region_name)
-        for architecture, mapping_name in ARCHITECTURES_TO_MAPPING_NAME.items():
-            amis_json[mapping_name][region_name] = get_amis_for_architecture(images_for_region, architecture)
-
-            if main_region == region_name:
-                for credential in credentials:
-                    credential_region = credential[0]
-                    images_for_credential_region = get_images_ec2_credential(filters, main_region, credential)
-                    amis_json[mapping_name][credential_region] = get_amis_for_architecture(
-                        images_for_credential_region, architecture
-                    )
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        images_per_region = {
+            region_name: executor.submit(get_images_ec2, filters, owner, region_name) for region_name in regions
+        }
+        images_per_credential = []
+        if main_region in regions:
+            images_per_credential = [
+                (credential[0], executor.submit(get_images_ec2_credential, filters, main_region, credential))
+                for credential in credentials
+            ]
+
+        for region_name in regions:
+            images_for_region = images_per_region[region_name].result()
+            for architecture, mapping_name in ARCHITECTURES_TO_MAPPING_NAME.items():
+                amis_json[mapping_name][region_name] = get_amis_for_architecture(images_for_region, architecture)
+
+                if main_region == region_name:
+                    for credential_region, images_for_credential_region in images_per_credential:
+                        amis_json[mapping_name][credential_region] = get_amis_for_architecture(
+                            images_for_credential_region.result(), architecture
+                        )
 
     return amis_json
 
@@ -125,7 +153,16 @@ def get_amis_for_architecture(images, architecture):
 
 
 def get_ami_list_by_git_refs(
-    main_region, regions, cli_git_ref, cookbook_git_ref, node_git_ref, build_date, build_number, owner, credentials
+    main_region,
+    regions,
+    cli_git_ref,
+    cookbook_git_ref,
+    node_git_ref,
+    build_date,
+    build_number,
+    owner,
+    credentials,
+    max_workers=DEFAULT_MAX_WORKERS,
 ):
     """Get the ParallelCluster AMIs by querying EC2 based on git refs and build date."""
     filters = [
@@ -137,7 +174,7 @@ def get_ami_list_by_git_refs(
         filters.append({"Name": "tag:build:parallelcluster:cli_ref", "Values": [cli_git_ref]})
     if build_number:
         filters.append({"Name": "tag:build:parallelcluster:build_number", "Values": [build_number]})
-    return get_ami_list_from_ec2(main_region, regions, owner, credentials, filters)
+    return get_ami_list_from_ec2(main_region, regions, owner, credentials, filters, max_workers)
 
 
 def get_images_ec2_credential(filters, main_region, credential):
@@ -150,7 +187,7 @@ def get_images_ec2_credential(filters, main_region, credential):
     credential_owner = match.group(1)
 
     try:
-        sts = boto3.client("sts", region_name=main_region, endpoint_url=credential_endpoint)
+        sts = create_client("sts", main_region, endpoint_url=credential_endpoint, config=BOTO_CONFIG)
         assumed_role_object = sts.assume_role(
             RoleArn=credential_arn,
             ExternalId=credential_external_id,
@@ -158,12 +195,13 @@ def get_images_ec2_credential(filters, main_region, credential):
         )
         aws_credentials = assumed_role_object["Credentials"]
 
-        ec2 = boto3.client(
+        ec2 = create_client(
             "ec2",
-            region_name=credential_region,
+            credential_region,
             aws_access_key_id=aws_credentials.get("AccessKeyId"),
             aws_secret_access_key=aws_credentials.get("SecretAccessKey"),
             aws_session_token=aws_credentials.get("SessionToken"),
+            config=BOTO_CONFIG,
         )
 
         images = ec2.describe_images(Owners=[credential_owner], Filters=filters)
@@ -180,8 +218,7 @@ def get_images_ec2(filters, owner, region_name):
     NOTE: this call to describe_images is not paginated.
     """
     try:
-        ec2 = boto3.client("ec2", region_name=region_name)
-        images = ec2.describe_images(Owners=[owner], Filters=filters)
+        images = get_ec2_client(region_name).describe_images(Owners=[owner], Filters=filters)
         return get_latest_images(images)
     except ClientError:
         print("Warning: non authorized in region '{0}', skipping".format(region_name))
@@ -247,8 +284,7 @@ def get_aws_regions_from_file(region_file):
 
 def get_all_aws_regions_from_ec2(region):
     """Return a list of all available regions for the partition in which the region arg resides in."""
-    ec2 = boto3.client("ec2", region_name=region)
-    return sorted(r.get("RegionName") for r in ec2.describe_regions().get("Regions"))
+    return sorted(r.get("RegionName") for r in get_ec2_client(region).describe_regions().get("Regions"))
 
 
 def read_json_file(json_file_path):
@@ -340,6 +376,13 @@ def parse_args():
     parser.add_argument("--partition", help="commercial | china | govcloud", required=True, choices=PARTITIONS)
     parser.add_argument("--account-id", help="AWS account id owning the AMIs", required=False)
     parser.add_argument("--json-file", help="path to output json file", required=False, default="amis.json")
+    parser.add_argument(
+        "--max-workers",
+        type=int,
+        help="maximum number of regions scanned in parallel",
+        required=False,
+        default=DEFAULT_MAX_WORKERS,
+    )
     args = parser.parse_args()
     if args.cookbook_git_ref and args.node_git_ref and not args.account_id:
         sys.exit("Must specify value for --account-id when using --cookbook-git-ref and --node-git-ref.")
@@ -374,6 +417,7 @@ def main():
             build_number=args.build_number,
             owner=args.account_id,
             credentials=credentials,
+            max_workers=args.max_workers,
         )
     elif not args.json_regions or not args.json_amis:
         sys.exit(
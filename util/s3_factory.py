@@ -3,6 +3,7 @@ import sys
 
 import boto3
 from botocore.exceptions import ClientError
+from common import create_client
 
 LOGGER = logging.getLogger(__name__)
 logging.basicConfig(format="%(asctime)s - %(levelname)s - %(module)s - %(message)s", level=logging.INFO)
@@ -14,6 +15,14 @@ class S3DocumentManager:
     def __init__(self, _region, _credentials=None):
         self._region = _region
         self._credentials = _credentials or {}
+        self._s3_client = None
+
+    @property
+    def s3_client(self):
+        """Return the S3 client of the region, shared by the operations of the manager."""
+        if not self._s3_client:
+            self._s3_client = create_client("s3", self._region, **self._credentials)
+        return self._s3_client
 
     def download(self, s3_bucket, document_s3_path, version_id=None):
         """
@@ -38,7 +47,7 @@ class S3DocumentManager:
             )
             raise
 
-    def upload(self, s3_bucket, s3_key, data, dryrun=True, md5=None, public_read=True):
+    def upload(self, s3_bucket, s3_key, data, dryrun=True, md5=None, public_read=True, metadata=None):
         """
         Upload a document to S3.
 
@@ -48,16 +57,18 @@ class S3DocumentManager:
         :param dryrun: don't actually upload, just print and exit
         :param md5: md5 checksum of the file
         :param public_read: make the files publicly readable
+        :param metadata: user metadata to store with the object
         """
         try:
             if not dryrun:
-                object = boto3.resource("s3", region_name=self._region, **self._credentials).Object(s3_bucket, s3_key)
                 extra_args = {}
                 if md5:
                     extra_args["ContentMD5"] = md5
                 if public_read:
                     extra_args["ACL"] = "public-read"
-                object.put(Body=data, **extra_args)
+                if metadata:
+                    extra_args["Metadata"] = metadata
+                self.s3_client.put_object(Bucket=s3_bucket, Key=s3_key, Body=data, **extra_args)
             else:
                 logging.info(
                     "Dryrun mode enabled. The following file would have been uploaded to s3://%s/%s:\n%s",
@@ -85,6 +96,19 @@ class S3DocumentManager:
         except ClientError:
             return False
 
+    def get_metadata(self, s3_bucket, document_s3_path):
+        """
+        Get the user metadata of the s3 file.
+
+        :param s3_bucket: bucket
+        :param document_s3_path: s3 key path to the object
+        :return: the user metadata of the object, None if it does not exist
+        """
+        try:
+            return self.s3_client.head_object(Bucket=s3_bucket, Key=document_s3_path).get("Metadata", {})
+        except ClientError:
+            return None
+
     def get_current_version(self, s3_bucket, document_s3_path, raise_on_object_not_found=True):
         """
         Get the most recent version of the s3 file.
@@ -95,9 +119,7 @@ class S3DocumentManager:
         :return: versionId if it's versioned, else None
         """
         try:
-            response = boto3.client("s3", region_name=self._region, **self._credentials).head_object(
-                Bucket=s3_bucket, Key=document_s3_path
-            )
+            response = self.s3_client.head_object(Bucket=s3_bucket, Key=document_s3_path)
             if not response.get("VersionId"):
                 self.error(f"Versioning not enabled for s3://{s3_bucket}")
             return response.get("VersionId")
@@ -183,8 +205,7 @@ class S3DocumentManager:
         :return: True if versioning is enabled, False otherwise.
         """
         try:
-            s3 = boto3.client("s3", region_name=self._region, **self._credentials)
-            return s3.get_bucket_versioning(Bucket=bucket_name).get("Status") == "Enabled"
+            return self.s3_client.get_bucket_versioning(Bucket=bucket_name).get("Status") == "Enabled"
         except Exception as e:
             self.error(f"Failed when checking versioning for S3 bucket {bucket_name} with error {e}")
             raise
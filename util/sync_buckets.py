@@ -21,11 +21,15 @@ from enum import Enum
 
 import argparse
 from common import (
+    CHECKSUM_METADATA_KEY,
+    DEFAULT_MAX_WORKERS,
     PARTITION_TO_MAIN_REGION,
     PARTITIONS,
+    fan_out,
     generate_rollback_data,
     get_aws_regions,
     retrieve_sts_credentials,
+    summarize_by_region,
 )
 from s3_factory import S3DocumentManager
 
@@ -42,6 +46,18 @@ class HashingAlgorithm(Enum):
         return self.value
 
 
+class UploadResult(Enum):
+    """Enum for the results of the upload of a file to a region."""
+
+    UPLOADED = "uploaded"
+    DRYRUN = "dryrun"
+    UNCHANGED = "unchanged"
+    SKIPPED = "skipped"
+
+    def __str__(self):
+        return self.value
+
+
 def _validate_args(args, parser):
     if not args.regions:
         parser.error("please specify --regions or --autodetect-regions")
@@ -113,6 +129,13 @@ def _parse_args():
         default=False,
         required=False,
     )
+    parser.add_argument(
+        "--max-workers",
+        type=int,
+        help="Maximum number of files copied or validated in parallel across all the regions",
+        default=DEFAULT_MAX_WORKERS,
+        required=False,
+    )
 
     args = parser.parse_args()
 
@@ -143,26 +166,50 @@ def _checksum(filename, base64_encoded=True, algorithm=HashingAlgorithm.SHA256):
     return base64.b64encode(checksum.digest()).decode("utf-8") if base64_encoded else checksum.hexdigest()
 
 
-def _upload_files(args, files, sts_credentials, dir):
-    for region in args.regions:
-        for file in files:
-            logging.info("Copying file %s to region %s", file, region)
-            doc_manager = S3DocumentManager(region, sts_credentials.get(region))
-            file_path = f"{dir}/{file}"
-            dest_bucket = args.dest_bucket.format(region=region)
-            exists = doc_manager.version_exists(s3_bucket=dest_bucket, document_s3_path=file)
-            if not args.update_existing and exists:
-                logging.warning(
-                    "Object %s already exists in %s and --update-existing flag was not specified. Skipping upload",
-                    file,
-                    dest_bucket,
-                )
-                continue
-
-            md5 = _checksum(file_path, base64_encoded=True, algorithm=HashingAlgorithm.MD5)
-            logging.info("Computed md5 checksum for S3 upload: %s", md5)
-            with open(file_path, "rb") as data:
-                doc_manager.upload(dest_bucket, file, data, dryrun=not args.deploy, md5=md5)
+def _upload_file(args, doc_manager, region, file, dir, checksums):
+    dest_bucket = args.dest_bucket.format(region=region)
+    md5, sha256 = checksums[file]
+    metadata = doc_manager.get_metadata(s3_bucket=dest_bucket, document_s3_path=file)
+    if metadata is not None:
+        if metadata.get(CHECKSUM_METADATA_KEY) == sha256:
+            logging.info("Object %s in %s has the same checksum of the file. Skipping upload", file, dest_bucket)
+            return UploadResult.UNCHANGED
+        if not args.update_existing:
+            logging.warning(
+                "Object %s already exists in %s and --update-existing flag was not specified. Skipping upload",
+                file,
+                dest_bucket,
+            )
+            return UploadResult.SKIPPED
+
+    logging.info("Copying file %s to region %s", file, region)
+    with open(f"{dir}/{file}", "rb") as data:
+        doc_manager.upload(
+            dest_bucket, file, data, dryrun=not args.deploy, md5=md5, metadata={CHECKSUM_METADATA_KEY: sha256}
+        )
+    return UploadResult.UPLOADED if args.deploy else UploadResult.DRYRUN
+
+
+def _upload_files(args, files, doc_managers, dir):
+    """Upload the files to all the regions, returning the tasks and the result of each of them."""
+    checksums = {}
+    for file in files:
+        file_path = f"{dir}/{file}"
+        checksums[file] = (
+            _checksum(file_path, base64_encoded=True, algorithm=HashingAlgorithm.MD5),
+            _checksum(file_path, base64_encoded=False, algorithm=HashingAlgorithm.SHA256),
+        )
+        logging.info("Computed md5 checksum for S3 upload of file %s: %s", file, checksums[file][0])
+
+    tasks = [(region, file) for region in args.regions for file in files]
+    results = fan_out(
+        lambda region, file: _upload_file(args, doc_managers[region], region, file, dir, checksums),
+        tasks,
+        args.max_workers,
+    )
+    logging.info("Upload summary per region:")
+    summarize_by_region(tasks, results)
+    return tasks, results
 
 
 def _check_file_integrity(file, checksum_file, algorithm):
@@ -203,27 +250,39 @@ def _download_files(args, dir):
             _check_file_integrity(file_path, checksum_file, args.integrity_check)
 
 
-def _validate_uploaded_files(args, uploaded_files, rollback_data):
-    for region in args.regions:
-        bucket_name = f"{args.dest_bucket.format(region=region)}"
-        bucket_url = f"https://{bucket_name}.s3.{region}.amazonaws.com{'.cn' if region.startswith('cn-') else ''}"
-        for file in uploaded_files:
-            url = f"{bucket_url}/{file}"
-            logging.info("Validating file %s", url)
-            metadata = _get_s3_object_metadata(url)
-            if not metadata["version_id"]:
-                logging.error("Cannot fetch object version")
-            if metadata["version_id"] == rollback_data[bucket_name]["files"][file]:
-                logging.error(f"Current version {metadata['version_id']} is the same as previous one")
+def _validate_uploaded_file(args, region, file, rollback_data):
+    bucket_name = f"{args.dest_bucket.format(region=region)}"
+    bucket_url = f"https://{bucket_name}.s3.{region}.amazonaws.com{'.cn' if region.startswith('cn-') else ''}"
+    url = f"{bucket_url}/{file}"
+    logging.info("Validating file %s", url)
+    metadata = _get_s3_object_metadata(url)
+    if not metadata["version_id"]:
+        logging.error("Cannot fetch object version")
+    if metadata["version_id"] == rollback_data[bucket_name]["files"][file]:
+        logging.error(f"Current version {metadata['version_id']} is the same as previous one")
+
+
+def _validate_uploaded_files(args, upload_tasks, upload_results, rollback_data):
+    # The unchanged and skipped objects keep the version of the rollback data
+    fan_out(
+        lambda region, file: _validate_uploaded_file(args, region, file, rollback_data),
+        [task for task, result in zip(upload_tasks, upload_results) if result == UploadResult.UPLOADED],
+        args.max_workers,
+    )
 
 
-def _check_buckets_versioning(args, sts_credentials):
-    for region in args.regions:
-        doc_manager = S3DocumentManager(region, sts_credentials.get(region))
-        bucket_name = f"{args.dest_bucket.format(region=region)}"
-        if not doc_manager.is_bucket_versioning_enabled(bucket_name):
-            logging.error("Versioning is not enabled for bucket %s. Exiting...", bucket_name)
-            sys.exit(1)
+def _check_buckets_versioning(args, doc_managers):
+    bucket_names = {region: args.dest_bucket.format(region=region) for region in args.regions}
+    versioning_enabled = fan_out(
+        lambda region: doc_managers[region].is_bucket_versioning_enabled(bucket_names[region]),
+        [(region,) for region in args.regions],
+        args.max_workers,
+    )
+    if not all(versioning_enabled):
+        for region, enabled in zip(args.regions, versioning_enabled):
+            if not enabled:
+                logging.error("Versioning is not enabled for bucket %s. Exiting...", bucket_names[region])
+        sys.exit(1)
 
 
 def main():
@@ -237,9 +296,11 @@ def main():
     logging.info("Retrieving STS credentials")
     sts_credentials = retrieve_sts_credentials(args.credentials, PARTITION_TO_MAIN_REGION[args.partition], args.regions)
 
+    doc_managers = {region: S3DocumentManager(region, sts_credentials.get(region)) for region in args.regions}
+
     logging.info("Generating rollback data")
     rollback_data = generate_rollback_data(
-        args.regions, args.dest_bucket, args.src_files + checksum_files, sts_credentials
+        args.regions, args.dest_bucket, args.src_files + checksum_files, sts_credentials, doc_managers
     )
 
     with tempfile.TemporaryDirectory() as temp_dir:
@@ -247,12 +308,12 @@ def main():
         logging.info("Downloading the data")
         _download_files(args, temp_dir)
         logging.info("Checking S3 versioning is enabled in destination bucket before proceeding")
-        _check_buckets_versioning(args, sts_credentials)
+        _check_buckets_versioning(args, doc_managers)
         logging.info("Copying files")
-        _upload_files(args, args.src_files + checksum_files, sts_credentials, temp_dir)
+        upload_tasks, upload_results = _upload_files(args, args.src_files + checksum_files, doc_managers, temp_dir)
         if args.deploy:
             logging.info("Validating uploaded files")
-            _validate_uploaded_files(args, args.src_files + checksum_files, rollback_data)
+            _validate_uploaded_files(args, upload_tasks, upload_results, rollback_data)
 
 
 if __name__ == "__main__":
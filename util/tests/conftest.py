@@ -0,0 +1,40 @@
+# Copyright 2026 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"). You may not use this file except in compliance
+# with the License. A copy of the License is located at
+#
+# http://aws.amazon.com/apache2.0/
+#
+# or in the "LICENSE.txt" file accompanying this file. This file is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES
+# OR CONDITIONS OF ANY KIND, express or implied. See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Fixtures of the tests of the util scripts.
+
+The scripts import each other as top level modules, as when they are run from the util directory, and some of them
+have dashes in their names, so they are loaded from their path. Run the tests with: cd util && python -m pytest tests
+"""
+
+import importlib.util
+import os
+import sys
+
+import pytest
+
+UTIL_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if UTIL_DIR not in sys.path:
+    sys.path.insert(0, UTIL_DIR)
+
+
+@pytest.fixture
+def load_util_script():
+    """Return a function loading a fresh module from the given script of the util directory."""
+
+    def _load_util_script(script_name):
+        module_name = os.path.splitext(script_name)[0].replace("-", "_")
+        spec = importlib.util.spec_from_file_location(module_name, os.path.join(UTIL_DIR, script_name))
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        return module
+
+    return _load_util_script
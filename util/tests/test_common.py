@@ -0,0 +1,89 @@
+# Copyright 2026 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"). You may not use this file except in compliance
+# with the License. A copy of the License is located at
+#
+# http://aws.amazon.com/apache2.0/
+#
+# or in the "LICENSE.txt" file accompanying this file. This file is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES
+# OR CONDITIONS OF ANY KIND, express or implied. See the License for the specific language governing permissions and
+# limitations under the License.
+import threading
+import time
+from collections import Counter
+
+import pytest
+from assertpy import assert_that
+from common import create_client, fan_out, summarize_by_region
+
+
+def test_fan_out():
+    lock = threading.Lock()
+    in_flight = {"current": 0, "max": 0}
+    completed = []
+
+    def _call(region, latency):
+        with lock:
+            in_flight["current"] += 1
+            in_flight["max"] = max(in_flight["max"], in_flight["current"])
+        time.sleep(latency)
+        with lock:
+            in_flight["current"] -= 1
+            completed.append(region)
+        return f"{region}-done"
+
+    # The results follow the order of the tasks, not the order of completion
+    tasks = [(f"region-{index}", 0.05 * (4 - index)) for index in range(4)]
+    assert_that(fan_out(_call, tasks, max_workers=2)).is_equal_to([f"region-{index}-done" for index in range(4)])
+    assert_that(in_flight["max"]).is_equal_to(2)
+    assert_that(completed).is_not_equal_to([region for region, _ in tasks])
+
+    assert_that(fan_out(_call, [], max_workers=2)).is_empty()
+
+
+def test_fan_out_failure():
+    completed = []
+
+    def _call(region):
+        if region == "region-1":
+            raise RuntimeError(f"{region} failed")
+        time.sleep(0.05)
+        completed.append(region)
+        return region
+
+    # The failure of a task is raised once all the other tasks have completed
+    with pytest.raises(RuntimeError, match="region-1 failed"):
+        fan_out(_call, [("region-0",), ("region-1",), ("region-2",), ("region-3",)], max_workers=4)
+    assert_that(completed).contains_only("region-0", "region-2", "region-3")
+
+
+def test_summarize_by_region():
+    tasks = [("us-east-1", "a"), ("us-east-1", "b"), ("eu-west-1", "a"), ("us-east-1", "c")]
+    results = ["uploaded", "unchanged", "uploaded", "uploaded"]
+
+    assert_that(summarize_by_region(tasks, results)).is_equal_to(
+        {"us-east-1": Counter({"uploaded": 2, "unchanged": 1}), "eu-west-1": Counter({"uploaded": 1})}
+    )
+
+
+def test_create_client(mocker):
+    lock = threading.Lock()
+    in_flight = {"current": 0, "max": 0}
+
+    def _client(service_name, region_name, **kwargs):
+        with lock:
+            in_flight["current"] += 1
+            in_flight["max"] = max(in_flight["max"], in_flight["current"])
+        time.sleep(0.01)
+        with lock:
+            in_flight["current"] -= 1
+        return (service_name, region_name, kwargs)
+
+    mocker.patch("common.boto3.client", side_effect=_client)
+
+    # The clients are created one at a time, even when requested by parallel tasks
+    tasks = [("s3", f"region-{index}") for index in range(4)]
+    assert_that(fan_out(lambda service, region: create_client(service, region, config="config"), tasks)).is_equal_to(
+        [(service, region, {"config": "config"}) for service, region in tasks]
+    )
+    assert_that(in_flight["max"]).is_equal_to(1)
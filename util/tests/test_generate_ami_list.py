@@ -0,0 +1,88 @@
+# Copyright 2026 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"). You may not use this file except in compliance
+# with the License. A copy of the License is located at
+#
+# http://aws.amazon.com/apache2.0/
+#
+# or in the "LICENSE.txt" file accompanying this file. This file is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES
+# OR CONDITIONS OF ANY KIND, express or implied. See the License for the specific language governing permissions and
+# limitations under the License.
+import threading
+import time
+
+import pytest
+from assertpy import assert_that
+
+
+class _StubEc2Client:
+    """EC2 client answering describe_images after the latency of its region, recording the concurrent calls."""
+
+    in_flight = 0
+    max_in_flight = 0
+    lock = threading.Lock()
+
+    def __init__(self, region_name, latency):
+        self.region_name = region_name
+        self.latency = latency
+
+    def describe_images(self, Owners, Filters):  # noqa: N803
+        with self.lock:
+            _StubEc2Client.in_flight += 1
+            _StubEc2Client.max_in_flight = max(_StubEc2Client.max_in_flight, _StubEc2Client.in_flight)
+        time.sleep(self.latency)
+        with self.lock:
+            _StubEc2Client.in_flight -= 1
+        return {
+            "Images": [
+                {
+                    "Name": f"aws-parallelcluster-3.12.0-{distro}-hvm-{architecture}-202601010000",
+                    "Architecture": architecture,
+                    "CreationDate": "2026-01-01T00:00:00.000Z",
+                    "ImageId": f"ami-{self.region_name}-{distro}-{architecture}",
+                }
+                for distro in ["amzn2", "ubuntu-2004"]
+                for architecture in ["x86_64", "arm64"]
+            ]
+        }
+
+
+@pytest.fixture
+def generate_ami_list(load_util_script):
+    _StubEc2Client.in_flight = _StubEc2Client.max_in_flight = 0
+    return load_util_script("generate-ami-list.py")
+
+
+@pytest.mark.parametrize("max_workers", [1, 4])
+def test_get_ami_list_from_ec2(mocker, generate_ami_list, max_workers):
+    # The first regions are the slowest ones, so the scans complete in the reverse order of the regions
+    regions = [f"region-{index}" for index in range(8)]
+    latencies = {region: 0.1 * (len(regions) - index) / len(regions) for index, region in enumerate(regions)}
+    clients = {region: _StubEc2Client(region, latency) for region, latency in latencies.items()}
+    mocker.patch.object(generate_ami_list, "get_ec2_client", side_effect=clients.get)
+
+    start_time = time.time()
+    amis_json = generate_ami_list.get_ami_list_from_ec2(
+        main_region="region-0",
+        regions=regions,
+        owner="123456789012",
+        credentials=[],
+        filters=[],
+        max_workers=max_workers,
+    )
+    elapsed_time = time.time() - start_time
+
+    # The regions are scanned in parallel up to max_workers
+    assert_that(_StubEc2Client.max_in_flight).is_equal_to(max_workers)
+    if max_workers > 1:
+        assert_that(elapsed_time).is_less_than(sum(latencies.values()))
+    # The mappings follow the order of the regions and hold the images of each region
+    for mapping_name, architecture in [("AWSRegionOS2AMIx86", "x86_64"), ("AWSRegionOS2AMIarm64", "arm64")]:
+        assert_that(list(amis_json[mapping_name])).is_equal_to(regions)
+        for region in regions:
+            assert_that(amis_json[mapping_name][region]).is_equal_to(
+                {
+                    "alinux2": f"ami-{region}-amzn2-{architecture}",
+                    "ubuntu2004": f"ami-{region}-ubuntu-2004-{architecture}",
+                }
+            )
@@ -0,0 +1,133 @@
+# Copyright 2026 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"). You may not use this file except in compliance
+# with the License. A copy of the License is located at
+#
+# http://aws.amazon.com/apache2.0/
+#
+# or in the "LICENSE.txt" file accompanying this file. This file is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES
+# OR CONDITIONS OF ANY KIND, express or implied. See the License for the specific language governing permissions and
+# limitations under the License.
+import hashlib
+import threading
+from collections import Counter
+
+import pytest
+from argparse import Namespace
+from assertpy import assert_that
+from botocore.exceptions import ClientError
+from common import CHECKSUM_METADATA_KEY
+from s3_factory import S3DocumentManager
+
+
+class _StubS3Client:
+    """S3 client of a region keeping the objects in memory, failing the uploads when asked to."""
+
+    def __init__(self, region, objects=None, fail_uploads=False):
+        self.region = region
+        self.objects = objects or {}
+        self.fail_uploads = fail_uploads
+        self.uploaded_keys = []
+        self.lock = threading.Lock()
+
+    def head_object(self, Bucket, Key):  # noqa: N803
+        if (Bucket, Key) not in self.objects:
+            raise ClientError({"Error": {"Code": "404", "Message": "Not Found"}}, "HeadObject")
+        return {"Metadata": self.objects[(Bucket, Key)]}
+
+    def put_object(self, Bucket, Key, Body, Metadata, **kwargs):  # noqa: N803
+        if self.fail_uploads:
+            raise ClientError({"Error": {"Code": "AccessDenied", "Message": "Access Denied"}}, "PutObject")
+        with self.lock:
+            self.objects[(Bucket, Key)] = Metadata
+            self.uploaded_keys.append(Key)
+
+
+@pytest.fixture
+def sync_buckets(load_util_script):
+    return load_util_script("sync_buckets.py")
+
+
+def _doc_managers(s3_clients):
+    doc_managers = {}
+    for region, s3_client in s3_clients.items():
+        doc_managers[region] = S3DocumentManager(region)
+        doc_managers[region]._s3_client = s3_client
+    return doc_managers
+
+
+def _args(regions, deploy=True, update_existing=False):
+    return Namespace(
+        regions=regions,
+        dest_bucket="{region}-aws-parallelcluster",
+        deploy=deploy,
+        update_existing=update_existing,
+        max_workers=4,
+    )
+
+
+@pytest.fixture
+def files(tmp_path):
+    for file, content in [("file1.json", b"content1"), ("file2.json", b"content2")]:
+        (tmp_path / file).write_bytes(content)
+    return ["file1.json", "file2.json"]
+
+
+def test_upload_files(sync_buckets, tmp_path, files):
+    regions = ["us-east-1", "eu-west-1"]
+    file1_checksum = hashlib.sha256(b"content1").hexdigest()
+    s3_clients = {
+        # file1 has already been uploaded with the same content, file2 with a different one
+        "us-east-1": _StubS3Client(
+            "us-east-1",
+            objects={
+                ("us-east-1-aws-parallelcluster", "file1.json"): {CHECKSUM_METADATA_KEY: file1_checksum},
+                ("us-east-1-aws-parallelcluster", "file2.json"): {CHECKSUM_METADATA_KEY: "old-checksum"},
+            },
+        ),
+        "eu-west-1": _StubS3Client("eu-west-1"),
+    }
+
+    tasks, results = sync_buckets._upload_files(_args(regions), files, _doc_managers(s3_clients), str(tmp_path))
+
+    # The objects with the same checksum are not uploaded again, the other existing ones need --update-existing
+    assert_that(dict(zip(tasks, results))).is_equal_to(
+        {
+            ("us-east-1", "file1.json"): sync_buckets.UploadResult.UNCHANGED,
+            ("us-east-1", "file2.json"): sync_buckets.UploadResult.SKIPPED,
+            ("eu-west-1", "file1.json"): sync_buckets.UploadResult.UPLOADED,
+            ("eu-west-1", "file2.json"): sync_buckets.UploadResult.UPLOADED,
+        }
+    )
+    assert_that(s3_clients["us-east-1"].uploaded_keys).is_empty()
+    assert_that(s3_clients["eu-west-1"].uploaded_keys).contains_only(*files)
+    assert_that(
+        s3_clients["eu-west-1"].objects[("eu-west-1-aws-parallelcluster", "file1.json")][CHECKSUM_METADATA_KEY]
+    ).is_equal_to(file1_checksum)
+
+
+def test_upload_files_dryrun(sync_buckets, tmp_path, files):
+    s3_clients = {"us-east-1": _StubS3Client("us-east-1")}
+
+    tasks, results = sync_buckets._upload_files(
+        _args(["us-east-1"], deploy=False), files, _doc_managers(s3_clients), str(tmp_path)
+    )
+
+    # The files that would be uploaded are counted apart from the uploaded ones
+    assert_that(results).is_equal_to([sync_buckets.UploadResult.DRYRUN] * 2)
+    assert_that(s3_clients["us-east-1"].uploaded_keys).is_empty()
+    assert_that(sync_buckets.summarize_by_region(tasks, results)).is_equal_to(
+        {"us-east-1": Counter({sync_buckets.UploadResult.DRYRUN: 2})}
+    )
+
+
+def test_upload_files_region_failure(sync_buckets, tmp_path, files):
+    regions = ["us-east-1", "eu-west-1", "ap-south-1"]
+    s3_clients = {region: _StubS3Client(region, fail_uploads=region == "eu-west-1") for region in regions}
+
+    # The failure of a region stops the sync, once the uploads to the other regions have completed
+    with pytest.raises(SystemExit):
+        sync_buckets._upload_files(_args(regions), files, _doc_managers(s3_clients), str(tmp_path))
+    assert_that(s3_clients["eu-west-1"].uploaded_keys).is_empty()
+    for region in ["us-east-1", "ap-south-1"]:
+        assert_that(s3_clients[region].uploaded_keys).contains_only(*files)
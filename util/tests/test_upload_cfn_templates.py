@@ -0,0 +1,57 @@
+# Copyright 2026 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"). You may not use this file except in compliance
+# with the License. A copy of the License is located at
+#
+# http://aws.amazon.com/apache2.0/
+#
+# or in the "LICENSE.txt" file accompanying this file. This file is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES
+# OR CONDITIONS OF ANY KIND, express or implied. See the License for the specific language governing permissions and
+# limitations under the License.
+from collections import Counter
+
+import pytest
+from argparse import Namespace
+from assertpy import assert_that
+from botocore.exceptions import ClientError
+
+
+class _StubS3Client:
+    """S3 client of a region with no objects, whose buckets may not be present."""
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.uploaded_keys = []
+
+    def head_object(self, Bucket, Key):  # noqa: N803
+        raise ClientError({"Error": {"Code": "404", "Message": "Not Found"}}, "HeadObject")
+
+    def put_object(self, Bucket, Key, **kwargs):  # noqa: N803
+        if Bucket not in self.buckets:
+            raise ClientError({"Error": {"Code": "NoSuchBucket", "Message": "Not Found"}}, "PutObject")
+        self.uploaded_keys.append(Key)
+        return {"ResponseMetadata": {"HTTPStatusCode": 200}}
+
+
+@pytest.fixture
+def upload_cfn_templates(load_util_script):
+    return load_util_script("upload-cfn-templates.py")
+
+
+def test_upload_to_s3_missing_bucket(upload_cfn_templates):
+    # The script reads its arguments from the module, as set when run from the command line
+    upload_cfn_templates.args = args = Namespace(
+        bucket=None, override=False, dryrun=False, createifnobucket=False, max_workers=4
+    )
+    s3_clients = {
+        "us-east-1": _StubS3Client(buckets=["us-east-1-aws-parallelcluster"]),
+        "eu-west-1": _StubS3Client(buckets=[]),
+    }
+    templates = [{"name": "template.cfn.json", "key": "templates/template.cfn.json", "data": b"", "checksum": "c"}]
+
+    # The uploads to a region without bucket are reported as failed
+    assert_that(upload_cfn_templates.upload_to_s3(args, s3_clients, templates)).is_equal_to(
+        {"us-east-1": Counter({"uploaded": 1}), "eu-west-1": Counter({"failed": 1})}
+    )
+    assert_that(s3_clients["us-east-1"].uploaded_keys).is_equal_to(["templates/template.cfn.json"])
+    assert_that(s3_clients["eu-west-1"].uploaded_keys).is_empty()
@@ -10,14 +10,20 @@
 # or in the "LICENSE.txt" file accompanying this file.
 # This file is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, express or implied.
 # See the License for the specific language governing permissions and limitations under the License.
+import hashlib
 import os
 import sys
+import threading
 from glob import glob
 
 import argparse
 import boto3
 import pkg_resources
 from botocore.exceptions import ClientError
+from common import CHECKSUM_METADATA_KEY, DEFAULT_MAX_WORKERS, create_client, fan_out, summarize_by_region
+
+# Buckets are created once, even when more templates are uploaded to them in parallel
+_bucket_creation_lock = threading.Lock()
 
 
 def get_all_aws_regions(region):
@@ -38,112 +44,156 @@ def get_template_extension(templates_dir, template_name):
     return ".cfn." + extension
 
 
-def put_object_to_s3(s3_client, bucket, key, region, data, template_name):
+def create_s3_client(region, aws_credentials=None):
+    if aws_credentials:
+        return create_client(
+            "s3",
+            region,
+            aws_access_key_id=aws_credentials.get("AccessKeyId"),
+            aws_secret_access_key=aws_credentials.get("SecretAccessKey"),
+            aws_session_token=aws_credentials.get("SessionToken"),
+        )
+    return create_client("s3", region)
+
+
+def create_bucket(s3_client, bucket, region):
+    with _bucket_creation_lock:
+        try:
+            s3_client.head_bucket(Bucket=bucket)
+            return
+        except ClientError:
+            pass
+        print("No bucket, creating now: ")
+        if region == "us-east-1":
+            s3_client.create_bucket(Bucket=bucket)
+        else:
+            s3_client.create_bucket(Bucket=bucket, CreateBucketConfiguration={"LocationConstraint": region})
+        s3_client.put_bucket_versioning(Bucket=bucket, VersioningConfiguration={"Status": "Enabled"})
+        print("Created %s bucket. Bucket versioning is enabled, " "please enable bucket logging manually." % bucket)
+
+
+def put_object_to_s3(s3_client, bucket, key, region, template):
+    """Upload the template, returning False when the bucket is not present and it is not created."""
+    put_object_args = {
+        "Bucket": bucket,
+        "Key": key,
+        "Body": template["data"],
+        "ACL": "public-read",
+        "Metadata": {CHECKSUM_METADATA_KEY: template["checksum"]},
+    }
     try:
-        object = s3_client.Object(bucket, key)
-        response = object.put(Body=data, ACL="public-read")
+        response = s3_client.put_object(**put_object_args)
         if response.get("ResponseMetadata").get("HTTPStatusCode") == 200:
-            print("Successfully uploaded %s to s3://%s/%s" % (template_name, bucket, key))
+            print("Successfully uploaded %s to s3://%s/%s" % (template["name"], bucket, key))
     except ClientError as e:
         if args.createifnobucket and e.response["Error"]["Code"] == "NoSuchBucket":
-            print("No bucket, creating now: ")
-            if region == "us-east-1":
-                s3_client.create_bucket(Bucket=bucket)
-            else:
-                s3_client.create_bucket(Bucket=bucket, CreateBucketConfiguration={"LocationConstraint": region})
-            s3_client.BucketVersioning(bucket).enable()
-            print("Created %s bucket. Bucket versioning is enabled, " "please enable bucket logging manually." % bucket)
-            b = s3_client.Bucket(bucket)
-            res = b.put_object(Body=data, ACL="public-read", Key=key)
+            create_bucket(s3_client, bucket, region)
+            res = s3_client.put_object(**put_object_args)
             print(res)
         else:
-            print("Couldn't upload %s to bucket s3://%s/%s" % (template_name, bucket, key))
+            print("Couldn't upload %s to bucket s3://%s/%s" % (template["name"], bucket, key))
             if e.response["Error"]["Code"] == "NoSuchBucket":
                 print("Bucket is not present.")
-            else:
-                raise e
-
+                return False
+            raise e
+    return True
 
-def upload_to_s3(args, region, aws_credentials=None):
-    if aws_credentials:
-        s3_client = boto3.resource(
-            "s3",
-            region_name=region,
-            aws_access_key_id=aws_credentials.get("AccessKeyId"),
-            aws_secret_access_key=aws_credentials.get("SecretAccessKey"),
-            aws_session_token=aws_credentials.get("SessionToken"),
-        )
-    else:
-        s3_client = boto3.resource("s3", region_name=region)
 
-    if args.bucket:
-        buckets = args.bucket.split(",")
-    else:
-        buckets = ["%s-aws-parallelcluster" % region]
+def read_templates(args):
+    """Read the templates to upload once, with the S3 key and the checksum of each of them."""
     key_path = "parallelcluster/{version}/templates/".format(version=args.version)
     template_paths = "cloudformation/"
 
+    templates = []
     for t in args.templates:
         template_ext = get_template_extension(template_paths, t)
         template_name = "{dir}{name}{extension}".format(dir=template_paths, name=t, extension=template_ext)
-        key = "{key_path}{name}-{version}{extension}".format(
-            key_path=key_path, name=t, version=args.version, extension=template_ext
+        with open(template_name, "rb") as template_file:
+            data = template_file.read()
+        templates.append(
+            {
+                "name": template_name,
+                "key": "{key_path}{name}-{version}{extension}".format(
+                    key_path=key_path, name=t, version=args.version, extension=template_ext
+                ),
+                "data": data,
+                "checksum": hashlib.sha256(data).hexdigest(),
+            }
         )
+    return templates
+
+
+def upload_template(args, s3_client, region, bucket, template):
+    key = template["key"]
+    try:
+        metadata = s3_client.head_object(Bucket=bucket, Key=key).get("Metadata", {})
+        exist = True
+    except ClientError:
+        exist = False
+
+    if exist and metadata.get(CHECKSUM_METADATA_KEY) == template["checksum"]:
+        print("Not uploading %s to bucket %s, object exists with the same checksum" % (template["name"], bucket))
+        return "unchanged"
+    if exist:
+        print("Warning: %s already exists in bucket %s" % (key, bucket))
+
+    if (exist and args.override and not args.dryrun) or (not exist and not args.dryrun):
+        return "uploaded" if put_object_to_s3(s3_client, bucket, key, region, template) else "failed"
+    if args.dryrun and (args.override or not exist):
+        print("Dryrun mode enabled, %s would have been uploaded to bucket %s" % (template["name"], bucket))
+        return "dryrun"
+
+    print(
+        "Not uploading %s to bucket %s, object exists %s, override is %s, dryrun is %s"
+        % (template["name"], bucket, exist, args.override, args.dryrun)
+    )
+    return "skipped"
 
-        for bucket in buckets:
-            try:
-                if aws_credentials:
-                    s3 = boto3.client(
-                        "s3",
-                        region_name=region,
-                        aws_access_key_id=aws_credentials.get("AccessKeyId"),
-                        aws_secret_access_key=aws_credentials.get("SecretAccessKey"),
-                        aws_session_token=aws_credentials.get("SessionToken"),
-                    )
-                else:
-                    s3 = boto3.client("s3", region_name=region)
-
-                s3.head_object(Bucket=bucket, Key=key)
-                print("Warning: %s already exists in bucket %s" % (key, bucket))
-                exist = True
-            except ClientError:
-                exist = False
-
-            if (exist and args.override and not args.dryrun) or (not exist and not args.dryrun):
-                with open(template_name, "rb") as data:
-                    put_object_to_s3(s3_client, bucket, key, region, data, template_name)
-            else:
-                print(
-                    "Not uploading %s to bucket %s, object exists %s, override is %s, dryrun is %s"
-                    % (template_name, bucket, exist, args.override, args.dryrun)
-                )
+
+def upload_to_s3(args, s3_clients, templates):
+    """Upload the templates to the buckets of all the regions, in parallel across (region, bucket, template)."""
+    tasks = []
+    for region in s3_clients:
+        buckets = args.bucket.split(",") if args.bucket else ["%s-aws-parallelcluster" % region]
+        tasks.extend((region, bucket, template_index) for bucket in buckets for template_index in range(len(templates)))
+
+    results = fan_out(
+        lambda region, bucket, template_index: upload_template(
+            args, s3_clients[region], region, bucket, templates[template_index]
+        ),
+        tasks,
+        args.max_workers,
+    )
+    print("Upload summary per region:")
+    return summarize_by_region(tasks, results)
 
 
 def main(main_region, args):
     # For all regions
-    for region in args.regions:
-        upload_to_s3(args, region)
+    s3_clients = {region: create_s3_client(region) for region in sorted(args.regions)}
 
-        if main_region == region:
-            for credential in credentials:
-                credential_region = credential[0]
-                credential_endpoint = credential[1]
-                credential_arn = credential[2]
-                credential_external_id = credential[3]
+    if main_region in args.regions:
+        for credential in credentials:
+            credential_region = credential[0]
+            credential_endpoint = credential[1]
+            credential_arn = credential[2]
+            credential_external_id = credential[3]
+
+            try:
+                sts = boto3.client("sts", region_name=main_region, endpoint_url=credential_endpoint)
+                assumed_role_object = sts.assume_role(
+                    RoleArn=credential_arn,
+                    ExternalId=credential_external_id,
+                    RoleSessionName=credential_region + "upload_cfn_templates_sts_session",
+                )
+                aws_credentials = assumed_role_object["Credentials"]
 
-                try:
-                    sts = boto3.client("sts", region_name=main_region, endpoint_url=credential_endpoint)
-                    assumed_role_object = sts.assume_role(
-                        RoleArn=credential_arn,
-                        ExternalId=credential_external_id,
-                        RoleSessionName=credential_region + "upload_cfn_templates_sts_session",
-                    )
-                    aws_credentials = assumed_role_object["Credentials"]
+                s3_clients[credential_region] = create_s3_client(credential_region, aws_credentials)
 
-                    upload_to_s3(args, credential_region, aws_credentials)
+            except ClientError:
+                print("Warning: non authorized in region '{0}', skipping".format(credential_region))
 
-                except ClientError:
-                    print("Warning: non authorized in region '{0}', skipping".format(credential_region))
+    upload_to_s3(args, s3_clients, read_templates(args))
 
 
 if __name__ == "__main__":
@@ -193,6 +243,13 @@ if __name__ == "__main__":
     parser.add_argument(
         "--unsupportedregions", type=str, help="Unsupported regions, comma separated", default="", required=False
     )
+    parser.add_argument(
+        "--max-workers",
+        type=int,
+        help="Maximum number of templates uploaded in parallel across all the regions",
+        default=DEFAULT_MAX_WORKERS,
+        required=False,
+    )
     parser.add_argument(
         "--version",
         type=str,